@@ -10,6 +10,7 @@ sys.stdout.reconfigure(encoding='utf-8')
 # 단일 출처 레지스트리 (execution/wrap_config.py)
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'execution'))
 import wrap_config
+import wrap_nav_store
 
 file_name = 'Wrap_NAV.xlsx'
 
@@ -19,7 +20,7 @@ ytd_base_dates = wrap_config.ytd_base_dates()
 print("1. 기준가 데이터 읽기 중...")
 
 # 기준가 시트 읽기
-df = pd.read_excel(file_name, sheet_name='기준가')
+df = wrap_nav_store.read_sheet('기준가', xlsx=file_name)
 
 # Date 컬럼을 인덱스로 설정
 if 'Date' in df.columns:
@@ -137,26 +138,14 @@ df_new_row = pd.DataFrame([returns_data])
 
 print("\n3. 결과 저장 중...")
 
-# 기존 '수익률' 시트가 있는지 확인
-try:
-    df_existing = pd.read_excel(file_name, sheet_name='수익률')
-    
-    # 같은 날짜가 이미 있으면 제거 (업데이트)
-    if '날짜' in df_existing.columns:
-        df_existing = df_existing[df_existing['날짜'] != current_date_str]
-    
-    # 기존 데이터에 새 행 추가
-    df_returns = pd.concat([df_existing, df_new_row], ignore_index=True)
-    print(f"   - 기존 데이터에 {current_date_str} 추가")
-    
-except:
-    # '수익률' 시트가 없으면 새로 생성
-    df_returns = df_new_row
+# 같은 날짜 행은 교체, 없으면 추가 (시트가 없으면 새로 생성) — 저장소 upsert 후 '수익률' 시트만 내보냄
+is_new_sheet = '수익률' not in wrap_nav_store.sheet_names(xlsx=file_name)
+wrap_nav_store.upsert('수익률', df_new_row, keys=['날짜'], xlsx=file_name)
+wrap_nav_store.export(['수익률'], xlsx=file_name)
+if is_new_sheet:
     print(f"   - 새로운 '수익률' 시트 생성")
-
-# 엑셀에 '수익률' 시트로 저장
-with pd.ExcelWriter(file_name, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-    df_returns.to_excel(writer, sheet_name='수익률', index=False)
+else:
+    print(f"   - 기존 데이터에 {current_date_str} 추가")
 
 print(f"\n[성공] '수익률' 시트가 업데이트되었습니다.")
 print(f"\n최신 데이터 ({current_date_str}):")
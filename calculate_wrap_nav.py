@@ -10,6 +10,8 @@ sys.stdout.reconfigure(encoding='utf-8')
 # 단일 출처 레지스트리 (execution/wrap_config.py)
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'execution'))
 import wrap_config
+import nav_engine
+import wrap_nav_store
 
 # ---------------------------------------------------------
 # 1. 설정
@@ -62,7 +64,11 @@ if not os.path.exists(file_name):
     print(f"오류: '{file_name}' 파일이 없습니다.")
     exit()
 
-df_dict = pd.read_excel(file_name, sheet_name=None)
+# 엑셀 전체 파싱 대신 SQLite 시트 저장소에서 필요한 시트만 (엑셀이 바뀐 경우에만 재적재)
+df_dict = wrap_nav_store.read_sheets(['기준가', 'NEW'], xlsx=file_name)
+if 'NEW' not in df_dict:
+    first_sheet = wrap_nav_store.sheet_names(xlsx=file_name)[0]
+    df_dict[first_sheet] = wrap_nav_store.read_sheet(first_sheet, xlsx=file_name)
 df_old = pd.DataFrame()
 is_update = False
 
@@ -220,13 +226,7 @@ if new_portfolios:
 # 3. 비중 데이터 전처리
 # ---------------------------------------------------------
 target_sheet = 'NEW' if 'NEW' in df_dict.keys() else list(df_dict.keys())[0]
-df_weights = df_dict[target_sheet].copy()
-
-df_weights = df_weights.dropna(subset=['코드'])
-df_weights['코드'] = df_weights['코드'].astype(str).str.strip()
-df_weights = df_weights[df_weights['코드'].str.lower() != 'nan']
-df_weights['코드'] = df_weights['코드'].str.zfill(6)
-df_weights['날짜'] = pd.to_datetime(df_weights['날짜'])
+df_weights = nav_engine.prepare_weights(df_dict[target_sheet])
 
 # ---------------------------------------------------------
 # 4. 데이터 수집
@@ -394,12 +394,10 @@ if len(calc_dates) == 0 and not new_portfolios:
 # ---------------------------------------------------------
 print("3. 추가분 기준가 계산 중...")
 
-new_pf_results = {}
+# 상품별 계산 구간만 여기서 정하고, 비중 정렬·수익률·누적은 nav_engine이 전 상품 일괄 처리.
+nav_plans = {}
 
 for pf_name, start_price in current_base_prices.items():
-    sub_df = df_weights[df_weights['상품명'] == pf_name]
-    if sub_df.empty: continue
-
     # 포트폴리오별 시작일 및 계산 대상 날짜 결정
     pf_config_start = pd.Timestamp(portfolio_config[pf_name]['start_date'])
     is_new_portfolio = is_update and pf_name not in df_old.columns
@@ -422,47 +420,17 @@ for pf_name, start_price in current_base_prices.items():
         pf_start_date = start_date
         pf_calc_dates = calc_dates[calc_dates <= pf_end]
 
-    # ★ 비중 = '리밸런스일 완전 스냅샷' (NEW 시트 한 날짜 = 그 시점 전체 포트폴리오, 편출종목은 미기재=0).
-    #   과거 reindex(calc_dates).ffill()는 편출된 종목의 옛 비중을 영구히 되살려(resurrect)
-    #   비중합 100% 초과·NAV 왜곡 유발 → 2026-03-23 수동→자동 전환 후 기준가 오염의 주원인.
-    #   따라서 ffill 금지: pivot 후 미기재 종목만 0으로 채우고(fillna), 각 리밸런스일 행을 그대로 사용.
-    w_table = sub_df.pivot_table(index='날짜', columns='코드', values='비중', aggfunc='last').fillna(0)
-
-    idx_list = []
-    date_list = []
-
     # 처음 생성 시 또는 신규 포트폴리오: 시작일(T=0) 초기값 기록
-    if not is_update or is_new_portfolio:
-        idx_list.append(start_price)
-        date_list.append(pf_start_date)
-
-    current_index = start_price
-
-    for d in pf_calc_dates:
-        # 전일(d-1)까지 유효했던 비중 찾기.
-        # 엄격한 '<' 필수: '<='로 바꾸면 당일 NEW 시트에 추가된 새 비중으로 당일 NAV가
-        # 계산되어 룩어헤드 버그 발생 (자문 워크플로상 오늘 변경은 다음 거래일부터 적용).
-        past_dates = w_table.index[w_table.index < d]
-
-        if len(past_dates) == 0:
-            port_return = 0
-        else:
-            eff_date = past_dates[-1]
-            weights = w_table.loc[eff_date]
-            valid_cols = weights.index.intersection(df_change.columns)
-
-            if len(valid_cols) == 0:
-                port_return = 0
-            else:
-                today_change = df_change.loc[d, valid_cols]
-                w_vec = weights[valid_cols]
-                port_return = (w_vec * today_change).sum() / 100
-
-        current_index = current_index * (1 + port_return)
-        idx_list.append(current_index)
-        date_list.append(d)
+    seed_date = pf_start_date if (not is_update or is_new_portfolio) else None
+    nav_plans[pf_name] = nav_engine.NavPlan(start_price, pf_calc_dates, seed_date)
 
-    new_pf_results[pf_name] = pd.Series(idx_list, index=date_list)
+# ★ 비중 = '리밸런스일 완전 스냅샷' (NEW 시트 한 날짜 = 그 시점 전체 포트폴리오, 편출종목은 미기재=0).
+#   과거 reindex(calc_dates).ffill()는 편출된 종목의 옛 비중을 영구히 되살려(resurrect)
+#   비중합 100% 초과·NAV 왜곡 유발 → 2026-03-23 수동→자동 전환 후 기준가 오염의 주원인.
+#   엔진도 ffill 없이 각 리밸런스일 행을 그대로 쓰고, 전일(d-1)까지 유효했던 스냅샷을
+#   엄격한 '<'로 붙인다 ('<='면 당일 NEW 변경이 당일 NAV에 반영되는 룩어헤드 버그 —
+#   자문 워크플로상 오늘 변경은 다음 거래일부터 적용). NEW에 없는 상품은 결과에서 빠진다.
+new_pf_results = nav_engine.build_nav(df_weights, df_change, nav_plans)
 
 # ---------------------------------------------------------
 # 6. 결과 병합 및 저장
@@ -496,9 +464,9 @@ if new_pf_results:
 
     df_final.index = df_final.index.strftime('%Y-%m-%d')
 
-    # 엑셀 저장
-    with pd.ExcelWriter(file_name, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-        df_final.to_excel(writer, sheet_name='기준가')
+    # 저장소 갱신 → 엑셀에는 '기준가' 시트만 내보낸다 (Date 인덱스 헤더 보존)
+    wrap_nav_store.replace('기준가', df_final.reset_index(), xlsx=file_name)
+    wrap_nav_store.export(['기준가'], xlsx=file_name, index_sheets=('기준가',))
 
     print(f"\n[성공] 저장이 완료되었습니다. (날짜 형식 인식 가능)")
     print(df_final.tail())
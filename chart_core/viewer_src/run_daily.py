@@ -1,43 +1,173 @@
 # -*- coding: utf-8 -*-
 """뷰어 데일리 파이프라인 — 매일 23:50 KST launchd (viewer-daily).
 
-수집 8종 → 빌드 3종 순차 실행. 수집이 실패해도 빌더는 진행한다
+수집 10종 → 빌드 4종. 수집이 실패해도 빌더는 진행한다
 (수집기 저장이 원자적이라 실패 시 CSV/JSON은 최악의 경우 전일본 유지) —
 단 하나라도 실패하면 rc=1 로 종료해 wrapper 가 notify 를 태운다.
 
+작업 그래프: 종전엔 14단계를 순서대로 돌려 소요가 단계 시간의 합이었다. 각 스크립트의
+입력·출력 파일(COLLECT·BUILD 표)로 의존을 잇고, 준비된 단계부터 WORKERS 개까지 동시에 돌린다.
+  · 빌더는 자기 입력을 만드는 수집기가 끝나는 대로(성공·실패 무관) 시작한다.
+  · 같은 출처(PACING 그룹)의 수집기는 한 번에 하나씩, 앞 단계 종료 후 간격(초)을 두고 —
+    KRX 로그인 세션·ECOS/DART 키 호출 한도를 동시 요청으로 깨지 않게.
+  · 단계 출력은 끝난 뒤 한 덩어리로 찍는다 (동시 실행 로그가 섞이지 않게). WORKERS 1 이면
+    종전처럼 실시간으로 흘린다.
+  · 단계마다 STEP_TIMEOUT 초 상한 — 멈춘 수집기가 실행 전체를 조용히 붙잡지 않게 죽이고
+    rc=124 실패로 기록한다 (뒤 단계는 계속).
+  · 단계별 시작 오프셋·소요·rc 를 RUN_LOG(jsonl)에 실행당 한 줄로 남긴다.
+
 construction 계열(수주잔고=DART 분기 집계)은 데일리 대상이 아님 — 분기 수동.
 
-사용: python3 run_daily.py [--skip-collect]
+기본 WORKERS=1 = 종전과 같다 (선언 순서대로 하나씩, 페이싱 간격 없음). COLLECT 의 출력 파일·PACING 그룹은 이 저장소에 없는 collect_*.py
+대신 빌더가 읽는 파일로 추정한 것이라, 운영 사본의 수집 스크립트와 대조하기 전까지는 동시 실행을
+켜지 않는다 — 표가 틀리면 빌더가 실제 생산자보다 먼저 돌아 전일본을 그리거나 같은 출처 수집기가
+겹친다. 대조 후 env VIEWER_DAILY_WORKERS(또는 --workers)로 올린다.
+
+사용: python3 run_daily.py [--skip-collect] [--workers N]   (--workers 1 = 한 번에 하나)
 """
 import argparse
+import json
 import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
 
 BASE = os.path.dirname(os.path.abspath(__file__))
+RUN_LOG = os.path.join(BASE, "run_daily_log.jsonl")
+WORKERS = int(os.environ.get("VIEWER_DAILY_WORKERS", "1"))   # COLLECT 표 대조 전까지 순차
+STEP_TIMEOUT = int(os.environ.get("VIEWER_DAILY_STEP_TIMEOUT", "1800"))   # 단계당 상한(초)
+RC_TIMEOUT = 124
+
+# (스크립트, 페이싱 그룹, 입력, 출력) — 파일명은 BASE 기준. 이 파이프라인이 만들지 않는 입력
+# (대시보드 REPO/dataset.csv 등)은 적지 않는다. 선언 순서 = 같은 조건일 때의 시작 순서.
+# 미검증: 수집기 출력·그룹은 빌더 입력에서 역으로 추정 — 운영 collect_*.py 와 대조할 것.
+COLLECT = [
+    ("collect.py",          "krx",  (), ("price_short.csv", "futures.csv")),
+    ("collect_mktcap.py",   "krx",  (), ("mktcap.csv",)),
+    ("collect_index.py",    "krx",  (), ("index.csv",)),
+    ("collect_etf.py",      "krx",  (), ("etf_aum_raw.json", "underlying_px.json")),
+    ("collect_vkospi.py",   "kis",  (), ("vkospi.csv",)),
+    ("collect_fx.py",       "ecos", (), ("fx.csv",)),
+    ("collect_us30y.py",    "fred", (), ("us30y.csv",)),
+    ("collect_earnings.py", "dart", (), ("earnings_fin.json",)),
+    ("collect_bop.py",      "ecos", (), ("bop_flows.json",)),
+    ("collect_monthly.py",  "ecos", (), ("monthly_flows.json",)),
+]
+BUILD = [
+    ("build_viewer.py", None, ("price_short.csv", "futures.csv"), ("chart_viewer.html",)),
+    ("build_viewer2.py", None, ("price_short.csv", "futures.csv", "mktcap.csv", "fx.csv",
+                                "us30y.csv", "index.csv", "vkospi.csv", "etf_aum_raw.json"),
+     ("chart_viewer2.html",)),
+    ("build_viewer_etf.py", None, ("etf_aum_raw.json", "underlying_px.json", "earnings_fin.json"),
+     ("chart_viewer_etf.html",)),
+    ("build_viewer_bop.py", None, ("bop_flows.json", "monthly_flows.json"),
+     ("chart_viewer_bop.html",)),
+]
+# 그룹 내 동시 1개 + 앞 단계 종료 후 다음 시작까지 간격(초)
+PACING = {"krx": 2.0, "kis": 1.0, "ecos": 1.0, "dart": 1.0, "fred": 0.0}
+
+_print_lock = threading.Lock()
+
+
+def run(script, stream=False):
+    """스크립트 1개 실행 → (rc, 출력). stream=True 면 출력을 그대로 흘리고 ""를 돌려준다,
+    아니면 모아서 돌려주고 호출 측이 한 덩어리로 찍는다. STEP_TIMEOUT 초과 → 죽이고 RC_TIMEOUT."""
+    pipe = {} if stream else {"stdout": subprocess.PIPE, "stderr": subprocess.STDOUT}
+    try:
+        p = subprocess.run([sys.executable, os.path.join(BASE, script)], cwd=BASE, check=False,
+                           timeout=STEP_TIMEOUT, text=True, errors="replace", **pipe)
+    except subprocess.TimeoutExpired as e:
+        out = e.output or ""
+        if isinstance(out, bytes):
+            out = out.decode("utf-8", "replace")
+        return RC_TIMEOUT, out + f"! {script}: {STEP_TIMEOUT}s 초과 — 중단\n"
+    return p.returncode, p.stdout or ""
+
+
+def run_graph(steps, workers):
+    """의존·페이싱을 지키며 steps 실행 → [{script, group, after, start, sec, rc}] (종료 순).
 
-COLLECT = ["collect.py", "collect_mktcap.py", "collect_index.py", "collect_etf.py",
-           "collect_vkospi.py", "collect_fx.py", "collect_us30y.py", "collect_earnings.py",
-           "collect_bop.py", "collect_monthly.py"]
-BUILD = ["build_viewer.py", "build_viewer2.py", "build_viewer_etf.py", "build_viewer_bop.py"]
+    workers 1 이면 표 대조 없이도 안전하게 — 선언 순서 그대로 하나씩, 페이싱 간격 없이.
+    """
+    serial = workers <= 1
+    producer = {out: s[0] for s in steps for out in s[3]}
+    deps = {s[0]: sorted({producer[i] for i in s[2] if i in producer} - {s[0]}) for s in steps}
+    pending = list(steps)
+    finished = {}                    # script → rc
+    free_at = {}                     # 그룹 → 다음 시작 가능 시각 (monotonic)
+    busy = set()
+    running = {}
+    records = []
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max(1, workers)) as ex:
+        while pending or running:
+            now = time.monotonic()
+            for step in (pending[:1] if serial else list(pending)):
+                if len(running) >= max(1, workers):
+                    break
+                script, group = step[0], step[1]
+                if any(d not in finished for d in deps[script]):
+                    continue
+                if group and (group in busy or now < free_at.get(group, 0.0)):
+                    continue
+                pending.remove(step)
+                if group:
+                    busy.add(group)
+                running[ex.submit(run, script, serial)] = (step, now)
+            if not running:
+                time.sleep(0.2)          # 페이싱 간격 대기뿐
+                continue
+            done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            for fut in done:
+                (script, group, _ins, _outs), started = running.pop(fut)
+                end = time.monotonic()
+                try:
+                    rc, out = fut.result()
+                except Exception as e:   # 실행 자체 실패 (파일 없음 등)
+                    rc, out = -1, "%s: %s\n" % (type(e).__name__, e)
+                finished[script] = rc
+                if group:
+                    busy.discard(group)
+                    free_at[group] = end + (0.0 if serial else PACING.get(group, 0.0))
+                records.append({"script": script, "group": group, "after": deps[script],
+                                "start": round(started - t0, 1), "sec": round(end - started, 1),
+                                "rc": rc})
+                with _print_lock:
+                    if out:
+                        sys.stdout.write(out if out.endswith("\n") else out + "\n")
+                    print(f"[viewer-daily] {script} rc={rc} ({end - started:.1f}s)", flush=True)
+    return records
 
 
-def run(script):
-    rc = subprocess.run([sys.executable, os.path.join(BASE, script)],
-                        cwd=BASE, check=False).returncode
-    print(f"[viewer-daily] {script} rc={rc}", flush=True)
-    return rc
+def write_log(entry):
+    try:
+        with open(RUN_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"[viewer-daily] 실행 로그 기록 실패: {e}", flush=True)
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--skip-collect", action="store_true", help="빌드만 재실행")
+    ap.add_argument("--workers", type=int, default=WORKERS,
+                    help="동시 실행 단계 수 (기본 env VIEWER_DAILY_WORKERS=1 순차)")
     args = ap.parse_args()
 
-    failed = []
-    if not args.skip_collect:
-        failed += [s for s in COLLECT if run(s) != 0]
-    failed += [s for s in BUILD if run(s) != 0]
+    steps = BUILD if args.skip_collect else COLLECT + BUILD
+    started = datetime.now()
+    t0 = time.monotonic()
+    records = run_graph(steps, args.workers)
+    wall = time.monotonic() - t0
+    failed = [r["script"] for r in records if r["rc"] != 0]
+    total = sum(r["sec"] for r in records)
+    write_log({"started_at": started.isoformat(timespec="seconds"), "workers": args.workers,
+               "skip_collect": args.skip_collect, "wall_sec": round(wall, 1),
+               "sum_sec": round(total, 1), "failed": failed, "steps": records})
+    print(f"[viewer-daily] 벽시계 {wall:.0f}s (단계 합 {total:.0f}s, 동시 {args.workers})", flush=True)
     if failed:
         print(f"! 실패: {', '.join(failed)}", flush=True)
         return 1
@@ -37,7 +37,7 @@ import time
 from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dl_common import dataset_dir, merge_into_year_files
+from dl_common import dataset_dir, dataset_years, merge_into_year_files, read_year
 
 PACE_SEC = 0.5
 MAX_CONSEC_FAIL = 5
@@ -431,11 +431,10 @@ def run_deriv_investor(runner, today):
 
 
 def load_trading_days():
-    """kr_ohlcv 연도 parquet의 고유 날짜 = 거래일 달력 (휴일 헛콜 방지)."""
-    import pandas as pd
+    """kr_ohlcv 연도 parquet(+일일 델타)의 고유 날짜 = 거래일 달력 (휴일 헛콜 방지)."""
     days = set()
-    for p in sorted(glob.glob(os.path.join(dataset_dir("kr_ohlcv"), "[0-9]" * 4 + ".parquet"))):
-        s = pd.read_parquet(p, columns=["date"])["date"].drop_duplicates()
+    for year in dataset_years("kr_ohlcv"):
+        s = read_year("kr_ohlcv", year, columns=["date"])["date"].drop_duplicates()
         days |= {d.date() for d in s}
     return sorted(days)
 
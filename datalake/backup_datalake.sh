@@ -1,6 +1,6 @@
 #!/bin/bash
 # datalake 주간 백업 — private repo sisyphe10/sisyphe-datalake push (일요일 10:00 launchd).
-# 제외: market.duckdb(재생성물), _staging/, *.tmp
+# 제외: market.duckdb·rollups.duckdb(재생성물), _staging/, *.tmp
 # 사용: bash datalake/backup_datalake.sh [--init]   # --init = 최초 repo 초기화+원격 연결
 set -euo pipefail
 
@@ -17,6 +17,11 @@ if [ "${1:-}" = "--init" ] || [ ! -d .git ]; then
   cat > .gitignore <<'EOF'
 market/market.duckdb
 market/market.duckdb.wal
+market/rollups.duckdb
+market/rollups.duckdb.wal
+market/.catalog_gen.json
+webui_sql_cache.sqlite*
+file_fingerprints.sqlite*
 market/*/_staging/
 market/*/.merge.lock/
 market/*/.backfill_done
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""parquet 레이아웃 벤치마크 — build_catalog.EXAMPLE_SQL 을 현행 파일 vs PARQUET_LAYOUTS 재작성본에 실행.
+
+  현행(old) : market/<name>/<year>.parquet 사본 (운영 중인 파일 그대로, _delta 제외)
+  신규(new) : 같은 데이터를 dl_common.write_parquet(layout_of(name)) 로 다시 쓴 것
+  측정      : 쿼리별 지연 중앙값(ms, 1회 워밍업 후 --repeat 회) + 읽은 바이트 + 파일 크기
+
+읽은 바이트는 프로세스 read 시스콜 누계(/proc/self/io rchar, 없으면 psutil) 차이다 — DuckDB 의
+파일 캐시를 끄고 재므로 row group 통계로 건너뛴 만큼 줄어든다. 둘 다 없는 OS 에서는 '-'.
+
+사용:
+  python3 datalake/bench_parquet_layout.py                       # EXAMPLE_SQL 전 데이터셋
+  python3 datalake/bench_parquet_layout.py --datasets kr_ohlcv,kr_short --years 2 --repeat 7
+  python3 datalake/bench_parquet_layout.py --json logs/parquet_layout_bench.json
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_catalog import EXAMPLE_SQL  # noqa: E402
+from dl_common import MARKET_DIR, PARQUET_LAYOUTS, layout_of, write_parquet  # noqa: E402
+
+
+def _read_bytes():
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().io_counters().read_chars
+    except Exception:
+        return None
+
+
+def _year_files(name, years):
+    files = sorted(glob.glob(os.path.join(MARKET_DIR, name, "[0-9]" * 4 + ".parquet")))
+    return files[-years:] if years else files
+
+
+def _referenced(sql, names):
+    return [n for n in names if re.search(r"\b%s\b" % re.escape(n), sql)]
+
+
+def prepare(work, names, years):
+    """work/old, work/new 에 데이터셋 사본·재작성본. {name: (old_bytes, new_bytes)}."""
+    import pandas as pd
+    sizes = {}
+    for name in names:
+        old_bytes = new_bytes = 0
+        for side in ("old", "new"):
+            os.makedirs(os.path.join(work, side, name), exist_ok=True)
+        for src in _year_files(name, years):
+            base = os.path.basename(src)
+            old = os.path.join(work, "old", name, base)
+            new = os.path.join(work, "new", name, base)
+            shutil.copy2(src, old)
+            if layout_of(name):
+                df = pd.read_parquet(src)
+                write_parquet(df, new, [c for c in ("date",) if c in df.columns], layout_of(name))
+            else:
+                shutil.copy2(src, new)
+            old_bytes += os.path.getsize(old)
+            new_bytes += os.path.getsize(new)
+        sizes[name] = (old_bytes, new_bytes)
+    return sizes
+
+
+def connect(root, names):
+    import duckdb
+    con = duckdb.connect(":memory:")
+    try:
+        con.execute("SET enable_external_file_cache=false")   # 반복 실행이 캐시로 0바이트가 되지 않게
+    except duckdb.Error:
+        pass
+    for name in names:
+        pattern = os.path.join(root, name, "*.parquet").replace("\\", "/")
+        con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{pattern}', union_by_name=true)")
+    return con
+
+
+def measure(con, sql, repeat):
+    con.execute(sql).fetchall()                 # 워밍업 (메타데이터·OS 캐시)
+    lat, nbytes = [], []
+    for _ in range(repeat):
+        b0 = _read_bytes()
+        t0 = time.perf_counter()
+        con.execute(sql).fetchall()
+        lat.append((time.perf_counter() - t0) * 1000)
+        b1 = _read_bytes()
+        if b0 is not None and b1 is not None:
+            nbytes.append(b1 - b0)
+    return statistics.median(lat), (statistics.median(nbytes) if nbytes else None)
+
+
+def _mb(n):
+    return "-" if n is None else "%.2f" % (n / 1e6)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--datasets", help="쉼표구분 (기본: EXAMPLE_SQL 중 파일이 있는 전부)")
+    ap.add_argument("--years", type=int, default=0, help="데이터셋별 최근 N개 연도 파일만 (기본 전부)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", help="결과 JSON 저장 경로")
+    ap.add_argument("--keep", action="store_true", help="작업 폴더 보존")
+    args = ap.parse_args()
+
+    present = {n for n in os.listdir(MARKET_DIR) if _year_files(n, 0)} if os.path.isdir(MARKET_DIR) else set()
+    targets = args.datasets.split(",") if args.datasets else sorted(EXAMPLE_SQL)
+    targets = [t for t in targets if t in EXAMPLE_SQL and t in present]
+    if not targets:
+        print("벤치할 데이터셋 없음 (EXAMPLE_SQL 대상 parquet 없음)")
+        return 1
+    needed = sorted({n for t in targets for n in _referenced(EXAMPLE_SQL[t], present)} | set(targets))
+
+    work = tempfile.mkdtemp(prefix="parquet_layout_")
+    try:
+        print(f"사본/재작성: {', '.join(needed)} → {work}")
+        sizes = prepare(work, needed, args.years)
+        cons = {side: connect(os.path.join(work, side), needed) for side in ("old", "new")}
+        results = []
+        for name in targets:
+            stmts = [s.strip() for s in EXAMPLE_SQL[name].split(";") if s.strip()]
+            for i, sql in enumerate(stmts, 1):
+                row = {"dataset": name, "query": i, "sql": sql,
+                       "layout": bool(layout_of(name))}
+                for side, con in cons.items():
+                    ms, nb = measure(con, sql, args.repeat)
+                    row[f"{side}_ms"] = round(ms, 2)
+                    row[f"{side}_bytes"] = nb
+                results.append(row)
+
+        print(f"\n{'dataset':<22}{'q':>2} {'old ms':>9} {'new ms':>9} {'old MB':>9} {'new MB':>9}")
+        for r in results:
+            print(f"{r['dataset']:<22}{r['query']:>2} {r['old_ms']:>9.1f} {r['new_ms']:>9.1f} "
+                  f"{_mb(r['old_bytes']):>9} {_mb(r['new_bytes']):>9}"
+                  + ("" if r["layout"] else "   (레이아웃 미선언)"))
+        print(f"\n{'파일 크기':<22}{'old MB':>12} {'new MB':>9}")
+        for name in needed:
+            o, n = sizes[name]
+            print(f"{name:<22}{_mb(o):>12} {_mb(n):>9}")
+        if args.json:
+            os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"results": results, "sizes": sizes,
+                           "layouts": {n: PARQUET_LAYOUTS.get(n) for n in needed}},
+                          f, ensure_ascii=False, indent=2)
+        for con in cons.values():
+            con.close()
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
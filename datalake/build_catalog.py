@@ -5,10 +5,17 @@
   ① market/market.duckdb 에 데이터셋별 뷰 (재)생성
   ② catalog/<dataset>.md — 스키마·기간·행수·쿼리 예시 (LLM 문답용)
   ③ catalog/INDEX.md — 전체 목록
+  ④ market/rollups.duckdb 요약 테이블 증분 갱신 (build_rollups.py) + catalog/ROLLUPS.md
+
+일일 증분이 _delta/ 에 쌓인 데이터셋은 뷰가 조회 시점에 키 중복을 제거한다 (델타 > 연도 파일,
+나중 델타 > 이전 델타). --compact 는 뷰 생성 전에 상한을 넘은 델타를 연도 파일로 접어 넣는다.
 
 사용:
-  python3 datalake/build_catalog.py           # 뷰+카탈로그 재생성
-  python3 datalake/build_catalog.py --check   # 현황 출력만
+  python3 datalake/build_catalog.py                 # 뷰+카탈로그 재생성
+  python3 datalake/build_catalog.py --compact       # 델타 압축(상한 초과분) 후 재생성
+  python3 datalake/build_catalog.py --compact-all   # 델타 전부 압축 후 재생성
+  python3 datalake/build_catalog.py --no-rollups    # 요약 테이블 갱신 생략
+  python3 datalake/build_catalog.py --check         # 현황 출력만
 """
 import argparse
 import glob
@@ -17,7 +24,8 @@ import sys
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dl_common import CATALOG_DIR, DUCKDB_PATH, MARKET_DIR, NOTES_DIR, REPO
+from dl_common import (CATALOG_DIR, DELTA_DIR, DUCKDB_PATH, MARKET_DIR, NOTES_DIR, REPO,
+                       catalog_rebuild, compact_deltas, delta_files, delta_keys)
 
 DESCRIPTIONS = {
     "kr_ohlcv": "국내 전 상장종목 일봉 — ★무수정 원시세 (KRX 정본, 액면분할 미반영). 장기 수익률 계산은 kr_ohlcv_adj 사용",
@@ -104,24 +112,85 @@ def scan_datasets():
         if not os.path.isdir(path):
             continue
         files = sorted(glob.glob(os.path.join(path, "[0-9]" * 4 + ".parquet")))
-        if files:
+        if files or delta_files(d):
             out[d] = files
     return out
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--check", action="store_true", help="현황 출력만")
-    args = ap.parse_args()
+def view_sql(name, has_base=True):
+    """데이터셋 뷰 본문 SELECT. 델타가 있으면 키 중복 제거 (델타 우선, 파일명 = 기록 순서)."""
+    base = os.path.join(MARKET_DIR, name, "*.parquet").replace("\\", "/")
+    # union_by_name: 연도 파일 간 컬럼 구성이 달라도(과거분 스키마 진화) 뷰가 깨지지 않게
+    base_src = f"read_parquet('{base}', union_by_name=true)"
+    keys = delta_keys(name)
+    if not (keys and delta_files(name)):
+        return f"SELECT * FROM {base_src}"
+    delta = os.path.join(MARKET_DIR, name, DELTA_DIR, "*", "*.parquet").replace("\\", "/")
+    part = ", ".join(f'"{k}"' for k in keys)
+    latest = (f"SELECT * EXCLUDE (filename) FROM read_parquet('{delta}', union_by_name=true, filename=true)"
+              f" QUALIFY row_number() OVER (PARTITION BY {part} ORDER BY filename DESC) = 1")
+    if not has_base:
+        return latest
+    on = " AND ".join(f'd."{k}" = b."{k}"' for k in keys)
+    return (f"WITH d AS ({latest})\n"
+            f"SELECT * FROM {base_src} b WHERE NOT EXISTS (SELECT 1 FROM d WHERE {on})\n"
+            f"UNION ALL BY NAME SELECT * FROM d")
+
+
+def write_rollups_md(rollups):
+    """catalog/ROLLUPS.md — 요약 테이블별 설명·스키마·쿼리 예시."""
+    from build_rollups import OVERLAP_DAYS
+    parts = ["# 요약 테이블 (market/rollups.duckdb)", "",
+             "build_rollups.py 가 원천 데이터셋에서 선계산해 증분 유지하는 테이블. 조회 이름은 "
+             "`rollups.<테이블>`. 원천 뷰로 같은 집계를 직접 계산하는 것보다 빠르므로 우선 쓴다.", ""]
+    for r, rows, through, cols in rollups:
+        col_lines = "\n".join(f"| {c} | {t} |" for c, t in cols)
+        parts += [f"## {r.name}", "", r.description, "",
+                  f"- 원천: {', '.join(f'[{s}]({s}.md)' for s in r.sources)}",
+                  f"- 행수: {rows or 0:,} · 최종 {r.date_col}: {str(through)[:10]}",
+                  "- 갱신: " + ("원천이 바뀌면 통째로" if r.period == "snapshot"
+                               else f"증분 — 원천이 바뀌면 최근 {OVERLAP_DAYS}일(주·월은 그 기간 시작)부터 재계산"), "",
+                  "| 컬럼 | 타입 |", "|:---:|:---:|", col_lines, "",
+                  f"```sql\n{r.example}\n```", ""]
+    with open(os.path.join(CATALOG_DIR, "ROLLUPS.md"), "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(parts))
+
 
+def build(args):
     import time
 
     import duckdb
     datasets = scan_datasets()
+    if (args.compact or args.compact_all) and not args.check:
+        for name in datasets:
+            res = compact_deltas(name, force=args.compact_all)
+            if res:
+                print(f"  {name}: 델타 압축 {res}")
+        datasets = scan_datasets()
     if not datasets:
         print("데이터셋 없음 — 백필 먼저 실행하세요")
         return 0
 
+    # 요약 테이블 — 원천은 parquet 를 직접 읽으므로 market.duckdb 뷰보다 먼저 돌려도 된다.
+    # 실패해도 뷰·카탈로그는 만든다 (직전 요약 테이블이 남아 있으면 그대로 안내)
+    import build_rollups
+    rc = 0
+    if not args.check and not args.no_rollups:
+        try:
+            build_rollups.update()
+        except Exception as e:
+            print(f"! 요약 테이블 갱신 실패: {type(e).__name__}: {e}")
+            rc = 1
+    try:
+        rollups = build_rollups.describe()
+    except Exception as e:
+        print(f"! 요약 테이블 조회 실패(갱신 중?): {type(e).__name__}: {e}")
+        rollups = []
+    rollups_of = {}
+    for r, *_ in rollups:
+        for src in r.sources:
+            rollups_of.setdefault(src, []).append(r.name)
+
     if args.check:
         con = duckdb.connect(":memory:")
     else:
@@ -139,24 +208,29 @@ def main():
     index_rows = []
 
     for name, files in datasets.items():
-        pattern = os.path.join(MARKET_DIR, name, "*.parquet").replace("\\", "/")
-        # union_by_name: 연도 파일 간 컬럼 구성이 달라도(과거분 스키마 진화) 뷰가 깨지지 않게
-        src = f"read_parquet('{pattern}', union_by_name=true)"
+        body = view_sql(name, has_base=bool(files))
+        src = f"({body})"
+        n_delta = len(delta_files(name))
         if not args.check:
-            con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM {src}")
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS {body}")
         stats = con.execute(f"SELECT COUNT(*), MIN(date), MAX(date) FROM {src}").fetchone()
         rows, dmin, dmax = stats
         cols = con.execute(f"DESCRIBE SELECT * FROM {src} LIMIT 0").fetchall()
         col_lines = "\n".join(f"| {c[0]} | {c[1]} |" for c in cols)
         period = f"{str(dmin)[:10]} ~ {str(dmax)[:10]}"
         index_rows.append((name, rows, period))
-        print(f"  {name}: {rows:,}행, {period}, 파일 {len(files)}개")
+        print(f"  {name}: {rows:,}행, {period}, 파일 {len(files)}개"
+              + (f" + 델타 {n_delta}개" if n_delta else ""))
 
         if not args.check:
             md = (
                 f"# {name}\n\n{DESCRIPTIONS.get(name, '')}\n\n"
-                f"- 기간: {period}\n- 행수: {rows:,}\n- 파일: `market/{name}/*.parquet` (연도 파티션)\n"
-                f"- 조회: `duckdb ~/datalake/market/market.duckdb` 후 뷰 `{name}` 사용\n\n"
+                f"- 기간: {period}\n- 행수: {rows:,}\n- 파일: `market/{name}/*.parquet` (연도 파티션)"
+                + (f" + `_delta/` 일일 증분 {n_delta}개 (뷰가 키 중복 제거)" if n_delta else "") + "\n"
+                f"- 조회: `duckdb ~/datalake/market/market.duckdb` 후 뷰 `{name}` 사용\n"
+                + ("- ★요약 테이블(집계·조인 선계산, 우선 사용): "
+                   + ", ".join(f"[`rollups.{t}`](ROLLUPS.md#{t})" for t in rollups_of[name]) + "\n"
+                   if name in rollups_of else "") + "\n"
                 f"## 스키마\n\n| 컬럼 | 타입 |\n|:---:|:---:|\n{col_lines}\n\n"
                 + (f"## 단위\n\n{UNITS[name]}\n\n" if name in UNITS else "")
                 + f"## 쿼리 예시\n\n```sql\n{EXAMPLE_SQL.get(name, f'SELECT * FROM {name} ORDER BY date DESC LIMIT 20;')}\n```\n"
@@ -173,7 +247,8 @@ def main():
                FROM kr_futures_ohlcv GROUP BY date, prod, prod_name""")
         md = (
             "# kr_futures_oi_daily\n\nkr_futures_ohlcv의 상품 단위 일별 합산 뷰 — "
-            "월물 합계 미결제약정(oi)·거래량·거래대금.\n\n"
+            "월물 합계 미결제약정(oi)·거래량·거래대금. 같은 내용을 선계산한 "
+            "`rollups.kr_futures_oi_daily` 가 더 빠르다 (ROLLUPS.md).\n\n"
             "## 쿼리 예시\n\n```sql\nSELECT date, oi FROM kr_futures_oi_daily "
             "WHERE prod_name='KOSPI200 선물' ORDER BY date DESC LIMIT 20;\n```\n"
         )
@@ -200,13 +275,38 @@ def main():
         ]
         for name, rows, period in index_rows:
             lines.append(f"| [{name}]({name}.md) | {rows:,} | {period} | {DESCRIPTIONS.get(name, '')} |")
+        if rollups:
+            lines += ["", "## ★요약 테이블 (rollups — 우선 사용)", "",
+                      "주봉·월봉·일간 수익률·공매도 비중·주간 수급 합계·최신 구성종목은 아래 선계산 테이블을 "
+                      "원천 뷰보다 먼저 쓴다 (`rollups.<테이블>` — 위키 run_sql 에 자동 연결, "
+                      "직접 조회는 `ATTACH '~/datalake/market/rollups.duckdb' AS rollups (READ_ONLY)`). "
+                      "상세는 [ROLLUPS.md](ROLLUPS.md).", "",
+                      "| 테이블 | 행수 | 최종일 | 원천 | 설명 |", "|:---:|:---:|:---:|:---:|:---|"]
+            for r, rows, through, _cols in rollups:
+                lines.append(f"| [rollups.{r.name}](ROLLUPS.md#{r.name}) | {rows or 0:,} | {str(through)[:10]} "
+                             f"| {', '.join(r.sources)} | {r.description} |")
+            write_rollups_md(rollups)
         lines += ["", f"- {note_line} (`research_notes/YYYY/YYYY-MM-DD.md`)",
                   "- 스냅샷: `snapshots/YYYY/MM/DD/*.gz`", ""]
         with open(os.path.join(CATALOG_DIR, "INDEX.md"), "w", encoding="utf-8", newline="\n") as f:
             f.write("\n".join(lines))
         print(f"카탈로그+뷰 생성 완료 → {CATALOG_DIR}, {DUCKDB_PATH}")
     con.close()
-    return 0
+    return rc
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="현황 출력만")
+    ap.add_argument("--compact", action="store_true", help="상한(파일 수·나이)을 넘은 델타를 연도 파일로 압축")
+    ap.add_argument("--compact-all", action="store_true", help="델타 전부 압축")
+    ap.add_argument("--no-rollups", action="store_true", help="요약 테이블(rollups.duckdb) 갱신 생략")
+    args = ap.parse_args()
+    if args.check:
+        return build(args)
+    # 재작성 구간 표시 → 위키 연결 풀이 유휴 연결을 놓고, 끝나면 세대 +1 (결과 캐시 무효화)
+    with catalog_rebuild():
+        return build(args)
 
 
 if __name__ == "__main__":
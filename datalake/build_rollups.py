@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""요약 테이블(materialized rollup) — 선언된 집계를 market/rollups.duckdb 에 증분 유지.
+
+배경: market.duckdb 는 read_parquet 뷰뿐이라 위키 run_sql 이 공매도 비중(kr_short×kr_ohlcv)·
+파생 수급 주간 합계·선물 상품별 미결제 합계 같은 조인·집계를 질문마다 원시 parquet 에서
+다시 계산했다.
+
+  저장  : market/rollups.duckdb — market.duckdb 와 별도 파일. 위키는 READ_ONLY 로 ATTACH 해
+          `rollups.<테이블>` 로 조회한다. 재생성물이라 백업 제외.
+  선언  : ROLLUPS — 이름·원천 데이터셋·집계 SQL·주기(day/week/month/snapshot)
+  원천  : build_catalog.view_sql 과 같은 본문(연도 파일+델타 중복 제거)을 임시 뷰로 만든다
+          → market.duckdb 쓰기 락과 무관.
+  증분  : _rollup_state 에 테이블별 원천 파일 지문·파일별 (크기:mtime, 최소 date)·SQL 해시를 기록.
+          · 원천 파일이 그대로면 건너뜀
+          · 바뀌었으면 (테이블 최대 날짜 - OVERLAP_DAYS) 이후만 지우고 다시 계산 — 주·월 집계는
+            그 날짜가 속한 주/월 시작부터. 일일 갱신의 재조회 창(최대 30일)에 들어온 정정도 따라온다.
+          · 바뀐(추가·삭제 포함) 파일에 든 가장 이른 date 가 그보다 앞서면 거기부터 — backfill_krx·
+            backfill_kr_adjusted 의 과거 재작성. 추가·변경 파일은 그 파일만 min(date) 로 읽고,
+            삭제 파일은 기록해 둔 최소 date(없으면 그 연도 1월 1일). 일일 델타는 최근 날짜뿐이라
+            창을 넓히지 않고, 연도 파일 압축(compact_deltas)은 파일이 바뀌므로 그 연도부터 재계산.
+          · SQL 이 바뀌었거나 --full 이면 통째로 재생성, snapshot 은 원천이 바뀌면 통째로(작다)
+          · 원천 데이터셋이 하나라도 없으면 그 테이블은 건너뜀
+
+build_catalog.py 가 뷰 생성 전에 update() 를 부르고 카탈로그에 '요약 테이블' 절로 올린다
+(daily_market_update.py → build_catalog.py --compact 경로로 매일 증분).
+
+사용:
+  python3 datalake/build_rollups.py           # 증분
+  python3 datalake/build_rollups.py --full    # 전부 재생성
+  python3 datalake/build_rollups.py --check   # 상태 출력만
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_catalog import scan_datasets, view_sql  # noqa: E402
+from dl_common import DELTA_DIR, MARKET_DIR, ROLLUP_DB_PATH, catalog_rebuild  # noqa: E402
+
+OVERLAP_DAYS = int(os.getenv("DL_ROLLUP_OVERLAP_DAYS", "31"))   # 증분 재계산 창 (일일 재조회 30일 포함)
+_MIN_DATE = "1900-01-01"
+
+
+@dataclass(frozen=True)
+class Rollup:
+    name: str
+    sources: tuple          # 원천 데이터셋 (전부 있어야 생성)
+    sql: str                # {lo}: 원천 하한 날짜, {since}: 결과 하한 날짜 (DATE 리터럴로 치환)
+    description: str
+    date_col: str = "date"  # 증분 삭제 기준 컬럼
+    period: str = "day"     # day | week | month | snapshot
+    warmup_days: int = 0    # 증분 시 {lo} = {since} - warmup (lag 등 창 함수용)
+    example: str = ""
+
+
+_OHLC_PERIOD = """
+SELECT CAST(date_trunc('{unit}', date) AS DATE) AS period, ticker,
+       arg_max(name, date) AS name, arg_max(market, date) AS market,
+       arg_min(open, date) FILTER (WHERE open > 0) AS open,
+       max(high) AS high, min(low) FILTER (WHERE low > 0) AS low,
+       arg_max(close, date) AS close, sum(volume) AS volume, sum(value) AS value,
+       CAST(min(date) AS DATE) AS first_date, CAST(max(date) AS DATE) AS last_date,
+       count(*) AS days
+FROM kr_ohlcv WHERE date >= {{since}}
+GROUP BY 1, 2
+"""
+
+ROLLUPS = [
+    Rollup(
+        "kr_daily_returns", ("kr_ohlcv_adj",),
+        """SELECT * FROM (
+             SELECT CAST(date AS DATE) AS date, ticker, name, market, adj_close, volume,
+                    adj_close / lag(adj_close) OVER w - 1 AS ret_1d
+             FROM kr_ohlcv_adj WHERE date >= {lo} AND adj_close > 0
+             WINDOW w AS (PARTITION BY ticker ORDER BY date)
+           ) WHERE date >= {since}""",
+        "종목별 일간 수익률 (kr_ohlcv_adj 수정주가 기준) — ret_1d = adj_close/직전 거래일 adj_close - 1",
+        warmup_days=45,
+        example="SELECT date, ret_1d FROM rollups.kr_daily_returns WHERE name='삼성전자' "
+                "AND date>='2026-01-01' ORDER BY date;"),
+    Rollup(
+        "kr_ohlcv_weekly", ("kr_ohlcv",), _OHLC_PERIOD.format(unit="week"),
+        "종목별 주봉 (kr_ohlcv 무수정 원시세, 월요일 시작) — 시가·저가는 거래정지일(0) 제외, "
+        "거래량·거래대금 합계, days=주중 거래일수",
+        date_col="period", period="week",
+        example="SELECT period, open, high, low, close, value FROM rollups.kr_ohlcv_weekly "
+                "WHERE name='삼성전자' ORDER BY period DESC LIMIT 12;"),
+    Rollup(
+        "kr_ohlcv_monthly", ("kr_ohlcv",), _OHLC_PERIOD.format(unit="month"),
+        "종목별 월봉 (kr_ohlcv 무수정 원시세) — 주봉과 같은 규칙, period=월 1일",
+        date_col="period", period="month",
+        example="SELECT period, close, value FROM rollups.kr_ohlcv_monthly "
+                "WHERE name='삼성전자' ORDER BY period DESC LIMIT 24;"),
+    Rollup(
+        "kr_short_ratio", ("kr_short", "kr_ohlcv", "kr_marcap"),
+        """SELECT CAST(s.date AS DATE) AS date, s.ticker, s.name, s.market,
+                  s.short_volume, o.volume, s.short_volume / NULLIF(o.volume, 0) AS short_volume_ratio,
+                  s.short_value, o.value, s.short_value / NULLIF(o.value, 0) AS short_value_ratio,
+                  s.balance_qty, s.balance_value, m.shares,
+                  s.balance_qty / NULLIF(m.shares, 0) AS balance_ratio
+           FROM kr_short s
+           JOIN kr_ohlcv o ON o.date = s.date AND o.ticker = s.ticker AND o.date >= {since}
+           LEFT JOIN kr_marcap m ON m.date = s.date AND m.ticker = s.ticker AND m.date >= {since}
+           WHERE s.date >= {since}""",
+        "종목별 일별 공매도 비중 — kr_short × kr_ohlcv(거래량·거래대금) × kr_marcap(상장주식수) 조인. "
+        "비율은 0~1 (×100 = %), 잔고는 T+2 공시라 최근 1~2일 balance_* 는 빈 값",
+        example="SELECT date, short_volume_ratio, balance_ratio FROM rollups.kr_short_ratio "
+                "WHERE name='삼성전자' ORDER BY date DESC LIMIT 20;"),
+    Rollup(
+        "kr_deriv_investor_weekly", ("kr_deriv_investor",),
+        """SELECT CAST(date_trunc('week', date) AS DATE) AS week, prod,
+                  arg_max(prod_name, date) AS prod_name, metric, side,
+                  sum(COLUMNS(* EXCLUDE (date, prod, prod_name, metric, side))),
+                  CAST(max(date) AS DATE) AS last_date, count(*) AS days
+           FROM kr_deriv_investor WHERE date >= {since}
+           GROUP BY week, prod, metric, side""",
+        "파생 투자자별 수급 주간 합계 (kr_deriv_investor, 월요일 시작) — 투자자 컬럼은 주중 합, "
+        "metric/side 의미는 원천과 같다",
+        date_col="week", period="week",
+        example="SELECT week, foreigner_total FROM rollups.kr_deriv_investor_weekly "
+                "WHERE prod='KR___FUK2I' AND metric='volume' AND side='net' ORDER BY week DESC LIMIT 10;"),
+    Rollup(
+        "kr_investor_value_weekly", ("kr_investor_value",),
+        """SELECT CAST(date_trunc('week', date) AS DATE) AS week, market,
+                  sum(COLUMNS(* EXCLUDE (date, market))),
+                  CAST(max(date) AS DATE) AS last_date, count(*) AS days
+           FROM kr_investor_value WHERE date >= {since}
+           GROUP BY week, market""",
+        "시장 단위 투자자별 순매수 주간 합계 (kr_investor_value, 원 단위, 월요일 시작)",
+        date_col="week", period="week",
+        example="SELECT week, foreigner/1e8 AS frn_eok FROM rollups.kr_investor_value_weekly "
+                "WHERE market='KOSPI' ORDER BY week DESC LIMIT 12;"),
+    Rollup(
+        "kr_futures_oi_daily", ("kr_futures_ohlcv",),
+        """SELECT CAST(date AS DATE) AS date, prod, prod_name, SUM(oi) AS oi,
+                  SUM(volume) AS volume, SUM(value) AS value
+           FROM kr_futures_ohlcv WHERE date >= {since}
+           GROUP BY ALL""",
+        "선물 상품 단위 일별 합산 (kr_futures_ohlcv 월물 합계) — 미결제약정(oi)·거래량·거래대금",
+        example="SELECT date, oi FROM rollups.kr_futures_oi_daily "
+                "WHERE prod_name='KOSPI200 선물' ORDER BY date DESC LIMIT 20;"),
+    Rollup(
+        "kr_index_constituents_latest", ("kr_index_constituents",),
+        """SELECT CAST(date AS DATE) AS date, index_name, ticker, name
+           FROM kr_index_constituents
+           QUALIFY date = max(date) OVER (PARTITION BY index_name)""",
+        "KOSPI200·KOSDAQ150 최신 구성 종목 (index_name 별 마지막 스냅샷, date=기준일)",
+        period="snapshot",
+        example="SELECT index_name, ticker, name FROM rollups.kr_index_constituents_latest "
+                "ORDER BY index_name, ticker;"),
+]
+
+_STATE_DDL = """CREATE TABLE IF NOT EXISTS _rollup_state (
+  name VARCHAR PRIMARY KEY, sql_hash VARCHAR, fingerprint VARCHAR,
+  rows BIGINT, through DATE, built_at TIMESTAMP, seconds DOUBLE, files VARCHAR)"""
+
+
+def connect(read_only=False, retries=5):
+    """rollups.duckdb 연결. 쓰기는 단일 writer — 위키의 READ_ONLY ATTACH 와 겹치면 재시도."""
+    import duckdb
+    for attempt in range(retries):
+        try:
+            return duckdb.connect(ROLLUP_DB_PATH, read_only=read_only)
+        except duckdb.Error:
+            if attempt == retries - 1:
+                raise
+            time.sleep(3)
+
+
+def _sql_hash(r):
+    return hashlib.sha1(" ".join(r.sql.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def source_files(names):
+    """원천 데이터셋 파일 {MARKET_DIR 기준 경로: "크기:mtime_ns"} — 연도 파일 + 델타."""
+    out = {}
+    for name in sorted(names):
+        d = os.path.join(MARKET_DIR, name)
+        files = glob.glob(os.path.join(d, "[0-9]" * 4 + ".parquet"))
+        files += glob.glob(os.path.join(d, DELTA_DIR, "[0-9]" * 4, "*.parquet"))
+        for p in files:
+            st = os.stat(p)
+            out[os.path.relpath(p, MARKET_DIR).replace(os.sep, "/")] = f"{st.st_size}:{st.st_mtime_ns}"
+    return out
+
+
+def source_fingerprint(names, files=None):
+    """원천 파일 목록 지문 (바뀌었는지만 본다)."""
+    files = source_files(names) if files is None else files
+    h = hashlib.sha1()
+    for rel in sorted(files):
+        h.update(f"{rel}:{files[rel]}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _file_year(rel):
+    """'<name>/2019.parquet' · '<name>/_delta/2019/<ns>.parquet' → 2019."""
+    parts = rel.split("/")
+    return int(parts[2] if len(parts) > 2 and parts[1] == DELTA_DIR else parts[-1][:4])
+
+
+def file_min_date(con, rel):
+    """원천 파일 하나의 최소 date (읽을 수 없거나 date 컬럼이 없으면 그 연도 1월 1일)."""
+    path = os.path.join(MARKET_DIR, rel).replace("\\", "/")
+    try:
+        v = con.execute(f"SELECT min(date) FROM read_parquet('{path}')").fetchone()[0]
+    except Exception:
+        v = None
+    return _as_date(v) or date(_file_year(rel), 1, 1)
+
+
+def _stamp(v):
+    """_rollup_state.files 값 → (크기:mtime, 최소 date 또는 None). 구 형식은 문자열만."""
+    return (v, None) if isinstance(v, str) else (v[0], _as_date(v[1]))
+
+
+def changed_min_date(con, old, new):
+    """이전 상태 old {rel: [stamp, min]}·현재 파일 new {rel: stamp} 사이 바뀐 파일들의 최소 date.
+
+    → (최소 date 또는 None, 현재 파일별 [stamp, min]) — 안 바뀐 파일은 기록된 min 을 이어받는다.
+    """
+    lo, files = None, {}
+    for rel, stamp in new.items():
+        prev = _stamp(old[rel]) if rel in old else None
+        if prev and prev[0] == stamp:
+            files[rel] = [stamp, prev[1].isoformat() if prev[1] else None]
+            continue
+        m = file_min_date(con, rel)
+        files[rel] = [stamp, m.isoformat()]
+        lo = m if lo is None else min(lo, m)
+    for rel in set(old) - set(new):
+        m = _stamp(old[rel])[1] or date(_file_year(rel), 1, 1)
+        lo = m if lo is None else min(lo, m)
+    return lo, files
+
+
+def _since(r, last, changed_min=None):
+    """증분 재계산 시작일 (None = 전체). changed_min: 바뀐 원천 파일에 든 가장 이른 date."""
+    if last is None or r.period == "snapshot":
+        return None
+    d = last - timedelta(days=OVERLAP_DAYS)
+    if changed_min is not None and changed_min < d:
+        d = changed_min
+    if r.period == "week":
+        d -= timedelta(days=d.weekday())
+    elif r.period == "month":
+        d = d.replace(day=1)
+    return d
+
+
+def _render(r, since):
+    lo = since - timedelta(days=r.warmup_days) if since else None
+    lit = lambda d: f"DATE '{d.isoformat() if d else _MIN_DATE}'"   # noqa: E731
+    return r.sql.format(lo=lit(lo), since=lit(since))
+
+
+def _as_date(v):
+    return None if v is None else date.fromisoformat(str(v)[:10])
+
+
+def refresh(con, r, full=False):
+    """테이블 하나 갱신. ('skip'|'full'|'incr', 행수 변화 설명)."""
+    state = con.execute("SELECT sql_hash, fingerprint, files FROM _rollup_state WHERE name=?",
+                        [r.name]).fetchone()
+    files = source_files(r.sources)
+    fp = source_fingerprint(r.sources, files)
+    sh = _sql_hash(r)
+    exists = con.execute("SELECT count(*) FROM information_schema.tables "
+                         "WHERE table_schema='main' AND table_name=?", [r.name]).fetchone()[0]
+    if exists and state and state[0] == sh and state[1] == fp and not full:
+        return "skip", None
+    t0 = time.time()
+    since = None
+    lo, stamps = changed_min_date(con, json.loads(state[2]) if state and state[2] else {}, files)
+    if exists and state and state[0] == sh and state[2] and not full:   # files 없는 구 상태 → 전체 1회
+        since = _since(r, _as_date(con.execute(f'SELECT max("{r.date_col}") FROM {r.name}').fetchone()[0]),
+                       lo)
+    body = _render(r, since)
+    con.execute("BEGIN")
+    try:
+        if since is None:
+            con.execute(f"CREATE OR REPLACE TABLE {r.name} AS {body}")
+            mode = "full"
+        else:
+            con.execute(f'DELETE FROM {r.name} WHERE "{r.date_col}" >= DATE \'{since.isoformat()}\'')
+            con.execute(f"INSERT INTO {r.name} BY NAME {body}")
+            mode = "incr"
+        rows, through = con.execute(f'SELECT count(*), max("{r.date_col}") FROM {r.name}').fetchone()
+        con.execute("INSERT OR REPLACE INTO _rollup_state VALUES (?, ?, ?, ?, ?, now(), ?, ?)",
+                    [r.name, sh, fp, rows, through, time.time() - t0,
+                     json.dumps(stamps, sort_keys=True)])
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return mode, f"{rows:,}행, ~{str(through)[:10]}" + (f" (≥{since} 재계산)" if since else "")
+
+
+def _source_views(con, names):
+    datasets = scan_datasets()
+    for name in names:
+        con.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS {view_sql(name, has_base=bool(datasets[name]))}")
+
+
+def update(full=False, only=None):
+    """선언된 요약 테이블 증분 갱신. {name: mode} (원천이 없어 건너뛴 것은 'missing')."""
+    present = set(scan_datasets())
+    targets = [r for r in ROLLUPS if only is None or r.name in only]
+    result = {}
+    runnable = []
+    for r in targets:
+        if set(r.sources) <= present:
+            runnable.append(r)
+        else:
+            result[r.name] = "missing"
+    if not runnable:
+        return result
+    os.makedirs(os.path.dirname(ROLLUP_DB_PATH), exist_ok=True)
+    con = connect()
+    try:
+        con.execute(_STATE_DDL)
+        con.execute("ALTER TABLE _rollup_state ADD COLUMN IF NOT EXISTS files VARCHAR")
+        _source_views(con, sorted({s for r in runnable for s in r.sources}))
+        for r in runnable:
+            mode, info = refresh(con, r, full=full)
+            result[r.name] = mode
+            if mode != "skip":
+                print(f"  rollups.{r.name}: {mode} {info}")
+        # 선언에서 빠진 테이블 정리
+        declared = {r.name for r in ROLLUPS}
+        for (name,) in con.execute("SELECT name FROM _rollup_state").fetchall():
+            if name not in declared:
+                con.execute(f"DROP TABLE IF EXISTS {name}")
+                con.execute("DELETE FROM _rollup_state WHERE name=?", [name])
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    return result
+
+
+def describe():
+    """카탈로그용 [(Rollup, rows, through, [(col, type), ...]), ...] — 생성된 테이블만."""
+    if not os.path.exists(ROLLUP_DB_PATH):
+        return []
+    con = connect(read_only=True)
+    try:
+        have = set(r[0] for r in con.execute("SELECT table_name FROM information_schema.tables "
+                                             "WHERE table_schema='main'").fetchall())
+        state = {} if "_rollup_state" not in have else {
+            n: (rows, through) for n, rows, through in
+            con.execute("SELECT name, rows, through FROM _rollup_state").fetchall()}
+        out = []
+        for r in ROLLUPS:
+            if r.name not in have:
+                continue
+            cols = [(c[0], c[1]) for c in con.execute(f"DESCRIBE {r.name}").fetchall()]
+            rows, through = state.get(r.name, (None, None))
+            out.append((r, rows, through, cols))
+        return out
+    finally:
+        con.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true", help="전부 재생성")
+    ap.add_argument("--only", help="쉼표구분 테이블명만")
+    ap.add_argument("--check", action="store_true", help="상태 출력만")
+    args = ap.parse_args()
+    if args.check:
+        for r, rows, through, _cols in describe():
+            print(f"  rollups.{r.name}: {rows or 0:,}행, ~{str(through)[:10]}")
+        return 0
+    t0 = time.time()
+    with catalog_rebuild():
+        res = update(full=args.full, only=set(args.only.split(",")) if args.only else None)
+    missing = sorted(n for n, m in res.items() if m == "missing")
+    skipped = sum(1 for m in res.values() if m == "skip")
+    print(f"요약 테이블 갱신 완료 ({time.time() - t0:.1f}s, 변경 없음 {skipped}개"
+          + (f", 원천 없음: {', '.join(missing)}" if missing else "") + f") → {ROLLUP_DB_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
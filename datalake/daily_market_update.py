@@ -4,10 +4,12 @@
 당일(및 lookback 창) 데이터를 각 데이터셋 연도 parquet에 upsert.
 휴장일은 KRX가 빈 응답을 주므로 조용히 skip. lookback으로 누락일 자가치유.
 
+- 국내 단면(종목·ETF·공매도)·수정주가: 연도 파일을 다시 쓰지 않고 _delta/ 에 일별 델타만 추가
+  (dl_common.merge_into_year_files delta=True — 쓰기량 = 신규 데이터 크기)
 - 국내 단면(종목·ETF): 최근 LOOKBACK_DAYS 중 아직 없는 날짜만 일별 단면 호출
 - 지수·투자자: 최근 30일 범위 재조회 upsert (잠정치 self-heal)
 - 해외: 심볼별 최근 14일 (yfinance 일괄 다운로드)
-- 마지막에 build_catalog.py 실행 (뷰·카탈로그 갱신)
+- 마지막에 build_catalog.py --compact 실행 (상한 넘은 델타 압축 + 뷰·카탈로그 갱신)
 
 사용: python3 datalake/daily_market_update.py [--days N]
 """
@@ -19,7 +21,7 @@ import time
 from datetime import date, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dl_common import REPO, merge_into_year_files, year_path
+from dl_common import REPO, dataset_years, merge_into_year_files, read_year, year_path
 
 PACE_SEC = 0.5
 LOOKBACK_DAYS = 7
@@ -43,14 +45,12 @@ def load_name_map(dataset):
     유지해야 연도 경계에서 parquet 스키마가 갈라지지 않고, upsert가 기존
     name을 NaN으로 덮지 않는다.
     """
-    import glob as _glob
     import json
-    import pandas as pd
     name_map = {}
-    files = sorted(_glob.glob(os.path.join(os.path.dirname(year_path(dataset, 2000)), "[0-9]" * 4 + ".parquet")))
-    if files:
+    years = dataset_years(dataset)
+    if years:
         try:
-            df = pd.read_parquet(files[-1], columns=["ticker", "name"])
+            df = read_year(dataset, years[-1], columns=["ticker", "name"])
             name_map = dict(df.dropna().drop_duplicates("ticker", keep="last").values)
         except Exception:
             pass
@@ -69,14 +69,11 @@ def load_name_map(dataset):
 
 
 def existing_dates(dataset, since):
-    """연도 parquet에서 since 이후 존재하는 날짜 집합."""
-    import pandas as pd
+    """연도 parquet(+델타)에서 since 이후 존재하는 날짜 집합."""
     dates = set()
     for year in {since.year, date.today().year}:
-        p = year_path(dataset, year)
-        if os.path.exists(p):
-            s = pd.read_parquet(p, columns=["date"])["date"]
-            dates |= {d.date() for d in s if d.date() >= since}
+        s = read_year(dataset, year, columns=["date"])["date"].drop_duplicates()
+        dates |= {d.date() for d in s if d.date() >= since}
     return dates
 
 
@@ -129,7 +126,8 @@ def cross_section(stock, dataset, fetch_by_market, key_cols, markets):
         if failed:
             continue
         if frames:
-            merge_into_year_files(dataset, pd.concat(frames, ignore_index=True), key_cols)
+            merge_into_year_files(dataset, pd.concat(frames, ignore_index=True), key_cols,
+                                  delta=True)
             added += 1
     print(f"[{dataset}] 신규 {added}일 (누락 후보 {len(missing)}일)", flush=True)
 
@@ -191,7 +189,7 @@ def short_update(stock):
             continue
         if frames:
             merge_into_year_files(dataset, pd.concat(frames, ignore_index=True),
-                                  ["date", "ticker"])
+                                  ["date", "ticker"], delta=True)
             added += 1
     print(f"[{dataset}] 신규 {added}일 (누락 후보 {len(missing)}일)", flush=True)
 
@@ -428,7 +426,7 @@ def kr_adjusted_update():
             ok += 1
         if merged:
             merge_into_year_files(DATASET, pd.concat(merged, ignore_index=True),
-                                  ["date", "ticker"])
+                                  ["date", "ticker"], delta=True)
     print(f"[{DATASET}] {ok}/{len(rows)}종목 최근 14일 갱신", flush=True)
 
 
@@ -467,9 +465,10 @@ def main():
     overseas_update()
     kr_adjusted_update()
 
-    # 카탈로그·뷰 갱신 — 실패를 성공으로 삼키지 않는다 (wrapper가 notify)
+    # 델타 압축(상한 초과분) + 카탈로그·뷰 갱신 — 실패를 성공으로 삼키지 않는다 (wrapper가 notify)
     rc = subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                      "build_catalog.py")], check=False).returncode
+                                                      "build_catalog.py"), "--compact"],
+                        check=False).returncode
     if rc != 0:
         print(f"! build_catalog 실패 rc={rc}", flush=True)
         return 1
@@ -18,6 +18,8 @@ NOTES_DIR = os.path.join(DATALAKE_ROOT, "research_notes")
 SNAP_DIR = os.path.join(DATALAKE_ROOT, "snapshots")
 CATALOG_DIR = os.path.join(DATALAKE_ROOT, "catalog")
 DUCKDB_PATH = os.path.join(MARKET_DIR, "market.duckdb")
+ROLLUP_DB_PATH = os.path.join(MARKET_DIR, "rollups.duckdb")   # 요약 테이블 (build_rollups.py)
+CATALOG_GEN_PATH = os.path.join(MARKET_DIR, ".catalog_gen.json")   # 카탈로그 세대 (catalog_rebuild)
 
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -67,11 +69,215 @@ def dataset_lock(name, timeout_sec=1800, stale_sec=7200):
             pass
 
 
-def merge_into_year_files(name, df, key_cols):
+# ── 카탈로그 세대 ──────────────────────────────────────────────────────
+# build_catalog/build_rollups 가 market.duckdb·rollups.duckdb 를 다시 쓰는 구간을 표시한다.
+# 위키 run_sql 연결 풀은 building 이면 유휴 연결을 놓고(DuckDB 는 읽기 연결이 열려 있으면 다른
+# 프로세스가 쓰기로 못 연다), 결과 캐시는 세대 번호를 키에 넣어 재작성 전 결과를 버린다.
+_GEN_STALE_SEC = 3600     # building 표시가 이보다 오래되면 죽은 프로세스가 남긴 것으로 본다
+
+
+def catalog_generation():
+    """(세대 번호, 재작성 중 여부)."""
+    import json
+    import time
+    try:
+        with open(CATALOG_GEN_PATH, encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return 0, False
+    building = d.get("building_since")
+    return int(d.get("gen", 0)), bool(building) and time.time() - float(building) < _GEN_STALE_SEC
+
+
+def _write_generation(gen, building_since=None):
+    import json
+    os.makedirs(MARKET_DIR, exist_ok=True)
+    tmp = f"{CATALOG_GEN_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"gen": gen, "building_since": building_since}, f)
+    os.replace(tmp, CATALOG_GEN_PATH)
+
+
+@contextlib.contextmanager
+def catalog_rebuild():
+    """재작성 구간 — 진입 시 building 표시, 나올 때(실패 포함) 세대 +1."""
+    import time
+    gen, _building = catalog_generation()
+    _write_generation(gen, time.time())
+    try:
+        yield gen
+    finally:
+        _write_generation(catalog_generation()[0] + 1)
+
+
+# ── parquet 물리 레이아웃 (데이터셋별) ──────────────────────────────────
+# 위키·차트 쿼리는 대부분 ticker/name/symbol/series 하나 + 기간 필터다 (build_catalog.EXAMPLE_SQL).
+# date 우선 정렬 + 기본 row group(1M행)이면 종목 하나를 찾으려 거의 모든 row group 을 읽는다 →
+# 종목 우선 정렬 + 작은 row group 으로 row group 통계(min/max)에 걸러지게 한다.
+#   sort              : 정렬 컬럼 (미지정 = key_cols, 즉 date 우선)
+#   row_group_size    : row group 행수 (미지정 = pyarrow 기본)
+#   dictionary        : 사전 인코딩 컬럼 (미지정 = pyarrow 기본 = 전 컬럼)
+#   compression(_level): 미지정 = snappy
+# 미선언 데이터셋은 종전과 같은 파일을 쓴다. 효과 확인: datalake/bench_parquet_layout.py
+_TICKER_MAJOR = {"sort": ["ticker", "date"], "row_group_size": 100_000,
+                 "dictionary": ["ticker", "name", "market"],
+                 "compression": "zstd", "compression_level": 3}
+PARQUET_LAYOUTS = {
+    "kr_ohlcv": _TICKER_MAJOR,
+    "kr_ohlcv_adj": _TICKER_MAJOR,
+    "kr_marcap": _TICKER_MAJOR,
+    "kr_foreign": _TICKER_MAJOR,
+    "kr_fundamental": _TICKER_MAJOR,
+    "kr_short": _TICKER_MAJOR,
+    "kr_etf_ohlcv": dict(_TICKER_MAJOR, dictionary=["ticker", "name"]),
+    "overseas_ohlcv": {"sort": ["symbol", "date"], "row_group_size": 100_000,
+                       "dictionary": ["symbol", "name"], "compression": "zstd", "compression_level": 3},
+    "global_markets": {"sort": ["category", "symbol", "date"], "row_group_size": 50_000,
+                       "compression": "zstd", "compression_level": 3},
+    "macro_series": {"sort": ["series", "date"], "row_group_size": 50_000,
+                     "compression": "zstd", "compression_level": 3},
+}
+
+
+def layout_of(name):
+    """데이터셋 레이아웃 (PARQUET_LAYOUTS, 미선언 = {} = pyarrow 기본)."""
+    return PARQUET_LAYOUTS.get(name, {})
+
+
+def write_parquet(df, path, key_cols, layout=None):
+    """df 를 layout(정렬·row group·사전 인코딩·압축)대로 path 에 기록. layout 에 없는 정렬 컬럼은 무시."""
+    layout = layout or {}
+    sort = [c for c in (layout.get("sort") or key_cols) if c in df.columns] or list(key_cols)
+    df = df.sort_values(sort, kind="stable").reset_index(drop=True)
+    kwargs = {k: layout[k] for k in ("row_group_size", "compression", "compression_level") if k in layout}
+    if "dictionary" in layout:
+        kwargs["use_dictionary"] = [c for c in layout["dictionary"] if c in df.columns]
+    df.to_parquet(path, index=False, **kwargs)
+    return len(df)
+
+
+# ── 증분(델타) 레이아웃 ─────────────────────────────────────────────
+# market/<name>/<year>.parquet       : 압축본 (key_cols 정렬, 키 유일)
+# market/<name>/_delta/<year>/<ns>.<pid>.parquet : 일일 upsert 델타 (파일명 = 기록 순서)
+# market/<name>/_delta/keys.json     : key_cols (build_catalog 뷰의 조회 시 중복 제거·압축용)
+# market/<name>/_delta/_anchor/schema.parquet : 0행 스키마 파일 — 델타가 전부 압축돼도 뷰의
+#                                      _delta/*/*.parquet glob 이 비지 않게 (DuckDB 는 빈 glob 을 에러로 본다)
+# 같은 키는 나중 델타가 이기고, 델타가 압축본을 이긴다. compact_deltas() 가 멱등하게 접어 넣는다.
+DELTA_DIR = "_delta"
+COMPACT_MAX_FILES = int(os.getenv("DL_COMPACT_MAX_FILES", "40"))   # 연도별 델타 파일 수 상한
+COMPACT_MAX_AGE_DAYS = float(os.getenv("DL_COMPACT_MAX_AGE_DAYS", "7"))  # 가장 오래된 델타 나이 상한
+
+
+def delta_root(name):
+    return os.path.join(dataset_dir(name), DELTA_DIR)
+
+
+def delta_files(name, year=None):
+    """델타 parquet 목록 (기록 순). year=None 이면 전 연도."""
+    import glob
+    sub = "[0-9]" * 4 if year is None else str(int(year))
+    files = glob.glob(os.path.join(delta_root(name), sub, "*.parquet"))
+    return sorted(files, key=lambda p: (os.path.basename(os.path.dirname(p)), os.path.basename(p)))
+
+
+def delta_keys(name):
+    """델타 기록 시 남긴 key_cols (델타가 한 번도 없었으면 None)."""
+    import json
+    try:
+        with open(os.path.join(delta_root(name), "keys.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def dataset_years(name):
+    """압축본 또는 델타가 있는 연도 (오름차순)."""
+    import glob
+    years = {int(os.path.basename(p)[:4])
+             for p in glob.glob(os.path.join(dataset_dir(name), "[0-9]" * 4 + ".parquet"))}
+    years |= {int(os.path.basename(os.path.dirname(p))) for p in delta_files(name)}
+    return sorted(years)
+
+
+def read_year(name, year, columns=None):
+    """연도 데이터 = 압축본 + 델타 (키 중복은 나중 값). 파일이 하나도 없으면 빈 DataFrame."""
+    import pandas as pd
+    keys = delta_keys(name) or []
+    cols = None if columns is None else list(dict.fromkeys(list(columns) + keys))
+    path = year_path(name, year)
+    frames = [pd.read_parquet(p, columns=cols)
+              for p in ([path] if os.path.exists(path) else []) + delta_files(name, year)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    if len(frames) > 1 and keys:
+        df = df.drop_duplicates(subset=keys, keep="last").reset_index(drop=True)
+    return df if columns is None else df[list(columns)]
+
+
+def _write_delta(name, year, chunk, key_cols):
+    import json
+    import time
+    d = os.path.join(delta_root(name), str(int(year)))
+    os.makedirs(d, exist_ok=True)
+    keys_path = os.path.join(delta_root(name), "keys.json")
+    if delta_keys(name) != list(key_cols):
+        with open(keys_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(list(key_cols), f)
+        os.replace(keys_path + ".tmp", keys_path)
+    path = os.path.join(d, f"{time.time_ns():019d}.{os.getpid()}.parquet")
+    chunk = chunk.drop_duplicates(subset=key_cols, keep="last")
+    anchor = os.path.join(delta_root(name), "_anchor", "schema.parquet")
+    if not os.path.exists(anchor):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(os.path.dirname(anchor), exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False).slice(0, 0), anchor + ".tmp")
+        os.replace(anchor + ".tmp", anchor)
+    write_parquet(chunk, path + ".tmp", key_cols, layout_of(name))
+    os.replace(path + ".tmp", path)
+    return len(chunk)
+
+
+def _rewrite_year(name, year, key_cols, chunk=None):
+    """압축본 + 해당 연도 델타 (+ chunk) → 압축본 재작성 후 접어 넣은 델타 삭제. (기존행수, 최종행수).
+
+    델타 삭제 전에 죽어도 재실행 결과가 같다 (같은 델타를 같은 순서로 다시 적용).
+    """
+    import pandas as pd
+    path = year_path(name, year)
+    deltas = delta_files(name, year)
+    frames, before = [], 0
+    if os.path.exists(path):
+        old = pd.read_parquet(path)
+        before = len(old)
+        frames.append(old)
+    frames += [pd.read_parquet(p) for p in deltas]
+    if chunk is not None:
+        frames.append(chunk)
+    merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    merged = merged.drop_duplicates(subset=key_cols, keep="last")
+    tmp = path + f".{os.getpid()}.tmp"
+    write_parquet(merged, tmp, key_cols, layout_of(name))
+    os.replace(tmp, path)
+    for p in deltas:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+    return before, len(merged)
+
+
+def merge_into_year_files(name, df, key_cols, delta=False):
     """df(반드시 'date' datetime 컬럼 보유)를 연도별 parquet에 upsert.
 
     같은 key_cols 조합은 새 값으로 대체(self-heal). 데이터셋 락 하에
     원자적 교체(pid 고유 tmp→rename). 반환: {year: (기존행수, 최종행수)}
+
+    delta=True : 연도 파일을 다시 쓰지 않고 _delta/<year>/ 에 작은 델타 parquet 만 추가
+                 (일일 증분용 — 쓰기량 = 신규 데이터 크기). 반환 {year: (None, 델타행수)}.
+                 조회는 build_catalog 뷰·read_year 가 키 중복을 제거, 압축은 compact_deltas.
+    delta=False 로 연도 파일을 쓸 때는 그 연도의 기존 델타도 함께 접어 넣는다 (순서 보존).
     """
     import pandas as pd
 
@@ -82,20 +288,39 @@ def merge_into_year_files(name, df, key_cols):
     out = {}
     with dataset_lock(name):
         for year, chunk in df.groupby(df["date"].dt.year):
-            path = year_path(name, year)
-            before = 0
-            if os.path.exists(path):
-                old = pd.read_parquet(path)
-                before = len(old)
-                merged = pd.concat([old, chunk], ignore_index=True)
+            if delta:
+                out[int(year)] = (None, _write_delta(name, year, chunk, key_cols))
             else:
-                merged = chunk
-            merged = merged.drop_duplicates(subset=key_cols, keep="last")
-            merged = merged.sort_values(key_cols).reset_index(drop=True)
-            tmp = path + f".{os.getpid()}.tmp"
-            merged.to_parquet(tmp, index=False)
-            os.replace(tmp, path)
-            out[int(year)] = (before, len(merged))
+                out[int(year)] = _rewrite_year(name, year, key_cols, chunk)
+    return out
+
+
+def compact_due(name, now=None):
+    """압축이 필요한 연도 목록 — 델타 파일 수 또는 가장 오래된 델타 나이가 상한을 넘은 연도."""
+    import time
+    now = time.time() if now is None else now
+    by_year = {}
+    for p in delta_files(name):
+        by_year.setdefault(int(os.path.basename(os.path.dirname(p))), []).append(p)
+    due = []
+    for year, files in sorted(by_year.items()):
+        oldest = int(os.path.basename(files[0]).split(".")[0]) / 1e9
+        if len(files) >= COMPACT_MAX_FILES or now - oldest >= COMPACT_MAX_AGE_DAYS * 86400:
+            due.append(year)
+    return due
+
+
+def compact_deltas(name, force=False):
+    """델타를 연도 파일로 접어 넣는다 (멱등). force=False 면 compact_due 연도만. {year: (기존, 최종)}."""
+    keys = delta_keys(name)
+    if not keys:
+        return {}
+    out = {}
+    with dataset_lock(name):
+        years = sorted({int(os.path.basename(os.path.dirname(p))) for p in delta_files(name)}) \
+            if force else compact_due(name)
+        for year in years:
+            out[year] = _rewrite_year(name, year, keys)
     return out
 
 
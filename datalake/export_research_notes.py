@@ -24,6 +24,7 @@ from datetime import date, datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dl_common import NOTES_DIR, REPO
+from file_fingerprint import shared as shared_fingerprints
 
 DB_PATH = os.path.join(REPO, "execution", "research_bot", "research_notes.db")
 MEDIA_OUT = os.path.join(NOTES_DIR, "media")
@@ -70,7 +71,8 @@ def copy_media(msg, day):
     """봇 media 파일을 datalake로 복사, md에서 쓸 상대경로 반환 (없으면 None).
 
     문서 첨부는 원본 파일명이라 같은 날 basename 충돌 가능 → 메시지 id를
-    prefix로 붙여 유일화한다.
+    prefix로 붙여 유일화한다. 사본이 있으면 내용 해시를 비교한다 (file_fingerprint
+    캐시 — 변경 없는 파일은 stat 만, 크기가 같은 교체본도 놓치지 않는다).
     """
     src = resolve_media_path(msg.get("media_path"))
     if not src:
@@ -80,7 +82,8 @@ def copy_media(msg, day):
     dst_dir = os.path.join(MEDIA_OUT, day)
     os.makedirs(dst_dir, exist_ok=True)
     dst = os.path.join(dst_dir, fname)
-    if not os.path.exists(dst) or os.path.getsize(dst) != os.path.getsize(src):
+    if (not os.path.exists(dst) or os.path.getsize(dst) != os.path.getsize(src)
+            or shared_fingerprints().sha256(dst) != shared_fingerprints().sha256(src)):
         shutil.copy2(src, dst)
     return f"../media/{day}/{fname}"
 
@@ -280,6 +283,16 @@ def export_day(conn, day):
     return len(messages)
 
 
+def update_search_index(days):
+    """재생성한 일별 md 를 위키 검색 인덱스(notes_index)에 반영. 실패해도 내보내기는 성공."""
+    try:
+        import notes_index
+        st = notes_index.update([os.path.join(NOTES_DIR, d[:4], f"{d}.md") for d in days])
+        print(f"검색 인덱스: 추가 {st['added']} / 갱신 {st['updated']} / 삭제 {st['removed']}")
+    except Exception as e:  # noqa: BLE001
+        print(f"WARN: 검색 인덱스 갱신 실패 (조회 시 증분 스캔으로 회수) — {e}")
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--all", action="store_true", help="DB 전 기간 백필")
@@ -321,6 +334,7 @@ def main():
             total_msgs += n
     conn.close()
     print(f"완료: {written}일 / 메시지 {total_msgs}건 → {NOTES_DIR}")
+    update_search_index(days)
     return 0
 
 
@@ -12,7 +12,7 @@ import sys
 import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dl_common import load_pykrx, merge_into_year_files, year_path
+from dl_common import load_pykrx, merge_into_year_files, read_year
 
 import pandas as pd
 
@@ -26,8 +26,7 @@ def main():
     asof = pd.Timestamp(trd)
 
     # 종목명 조인용 — kr_marcap 최신일 (지수 PDF는 티커만 반환)
-    mc = pd.read_parquet(year_path("kr_marcap", asof.year),
-                         columns=["date", "ticker", "name"])
+    mc = read_year("kr_marcap", asof.year, columns=["date", "ticker", "name"])   # 연도 파일+일일 델타
     names = mc[mc["date"] == mc["date"].max()].set_index("ticker")["name"]
 
     frames = []
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""파일 내용 해시 캐시 — (path, size, mtime_ns, inode) 가 그대로면 저장된 sha256 을 돌려준다.
+
+ocr_worker 는 매 실행 후보 이미지 전부를 file_sha 로 다시 읽었고(대부분 이미 succeeded),
+tag_docs 는 바뀌지 않은 md 도 전부 읽어 청크 해시를 다시 냈다 → 매일 늘어나는 media·문서
+폴더를 통째로 다시 읽었다. 같은 표를 공유해 변경 없는 파일은 stat 1회로 끝낸다.
+
+  캐시 : ~/datalake/file_fingerprints.sqlite  fingerprints(path, size, mtime_ns, inode, sha256)
+  규칙 : stat 4종이 모두 같을 때만 적중. mtime 이 RACY_SEC 초 이내인 파일은 해시해도 저장하지
+         않는다 (같은 mtime 틱 안에 다시 쓰이면 변경을 놓치므로 — git index 의 racy 처리와 같은 이유).
+  공유 : ocr_worker.main · tag_docs.main · export_research_notes.copy_media
+
+사용:
+  python3 datalake/file_fingerprint.py            # 항목 수
+  python3 datalake/file_fingerprint.py --prune    # 없어진 파일 항목 삭제
+"""
+import argparse
+import atexit
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dl_common import DATALAKE_ROOT  # noqa: E402
+
+FP_PATH = os.getenv("FILE_FP_CACHE") or os.path.join(DATALAKE_ROOT, "file_fingerprints.sqlite")
+RACY_SEC = 2.0
+_COMMIT_EVERY = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+  path TEXT PRIMARY KEY,
+  size INTEGER NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  inode INTEGER NOT NULL,
+  sha256 TEXT NOT NULL,
+  hashed_at REAL NOT NULL
+);
+"""
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_or_none(path):
+    try:
+        return hash_file(path)
+    except OSError:
+        return None
+
+
+class FingerprintCache:
+    """sha256(path) — 적중이면 stat 만, 아니면 읽어서 해시 후 저장. 캐시 DB 오류는 해시로 폴백."""
+
+    def __init__(self, path=FP_PATH):
+        self.path = path
+        self.hits = self.misses = 0
+        self._pending = 0
+        self._con = None
+        try:
+            self._con = sqlite3.connect(path, timeout=30)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print("file_fingerprint: 캐시 열기 실패 — 매번 해시한다 (%s)" % e, file=sys.stderr)
+            self._con = None
+
+    def sha256(self, path):
+        """파일 내용 sha256 hex. 파일이 없으면 OSError."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        key = (st.st_size, st.st_mtime_ns, st.st_ino)
+        if self._con is not None:
+            row = self._con.execute("SELECT size, mtime_ns, inode, sha256 FROM fingerprints"
+                                    " WHERE path=?", (path,)).fetchone()
+            if row and tuple(row[:3]) == key:
+                self.hits += 1
+                return row[3]
+        self.misses += 1
+        digest = hash_file(path)
+        self._store(path, st, digest)
+        return digest
+
+    def sha256_many(self, paths, workers=1):
+        """{path: sha256} — 캐시 조회는 IN 질의 몇 번으로 몰아서, 미스만 스레드 풀(workers)로
+        해시한다 (파일 읽기·hashlib 은 GIL 을 놓는다). 없는 파일은 결과에서 빠진다."""
+        stats = {}
+        for p in paths:
+            ap = os.path.abspath(p)
+            try:
+                stats[p] = (ap, os.stat(ap))
+            except OSError:
+                continue
+        known = {}
+        if self._con is not None:
+            aps = sorted({ap for ap, _ in stats.values()})
+            for i in range(0, len(aps), 900):
+                part = aps[i:i + 900]
+                known.update((r[0], tuple(r[1:])) for r in self._con.execute(
+                    "SELECT path, size, mtime_ns, inode, sha256 FROM fingerprints"
+                    " WHERE path IN (%s)" % ",".join("?" * len(part)), part))
+        out, miss = {}, []
+        for p, (ap, st) in stats.items():
+            row = known.get(ap)
+            if row and row[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+                self.hits += 1
+                out[p] = row[3]
+            else:
+                miss.append(p)
+        if not miss:
+            return out
+        with ThreadPoolExecutor(max(1, workers)) as ex:
+            digests = list(ex.map(_hash_or_none, [stats[p][0] for p in miss]))
+        for p, digest in zip(miss, digests):
+            if digest is None:
+                continue
+            self.misses += 1
+            self._store(stats[p][0], stats[p][1], digest)
+            out[p] = digest
+        return out
+
+    def _store(self, path, st, digest):
+        if self._con is None or time.time() - st.st_mtime_ns / 1e9 <= RACY_SEC:
+            return
+        try:
+            self._con.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)",
+                              (path, st.st_size, st.st_mtime_ns, st.st_ino, digest, time.time()))
+            self._pending += 1
+            if self._pending >= _COMMIT_EVERY:
+                self.commit()
+        except sqlite3.Error as e:
+            print("file_fingerprint: 저장 실패 — %s" % e, file=sys.stderr)
+
+    def commit(self):
+        if self._con is not None and self._pending:
+            try:
+                self._con.commit()
+            except sqlite3.Error as e:
+                print("file_fingerprint: 커밋 실패 — %s" % e, file=sys.stderr)
+            self._pending = 0
+
+    def close(self):
+        if self._con is not None:
+            self.commit()
+            self._con.close()
+            self._con = None
+
+    def prune(self):
+        """없어진 파일의 항목 삭제 → 삭제 건수."""
+        if self._con is None:
+            return 0
+        gone = [(p,) for (p,) in self._con.execute("SELECT path FROM fingerprints")
+                if not os.path.exists(p)]
+        with self._con:
+            self._con.executemany("DELETE FROM fingerprints WHERE path=?", gone)
+        return len(gone)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_SHARED = None
+
+
+def shared():
+    """프로세스 공용 인스턴스 (종료 시 커밋)."""
+    global _SHARED
+    if _SHARED is None:
+        _SHARED = FingerprintCache()
+        atexit.register(_SHARED.close)
+    return _SHARED
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--prune", action="store_true", help="없어진 파일 항목 삭제")
+    args = ap.parse_args()
+    with FingerprintCache() as fp:
+        if fp._con is None:
+            return 1
+        if args.prune:
+            print("삭제 %d건" % fp.prune())
+        n = fp._con.execute("SELECT count(*) FROM fingerprints").fetchone()[0]
+        print("file_fingerprints: %d건 → %s" % (n, fp.path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""위키 search_notes 용 md 코퍼스 전문 인덱스 — SQLite FTS5 (trigram, 한글 부분일치 가능).
+
+search_notes 가 도구 호출마다 SEARCH_ROOTS 전체를 os.walk 해 모든 md 를 열고 줄 단위 정규식을
+돌렸다 → 리서치노트·전문·분석이 매일 늘수록 위키 질문 지연이 같이 늘었다.
+
+  인덱스 : ~/datalake/notes_fts.sqlite
+           files(path, mtime_ns, size) + docs(body) FTS5 trigram (rowid = files.id)
+  갱신   : 파일별 (mtime_ns, size) 비교 → 바뀐 파일만 다시 읽는다 (없어진 파일은 삭제).
+           · export_research_notes.py / notion_study_sync.py 가 쓴 파일을 update(paths) 로 즉시 반영
+           · 조회 시 마지막 전체 스캔이 INDEX_TTL 초보다 오래됐으면 stat 스캔 1회 (다른 잡이
+             쓴 transcripts·analyses·catalog 등도 따라온다)
+  검색   : 정규식에서 '반드시 나와야 하는 문자열'을 뽑아 FTS 로 후보 파일을 고르고 (bm25 순),
+           후보 본문(인덱스 사본)에만 기존 줄 단위 정규식을 돌린다 → 출력 형식은 종전과 같다.
+           뽑을 문자열이 없는 패턴(예: \\d{4})은 인덱스 사본 전체를 최근 수정순으로 훑는다.
+
+trigram 은 3글자 이상 문자열만 색인을 탄다 — 2글자(예: '삼성')만 있는 패턴은 LIKE 로
+사본을 훑는다 (파일을 열지 않으므로 종전보다는 빠르다).
+
+사용:
+  python3 datalake/notes_index.py            # 증분 갱신
+  python3 datalake/notes_index.py --rebuild  # 통째로 재생성
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dl_common import CATALOG_DIR, DATALAKE_ROOT, REPO  # noqa: E402
+
+INDEX_PATH = os.path.join(DATALAKE_ROOT, "notes_fts.sqlite")
+INDEX_TTL = float(os.getenv("WIKI_INDEX_TTL", "60"))   # 조회 시 전체 stat 스캔 최소 간격(초)
+
+WIKI_DIR = os.path.join(REPO, "architecture", "wiki")
+
+SEARCH_ROOTS = [
+    os.path.join(DATALAKE_ROOT, "research_notes"),
+    os.path.join(DATALAKE_ROOT, "transcripts"),
+    os.path.join(DATALAKE_ROOT, "news"),
+    os.path.join(DATALAKE_ROOT, "analyses"),
+    os.path.join(DATALAKE_ROOT, "notion_study"),
+    os.path.join(DATALAKE_ROOT, "reports"),
+    CATALOG_DIR,
+    WIKI_DIR,
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+  id INTEGER PRIMARY KEY,
+  path TEXT NOT NULL UNIQUE,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(body, tokenize='trigram');
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+"""
+
+
+def connect(path=INDEX_PATH):
+    con = sqlite3.connect(path, timeout=60)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(SCHEMA)
+    return con
+
+
+# ── 갱신 ───────────────────────────────────────────────────────────
+def _under_roots(path):
+    return any(path == r or path.startswith(r + os.sep) for r in SEARCH_ROOTS)
+
+
+def walk_md():
+    """SEARCH_ROOTS 의 *.md 경로 (종전 search_notes 와 같은 순서)."""
+    for root in SEARCH_ROOTS:
+        if not os.path.isdir(root):
+            continue
+        for dirpath, _dirs, files in os.walk(root):
+            for fn in sorted(files):
+                if fn.endswith(".md"):
+                    yield os.path.join(dirpath, fn)
+
+
+def _read(path):
+    # 텍스트 모드(유니버설 개행) — 저장 사본의 '\n' 분할 줄번호가 파일 줄번호와 같다
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        return fh.read()
+
+
+def _apply(con, paths, prune):
+    """paths 를 stat 비교해 바뀐 것만 재색인. prune=True 면 목록에 없는 색인 파일 삭제."""
+    known = {p: (i, m, s) for i, p, m, s in con.execute("SELECT id, path, mtime_ns, size FROM files")}
+    seen = set()
+    added = updated = removed = 0
+    for path in paths:
+        path = os.path.abspath(path)
+        seen.add(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        old = known.get(path)
+        if st is None or not path.endswith(".md") or not _under_roots(path):
+            if old:
+                con.execute("DELETE FROM docs WHERE rowid=?", (old[0],))
+                con.execute("DELETE FROM files WHERE id=?", (old[0],))
+                removed += 1
+            continue
+        if old and (old[1], old[2]) == (st.st_mtime_ns, st.st_size):
+            continue
+        try:
+            body = _read(path)
+        except OSError:
+            continue
+        if old:
+            con.execute("UPDATE files SET mtime_ns=?, size=? WHERE id=?",
+                        (st.st_mtime_ns, st.st_size, old[0]))
+            con.execute("DELETE FROM docs WHERE rowid=?", (old[0],))
+            con.execute("INSERT INTO docs(rowid, body) VALUES(?, ?)", (old[0], body))
+            updated += 1
+        else:
+            cur = con.execute("INSERT INTO files(path, mtime_ns, size) VALUES(?, ?, ?)",
+                              (path, st.st_mtime_ns, st.st_size))
+            con.execute("INSERT INTO docs(rowid, body) VALUES(?, ?)", (cur.lastrowid, body))
+            added += 1
+    if prune:
+        for path, (fid, _m, _s) in known.items():
+            if path not in seen:
+                con.execute("DELETE FROM docs WHERE rowid=?", (fid,))
+                con.execute("DELETE FROM files WHERE id=?", (fid,))
+                removed += 1
+    return {"added": added, "updated": updated, "removed": removed}
+
+
+def update(paths=None, con=None):
+    """증분 갱신. paths=None 이면 SEARCH_ROOTS 전체 스캔(+삭제 반영), 아니면 그 파일들만."""
+    own = con is None
+    con = con or connect()
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        stats = _apply(con, walk_md() if paths is None else paths, prune=paths is None)
+        if paths is None:
+            con.execute("INSERT OR REPLACE INTO meta(k, v) VALUES('scanned_at', ?)", (str(time.time()),))
+        con.commit()
+        return stats
+    except BaseException:
+        con.rollback()
+        raise
+    finally:
+        if own:
+            con.close()
+
+
+def ensure_fresh(con, ttl=INDEX_TTL):
+    """마지막 전체 스캔이 ttl 초보다 오래됐으면 증분 갱신."""
+    row = con.execute("SELECT v FROM meta WHERE k='scanned_at'").fetchone()
+    if row is None or time.time() - float(row[0]) > ttl:
+        update(con=con)
+
+
+# ── 검색 ───────────────────────────────────────────────────────────
+def required_literals(pattern):
+    """정규식 → 최상위 분기별 '반드시 포함되는 문자열' 목록 [[str, ...], ...].
+
+    보수적으로 뽑는다 (놓치면 검색 누락이므로): 그룹·문자클래스 안쪽, 선택적 수량자(* ? {)가 붙은
+    글자는 버린다. 뽑을 수 없으면(VERBOSE 등) None.
+    """
+    branches, runs, cur = [], [], []
+    depth, i, n = 0, 0, len(pattern)
+
+    def cut():
+        if cur:
+            runs.append("".join(cur))
+            cur.clear()
+
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= n:
+                return None
+            e = pattern[i + 1]
+            i += 2
+            if e.isalnum():            # \d \w \b \1 \x41 \n 등 — 리터럴로 취급하지 않음
+                if e in "xuU":         # 뒤따르는 16진 자리까지 건너뜀
+                    i += {"x": 2, "u": 4, "U": 8}[e]
+                elif e == "N":
+                    close = pattern.find("}", i)
+                    i = n if close < 0 else close + 1
+                elif e.isdigit():
+                    while i < n and pattern[i].isdigit():
+                        i += 1
+                cut()
+                continue
+            ch = e
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] == "^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            i = j + 1
+            cut()
+            continue
+        elif c in "()":
+            depth += 1 if c == "(" else -1
+            i += 1
+            cut()
+            continue
+        elif c == "|":
+            i += 1
+            if depth == 0:
+                cut()
+                branches.append(runs)
+                runs = []
+            continue
+        elif c in ".^$":
+            i += 1
+            cut()
+            continue
+        elif c in "*?{+":
+            if c != "+" and cur:
+                cur.pop()              # 0회 가능 → 직전 글자는 필수가 아니다
+            if c == "{":
+                close = pattern.find("}", i)
+                i = n if close < 0 else close + 1
+            else:
+                i += 1
+            cut()
+            continue
+        else:
+            ch = c
+            i += 1
+        if depth == 0:
+            cur.append(ch)
+        else:
+            cut()
+    cut()
+    branches.append(runs)
+    return branches
+
+
+def _fts_phrase(s):
+    return '"%s"' % s.replace('"', '""')
+
+
+def _like(s):
+    return "%" + re.sub(r"([\\%_])", r"\\\1", s) + "%"
+
+
+def candidates(con, rx):
+    """정규식의 후보 문서 [(id, path), ...] — 순위순 (본문은 search 가 필요한 만큼만 읽는다)."""
+    branches = None if rx.flags & re.VERBOSE else required_literals(rx.pattern)
+    if branches and all(any(len(r) >= 3 for r in runs) for runs in branches):
+        query = " OR ".join(
+            "(" + " AND ".join(_fts_phrase(r) for r in runs if len(r) >= 3) + ")" for runs in branches)
+        return con.execute("SELECT f.id, f.path FROM docs JOIN files f ON f.id = docs.rowid"
+                           " WHERE docs MATCH ? ORDER BY rank", (query,)).fetchall()
+    if branches and all(runs for runs in branches):
+        where = " OR ".join(
+            "(" + " AND ".join("d.body LIKE ? ESCAPE '\\'" for _ in runs) + ")" for runs in branches)
+        args = [_like(r) for runs in branches for r in runs]
+        return con.execute("SELECT f.id, f.path FROM docs d JOIN files f ON f.id = d.rowid"
+                           " WHERE " + where + " ORDER BY f.mtime_ns DESC", args).fetchall()
+    return con.execute("SELECT id, path FROM files ORDER BY mtime_ns DESC").fetchall()
+
+
+def search(rx, max_results, con=None):
+    """후보 문서 본문(인덱스 사본)에 줄 단위 정규식 → ['경로:줄번호: 줄', ...] (최대 max_results)."""
+    own = con is None
+    con = con or connect()
+    try:
+        ensure_fresh(con)
+        hits = []
+        for fid, path in candidates(con, rx):
+            row = con.execute("SELECT body FROM docs WHERE rowid=?", (fid,)).fetchone()
+            for i, line in enumerate((row[0] if row else "").split("\n"), 1):
+                if rx.search(line):
+                    hits.append("%s:%d: %s" % (path, i, line.strip()[:200]))
+                    if len(hits) >= max_results:
+                        return hits
+        return hits
+    finally:
+        if own:
+            con.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rebuild", action="store_true", help="인덱스를 지우고 통째로 재생성")
+    args = ap.parse_args()
+    if args.rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(INDEX_PATH + suffix)
+            except OSError:
+                pass
+    t0 = time.time()
+    stats = update()
+    print("notes_fts: 추가 %(added)d / 갱신 %(updated)d / 삭제 %(removed)d" % stats,
+          "(%.1fs) → %s" % (time.time() - t0, INDEX_PATH))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
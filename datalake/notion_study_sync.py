@@ -301,6 +301,18 @@ def write_md(rel, text):
     return sha
 
 
+def update_search_index(paths):
+    """Reflect written/moved/tombstoned pages in the wiki search index (notes_index)."""
+    if not paths:
+        return
+    try:
+        import notes_index
+        st = notes_index.update(paths)
+        print(f"search index: +{st['added']} ~{st['updated']} -{st['removed']}")
+    except Exception as e:  # noqa: BLE001 — sync succeeded; next query-time scan catches up
+        print(f"WARN: search index update failed: {e}")
+
+
 def main():
     global TOKEN
     ap = argparse.ArgumentParser()
@@ -328,6 +340,7 @@ def main():
         seen = set()
         stats = {"new": 0, "updated": 0, "unchanged": 0, "failed": 0}
         changed = []
+        touched = []     # 검색 인덱스 반영 대상 (쓰기·이동·삭제된 md)
         for p in pages:
             pid = p["id"].replace("-", "")
             seen.add(pid)
@@ -351,6 +364,7 @@ def main():
                     print(f"[dry] {rel} ({len(text)} chars)")
                     continue
                 sha = write_md(rel, text)
+                touched.append(os.path.join(ROOT, rel))
                 is_new = pid not in state["pages"]
                 old_rel = (state["pages"].get(pid) or {}).get("path")
                 if old_rel and old_rel != rel:
@@ -358,6 +372,7 @@ def main():
                         os.remove(os.path.join(ROOT, old_rel))
                     except OSError:
                         pass
+                    touched.append(os.path.join(ROOT, old_rel))
                 state["pages"][pid] = {
                     "last_edited": p["last_edited_time"],
                     "path": rel, "sha": sha, "miss": 0,
@@ -383,11 +398,13 @@ def main():
                     src = os.path.join(ROOT, e["path"])
                     if os.path.exists(src):
                         os.replace(src, os.path.join(TOMBSTONES, os.path.basename(e["path"])))
+                    touched.append(src)
                     print(f"  tombstoned {pid} ({e.get('title', '')})")
                     del state["pages"][pid]
 
         if not args.dry_run:
             save_state(state)
+            update_search_index(touched)
         print("done:", json.dumps(stats, ensure_ascii=False))
         if stats["failed"]:
             sys.exit(1)
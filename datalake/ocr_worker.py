@@ -13,9 +13,14 @@ tag_worker 와 동일한 설계 원칙: exporter 는 매일 어제+오늘을 통
   venv/bin/python3 datalake/ocr_worker.py --date 2026-07-30
   venv/bin/python3 datalake/ocr_worker.py --dry-run           # 견적만 (DB 무부작용)
   venv/bin/python3 datalake/ocr_worker.py --retry-failed
+  venv/bin/python3 datalake/ocr_worker.py --concurrency 4     # 파이프라인 (백로그 야간)
+
+파이프라인 모드: 이미지 전처리(encode_image)는 프로세스 풀, 모델 호출은 N건 동시(호출 시작 간격·
+rate 백오프 공유), 결과는 OCR_COMMIT_EVERY 건씩 커밋. 캐시 키·dead_letter·엔진 장애 중단은 순차와 같다.
 """
 import argparse
 import base64
+import collections
 import datetime as dt
 import fcntl
 import hashlib
@@ -23,12 +28,15 @@ import io
 import os
 import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, HERE)
 from dl_common import NOTES_DIR, REPO  # noqa: E402
 from export_research_notes import resolve_media_path  # noqa: E402
+from file_fingerprint import shared as shared_fingerprints  # noqa: E402
 
 DB_SRC = os.path.join(REPO, "execution", "research_bot", "research_notes.db")
 STATE_PATH = os.path.join(NOTES_DIR, "ocr_state.sqlite")
@@ -51,6 +59,11 @@ OCR_ENGINE = os.getenv("OCR_ENGINE", "headless")            # headless | api(롤
 OCR_HEADLESS_MODEL = os.getenv("OCR_HEADLESS_MODEL", "claude-sonnet-5")
 OCR_HEADLESS_TIMEOUT = _env_int("OCR_HEADLESS_TIMEOUT", 180)
 OCR_HEADLESS_MAX_ITEMS = _env_int("OCR_HEADLESS_MAX_ITEMS", 200)
+# 파이프라인 모드 (--concurrency N>1): 전처리 프로세스 수 · 동시 호출 수 · 커밋 묶음 크기
+OCR_CONCURRENCY = _env_int("OCR_CONCURRENCY", 1)
+OCR_PREP_WORKERS = max(1, _env_int("OCR_PREP_WORKERS", min(4, os.cpu_count() or 1)))
+OCR_COMMIT_EVERY = max(1, _env_int("OCR_COMMIT_EVERY", 10))
+CALL_INTERVAL = 0.2                   # 호출 시작 최소 간격(초) — 두 모드 공통
 MAX_B64_CHARS = 7_000_000   # stream-json 페이로드 가드 (~5MB 원본 상당)
 OCR_SYSTEM = "당신은 이미지 속 텍스트를 정확히 옮겨 적는 OCR 도우미다. 사용자 지시를 그대로 따른다."
 MAX_EDGE = 1568                       # 비전 다운스케일 상한 (초과분만 축소)
@@ -112,12 +125,13 @@ def _acquire_lock():
     return fh
 
 
-def file_sha(path):
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()[:20]
+def load_cache_status(st, ids):
+    """후보 id 범위의 ocr_items 캐시 상태를 질의 1회로 → {message_id: (cache_key, status)}."""
+    if not ids:
+        return {}
+    return {r["message_id"]: (r["cache_key"], r["status"]) for r in st.execute(
+        "SELECT message_id, cache_key, status FROM ocr_items WHERE message_id BETWEEN ? AND ?",
+        (min(ids), max(ids)))}
 
 
 def encode_image(path):
@@ -137,9 +151,12 @@ def encode_image(path):
     return base64.standard_b64encode(data).decode(), MEDIA_TYPES.get(ext, "image/jpeg")
 
 
-def call_ocr(client, b64, media_type, max_retries=4):
+def call_ocr(client, b64, media_type, max_retries=4, gate=None):
+    """API 1건. gate(RateGate) 를 주면 rate·overload 백오프를 동시 호출 전체가 공유한다."""
     last = None
     for attempt in range(max_retries):
+        if gate is not None:
+            gate.wait()
         try:
             resp = client.messages.create(
                 model=MODEL, max_tokens=3000,
@@ -155,7 +172,10 @@ def call_ocr(client, b64, media_type, max_retries=4):
             last = e
             msg = str(e).lower()
             if "rate" in msg or "overloaded" in msg or "529" in msg or "429" in msg:
-                time.sleep(min(60, 2 ** attempt * 5))
+                if gate is not None:
+                    gate.backoff(min(60, 2 ** attempt * 5))
+                else:
+                    time.sleep(min(60, 2 ** attempt * 5))
                 continue
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)
@@ -198,6 +218,182 @@ def migrate_cache_keys_v2(st):
     return n
 
 
+# --------------------------------------------------------------------------- #
+# 호출·기록 (순차/파이프라인 공용)
+# --------------------------------------------------------------------------- #
+def ocr_one(hl, client, b64, mt, gate=None):
+    """이미지 1건 OCR → (text, in_tok, out_tok, used_model). 엔진 장애 예외는 그대로 raise."""
+    if len(b64) > MAX_B64_CHARS:
+        raise ValueError("이미지 페이로드 과대 (b64 %d chars)" % len(b64))
+    if hl is not None:
+        if gate is not None:
+            gate.wait()
+        res = hl.call_multimodal(
+            OCR_SYSTEM,
+            [{"type": "image",
+              "source": {"type": "base64", "media_type": mt, "data": b64}},
+             {"type": "text", "text": PROMPT}],
+            model=OCR_HEADLESS_MODEL, timeout_sec=OCR_HEADLESS_TIMEOUT)
+        # 실입력 대부분은 cacheCreationInputTokens 에 계상 (8/18 실측)
+        return (res["text"], res["input_tokens"] + res["cache_creation_input_tokens"],
+                res["output_tokens"], res["resolved_model"] + "@headless")
+    text, usage = call_ocr(client, b64, mt, gate=gate)
+    return text, usage.input_tokens, usage.output_tokens, MODEL
+
+
+def record_ok(st, r, text, used_model, in_tok, out_tok):
+    st.execute(
+        "INSERT INTO ocr_items (message_id,day,media_file,file_sha,cache_key,"
+        " status,ocr_text,error,attempts,model,in_tokens,out_tokens,updated_at)"
+        " VALUES (?,?,?,?,?,'succeeded',?,NULL,0,?,?,?,?)"
+        " ON CONFLICT(message_id) DO UPDATE SET day=excluded.day,"
+        " media_file=excluded.media_file, file_sha=excluded.file_sha,"
+        " cache_key=excluded.cache_key, status='succeeded',"
+        " ocr_text=excluded.ocr_text, error=NULL, attempts=0,"
+        " model=excluded.model, in_tokens=excluded.in_tokens,"
+        " out_tokens=excluded.out_tokens, updated_at=excluded.updated_at",
+        (r["id"], r["timestamp"][:10], os.path.basename(r["_path"]), r["_fs"], r["_ck"],
+         text, used_model, in_tok, out_tok, now()))
+
+
+def record_failed(st, r, e, fail_model):
+    st.execute(
+        "INSERT INTO ocr_items (message_id,day,media_file,file_sha,cache_key,"
+        " status,ocr_text,error,attempts,model,updated_at)"
+        " VALUES (?,?,?,?,?,'failed',NULL,?,1,?,?)"
+        " ON CONFLICT(message_id) DO UPDATE SET attempts=attempts+1,"
+        " error=excluded.error, updated_at=excluded.updated_at,"
+        " status=CASE WHEN attempts+1>=%d THEN 'dead_letter' ELSE 'failed' END"
+        % MAX_ATTEMPTS,
+        (r["id"], r["timestamp"][:10], os.path.basename(r["_path"]), r["_fs"], r["_ck"],
+         str(e)[:500], fail_model, now()))
+
+
+def _progress(i, n, ok, fail, tin, tout):
+    if i % 25 == 0 or i == n:
+        print("  %d/%d  ok=%d fail=%d  in=%s out=%s" % (i, n, ok, fail, f"{tin:,}", f"{tout:,}"),
+              flush=True)
+
+
+def run_sequential(st, todo, hl, client, engine_errors, fail_model):
+    """1건씩: 전처리 → 호출 → 기록·커밋. → (ok, fail, tin, tout, engine_down)"""
+    ok = fail = tin = tout = 0
+    engine_down = False
+    for i, r in enumerate(todo, 1):
+        try:
+            b64, mt = encode_image(r["_path"])
+            text, in_tok, out_tok, used_model = ocr_one(hl, client, b64, mt)
+            tin += in_tok
+            tout += out_tok
+            record_ok(st, r, text, used_model, in_tok, out_tok)
+            ok += 1
+        except engine_errors as e:
+            # 인증·쿼터 장애 — 항목 실패로 기록하지 않고 즉시 중단 (다음 실행에서 자연 회수)
+            print("  [중단] 엔진 장애: %s" % str(e)[:180])
+            engine_down = True
+            break
+        except Exception as e:  # noqa: BLE001
+            record_failed(st, r, e, fail_model)
+            fail += 1
+        st.commit()
+        _progress(i, len(todo), ok, fail, tin, tout)
+        time.sleep(CALL_INTERVAL)
+    return ok, fail, tin, tout, engine_down
+
+
+class RateGate:
+    """동시 호출 간 공유 페이싱·백오프 — 호출 시작 간격 ≥ interval, 쿼터 신호면 전원 대기."""
+
+    def __init__(self, interval=CALL_INTERVAL):
+        self.interval = interval
+        self._mu = threading.Lock()
+        self._next = 0.0             # 다음 호출 시작 가능 시각 (monotonic)
+
+    def wait(self):
+        with self._mu:
+            now_ = time.monotonic()
+            start = max(now_, self._next)
+            self._next = start + self.interval
+        if start > now_:
+            time.sleep(start - now_)
+
+    def backoff(self, sec):
+        with self._mu:
+            self._next = max(self._next, time.monotonic() + sec)
+
+
+class _Skipped(Exception):
+    """엔진 장애로 중단된 뒤 아직 시작하지 않은 호출 — 기록하지 않는다."""
+
+
+def run_pipelined(st, todo, hl, client, engine_errors, fail_model, concurrency):
+    """전처리는 프로세스 풀, 모델 호출은 최대 concurrency 건 동시, 기록은 메인 스레드에서 묶어 커밋.
+
+    캐시 키·실패/dead_letter 기록은 순차 모드와 같다. 엔진 장애가 나면 새 호출을 시작하지 않고
+    이미 나간 호출만 받아 기록한 뒤 중단한다 (장애 항목·미시작 항목은 기록하지 않음).
+    """
+    gate = RateGate()
+    stop = threading.Event()
+    lookahead = concurrency + OCR_PREP_WORKERS       # 전처리를 앞서 돌려 둘 건수
+
+    def call(r, prep):
+        b64, mt = prep.result()
+        if stop.is_set():
+            raise _Skipped()
+        return ocr_one(hl, client, b64, mt, gate=gate)
+
+    ok = fail = tin = tout = done = pending = 0
+    engine_down = False
+    queue = collections.deque()                      # [(r, prep_future)] 호출 대기
+    items = iter(todo)
+    with ProcessPoolExecutor(OCR_PREP_WORKERS) as prep_pool, \
+            ThreadPoolExecutor(concurrency, thread_name_prefix="ocr-call") as call_pool:
+        in_flight = {}
+        while True:
+            while not stop.is_set() and len(queue) + len(in_flight) < lookahead:
+                r = next(items, None)
+                if r is None:
+                    break
+                queue.append((r, prep_pool.submit(encode_image, r["_path"])))
+            while queue and len(in_flight) < concurrency and not stop.is_set():
+                r, prep = queue.popleft()
+                in_flight[call_pool.submit(call, r, prep)] = r
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                r = in_flight.pop(fut)
+                try:
+                    text, in_tok, out_tok, used_model = fut.result()
+                    tin += in_tok
+                    tout += out_tok
+                    record_ok(st, r, text, used_model, in_tok, out_tok)
+                    ok += 1
+                except _Skipped:
+                    continue
+                except engine_errors as e:
+                    # 인증·쿼터 장애 — 항목 실패로 기록하지 않고 중단 (다음 실행에서 자연 회수)
+                    if not stop.is_set():
+                        print("  [중단] 엔진 장애: %s — 진행 중 %d건만 마저 받는다"
+                              % (str(e)[:180], len(in_flight)))
+                    stop.set()
+                    engine_down = True
+                    continue
+                except Exception as e:  # noqa: BLE001
+                    record_failed(st, r, e, fail_model)
+                    fail += 1
+                done += 1
+                pending += 1
+                if pending >= OCR_COMMIT_EVERY:
+                    st.commit()
+                    pending = 0
+                _progress(done, len(todo), ok, fail, tin, tout)
+        for _r, prep in queue:
+            prep.cancel()
+    st.commit()
+    return ok, fail, tin, tout, engine_down
+
+
 def pick_targets(src, args):
     q = ("SELECT id, timestamp, media_path FROM messages"
          " WHERE message_type IN ('photo','document') AND media_path IS NOT NULL")
@@ -216,6 +412,8 @@ def main():
     ap.add_argument("--max-items", type=int)
     ap.add_argument("--dry-run", action="store_true")
     ap.add_argument("--retry-failed", action="store_true")
+    ap.add_argument("--concurrency", type=int, default=OCR_CONCURRENCY,
+                    help="동시 모델 호출 수 (>1 이면 파이프라인 모드, 기본 env OCR_CONCURRENCY=1)")
     args = ap.parse_args()
 
     if OCR_ENGINE not in ("headless", "api"):
@@ -237,27 +435,33 @@ def main():
             "SELECT message_id FROM ocr_items WHERE status IN ('failed','dead_letter')")}
         rows = [r for r in rows if r["id"] in bad]
 
+    # 계획: 파일 sha 는 지문 캐시 일괄 조회 + 미스만 스레드 풀, 캐시 상태는 범위 질의 1회
+    t_plan = time.perf_counter()
+    paths = {r["id"]: resolve_media_path(r["media_path"]) for r in rows}
+    fp = shared_fingerprints()
+    shas = fp.sha256_many([p for p in paths.values() if p], workers=OCR_PREP_WORKERS)
+    cache = load_cache_status(st, [r["id"] for r in rows])
     todo, cached, missing = [], 0, 0
     for r in rows:
-        path = resolve_media_path(r["media_path"])
-        if not path:
+        path = paths[r["id"]]
+        if not path or path not in shas:
             missing += 1
             continue
-        fs = file_sha(path)
+        fs = shas[path][:20]
         # 캐시 키 v2 — 모델명 제거 (엔진 전환이 캐시를 무효화하지 않게, tag_worker 8/5 정책 승계)
         ck = sha(fs, PROMPT_VER)
-        cur = st.execute("SELECT cache_key,status FROM ocr_items WHERE message_id=?",
-                         (r["id"],)).fetchone()
-        if cur and cur["cache_key"] == ck and cur["status"] == "succeeded":
+        if cache.get(r["id"]) == (ck, "succeeded"):
             cached += 1
             continue
         r["_path"], r["_fs"], r["_ck"] = path, fs, ck
         todo.append(r)
     if args.max_items:
         todo = todo[:args.max_items]
+    fp.commit()
+    plan_sec = time.perf_counter() - t_plan
 
-    print("대상 %d건 (캐시 재사용 %d · 파일 없음 %d) / 엔진 %s / 모델 %s"
-          % (len(todo), cached, missing, OCR_ENGINE,
+    print("대상 %d건 (캐시 재사용 %d · 파일 없음 %d · 재해시 %d) / 계획 %.1fs / 엔진 %s / 모델 %s"
+          % (len(todo), cached, missing, fp.misses, plan_sec, OCR_ENGINE,
              OCR_HEADLESS_MODEL if OCR_ENGINE == "headless" else MODEL))
     if args.dry_run or not todo:
         # --retry-failed 대상 0건 등은 정상 종료 (일일 잡 rc 오염 방지)
@@ -284,69 +488,16 @@ def main():
         hl = None
         engine_errors = ()
         fail_model = MODEL
-    ok = fail = tin = tout = 0
-    engine_down = False
-    for i, r in enumerate(todo, 1):
-        day = r["timestamp"][:10]
-        try:
-            b64, mt = encode_image(r["_path"])
-            if len(b64) > MAX_B64_CHARS:
-                raise ValueError("이미지 페이로드 과대 (b64 %d chars)" % len(b64))
-            if hl is not None:
-                res = hl.call_multimodal(
-                    OCR_SYSTEM,
-                    [{"type": "image",
-                      "source": {"type": "base64", "media_type": mt, "data": b64}},
-                     {"type": "text", "text": PROMPT}],
-                    model=OCR_HEADLESS_MODEL, timeout_sec=OCR_HEADLESS_TIMEOUT)
-                text = res["text"]
-                # 실입력 대부분은 cacheCreationInputTokens 에 계상 (8/18 실측)
-                in_tok = res["input_tokens"] + res["cache_creation_input_tokens"]
-                out_tok = res["output_tokens"]
-                used_model = res["resolved_model"] + "@headless"
-            else:
-                text, usage = call_ocr(client, b64, mt)
-                in_tok, out_tok = usage.input_tokens, usage.output_tokens
-                used_model = MODEL
-            tin += in_tok
-            tout += out_tok
-            st.execute(
-                "INSERT INTO ocr_items (message_id,day,media_file,file_sha,cache_key,"
-                " status,ocr_text,error,attempts,model,in_tokens,out_tokens,updated_at)"
-                " VALUES (?,?,?,?,?,'succeeded',?,NULL,0,?,?,?,?)"
-                " ON CONFLICT(message_id) DO UPDATE SET day=excluded.day,"
-                " media_file=excluded.media_file, file_sha=excluded.file_sha,"
-                " cache_key=excluded.cache_key, status='succeeded',"
-                " ocr_text=excluded.ocr_text, error=NULL, attempts=0,"
-                " model=excluded.model, in_tokens=excluded.in_tokens,"
-                " out_tokens=excluded.out_tokens, updated_at=excluded.updated_at",
-                (r["id"], day, os.path.basename(r["_path"]), r["_fs"], r["_ck"],
-                 text, used_model, in_tok, out_tok, now()))
-            ok += 1
-        except engine_errors as e:
-            # 인증·쿼터 장애 — 항목 실패로 기록하지 않고 즉시 중단 (다음 실행에서 자연 회수)
-            print("  [중단] 엔진 장애: %s" % str(e)[:180])
-            engine_down = True
-            break
-        except Exception as e:  # noqa: BLE001
-            st.execute(
-                "INSERT INTO ocr_items (message_id,day,media_file,file_sha,cache_key,"
-                " status,ocr_text,error,attempts,model,updated_at)"
-                " VALUES (?,?,?,?,?,'failed',NULL,?,1,?,?)"
-                " ON CONFLICT(message_id) DO UPDATE SET attempts=attempts+1,"
-                " error=excluded.error, updated_at=excluded.updated_at,"
-                " status=CASE WHEN attempts+1>=%d THEN 'dead_letter' ELSE 'failed' END"
-                % MAX_ATTEMPTS,
-                (r["id"], day, os.path.basename(r["_path"]), r["_fs"], r["_ck"],
-                 str(e)[:500], fail_model, now()))
-            fail += 1
-        st.commit()
-        if i % 25 == 0 or i == len(todo):
-            print("  %d/%d  ok=%d fail=%d  in=%s out=%s"
-                  % (i, len(todo), ok, fail, f"{tin:,}", f"{tout:,}"))
-        time.sleep(0.2)
+    t_run = time.perf_counter()
+    if args.concurrency > 1:
+        ok, fail, tin, tout, engine_down = run_pipelined(st, todo, hl, client, engine_errors,
+                                                         fail_model, args.concurrency)
+    else:
+        ok, fail, tin, tout, engine_down = run_sequential(st, todo, hl, client, engine_errors,
+                                                          fail_model)
 
-    print("완료: ok=%d fail=%d / 입력 %s · 출력 %s 토큰" % (ok, fail, f"{tin:,}", f"{tout:,}"))
+    print("완료: ok=%d fail=%d / 입력 %s · 출력 %s 토큰 / 계획 %.1fs · 처리 %.1fs"
+          % (ok, fail, f"{tin:,}", f"{tout:,}", plan_sec, time.perf_counter() - t_run))
     if engine_down:
         sys.exit(75)
     if fail:
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""별칭 매칭 벤치마크 — find_candidates(Aho-Corasick) vs 종전 전수 스캔, 하루치 리서치노트.
+
+  종전(scan) : 별칭 엔트리마다 `alias.lower() in text.lower()` 사전필터 + O(hits²) 덮임 검사
+  신규(ac)   : tagging_common.find_candidates (오토마톤 1회 스캔 → 등장 별칭만 규칙 적용)
+  검증       : 메시지·필드(text/article)별 후보 목록이 완전히 같은지 (다르면 rc=1)
+
+사용:
+  python3 datalake/tagging/bench_alias_matcher.py                    # DB 의 마지막 날
+  python3 datalake/tagging/bench_alias_matcher.py --date 2026-08-20 --repeat 3
+  python3 datalake/tagging/bench_alias_matcher.py --md ~/datalake/research_notes/2026/2026-08-20.md
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import tagging_common as tc  # noqa: E402
+from dl_common import REPO  # noqa: E402
+
+SRC_DB = os.path.join(REPO, "execution", "research_bot", "research_notes.db")
+
+
+def find_candidates_scan(text, alias_index, max_hits_per_alias=3):
+    """종전 구현 (비교 기준) — 경계 규칙은 같은 _iter_hits 를 쓴다."""
+    text = tc.nfkc(text or "")
+    if not text:
+        return []
+    text = tc.URL_RE.sub(lambda m: " " * len(m.group(0)), text)
+    src_spans = tc.detect_source_spans(text)
+    seen, out = set(), []
+    for e in alias_index["entries"]:
+        alias = tc.nfkc(e["alias"])
+        if not alias or alias.lower() not in text.lower():
+            continue
+        if e["blocked_context"] and any(b and b in text for b in e["blocked_context"]):
+            continue
+        if e["required_context"] and not any(r in text for r in e["required_context"]):
+            continue
+        n = 0
+        for s, t_, surface in tc._iter_hits(text, alias, e["match_mode"]):
+            key = (e["entity_id"], s, t_)
+            if key in seen:
+                continue
+            if any(o["start"] <= s and t_ <= o["end"] for o in out):
+                continue
+            seen.add(key)
+            out.append({"entity_id": e["entity_id"], "alias": e["alias"], "surface": surface,
+                        "start": s, "end": t_, "strength": e["strength"],
+                        "origin": e.get("origin", "manual"),
+                        "in_source_header": any(a <= s < b for a, b in src_spans)})
+            n += 1
+            if n >= max_hits_per_alias:
+                break
+    return sorted(out, key=lambda x: x["start"])
+
+
+def load_texts(args):
+    """[(라벨, 본문)] — DB 의 하루치 메시지(text·article) 또는 md 파일 하나."""
+    if args.md:
+        with open(os.path.expanduser(args.md), encoding="utf-8") as f:
+            return [(os.path.basename(args.md), f.read())]
+    if not os.path.exists(SRC_DB):
+        sys.exit("DB 없음 — %s (--md 로 파일 지정)" % SRC_DB)
+    con = sqlite3.connect("file:%s?mode=ro" % SRC_DB, uri=True)
+    con.row_factory = sqlite3.Row
+    day = args.date or con.execute(
+        "SELECT max(substr(timestamp,1,10)) FROM messages").fetchone()[0]
+    rows = con.execute("SELECT id, text_content, article_content FROM messages"
+                       " WHERE timestamp LIKE ? ORDER BY timestamp, id", (day + "%",)).fetchall()
+    con.close()
+    print("대상일 %s — 메시지 %d건" % (day, len(rows)))
+    return [("%s/%s" % (r["id"], f), r[col]) for r in rows
+            for f, col in (("text", "text_content"), ("article", "article_content")) if r[col]]
+
+
+def timed(fn, texts, idx, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = [fn(t, idx) for _, t in texts]
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--date", help="YYYY-MM-DD (기본: DB 의 마지막 날)")
+    ap.add_argument("--md", help="DB 대신 md 파일 하나")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    idx = tc.build_alias_index()
+    print("별칭 %d개 — 인덱스+오토마톤 컴파일 %.2fs" % (len(idx["entries"]), time.perf_counter() - t0))
+    texts = load_texts(args)
+    chars = sum(len(t) for _, t in texts)
+
+    t_scan, r_scan = timed(find_candidates_scan, texts, idx, args.repeat)
+    t_ac, r_ac = timed(tc.find_candidates, texts, idx, args.repeat)
+    diff = [label for (label, _), a, b in zip(texts, r_scan, r_ac) if a != b]
+    hits = sum(len(r) for r in r_ac)
+
+    print("본문 %d개 · %s자 · 후보 %d건" % (len(texts), format(chars, ","), hits))
+    print("  scan : %8.1f ms" % (t_scan * 1000))
+    print("  ac   : %8.1f ms   (×%.1f)" % (t_ac * 1000, t_scan / t_ac if t_ac else float("inf")))
+    if diff:
+        print("[불일치] %d건: %s" % (len(diff), ", ".join(diff[:10])))
+        return 1
+    print("후보 동일 ✓")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,31 @@
 
   입력 : ~/datalake/research_notes/tag_state.sqlite  (+ execution/research_bot/research_notes.db 본문)
          ~/datalake/doc_tag_state.sqlite             (+ transcripts·analyses md 본문)
-  출력 : ~/datalake/tag_index.sqlite                 (매 실행 시 통째로 재생성)
+  출력 : ~/datalake/tag_index.sqlite
+         + 자동완성 색인 tag_terms(FTS5 trigram, rowid=빈도 순위)·tag_short(1~2글자 상위 K)
+           — 조회는 webui/tag_lookup.py
+
+증분 갱신 (기본):
+  히트마다 출처 키 src('note:<message_id>' / 'doc:<rel_path>')를 달고, sources 표에 출처별
+  워터마크(stamp)를 둔다. 매 실행 상태 DB 의 워터마크와 비교해 바뀐·사라진 출처의 히트만
+  지우고 다시 넣는다 → 하룻밤 새 노트·전문 몇 건이면 그만큼만 쓴다.
+    노트 : items 의 day·content_hash·cache_key·updated_at
+    문서 : md 파일 sha(file_fingerprint — mtime 같으면 stat 만) + 청크 items 워터마크
+  라벨 빈도는 지운 히트만큼 빼고 넣은 히트만큼 더한다 (0 이하 태그는 삭제).
+  자동완성 색인·검색 별칭은 작아서 매번 다시 만든다.
+
+전체 재생성 (임시파일 → os.replace):
+  --full, 인덱스가 없거나 구 스키마, 온톨로지·유니버스·extra 지문이 바뀜, 또는 마지막 전체
+  재생성이 FULL_EVERY_DAYS 일 지남. 직전 인덱스가 있으면 라벨 빈도를 대조해 증분 누적
+  드리프트를 보고한다.
 
 사용:
-  python3 datalake/tagging/build_tag_index.py
+  python3 datalake/tagging/build_tag_index.py           # 증분 (조건 미달이면 전체)
+  python3 datalake/tagging/build_tag_index.py --full    # 전체 재생성 + 드리프트 점검
 """
+import argparse
+import datetime as dt
+import hashlib
 import io
 import os
 import re
@@ -25,12 +45,16 @@ sys.path.insert(0, os.path.dirname(HERE))
 import tag_docs  # noqa: E402
 import tagging_common as tc  # noqa: E402
 from dl_common import DATALAKE_ROOT, REPO  # noqa: E402
+from file_fingerprint import shared as shared_fingerprints  # noqa: E402
 
 OUT_PATH = os.path.join(DATALAKE_ROOT, "tag_index.sqlite")
 RESEARCH_STATE = os.path.join(DATALAKE_ROOT, "research_notes", "tag_state.sqlite")
 RESEARCH_SRC = os.path.join(REPO, "execution", "research_bot", "research_notes.db")
 DOC_STATE = os.path.join(DATALAKE_ROOT, "doc_tag_state.sqlite")
 SNIPPET_CHARS = 180
+SCHEMA_VERSION = "2"     # 2: hits.src + sources (증분 갱신)
+FULL_EVERY_DAYS = 7      # 증분만 이어 가는 최대 일수 — 넘으면 전체 재생성으로 드리프트 점검
+INSERT_BATCH = 5000
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS hits (
@@ -41,9 +65,12 @@ CREATE TABLE IF NOT EXISTS hits (
   rel_path TEXT NOT NULL,
   anchor TEXT,                -- 문서 안 위치 (rn-id / chunk 번호)
   title TEXT,
-  snippet TEXT
+  snippet TEXT,
+  src TEXT NOT NULL           -- 출처 키 note:<message_id> | doc:<rel_path>
 );
 CREATE INDEX IF NOT EXISTS idx_hits_tag ON hits(tag, doc_date DESC);
+CREATE INDEX IF NOT EXISTS idx_hits_src ON hits(src);
+CREATE TABLE IF NOT EXISTS sources (src TEXT PRIMARY KEY, stamp TEXT NOT NULL);
 CREATE TABLE IF NOT EXISTS labels (
   tag TEXT PRIMARY KEY, kind TEXT NOT NULL, label TEXT NOT NULL, freq INTEGER DEFAULT 0
 );
@@ -52,7 +79,16 @@ CREATE TABLE IF NOT EXISTS aliases (
   alias TEXT PRIMARY KEY, tag TEXT NOT NULL, label TEXT
 );
 CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS tag_terms USING fts5(
+  term, tag UNINDEXED, label UNINDEXED, kind UNINDEXED, freq UNINDEXED, tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS tag_short (
+  gram TEXT NOT NULL, rank INTEGER NOT NULL,
+  tag TEXT NOT NULL, label TEXT, kind TEXT, freq INTEGER,
+  PRIMARY KEY (gram, rank)
+) WITHOUT ROWID;
 """
+SHORT_K = 30          # tag_short 글자(쌍)당 보관 건수 (webui/tag_lookup.SHORT_K 와 같게)
 
 WS_RE = re.compile(r"\s+")
 
@@ -67,28 +103,80 @@ def snippet_of(text):
     return s[:SNIPPET_CHARS]
 
 
+def _stamp(*parts):
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _chunks(seq, n=900):
+    seq = list(seq)
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
 class Index:
     def __init__(self, conn):
         self.conn = conn
-        self.labels = {}          # key → (kind, label, freq)
+        self.labels = {}          # key → (kind, label, freq 증감)
+        self.rows = []            # hits 삽입 대기 (executemany)
+        self.stamps = []          # sources 갱신 대기
 
-    def add(self, tag_label, kind, corpus, doc_date, rel_path, anchor, title, snippet):
+    def add(self, tag_label, kind, corpus, doc_date, rel_path, anchor, title, snippet, src):
         key = norm(tag_label)
         if not key:
             return
-        self.conn.execute(
-            "INSERT INTO hits (tag,kind,corpus,doc_date,rel_path,anchor,title,snippet)"
-            " VALUES (?,?,?,?,?,?,?,?)",
-            (key, kind, corpus, doc_date, rel_path, anchor, title, snippet))
+        self.rows.append((key, kind, corpus, doc_date, rel_path, anchor, title, snippet, src))
+        if len(self.rows) >= INSERT_BATCH:
+            self.flush()
         cur = self.labels.get(key)
         self.labels[key] = (kind, tag_label if not cur else cur[1], (cur[2] if cur else 0) + 1)
 
+    def done(self, src, stamp):
+        """출처 하나를 다 넣었다 — 워터마크 기록."""
+        self.stamps.append((src, stamp))
+
+    def retract(self, srcs):
+        """출처들의 기존 히트 삭제 + 라벨 빈도 차감 → 삭제 히트 수."""
+        n = 0
+        for part in _chunks(srcs):
+            marks = ",".join("?" * len(part))
+            for key, kind, cnt in self.conn.execute(
+                    "SELECT tag, kind, count(*) FROM hits WHERE src IN (%s) GROUP BY tag" % marks, part):
+                cur = self.labels.get(key)
+                self.labels[key] = (cur[0] if cur else kind, cur[1] if cur else key,
+                                    (cur[2] if cur else 0) - cnt)
+                n += cnt
+            self.conn.execute("DELETE FROM hits WHERE src IN (%s)" % marks, part)
+            self.conn.execute("DELETE FROM sources WHERE src IN (%s)" % marks, part)
+        return n
+
+    def flush(self):
+        if self.rows:
+            self.conn.executemany(
+                "INSERT INTO hits (tag,kind,corpus,doc_date,rel_path,anchor,title,snippet,src)"
+                " VALUES (?,?,?,?,?,?,?,?,?)", self.rows)
+            self.rows = []
+        if self.stamps:
+            self.conn.executemany("INSERT OR REPLACE INTO sources (src, stamp) VALUES (?,?)",
+                                  self.stamps)
+            self.stamps = []
+
     def flush_labels(self):
-        for key, (kind, label, freq) in self.labels.items():
-            self.conn.execute(
-                "INSERT INTO labels (tag,kind,label,freq) VALUES (?,?,?,?)"
-                " ON CONFLICT(tag) DO UPDATE SET freq=freq+excluded.freq",
-                (key, kind, label, freq))
+        self.flush()
+        self.conn.executemany(
+            "INSERT INTO labels (tag,kind,label,freq) VALUES (?,?,?,?)"
+            " ON CONFLICT(tag) DO UPDATE SET freq=freq+excluded.freq",
+            [(key, kind, label, freq) for key, (kind, label, freq) in self.labels.items() if freq])
+        self.conn.execute("DELETE FROM labels WHERE freq <= 0")
+        self.labels = {}
+
+
+def plan(prev, cur, prefix):
+    """(다시 넣을 출처, 지울 출처). prev=None 이면 전체 재생성 — 전부 넣고 지울 것 없음."""
+    if prev is None:
+        return list(cur), []
+    todo = [s for s, stamp in cur.items() if prev.get(s) != stamp]
+    gone = [s for s in prev if s.startswith(prefix) and s not in cur]
+    return todo, [s for s in todo if s in prev] + gone
 
 
 def entity_tags(entity_id, uni, extra):
@@ -112,20 +200,32 @@ def entity_tags(entity_id, uni, extra):
     return out, (u.get("sector") or None)
 
 
-def index_research(idx, onto, uni, extra):
+def index_research(idx, onto, uni, extra, prev=None):
+    """→ (넣은 히트, 다시 넣은 메시지, 지운 히트). prev = 기존 sources 워터마크 (None=전체)."""
     if not (os.path.exists(RESEARCH_STATE) and os.path.exists(RESEARCH_SRC)):
         print("  리서치노트: 소스 없음 — 건너뜀")
-        return 0
+        return 0, 0, idx.retract(plan(prev, {}, "note:")[1])
     st = sqlite3.connect("file:%s?mode=ro" % RESEARCH_STATE, uri=True)
     st.row_factory = sqlite3.Row
+    days, cur = {}, {}
+    for r in st.execute("SELECT message_id, day, content_hash, cache_key, updated_at"
+                        " FROM items WHERE status='succeeded'"):
+        s = "note:%d" % r["message_id"]
+        days[s] = (r["message_id"], r["day"])
+        cur[s] = _stamp(r["day"], r["content_hash"], r["cache_key"], r["updated_at"])
+    todo, stale = plan(prev, cur, "note:")
+    removed = idx.retract(stale)
     src = sqlite3.connect("file:%s?mode=ro" % RESEARCH_SRC, uri=True)
     src.row_factory = sqlite3.Row
-    texts = {r["id"]: (r["timestamp"], r["text_content"])
-             for r in src.execute("SELECT id,timestamp,text_content FROM messages")}
-    days = {r["message_id"]: r["day"] for r in st.execute(
-        "SELECT message_id, day FROM items WHERE status='succeeded'")}
+    texts = {}
+    for part in _chunks([days[s][0] for s in todo]):
+        texts.update((r["id"], (r["timestamp"], r["text_content"])) for r in src.execute(
+            "SELECT id,timestamp,text_content FROM messages WHERE id IN (%s)"
+            % ",".join("?" * len(part)), part))
+    src.close()
     n = 0
-    for mid, day in days.items():
+    for s in todo:
+        mid, day = days[s]
         ts, text = texts.get(mid, (day, ""))
         rel = "research_notes/%s/%s.md" % (day[:4], day)
         anchor = "rn-id: %s" % mid
@@ -133,67 +233,82 @@ def index_research(idx, onto, uni, extra):
         snip = snippet_of(text)
         for r in st.execute("SELECT theme_id FROM theme_assignments WHERE message_id=?", (mid,)):
             meta = onto["themes"].get(r["theme_id"]) or {}
-            idx.add(meta.get("label") or r["theme_id"], "theme", "note", day, rel, anchor, title, snip)
+            idx.add(meta.get("label") or r["theme_id"], "theme", "note", day, rel, anchor, title,
+                    snip, s)
             n += 1
         for r in st.execute(
                 "SELECT DISTINCT entity_id FROM entity_occurrences"
                 " WHERE role!='incidental' AND message_id=?", (mid,)):
             tags, sector = entity_tags(r["entity_id"], uni, extra)
             for label, kind in tags:
-                idx.add(label, kind, "note", day, rel, anchor, title, snip)
+                idx.add(label, kind, "note", day, rel, anchor, title, snip, s)
                 n += 1
             if sector:
-                idx.add(sector, "sector", "note", day, rel, anchor, title, snip)
+                idx.add(sector, "sector", "note", day, rel, anchor, title, snip, s)
                 n += 1
+        idx.done(s, cur[s])
     st.close()
-    src.close()
-    return n
+    return n, len(todo), removed
 
 
-def index_docs(idx, onto, uni, extra):
+def index_docs(idx, onto, uni, extra, prev=None):
+    """→ (넣은 히트, 다시 넣은 문서, 지운 히트). 문서(rel_path) 단위로 지우고 다시 넣는다."""
     if not os.path.exists(DOC_STATE):
         print("  전문·분석: 소스 없음 — 건너뜀")
-        return 0
+        return 0, 0, idx.retract(plan(prev, {}, "doc:")[1])
     st = sqlite3.connect("file:%s?mode=ro" % DOC_STATE, uri=True)
     st.row_factory = sqlite3.Row
-    chunk_cache = {}
+    by_doc = {}
+    for d in st.execute(
+            "SELECT d.chunk_id, d.rel_path, d.chunk_no, d.kind, d.doc_date, d.title,"
+            " i.content_hash, i.cache_key, i.updated_at"
+            " FROM docs d JOIN items i ON i.message_id = d.chunk_id"
+            " WHERE i.status='succeeded'"):
+        by_doc.setdefault("doc:" + d["rel_path"], []).append(d)
+    fp = shared_fingerprints()
+    cur = {}
+    for s, rows in by_doc.items():
+        try:
+            fsha = fp.sha256(os.path.join(DATALAKE_ROOT, rows[0]["rel_path"]))
+        except OSError:
+            fsha = "missing"
+        cur[s] = _stamp(fsha, *(tuple(d) for d in rows))
+    todo, stale = plan(prev, cur, "doc:")
+    removed = idx.retract(stale)
     n = 0
-    rows = st.execute(
-        "SELECT d.chunk_id, d.rel_path, d.chunk_no, d.kind, d.doc_date, d.title"
-        " FROM docs d JOIN items i ON i.message_id = d.chunk_id"
-        " WHERE i.status='succeeded'").fetchall()
-    for d in rows:
-        rel, cno = d["rel_path"], d["chunk_no"]
-        if rel not in chunk_cache:
-            path = os.path.join(DATALAKE_ROOT, rel)
-            try:
-                _fm, body = tag_docs.parse_md(io.open(path, encoding="utf-8").read())
-                chunk_cache[rel] = tag_docs.split_chunks(body)
-            except OSError:
-                chunk_cache[rel] = []
-        chunks = chunk_cache[rel]
-        snip = snippet_of(chunks[cno]) if cno < len(chunks) else ""
-        corpus = {"transcripts": "transcript", "analyses": "analysis"}.get(d["kind"], d["kind"])
-        title = d["title"] or os.path.basename(rel)
-        anchor = "chunk %d" % cno
-        cid = d["chunk_id"]
-        for r in st.execute("SELECT theme_id FROM theme_assignments WHERE message_id=?", (cid,)):
-            meta = onto["themes"].get(r["theme_id"]) or {}
-            idx.add(meta.get("label") or r["theme_id"], "theme", corpus,
-                    d["doc_date"], rel, anchor, title, snip)
-            n += 1
-        for r in st.execute(
-                "SELECT DISTINCT entity_id FROM entity_occurrences"
-                " WHERE role!='incidental' AND message_id=?", (cid,)):
-            tags, sector = entity_tags(r["entity_id"], uni, extra)
-            for label, kind in tags:
-                idx.add(label, kind, corpus, d["doc_date"], rel, anchor, title, snip)
-                n += 1
-            if sector:
-                idx.add(sector, "sector", corpus, d["doc_date"], rel, anchor, title, snip)
+    for s in todo:
+        rel = by_doc[s][0]["rel_path"]
+        path = os.path.join(DATALAKE_ROOT, rel)
+        try:
+            _fm, body = tag_docs.parse_md(io.open(path, encoding="utf-8").read())
+            chunks = tag_docs.split_chunks(body)
+        except OSError:
+            chunks = []
+        for d in by_doc[s]:
+            cno = d["chunk_no"]
+            snip = snippet_of(chunks[cno]) if cno < len(chunks) else ""
+            corpus = {"transcripts": "transcript", "analyses": "analysis"}.get(d["kind"], d["kind"])
+            title = d["title"] or os.path.basename(rel)
+            anchor = "chunk %d" % cno
+            cid = d["chunk_id"]
+            for r in st.execute("SELECT theme_id FROM theme_assignments WHERE message_id=?", (cid,)):
+                meta = onto["themes"].get(r["theme_id"]) or {}
+                idx.add(meta.get("label") or r["theme_id"], "theme", corpus,
+                        d["doc_date"], rel, anchor, title, snip, s)
                 n += 1
+            for r in st.execute(
+                    "SELECT DISTINCT entity_id FROM entity_occurrences"
+                    " WHERE role!='incidental' AND message_id=?", (cid,)):
+                tags, sector = entity_tags(r["entity_id"], uni, extra)
+                for label, kind in tags:
+                    idx.add(label, kind, corpus, d["doc_date"], rel, anchor, title, snip, s)
+                    n += 1
+                if sector:
+                    idx.add(sector, "sector", corpus, d["doc_date"], rel, anchor, title, snip, s)
+                    n += 1
+        idx.done(s, cur[s])
     st.close()
-    return n
+    return n, len(todo), removed
 
 
 ALIAS_CSV = os.path.join(HERE, "search_aliases.csv")
@@ -215,32 +330,131 @@ def load_search_aliases(conn):
     return n
 
 
+def build_suggest(conn):
+    """자동완성 색인 — 태그 키·검색 별칭을 빈도 내림차순으로 tag_terms 에 넣고 (rowid = 순위),
+    1~2글자 부분문자열별 상위 SHORT_K 태그를 tag_short 에 뽑아 둔다. → 색인 행 수."""
+    rows = conn.execute(
+        "SELECT term, tag, label, kind, freq FROM ("
+        " SELECT tag AS term, tag, label, kind, freq FROM labels"
+        " UNION ALL"
+        " SELECT a.alias, l.tag, COALESCE(a.label, l.label), l.kind, l.freq"
+        " FROM aliases a JOIN labels l ON l.tag = a.tag)"
+        " ORDER BY freq DESC, term").fetchall()
+    conn.executemany("INSERT INTO tag_terms (rowid, term, tag, label, kind, freq)"
+                     " VALUES (?,?,?,?,?,?)", [(i,) + tuple(r) for i, r in enumerate(rows, 1)])
+    short = {}
+    for term, tag, label, kind, freq in rows:
+        grams = {term[i:i + n] for n in (1, 2) for i in range(len(term) - n + 1)}
+        for g in grams:
+            lst = short.setdefault(g, [])
+            if len(lst) < SHORT_K and all(t[0] != tag for t in lst):
+                lst.append((tag, label, kind, freq))
+    conn.executemany("INSERT INTO tag_short (gram, rank, tag, label, kind, freq) VALUES (?,?,?,?,?,?)",
+                     [(g, i, *t) for g, lst in short.items() for i, t in enumerate(lst)])
+    return len(rows)
+
+
+def read_meta(path):
+    """기존 인덱스 meta dict (없거나 못 읽으면 {})."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        con = sqlite3.connect("file:%s?mode=ro" % path, uri=True)
+        try:
+            return dict(con.execute("SELECT k, v FROM meta"))
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return {}
+
+
+def full_reason(meta, dict_hash, now):
+    """전체 재생성이 필요한 이유 (증분 가능하면 None)."""
+    if not meta:
+        return "인덱스 없음"
+    if meta.get("schema") != SCHEMA_VERSION:
+        return "구 스키마"
+    if meta.get("dict_hash") != dict_hash:
+        return "온톨로지·유니버스·extra 변경"
+    try:
+        age = now - dt.datetime.fromisoformat(meta.get("full_built_at") or "")
+    except ValueError:
+        return "전체 재생성 기록 없음"
+    if age > dt.timedelta(days=FULL_EVERY_DAYS):
+        return "마지막 전체 재생성 %d일 경과" % age.days
+    return None
+
+
+def drift_report(old_path, conn):
+    """직전 인덱스(증분 누적)와 방금 만든 전체 인덱스의 라벨 빈도 대조 → 불일치 태그 수."""
+    try:
+        old = sqlite3.connect("file:%s?mode=ro" % old_path, uri=True)
+        before = dict(old.execute("SELECT tag, freq FROM labels"))
+        old.close()
+    except sqlite3.Error:
+        return None
+    after = dict(conn.execute("SELECT tag, freq FROM labels"))
+    diff = sorted(t for t in set(before) | set(after) if before.get(t) != after.get(t))
+    if diff:
+        print("  드리프트 : 태그 %d종 빈도 불일치 (예: %s)" % (len(diff), ", ".join(
+            "%s %s→%s" % (t, before.get(t, 0), after.get(t, 0)) for t in diff[:5])))
+    else:
+        print("  드리프트 : 없음")
+    return len(diff)
+
+
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true", help="전체 재생성 (+ 직전 인덱스와 드리프트 대조)")
+    args = ap.parse_args()
+
     onto = tc.load_ontology()
     uni = tc.load_universe()
     extra = tc.load_entities_extra()
-
-    tmp = OUT_PATH + ".tmp"
-    if os.path.exists(tmp):
-        os.remove(tmp)
-    conn = sqlite3.connect(tmp)
-    conn.executescript(SCHEMA)
+    dict_hash = _stamp(onto["hash"], uni["hash"], extra["hash"])
+    now = dt.datetime.now().replace(microsecond=0)
+    meta = read_meta(OUT_PATH)
+    reason = "--full" if args.full else full_reason(meta, dict_hash, now)
+
+    if reason:
+        print("태그 인덱스 전체 재생성 (%s)" % reason)
+        tmp = OUT_PATH + ".tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        conn = sqlite3.connect(tmp)
+        conn.executescript(SCHEMA)
+        prev = None
+    else:
+        print("태그 인덱스 증분 갱신 (전체 재생성 %s)" % meta["full_built_at"])
+        conn = sqlite3.connect(OUT_PATH, timeout=30)      # 한 트랜잭션 — 조회 쪽은 커밋 전 상태를 본다
+        prev = dict(conn.execute("SELECT src, stamp FROM sources"))
     idx = Index(conn)
 
-    print("태그 인덱스 재생성")
-    n1 = index_research(idx, onto, uni, extra)
-    print("  리서치노트: %s 건" % format(n1, ","))
-    n2 = index_docs(idx, onto, uni, extra)
-    print("  전문·분석 : %s 건" % format(n2, ","))
+    n1, d1, r1 = index_research(idx, onto, uni, extra, prev)
+    print("  리서치노트: %s 건 (메시지 %s · 삭제 %s)" % (format(n1, ","), format(d1, ","), format(r1, ",")))
+    n2, d2, r2 = index_docs(idx, onto, uni, extra, prev)
+    print("  전문·분석 : %s 건 (문서 %s · 삭제 %s)" % (format(n2, ","), format(d2, ","), format(r2, ",")))
     idx.flush_labels()
+    conn.execute("DELETE FROM aliases")
     na = load_search_aliases(conn)
     print("  검색 별칭 : %d 건" % na)
-    conn.execute("INSERT OR REPLACE INTO meta (k,v) VALUES ('built_at', datetime('now','localtime'))")
+    conn.execute("DELETE FROM tag_terms")
+    conn.execute("DELETE FROM tag_short")
+    nt = build_suggest(conn)
+    print("  자동완성  : %d 건" % nt)
+    stamp = now.isoformat(sep=" ")
+    conn.executemany("INSERT OR REPLACE INTO meta (k,v) VALUES (?,?)",
+                     [("built_at", stamp), ("schema", SCHEMA_VERSION), ("dict_hash", dict_hash),
+                      ("full_built_at", stamp if reason else meta["full_built_at"])])
     conn.commit()
+    hits = conn.execute("SELECT count(*) FROM hits").fetchone()[0]
     tags = conn.execute("SELECT count(*) FROM labels").fetchone()[0]
+    if reason and meta.get("schema") == SCHEMA_VERSION:
+        drift_report(OUT_PATH, conn)
     conn.close()
-    os.replace(tmp, OUT_PATH)          # 조회 중에도 안전하게 교체
-    print("완료: hits %s · 태그 %s 종" % (format(n1 + n2, ","), format(tags, ",")))
+    if reason:
+        os.replace(tmp, OUT_PATH)          # 조회 중에도 안전하게 교체
+    print("완료: hits %s · 태그 %s 종" % (format(hits, ","), format(tags, ",")))
     return 0
 
 
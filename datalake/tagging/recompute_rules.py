@@ -22,7 +22,7 @@ sys.path.insert(0, os.path.dirname(HERE))
 
 import tagging_common as tc  # noqa: E402
 from dl_common import DATALAKE_ROOT, REPO  # noqa: E402
-from tag_worker import rule_pass  # noqa: E402
+from tag_worker import now, rule_pass  # noqa: E402
 
 STATE_DB = os.path.join(DATALAKE_ROOT, "research_notes", "tag_state.sqlite")
 SRC_DB = os.path.join(REPO, "execution", "research_bot", "research_notes.db")
@@ -76,6 +76,8 @@ def main():
                 st.execute("DELETE FROM entity_occurrences WHERE message_id=? AND entity_id=? "
                            "AND method='llm_context'", (mid, r["entity_id"]))
                 dropped_llm += 1
+        # build_tag_index 증분 갱신의 워터마크 — 태그가 바뀐 메시지로 보이게 한다
+        st.execute("UPDATE items SET updated_at=? WHERE message_id=?", (now(), mid))
         if i % 500 == 0:
             st.commit()
             print("  %d/%d" % (i, len(targets)), flush=True)
@@ -11,6 +11,10 @@
   정본 : ~/datalake/doc_tag_state.sqlite   (청크별 테마·개체)
   투영 : 각 md 의 frontmatter (themes/tickers/sectors/orgs) — 재생성 가능한 캐시
 
+변경 없는 문서는 읽지 않는다: 모든 청크가 캐시 적중이던 문서는 doc_files 에 (파일 sha,
+문맥 해시 = 프롬프트·온톨로지·별칭 epoch·유니버스/별칭 해시)를 남기고, 다음 실행에서
+file_fingerprint 캐시(stat 만)로 얻은 sha 와 문맥이 같으면 건너뛴다.
+
 사용:
   python3 datalake/tagging/tag_docs.py --dry-run           # 대상·토큰 견적만
   python3 datalake/tagging/tag_docs.py                     # 미처리분 전부
@@ -33,6 +37,7 @@ import sqlite3  # noqa: E402
 import tagging_common as tc  # noqa: E402
 import tag_worker as tw  # noqa: E402
 from dl_common import DATALAKE_ROOT  # noqa: E402
+from file_fingerprint import shared as shared_fingerprints  # noqa: E402
 
 DOC_TAGGER_VERSION = "1.0.0"
 STATE_DB = os.path.join(DATALAKE_ROOT, "doc_tag_state.sqlite")
@@ -68,6 +73,9 @@ CREATE TABLE IF NOT EXISTS docs (
 );
 CREATE INDEX IF NOT EXISTS idx_docs_path ON docs(rel_path);
 CREATE INDEX IF NOT EXISTS idx_docs_kind ON docs(kind);
+CREATE TABLE IF NOT EXISTS doc_files (
+  rel_path TEXT PRIMARY KEY, file_sha TEXT NOT NULL, ctx TEXT NOT NULL
+);
 """
 
 
@@ -417,9 +425,23 @@ def main():
         print("별칭 신규 %d건 — 해당 문자열이 등장하는 청크만 재태깅: %s"
               % (len(added_aliases), ", ".join(added_aliases[:5])))
 
+    # 문서 단위 건너뛰기 — 청크 캐시 키를 바꿀 수 있는 옵션·신규 별칭이 있으면 끈다
+    ctx = tw.sha(prompt_hash, onto["hash"], str(epoch), uni["hash"], idx["hash"])
+    skip_ok = not (args.force or args.project or args.retry_failed or args.migrate_cache_key
+                   or args.migrate_only or added_aliases)
+    settled = {r["rel_path"]: (r["file_sha"], r["ctx"])
+               for r in st.execute("SELECT rel_path, file_sha, ctx FROM doc_files")}
+    fp = shared_fingerprints()
+
     todo, cached, touched, migrated, key_drift = [], 0, [], 0, 0
+    unchanged, doc_state = 0, []          # doc_state: [(rel, file_sha, 전 청크 적중 여부)]
     fm_changed = []                       # fm_meta 가 바뀐 문서 — 캐시 적중이어도 재투영
     for kind, path, rel in docs:
+        fsha = fp.sha256(path)
+        if skip_ok and settled.get(rel) == (fsha, ctx):
+            unchanged += 1
+            continue
+        all_hit = True
         with open(path, encoding="utf-8") as f:
             raw = f.read()
         fm, body = parse_md(raw)
@@ -456,14 +478,23 @@ def main():
             if hit:
                 cached += 1
                 continue
+            all_hit = False
             if args.retry_failed and (not cur or cur["status"] == "succeeded"):
                 continue
             todo.append({"id": cid, "text_content": text, "article_content": None,
                          "forward_source": None, "timestamp": doc_date or "1970-01-01",
                          "_content_hash": ch, "_cache_key": ck, "_subject": subject,
                          "_rel": rel})
+        doc_state.append((rel, fsha, all_hit))
     if not args.dry_run:
+        for rel, fsha, all_hit in doc_state:
+            if all_hit:
+                st.execute("INSERT OR REPLACE INTO doc_files (rel_path,file_sha,ctx) VALUES (?,?,?)",
+                           (rel, fsha, ctx))
+            else:
+                st.execute("DELETE FROM doc_files WHERE rel_path=?", (rel,))
         st.commit()
+    fp.commit()
 
     if args.project:
         n = sum(1 for rel in touched if project_doc(st, rel, uni, extra, onto))
@@ -478,8 +509,9 @@ def main():
     if migrated and not args.dry_run:
         st.commit()   # --dry-run 이면 커밋하지 않아 이관도 롤백된다(견적만)
         print("캐시 키 이관(v1→v2): %d건 — 재태깅 없음" % migrated)
-    print("문서 %d건 / 청크 대상 %d개 (캐시 재사용 %d) / 배치 %d / 엔진 %s / 추정 입력 토큰 ~%s"
-          % (len(docs), len(todo), cached, BATCH, engine, format(est_in, ",")))
+    print("문서 %d건 (변경 없음 %d) / 청크 대상 %d개 (캐시 재사용 %d) / 배치 %d / 엔진 %s"
+          " / 추정 입력 토큰 ~%s"
+          % (len(docs), unchanged, len(todo), cached, BATCH, engine, format(est_in, ",")))
     if key_drift:
         print("[주의] 캐시 키 드리프트 %d건 — 본문 동일·키 불일치"
               " (프롬프트/온톨로지/epoch 변경 신호)" % key_drift)
@@ -42,6 +42,7 @@ import subprocess
 import sys
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, HERE)
@@ -58,6 +59,9 @@ OCR_DB = os.path.join(DATALAKE_ROOT, "research_notes", "ocr_state.sqlite")
 
 BATCH_SIZE = int(os.getenv("TAG_BATCH", "16"))
 MAX_TEXT_CHARS = 5000
+# 계획 단계 본문 해시 프로세스 수 — 후보가 PLAN_POOL_MIN 건 미만이면 풀을 띄우지 않는다
+PLAN_WORKERS = max(1, int(os.getenv("TAG_PLAN_WORKERS", str(min(8, os.cpu_count() or 1)))))
+PLAN_POOL_MIN = 2000
 MAX_ATTEMPTS = 3
 
 ROLES = ("subject", "source", "author", "comparison", "incidental")
@@ -97,6 +101,28 @@ def sha(*parts):
     return h.hexdigest()[:20]
 
 
+def _content_hash(parts):
+    return sha(*parts)
+
+
+def content_hashes(rows, workers=PLAN_WORKERS):
+    """메시지별 content_hash (rows 순서). 대량이면 프로세스 풀 — str 인코딩이 GIL 을 잡는다."""
+    parts = [(r["text_content"], r["article_content"], r["forward_source"]) for r in rows]
+    if workers <= 1 or len(parts) < PLAN_POOL_MIN:
+        return [_content_hash(p) for p in parts]
+    with ProcessPoolExecutor(workers) as ex:
+        return list(ex.map(_content_hash, parts, chunksize=max(1, len(parts) // (workers * 4))))
+
+
+def load_cache_status(st, ids):
+    """후보 id 범위의 items 캐시 상태를 질의 1회로 → {message_id: Row(cache_key, status, content_hash)}."""
+    if not ids:
+        return {}
+    return {r["message_id"]: r for r in st.execute(
+        "SELECT message_id, cache_key, status, content_hash FROM items"
+        " WHERE message_id BETWEEN ? AND ?", (min(ids), max(ids)))}
+
+
 def now():
     return dt.datetime.now().isoformat(timespec="seconds")
 
@@ -773,14 +799,16 @@ def main():
         print("별칭 신규 %d건 — 해당 문자열이 등장하는 문서만 재태깅: %s"
               % (len(added_aliases), ", ".join(added_aliases[:5])))
 
+    # 계획: 본문 해시는 풀로 한꺼번에, 캐시 상태는 후보 id 범위 질의 1회로 메모리에
+    t_plan = time.perf_counter()
+    hashes = content_hashes(rows)
+    cache = load_cache_status(st, [r["id"] for r in rows])
     todo, cached, migrated, key_drift = [], 0, 0, 0
-    for r in rows:
-        ch = sha(r["text_content"], r["article_content"], r["forward_source"])
+    for r, ch in zip(rows, hashes):
         # 캐시 키 = 본문 + 태거/프롬프트/온톨로지 + alias_epoch.
         # universe/alias 해시는 넣지 않는다 — 종목 1건 추가로 전량 무효화되던 원인.
         ck = sha(ch, TAGGER_VERSION, prompt_hash, onto["hash"], epoch)
-        cur = st.execute("SELECT cache_key,status,content_hash FROM items "
-                         "WHERE message_id=?", (r["id"],)).fetchone()
+        cur = cache.get(r["id"])
         hit = bool(not args.force and cur and cur["cache_key"] == ck
                    and cur["status"] == "succeeded")
         if (not hit and args.migrate_cache_key and not args.force and cur
@@ -804,14 +832,15 @@ def main():
         todo.append(r)
     if args.max_items:
         todo = todo[:args.max_items]
+    plan_sec = time.perf_counter() - t_plan
 
     est_in = sum(len(tc.nfkc(r["text_content"] or "")[:MAX_TEXT_CHARS]) for r in todo) // 2
     est_in += len(system) // 2 * (len(todo) // BATCH_SIZE + 1)
     if migrated and not args.dry_run:
         st.commit()   # --dry-run 이면 커밋하지 않아 이관도 롤백된다(견적만)
         print("캐시 키 이관(v1→v2): %d건 — 재태깅 없음" % migrated)
-    print("대상 %d건 (캐시 재사용 %d건) / 배치 %d / 엔진 %s / 추정 입력 토큰 ~%s"
-          % (len(todo), cached, BATCH_SIZE, engine, format(est_in, ",")))
+    print("대상 %d건 (캐시 재사용 %d건) / 계획 %.1fs / 배치 %d / 엔진 %s / 추정 입력 토큰 ~%s"
+          % (len(todo), cached, plan_sec, BATCH_SIZE, engine, format(est_in, ",")))
     if key_drift:
         print("[주의] 캐시 키 드리프트 %d건 — 본문 동일·키 불일치"
               " (프롬프트/온톨로지/epoch 변경 신호)" % key_drift)
@@ -840,12 +869,14 @@ def main():
         system_rt = runtime_system(system, engine)
         anchor_text, anchor_hash = build_anchor(st)
         run_meta = {"engine": engine, "model": model, "cli_version": _cli_version(),
-                    "anchor_hash": anchor_hash, "batch_size": BATCH_SIZE}
+                    "anchor_hash": anchor_hash, "batch_size": BATCH_SIZE,
+                    "plan_sec": round(plan_sec, 2)}
     else:
         import anthropic
         client = anthropic.Anthropic(api_key=load_env_key())
         model, system_rt, anchor_text = MODEL, system, ""
-        run_meta = {"engine": engine, "model": model, "batch_size": BATCH_SIZE}
+        run_meta = {"engine": engine, "model": model, "batch_size": BATCH_SIZE,
+                    "plan_sec": round(plan_sec, 2)}
 
     cur = st.execute(
         "INSERT INTO tag_runs (started_at,model,tagger_version,prompt_hash,ontology_version,"
@@ -859,6 +890,7 @@ def main():
 
     ok = fail = tin = tout = tcache = 0
     engine_down = None
+    t_run = time.perf_counter()
     for i in range(0, len(todo), BATCH_SIZE):
         batch = todo[i:i + BATCH_SIZE]
         prepared = []
@@ -922,8 +954,9 @@ def main():
         tc.commit_alias_state(st, idx, epoch)
     if engine == "headless" and ok:
         _drift_report(st)
-    print("완료: ok=%d fail=%d / 입력 %s · 출력 %s · 캐시읽기 %s 토큰%s"
+    print("완료: ok=%d fail=%d / 입력 %s · 출력 %s · 캐시읽기 %s 토큰 / 계획 %.1fs · 태깅 %.1fs%s"
           % (ok, fail, format(tin, ","), format(tout, ","), format(tcache, ","),
+             plan_sec, time.perf_counter() - t_run,
              "" if full_pass else " (부분 실행 — 별칭 서명 미확정)"))
     return 0 if fail == 0 else 1
 
@@ -12,6 +12,7 @@
 """
 import csv
 import hashlib
+import functools
 import sqlite3
 import json
 import os
@@ -235,10 +236,12 @@ def build_alias_index(universe=None, manual=None, extra=None):
     unknown = [e["entity_id"] for e in index.values()
                if e["entity_id"] not in universe["rows"]
                and e["entity_id"] not in extra["rows"]]
+    entries = sorted(index.values(), key=lambda x: (-len(x["alias"]), x["alias"]))
     return {
-        "entries": sorted(index.values(), key=lambda x: (-len(x["alias"]), x["alias"])),
+        "entries": entries,
         "unknown_entity_ids": sorted(set(unknown)),
         "hash": _sha(manual["hash"] + extra["hash"] + universe["hash"]),
+        "matcher": AliasMatcher(entries),
     }
 
 
@@ -357,6 +360,99 @@ KO_SUFFIXES = (
 )
 
 
+class AliasMatcher:
+    """별칭 전체를 Aho-Corasick 오토마톤 하나로 컴파일 — 본문 1회 스캔으로 '등장한 별칭'을 찾는다.
+
+    키는 nfkc(alias).lower(), 본문은 (nfkc 된) text.lower() — 종전 사전필터
+    `alias.lower() in text.lower()` 와 같은 판정이다. 경계 규칙(code6·symbol·ko_boundary 등)은
+    여기서 보지 않고 find_candidates 가 후보 엔트리에만 _iter_hits 로 적용한다.
+    """
+
+    def __init__(self, entries):
+        self.size = len(entries)
+        goto, fail, out = [{}], [0], [[]]
+        for i, e in enumerate(entries):
+            key = nfkc(e["alias"]).lower()
+            if not key:
+                continue
+            s = 0
+            for ch in key:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[s][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                s = nxt
+            out[s].append(i)
+        queue = list(goto[0].values())
+        for s in queue:                                   # BFS — 실패 링크·출력 병합
+            for ch, nxt in goto[s].items():
+                queue.append(nxt)
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def present(self, text_lower):
+        """본문에 등장하는 별칭의 엔트리 번호 (entries 순서, 오름차순)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        s = 0
+        for ch in text_lower:
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found.update(out[s])
+        return sorted(found)
+
+
+def _matcher(alias_index):
+    """alias_index 의 컴파일된 매처 (build_alias_index 밖에서 만든 dict 는 처음 쓸 때 컴파일)."""
+    m = alias_index.get("matcher")
+    if m is None or m.size != len(alias_index["entries"]):
+        m = alias_index["matcher"] = AliasMatcher(alias_index["entries"])
+    return m
+
+
+class _SpanCover:
+    """채택된 구간 [s, e) 들 중 주어진 구간을 덮는 것이 있는지 — 시작 위치별 최대 끝(펜윅 트리)."""
+
+    def __init__(self, n):
+        self.n = n
+        self.tree = [-1] * (n + 1)
+
+    def add(self, s, e):
+        i = s + 1
+        while i <= self.n:
+            if self.tree[i] < e:
+                self.tree[i] = e
+            i += i & -i
+
+    def covers(self, s, e):
+        i, best = min(s + 1, self.n), -1
+        while i > 0:
+            if self.tree[i] > best:
+                best = self.tree[i]
+            i -= i & -i
+        return best >= e
+
+
+@functools.lru_cache(maxsize=None)
+def _hit_re(mode, alias):
+    """code6/symbol/symbol_dollar 경계 패턴 — 별칭 수천 개라 re 내부 캐시(512)로는 매번 재컴파일된다."""
+    body = re.escape(alias)
+    if mode == "code6":
+        return re.compile(r"(?<![0-9])A?" + body + r"(?![0-9])")
+    if mode == "symbol":
+        return re.compile(r"(?<![0-9A-Za-z])\$?" + body + r"(?![0-9A-Za-z])")
+    return re.compile(r"(?<![0-9A-Za-z])\$" + body + r"(?![0-9A-Za-z])")
+
+
 def _iter_hits(text, alias, mode):
     """(start, end, surface) 생성. mode별 경계 규칙 적용."""
     t = text
@@ -365,20 +461,18 @@ def _iter_hits(text, alias, mode):
     else:
         hay, needle = t, alias
     if mode == "code6":
-        for m in re.finditer(r"(?<![0-9])A?" + re.escape(alias) + r"(?![0-9])", t):
+        for m in _hit_re(mode, alias).finditer(t):
             yield m.start(), m.end(), m.group(0)
         return
     if mode == "symbol":
         # 대소문자를 구분한다. 티커는 대문자로 쓰는 것이 관례이고, 소문자까지
         # 허용하면 WELL→"well", COST→"cost" 처럼 일반 영단어를 종목으로 잡는다.
-        pat = r"(?<![0-9A-Za-z])\$?" + re.escape(alias) + r"(?![0-9A-Za-z])"
-        for m in re.finditer(pat, t):
+        for m in _hit_re(mode, alias).finditer(t):
             yield m.start(), m.end(), m.group(0)
         return
     if mode == "symbol_dollar":
         # $MU / $T 처럼 티커 표기가 명시된 경우만. 대소문자는 구분한다.
-        pat = r"(?<![0-9A-Za-z])\$" + re.escape(alias) + r"(?![0-9A-Za-z])"
-        for m in re.finditer(pat, t):
+        for m in _hit_re(mode, alias).finditer(t):
             yield m.start(), m.end(), m.group(0)
         return
     start = 0
@@ -426,10 +520,12 @@ def find_candidates(text, alias_index, max_hits_per_alias=3):
     text = URL_RE.sub(lambda m: " " * len(m.group(0)), text)
     src_spans = detect_source_spans(text)
     seen, out = set(), []
-    for e in alias_index["entries"]:
+    cover = _SpanCover(len(text))
+    entries = alias_index["entries"]
+    # 본문 1회 스캔으로 등장 별칭만 추린 뒤, 엔트리 순서(긴 별칭 먼저)대로 종전 규칙을 적용한다
+    for i in _matcher(alias_index).present(text.lower()):
+        e = entries[i]
         alias = nfkc(e["alias"])
-        if not alias or alias.lower() not in text.lower():
-            continue
         if e["blocked_context"] and any(b and b in text for b in e["blocked_context"]):
             continue
         if e["required_context"] and not any(r in text for r in e["required_context"]):
@@ -440,9 +536,10 @@ def find_candidates(text, alias_index, max_hits_per_alias=3):
             if key in seen:
                 continue
             # 더 긴 별칭이 이미 같은 구간을 덮었으면 건너뛴다
-            if any(o["start"] <= s and t_ <= o["end"] for o in out):
+            if cover.covers(s, t_):
                 continue
             seen.add(key)
+            cover.add(s, t_)
             out.append({
                 "entity_id": e["entity_id"],
                 "alias": e["alias"],
@@ -5,20 +5,21 @@
 ★2026-08-05 API 경로(/ask) 제거로 api 측은 더 이상 동작하지 않는다 — 이 스크립트는 이력 보존용.
 결과: ~/datalake/ab_eval_latest.json  (테스트 페이지 /wiki/test/headless/ab 가 읽음)
 ★API 쪽은 실제 과금된다. 문항 수를 늘리기 전에 비용을 확인할 것.
+headless 쪽은 webui 잡 큐(/ask_job, priority=batch)로 보낸다 — 대화형 질문을 막지 않고,
+데이터가 그대로면 wiki_jobs 답변 캐시에서 즉시 돌아온다 (meta.cached_from).
 """
 import json
 import os
-import sys
 import time
 import urllib.request
 
-HERE = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, HERE)
-import headless_backend  # noqa: E402
-
 DATALAKE_ROOT = os.path.expanduser(os.getenv("DATALAKE_ROOT", "~/datalake"))
 OUT = os.path.join(DATALAKE_ROOT, "ab_eval_latest.json")
 API_URL = "http://127.0.0.1:8787/ask"
+JOB_URL = "http://127.0.0.1:8787/ask_job"
+JOB_POLL_URL = "http://127.0.0.1:8787/jobs/%s"
+JOB_POLL_SEC = 5
+JOB_TIMEOUT_SEC = 1800
 
 QUESTIONS = [
     ("SQL", "삼성전자(005930)의 최근 5거래일 수정종가를 날짜와 함께 표로 보여줘."),
@@ -53,14 +54,37 @@ def ask_api(q, timeout=900):
                 "error": "%s: %s" % (type(e).__name__, e)}
 
 
+def _post_json(url, payload, timeout=30):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read().decode("utf-8"))
+
+
 def ask_headless(q):
     t0 = time.time()
-    out = headless_backend.run_question(q)
-    return {"ok": bool(out.get("ok")), "answer": out.get("answer") or "",
+    try:
+        # no_cache: 답변 캐시가 아니라 백엔드 자체를 비교한다
+        job = _post_json(JOB_URL, {"question": q, "history": [], "priority": "batch",
+                                   "no_cache": True})
+        # 202 본문엔 answer·steps·meta 가 없다 — 캐시 적중으로 이미 succeeded 여도 잡을 한 번은 읽는다
+        while True:
+            with urllib.request.urlopen(JOB_POLL_URL % job["job_id"], timeout=30) as r:
+                out = json.loads(r.read().decode("utf-8"))
+            if out.get("status") not in ("queued", "running"):
+                break
+            if time.time() - t0 > JOB_TIMEOUT_SEC:
+                raise TimeoutError("잡 %s 이 %d초 안에 끝나지 않음" % (job["job_id"], JOB_TIMEOUT_SEC))
+            time.sleep(JOB_POLL_SEC)
+    except Exception as e:
+        out = {"status": "failed", "error": "%s: %s" % (type(e).__name__, e)}
+    meta = out.get("meta") or {}
+    return {"ok": out.get("status") == "succeeded", "answer": out.get("answer") or "",
             "steps": [s["tool"] for s in out.get("steps") or []],
             "elapsed": round(time.time() - t0, 1),
-            "turns": (out.get("meta") or {}).get("num_turns"),
-            "notional_cost_usd": (out.get("meta") or {}).get("notional_cost_usd"),
+            "turns": meta.get("num_turns"),
+            "notional_cost_usd": meta.get("notional_cost_usd"),
+            "cached_from": meta.get("cached_from"),
             "error": out.get("error")}
 
 
@@ -516,6 +516,9 @@ def chat_delete(cid: str):
 
 # ── 태그 검색 (2026-07-29) ────────────────────────────────────────────────
 # build_tag_index.py 가 만든 조회 전용 인덱스. LLM 을 부르지 않으므로 즉시·무료다.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import tag_lookup  # noqa: E402  — 자동완성·부분일치 (tag_terms/tag_short 색인)
+
 TAG_INDEX_PATH = os.path.join(DATALAKE_ROOT, "tag_index.sqlite")
 TAG_CORPUS_ROOTS = ("research_notes/", "transcripts/", "analyses/", "reports/", "notion_study/")
 
@@ -528,13 +531,9 @@ def _tag_conn():
     return con
 
 
-def _tag_norm(q):
-    return re.sub(r"\s+", "", (q or "").strip().lstrip("#")).lower()
-
-
 def _resolve_tags(con, q, limit=12):
     """질의 → 실제 태그 키 목록. 정확히 일치하면 그것만, 아니면 부분 일치."""
-    key = _tag_norm(q)
+    key = tag_lookup.tag_norm(q)
     if not key:
         return []
     keys = [r["tag"] for r in con.execute("SELECT tag FROM labels WHERE tag=?", (key,))]
@@ -545,9 +544,7 @@ def _resolve_tags(con, q, limit=12):
         pass
     if keys:
         return keys
-    like = "%" + key + "%"
-    return [r["tag"] for r in con.execute(
-        "SELECT tag FROM labels WHERE tag LIKE ? ORDER BY freq DESC LIMIT ?", (like, limit))]
+    return [r["tag"] for r in tag_lookup.suggest(con, key, limit)]
 
 
 def _tag_search(q, limit=20):
@@ -580,27 +577,8 @@ def tags_suggest(q: str = "", limit: int = 10):
     con = _tag_conn()
     if con is None:
         return JSONResponse([])
-    try:
-        key = _tag_norm(q)
-        like = "%" + key + "%"
-        rows = con.execute(
-            "SELECT tag, label, kind, freq FROM labels WHERE tag LIKE ?"
-            " ORDER BY (tag = ?) DESC, freq DESC LIMIT ?",
-            (like, key, max(1, min(int(limit), 30)))).fetchall()
-        out = [dict(r) for r in rows]
-        try:                               # 별칭도 자동완성에 노출 (canonical 라벨로)
-            arows = con.execute(
-                "SELECT a.label AS alabel, l.tag, l.kind, l.freq FROM aliases a"
-                " JOIN labels l ON l.tag = a.tag WHERE a.alias LIKE ?"
-                " ORDER BY l.freq DESC LIMIT 10", (like,)).fetchall()
-        except sqlite3.OperationalError:
-            arows = []
-        seen = {o["tag"] for o in out}
-        for r in arows:
-            if r["tag"] not in seen:
-                out.append({"tag": r["tag"], "label": r["alabel"],
-                            "kind": r["kind"], "freq": r["freq"]})
-        return JSONResponse(out)
+    try:                                   # 별칭도 자동완성에 노출 (canonical 라벨로)
+        return JSONResponse(tag_lookup.suggest(con, q, limit))
     finally:
         con.close()
 
@@ -664,6 +642,8 @@ class HeadlessAskRequest(BaseModel):
     history: list = []
     chat_id: str = ""
     request_id: str = ""
+    priority: str = ""          # "batch" = 대화형 잡 뒤로 (ab_eval 등)
+    no_cache: bool = False      # 답변 캐시 우회 (조회·저장 모두 안 함 — 측정용)
 
 
 @app.post("/ask_job")
@@ -686,7 +666,9 @@ def test_headless_ask(req: HeadlessAskRequest):
             if m.get("role") in ("user", "assistant") and m.get("content")]
     job = wiki_jobs.submit(q, history=hist,
                            chat_id=(req.chat_id or None),
-                           request_id=(req.request_id or None))
+                           request_id=(req.request_id or None),
+                           batch=(req.priority == "batch"),
+                           no_cache=req.no_cache)
     return JSONResponse({"job_id": job["id"], "status": job["status"],
                          "queue_depth": wiki_jobs.queue_depth()}, status_code=202)
 
@@ -709,6 +691,24 @@ def test_headless_job(job_id: str):
     })
 
 
+@app.get("/health")
+def health():
+    """상태 요약 — 잡 큐 깊이, 카탈로그 세대, run_sql 결과 캐시·연결 풀 카운터 (sql_pool)."""
+    import sql_pool
+    import wiki_jobs
+    from dl_common import catalog_generation
+    gen, building = catalog_generation()
+    try:
+        sql = sql_pool.ResultCache().stats()
+    except sqlite3.Error as e:
+        sql = {"error": str(e)}
+    opened, reused = sql.get("pool_open", 0), sql.get("pool_reuse", 0)
+    sql["pool_reuse_rate"] = round(reused / (opened + reused), 4) if opened + reused else None
+    return JSONResponse({"ok": True, "queue_depth": wiki_jobs.queue_depth(),
+                         "catalog": {"generation": gen, "building": building},
+                         "run_sql": sql})
+
+
 _HEADLESS_UI = """<!doctype html><meta charset="utf-8">
 <title>위키 headless A/B 테스트</title>
 <style>
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""위키 run_sql 연결 풀 + 결과 캐시.
+
+배경: run_sql 이 도구 호출마다 duckdb.connect(read_only) → 샌드박스 SET·rollups ATTACH →
+threading.Timer 를 새로 만들었고, 에이전트 루프는 한 대화에서 거의 같은 쿼리를 여러 번 낸다.
+
+  연결 풀  : 샌드박스가 적용된 읽기전용 연결을 POOL_SIZE 개까지 재사용 (wiki_mcp 프로세스 단위).
+             · DuckDB 는 읽기 연결이 열려 있으면 다른 프로세스가 쓰기로 못 연다 → 유휴 연결은
+               POOL_IDLE_SEC 뒤에 닫고, build_catalog 가 재작성 중(catalog_generation building)이면
+               바로 닫는다. 재작성 뒤(세대 변경) 반납된 옛 세대 연결은 버린다.
+             · 쿼리 시간 상한은 감시 스레드 1개가 deadline 이 지난 연결을 interrupt 한다
+               (호출마다 Timer 스레드를 만들지 않는다). 중단된 연결은 재사용하지 않는다.
+  결과 캐시: DATALAKE_ROOT/webui_sql_cache.sqlite — (카탈로그 세대, 정규화 SQL) → run_sql 출력.
+             MCP 서버는 질문(잡)마다 새로 뜨므로 프로세스 간 공유되는 SQLite 에 둔다.
+             최근 사용순 CACHE_MAX 건(LRU), CACHE_TTL_SEC 초 경과분은 미스 (build_catalog 를 거치지 않는
+             적재기도 있으므로). hit/miss·연결 재사용 카운터는 같은 파일 stats → server.py /health.
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dl_common import CATALOG_GEN_PATH, DATALAKE_ROOT, catalog_generation  # noqa: E402
+
+POOL_SIZE = int(os.getenv("WIKI_SQL_POOL_SIZE", "2"))
+POOL_IDLE_SEC = float(os.getenv("WIKI_SQL_POOL_IDLE", "20"))
+CACHE_PATH = os.getenv("WIKI_SQL_CACHE") or os.path.join(DATALAKE_ROOT, "webui_sql_cache.sqlite")
+CACHE_MAX = int(os.getenv("WIKI_SQL_CACHE_MAX", "256"))
+CACHE_TTL_SEC = float(os.getenv("WIKI_SQL_CACHE_TTL", "900"))
+_TICK_SEC = 0.5
+
+
+# ── SQL 정규화 ─────────────────────────────────────────────────────
+def normalize_sql(sql):
+    """캐시 키용 — 주석 제거, 문자열·따옴표 식별자 밖의 공백을 한 칸으로·소문자로, 끝 ';' 제거."""
+    out, i, n = [], 0, len(sql)
+
+    def space():
+        if out and out[-1] != " ":
+            out.append(" ")
+
+    while i < n:
+        c = sql[i]
+        if c in "'\"":
+            j = i + 1
+            while j < n:
+                if sql[j] == c:
+                    if j + 1 < n and sql[j + 1] == c:     # '' / "" 이스케이프
+                        j += 2
+                        continue
+                    break
+                j += 1
+            out.append(sql[i:j + 1])
+            i = j + 1
+        elif sql.startswith("--", i):
+            j = sql.find("\n", i)
+            i = n if j < 0 else j
+            space()
+        elif sql.startswith("/*", i):
+            j = sql.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+            space()
+        elif c.isspace():
+            while i < n and sql[i].isspace():
+                i += 1
+            space()
+        else:
+            out.append(c.lower())
+            i += 1
+    return "".join(out).strip().rstrip(";").strip()
+
+
+# ── 결과 캐시 ──────────────────────────────────────────────────────
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+  gen INTEGER NOT NULL,
+  key TEXT NOT NULL,
+  sql TEXT NOT NULL,
+  out TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  used_at REAL NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (gen, key)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used_at);
+CREATE TABLE IF NOT EXISTS stats (k TEXT PRIMARY KEY, v INTEGER NOT NULL);
+"""
+
+
+class ResultCache:
+    """run_sql 출력 LRU (SQLite, 프로세스 간 공유). 캐시 오류는 삼키고 미스로 취급한다."""
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX, ttl_sec=CACHE_TTL_SEC):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+
+    def _conn(self):
+        con = sqlite3.connect(self.path, timeout=5)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.executescript(_SCHEMA)
+        return con
+
+    @staticmethod
+    def key(normalized):
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _bump(con, counters):
+        con.executemany("INSERT INTO stats(k, v) VALUES(?, ?) ON CONFLICT(k) DO UPDATE SET v = v + excluded.v",
+                        [(k, int(v)) for k, v in counters.items() if v])
+
+    def get(self, gen, normalized):
+        """hit 면 출력 문자열, 아니면 None (hit/miss 카운트)."""
+        try:
+            con = self._conn()
+            try:
+                now = time.time()
+                row = con.execute("SELECT out, created_at FROM results WHERE gen=? AND key=?",
+                                  (gen, self.key(normalized))).fetchone()
+                hit = row is not None and now - row[1] <= self.ttl_sec
+                with con:
+                    if hit:
+                        con.execute("UPDATE results SET used_at=?, hits=hits+1 WHERE gen=? AND key=?",
+                                    (now, gen, self.key(normalized)))
+                    self._bump(con, {"hit" if hit else "miss": 1})
+                return row[0] if hit else None
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            print("sql_pool: 캐시 조회 실패 — %s" % e, file=sys.stderr)
+            return None
+
+    def put(self, gen, normalized, out, **counters):
+        """저장 + 다른 세대 정리 + LRU 상한. counters 는 stats 에 더한다 (연결 재사용 등)."""
+        try:
+            con = self._conn()
+            try:
+                now = time.time()
+                with con:
+                    con.execute("INSERT OR REPLACE INTO results(gen, key, sql, out, created_at, used_at)"
+                                " VALUES(?, ?, ?, ?, ?, ?)",
+                                (gen, self.key(normalized), normalized, out, now, now))
+                    con.execute("DELETE FROM results WHERE gen <> ?", (gen,))
+                    con.execute("DELETE FROM results WHERE rowid IN (SELECT rowid FROM results"
+                                " ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+                    self._bump(con, counters)
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            print("sql_pool: 캐시 저장 실패 — %s" % e, file=sys.stderr)
+
+    def count(self, **counters):
+        try:
+            con = self._conn()
+            try:
+                with con:
+                    self._bump(con, counters)
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            print("sql_pool: 카운터 기록 실패 — %s" % e, file=sys.stderr)
+
+    def stats(self):
+        """/health 용 {entries, hit, miss, hit_rate, pool_open, pool_reuse, ...}."""
+        if not os.path.exists(self.path):
+            return {"entries": 0, "hit": 0, "miss": 0, "hit_rate": None}
+        con = self._conn()
+        try:
+            out = dict(con.execute("SELECT k, v FROM stats").fetchall())
+            out["entries"] = con.execute("SELECT count(*) FROM results").fetchone()[0]
+        finally:
+            con.close()
+        looked = out.get("hit", 0) + out.get("miss", 0)
+        out.setdefault("hit", 0)
+        out.setdefault("miss", 0)
+        out["hit_rate"] = round(out["hit"] / looked, 4) if looked else None
+        return out
+
+
+# ── 연결 풀 ────────────────────────────────────────────────────────
+class Lease:
+    """풀에서 빌린 연결 1개. timed_out 은 감시 스레드가 interrupt 했는지."""
+
+    __slots__ = ("con", "gen", "reused", "deadline", "timed_out")
+
+    def __init__(self, con, gen, reused, deadline):
+        self.con = con
+        self.gen = gen
+        self.reused = reused
+        self.deadline = deadline
+        self.timed_out = False
+
+
+class ConnectionPool:
+    def __init__(self, connect, size=POOL_SIZE, idle_sec=POOL_IDLE_SEC):
+        self._connect = connect
+        self.size = size
+        self.idle_sec = idle_sec
+        self._mu = threading.Lock()
+        self._idle = []            # [(con, gen, released_at)]
+        self._active = set()       # {Lease}
+        self._watcher = None
+        self._gen_cache = (None, (0, False))
+
+    def generation(self):
+        """catalog_generation() — 파일 mtime 이 그대로면 직전 값."""
+        try:
+            mtime = os.stat(CATALOG_GEN_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is None or mtime != self._gen_cache[0]:
+            self._gen_cache = (mtime, catalog_generation())
+        return self._gen_cache[1]
+
+    def acquire(self, timeout_sec):
+        """연결 대여 (없으면 새로 연다 — 연결 실패는 그대로 raise)."""
+        gen, building = self.generation()
+        con = None
+        with self._mu:
+            while self._idle:
+                c, g, _t = self._idle.pop()
+                if g == gen and not building:
+                    con = c
+                    break
+                _close(c)
+        reused = con is not None
+        if con is None:
+            con = self._connect()
+        lease = Lease(con, gen, reused, time.monotonic() + timeout_sec)
+        with self._mu:
+            self._active.add(lease)
+            self._ensure_watcher()
+        return lease
+
+    def release(self, lease):
+        """반납 — 중단·옛 세대·재작성 중·정원 초과면 닫는다."""
+        gen, building = self.generation()
+        with self._mu:
+            self._active.discard(lease)
+            keep = (not lease.timed_out and lease.gen == gen and not building
+                    and len(self._idle) < self.size)
+            if keep:
+                self._idle.append((lease.con, lease.gen, time.monotonic()))
+        if not keep:
+            _close(lease.con)
+
+    def close_all(self):
+        with self._mu:
+            idle, self._idle = self._idle, []
+        for c, _g, _t in idle:
+            _close(c)
+
+    def _ensure_watcher(self):
+        if self._watcher is None or not self._watcher.is_alive():
+            self._watcher = threading.Thread(target=self._watch, daemon=True, name="sql-pool-watch")
+            self._watcher.start()
+
+    def _watch(self):
+        """deadline 지난 대여 연결 interrupt + 유휴 연결 정리 (idle 초과·재작성 중·세대 변경)."""
+        while True:
+            time.sleep(_TICK_SEC)
+            now = time.monotonic()
+            gen, building = self.generation()
+            drop = []
+            with self._mu:
+                for lease in self._active:
+                    if not lease.timed_out and now > lease.deadline:
+                        lease.timed_out = True
+                        try:
+                            lease.con.interrupt()
+                        except Exception:
+                            pass
+                keep = []
+                for c, g, t in self._idle:
+                    (drop if building or g != gen or now - t > self.idle_sec else keep).append((c, g, t))
+                self._idle = keep
+            for c, _g, _t in drop:
+                _close(c)
+
+
+def _close(con):
+    try:
+        con.close()
+    except Exception:
+        pass
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""태그 자동완성·부분일치 조회 — build_tag_index.py 가 만든 tag_terms / tag_short 를 쓴다.
+
+server.py(/tags/suggest·/tags/search)와 wiki_tools(tag_search)가 같이 쓴다. 종전에는 둘 다
+labels·aliases 에 LIKE '%키%' ORDER BY freq 를 돌려 키 입력마다 표 전체를 훑었다.
+
+  3글자 이상 : tag_terms (FTS5 trigram) MATCH — 행을 빈도 내림차순으로 넣어 rowid = 빈도 순위라
+               ORDER BY rowid LIMIT k 가 앞에서 k 건만 읽고 멈춘다.
+  1~2글자    : tag_short(gram, rank) — 빌드 때 뽑아 둔 글자(쌍)별 상위 SHORT_K 건.
+  구 인덱스  : 두 표가 없으면 종전 LIKE 조회로 폴백.
+"""
+import re
+import sqlite3
+
+SHORT_K = 30          # tag_short 에 글자(쌍)당 보관하는 건수 = suggest limit 상한
+
+
+def tag_norm(q):
+    return re.sub(r"\s+", "", (q or "").strip().lstrip("#")).lower()
+
+
+def _fts_phrase(s):
+    return '"%s"' % s.replace('"', '""')
+
+
+def _like_rows(con, key, limit):
+    """구 인덱스(tag_terms 없음) — 종전 LIKE 조회."""
+    like = "%" + key + "%"
+    rows = [dict(r) for r in con.execute(
+        "SELECT tag, label, kind, freq FROM labels WHERE tag LIKE ?"
+        " ORDER BY (tag = ?) DESC, freq DESC LIMIT ?", (like, key, limit))]
+    try:
+        rows += [{"tag": r["tag"], "label": r["alabel"], "kind": r["kind"], "freq": r["freq"]}
+                 for r in con.execute(
+                     "SELECT a.label AS alabel, l.tag, l.kind, l.freq FROM aliases a"
+                     " JOIN labels l ON l.tag = a.tag WHERE a.alias LIKE ?"
+                     " ORDER BY l.freq DESC LIMIT 10", (like,))]
+    except sqlite3.OperationalError:
+        pass
+    return rows
+
+
+def suggest(con, q, limit=10):
+    """질의 → [{tag, label, kind, freq}] (정확일치 먼저, 이후 빈도순, 태그 중복 제거)."""
+    key = tag_norm(q)
+    limit = max(1, min(int(limit), SHORT_K))
+    if not key:
+        return [dict(r) for r in con.execute(
+            "SELECT tag, label, kind, freq FROM labels ORDER BY freq DESC LIMIT ?", (limit,))]
+    out = [dict(r) for r in con.execute(
+        "SELECT tag, label, kind, freq FROM labels WHERE tag=?", (key,))]
+    try:
+        if len(key) >= 3:
+            rows = con.execute(
+                "SELECT tag, label, kind, freq FROM tag_terms WHERE tag_terms MATCH ?"
+                " ORDER BY rowid LIMIT ?", (_fts_phrase(key), limit * 3)).fetchall()
+        else:
+            rows = con.execute(
+                "SELECT tag, label, kind, freq FROM tag_short WHERE gram=?"
+                " ORDER BY rank LIMIT ?", (key, limit + 1)).fetchall()
+        rows = [dict(r) for r in rows]
+    except sqlite3.OperationalError:       # 구 인덱스 — tag_terms/tag_short 없음
+        rows = _like_rows(con, key, limit)
+    seen = {o["tag"] for o in out}
+    for r in rows:
+        if r["tag"] not in seen:
+            seen.add(r["tag"])
+            out.append(r)
+    return out[:limit]
@@ -1,25 +1,46 @@
 # -*- coding: utf-8 -*-
-"""위키 headless 문답 비동기 잡 큐 — 단일 worker, sqlite 영속.
+"""위키 headless 문답 비동기 잡 큐 — 워커 풀, sqlite 영속.
 
 저장은 기존 webui_chats.sqlite 에 테이블을 추가한다 (chats 스키마 불변).
 설계 근거: 잡이 chat_id 를 참조하므로 같은 파일이 정합성에 유리하고 WAL도 하나만 관리.
 
-동시 실행 1개 — 구독 쿼터를 자가치료 진단·아침 다이제스트와 나눠 쓰기 때문.
+동시 실행 WIKI_JOB_WORKERS 개(기본 2) — 종전 1개라 몇 분짜리 질문 하나가 뒤의 대화형 질문을
+전부 세웠다. 구독 쿼터를 자가치료 진단·아침 다이제스트와 나눠 쓰므로 크게 잡지 않는다.
+  우선순위 : priority 0 = 대화형(/ask_job), 1 = 배치(ab_eval 등). 대화형이 먼저 claim 되고,
+             배치는 프로세스 합산 동시 WIKI_JOB_BATCH_SLOTS 개(기본 1)까지만 돈다.
+  답변 캐시: (정규화 질문, history 해시, 카탈로그 세대) → 성공 답변 (wiki_answers 표).
+             같은 데이터에서 다시 물으면 제출 즉시 succeeded 로 끝난다. 카탈로그 재작성 중이면
+             쓰지 않고, 세대가 같아도 WIKI_ANSWER_TTL 초가 지나면 미스 (노트·태그 인덱스는
+             카탈로그 세대와 무관하게 매일 갱신되므로 — sql_pool 결과 캐시와 같은 이유).
+             no_cache=True 잡(ab_eval 등 측정용)은 조회도 저장도 하지 않는다 (cache_key NULL).
 재시작 시 running 잡은 재실행하지 않고 failed(server_restart) 로 확정한다 (쿼터 이중소모 방지).
 """
+import hashlib
 import json
 import os
+import re
 import sqlite3
+import sys
 import threading
 import time
+import unicodedata
 import uuid
 
 HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from dl_common import catalog_generation  # noqa: E402
+
 DATALAKE_ROOT = os.path.expanduser(os.getenv("DATALAKE_ROOT", "~/datalake"))
 DB_PATH = os.path.join(DATALAKE_ROOT, "webui_chats.sqlite")
 
+WORKERS = max(1, int(os.getenv("WIKI_JOB_WORKERS", "2")))
+BATCH_SLOTS = max(1, int(os.getenv("WIKI_JOB_BATCH_SLOTS", "1")))
+ANSWER_TTL_SEC = float(os.getenv("WIKI_ANSWER_TTL", "21600"))
+ANSWER_MAX = int(os.getenv("WIKI_ANSWER_MAX", "500"))
+PRIO_INTERACTIVE, PRIO_BATCH = 0, 1
+
 WORKER_ID = uuid.uuid4().hex[:12]     # 이 프로세스의 워커 식별자
-_worker_thread = None
+_worker_threads = []
 _lock = threading.Lock()
 _wake = threading.Event()
 _db_ready = False
@@ -47,6 +68,16 @@ def init_db():
         cols = [r[1] for r in con.execute("PRAGMA table_info(wiki_jobs)")]
         if "worker" not in cols:
             con.execute("ALTER TABLE wiki_jobs ADD COLUMN worker TEXT")
+        if "priority" not in cols:
+            con.execute("ALTER TABLE wiki_jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        if "cache_key" not in cols:
+            con.execute("ALTER TABLE wiki_jobs ADD COLUMN cache_key TEXT")
+        con.execute("CREATE INDEX IF NOT EXISTS ix_wiki_jobs_claim"
+                    " ON wiki_jobs(status, priority, created_at)")
+        con.execute("CREATE TABLE IF NOT EXISTS wiki_answers ("
+                    "key TEXT PRIMARY KEY, gen INTEGER NOT NULL, job_id TEXT,"
+                    "answer TEXT NOT NULL, steps TEXT, meta TEXT,"
+                    "created_at REAL NOT NULL, used_at REAL NOT NULL, hits INTEGER DEFAULT 0)")
         # ★살아있는 다른 워커의 잡까지 죽이지 않도록 '충분히 오래된 running' 만 정리한다
         #   (codex 지적: 종전엔 무조건 전체 running 을 failed 로 덮었다)
         cutoff = time.time() - (int(os.getenv("WIKI_TIMEOUT_SEC", "900")) + 300)
@@ -74,9 +105,54 @@ def _row_to_dict(row):
     return d
 
 
-def submit(question, history=None, chat_id=None, request_id=None):
-    """잡 등록. 같은 request_id 가 이미 있으면 그 잡을 그대로 돌려준다(멱등)."""
+def normalize_question(q):
+    """캐시 키용 — NFKC·소문자·공백 1칸, 끝의 물음표·마침표 무시."""
+    q = unicodedata.normalize("NFKC", q or "").lower()
+    return re.sub(r"\s+", " ", q).strip().rstrip("?？.!。 ").strip()
+
+
+def answer_key(question, history=None):
+    hist = json.dumps(history or [], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(("%s\x1f%s" % (normalize_question(question), hist))
+                          .encode("utf-8")).hexdigest()
+
+
+def _cached_answer(con, key):
+    """현 카탈로그 세대의 유효한 캐시 답변 행 (재작성 중이거나 없으면 None)."""
+    gen, building = catalog_generation()
+    if building:
+        return None
+    row = con.execute("SELECT * FROM wiki_answers WHERE key=? AND gen=?", (key, gen)).fetchone()
+    if row is None or time.time() - row["created_at"] > ANSWER_TTL_SEC:
+        return None
+    return row
+
+
+def _store_answer(con, key, gen, job_id, out):
+    """성공 답변 저장 — 실행 중 카탈로그가 바뀌었으면(세대 불일치·재작성 중) 저장하지 않는다."""
+    cur_gen, building = catalog_generation()
+    if building or cur_gen != gen:
+        return
+    now = time.time()
+    con.execute(
+        "INSERT OR REPLACE INTO wiki_answers(key, gen, job_id, answer, steps, meta,"
+        " created_at, used_at) VALUES(?,?,?,?,?,?,?,?)",
+        (key, gen, job_id, out.get("answer") or "",
+         json.dumps(out.get("steps") or [], ensure_ascii=False),
+         json.dumps(out.get("meta") or {}, ensure_ascii=False), now, now))
+    con.execute("DELETE FROM wiki_answers WHERE gen <> ?", (gen,))
+    con.execute("DELETE FROM wiki_answers WHERE rowid IN (SELECT rowid FROM wiki_answers"
+                " ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (ANSWER_MAX,))
+
+
+def submit(question, history=None, chat_id=None, request_id=None, batch=False, no_cache=False):
+    """잡 등록. 같은 request_id 가 이미 있으면 그 잡을 그대로 돌려준다(멱등).
+
+    캐시 답변이 있으면 워커를 거치지 않고 succeeded 잡으로 바로 기록한다 (meta.cached_from).
+    batch=True 면 대화형 잡 뒤로 밀린다 (PRIO_BATCH). no_cache=True 면 캐시를 보지도 채우지도 않는다.
+    """
     init_once()
+    key = None if no_cache else answer_key(question, history)
     con = _con()
     try:
         if request_id:
@@ -85,15 +161,32 @@ def submit(question, history=None, chat_id=None, request_id=None):
             if row:
                 return _row_to_dict(row)
         jid = uuid.uuid4().hex[:16]
-        con.execute(
-            "INSERT INTO wiki_jobs(id, request_id, chat_id, question, history, status,"
-            " created_at) VALUES(?,?,?,?,?,'queued',?)",
-            (jid, request_id, chat_id, question,
-             json.dumps(history or [], ensure_ascii=False), time.time()))
+        now = time.time()
+        hit = _cached_answer(con, key) if key else None
+        if hit:
+            meta = json.loads(hit["meta"] or "{}")
+            meta.update(cached_from=hit["job_id"], cached_at=hit["created_at"])
+            con.execute(
+                "INSERT INTO wiki_jobs(id, request_id, chat_id, question, history, status,"
+                " answer, steps, meta, notified, created_at, started_at, finished_at,"
+                " priority, cache_key) VALUES(?,?,?,?,?,'succeeded',?,?,?,1,?,?,?,?,?)",
+                (jid, request_id, chat_id, question,
+                 json.dumps(history or [], ensure_ascii=False), hit["answer"], hit["steps"],
+                 json.dumps(meta, ensure_ascii=False), now, now, now,
+                 PRIO_BATCH if batch else PRIO_INTERACTIVE, key))
+            con.execute("UPDATE wiki_answers SET used_at=?, hits=hits+1 WHERE key=?", (now, key))
+        else:
+            con.execute(
+                "INSERT INTO wiki_jobs(id, request_id, chat_id, question, history, status,"
+                " created_at, priority, cache_key) VALUES(?,?,?,?,?,'queued',?,?,?)",
+                (jid, request_id, chat_id, question,
+                 json.dumps(history or [], ensure_ascii=False), now,
+                 PRIO_BATCH if batch else PRIO_INTERACTIVE, key))
         con.commit()
     finally:
         con.close()
-    _wake.set()
+    if not hit:
+        _wake.set()
     return get(jid)
 
 
@@ -133,14 +226,19 @@ def _claim_job():
 
     ★종전엔 SELECT 와 UPDATE 가 분리돼 있어, 프로세스가 둘이면 같은 잡을
       중복 실행할 수 있었다 (codex 지적). 단일 UPDATE ... RETURNING 으로 바꾼다.
+    대화형(priority 0) 먼저, 같은 등급은 먼저 온 순. 배치는 running 배치가 BATCH_SLOTS 개
+    미만일 때만 — 판정이 같은 문장 안이라 워커·프로세스가 여럿이어도 원자적이다.
     """
     con = _con()
     try:
         row = con.execute(
             "UPDATE wiki_jobs SET status='running', started_at=?, worker=?"
             " WHERE id = (SELECT id FROM wiki_jobs WHERE status='queued'"
-            "             ORDER BY created_at LIMIT 1)"
-            " RETURNING *", (time.time(), WORKER_ID)).fetchone()
+            "             AND (priority = ? OR (SELECT count(*) FROM wiki_jobs"
+            "                  WHERE status='running' AND priority <> ?) < ?)"
+            "             ORDER BY priority, created_at LIMIT 1)"
+            " RETURNING *", (time.time(), WORKER_ID, PRIO_INTERACTIVE, PRIO_INTERACTIVE,
+                             BATCH_SLOTS)).fetchone()
         con.commit()
         return _row_to_dict(row) if row else None
     finally:
@@ -149,22 +247,26 @@ def _claim_job():
 
 def _run_one(job):
     import headless_backend
+    gen, _building = catalog_generation()
     try:
         out = headless_backend.run_question(job["question"],
                                             history=job.get("history") or [])
     except Exception as e:
         out = {"ok": False, "status": "failed", "answer": "", "steps": [], "meta": {},
                "error": "%s: %s" % (type(e).__name__, e)}
+    status = out.get("status") or ("succeeded" if out.get("ok") else "failed")
     con = _con()
     try:
         con.execute(
             "UPDATE wiki_jobs SET status=?, answer=?, steps=?, meta=?, error=?,"
             " finished_at=? WHERE id=?",
-            (out.get("status") or ("succeeded" if out.get("ok") else "failed"),
+            (status,
              out.get("answer") or "",
              json.dumps(out.get("steps") or [], ensure_ascii=False),
              json.dumps(out.get("meta") or {}, ensure_ascii=False),
              out.get("error"), time.time(), job["id"]))
+        if status == "succeeded" and out.get("answer") and job.get("cache_key"):
+            _store_answer(con, job["cache_key"], gen, job["id"], out)
         con.commit()
     finally:
         con.close()
@@ -285,22 +387,29 @@ def _worker_tick():
 
 
 def init_once():
-    """DB 초기화 1회 + 워커 생존 보장.
+    """DB 초기화 1회 + 워커 WORKERS 개 생존 보장.
 
     ★종전엔 플래그 하나로 '한 번 띄웠다'만 기록해서, 스레드가 죽어도 아무도 몰랐다.
       이제 매 호출마다 살아있는지 확인하고 죽었으면 되살린다 (codex 지적).
     """
-    global _worker_thread, _db_ready
+    global _db_ready
     with _lock:
         if not _db_ready:
             init_db()
             _db_ready = True
-        if _worker_thread is None or not _worker_thread.is_alive():
-            if _worker_thread is not None:
-                print("[wiki_jobs] ★워커 스레드가 죽어 있어 재기동합니다", flush=True)
-            _worker_thread = threading.Thread(target=_worker, daemon=True, name="wiki-jobs")
-            _worker_thread.start()
+        for i in range(WORKERS):
+            t = _worker_threads[i] if i < len(_worker_threads) else None
+            if t is not None and t.is_alive():
+                continue
+            if t is not None:
+                print("[wiki_jobs] ★워커 스레드 %d 가 죽어 있어 재기동합니다" % i, flush=True)
+            t = threading.Thread(target=_worker, daemon=True, name="wiki-jobs-%d" % i)
+            t.start()
+            if i < len(_worker_threads):
+                _worker_threads[i] = t
+            else:
+                _worker_threads.append(t)
 
 
 def worker_alive():
-    return _worker_thread is not None and _worker_thread.is_alive()
+    return any(t.is_alive() for t in _worker_threads)
@@ -24,6 +24,7 @@ def run_sql(sql: str) -> str:
     """market.duckdb 에 읽기전용 SELECT 를 실행한다. 결과는 최대 200행(CSV).
 
     뷰 목록·스키마는 ~/datalake/catalog/INDEX.md 를 Read 로 먼저 확인할 것.
+    주봉·월봉·수익률·공매도 비중·주간 수급 등은 선계산된 rollups.<테이블> 을 우선 쓴다.
     SELECT 외 구문은 거부된다.
     """
     return wiki_tools.run_sql(sql)
@@ -31,7 +32,7 @@ def run_sql(sql: str) -> str:
 
 @mcp.tool()
 def search_notes(pattern: str, max_results: int = 40) -> str:
-    """md 코퍼스를 정규식으로 검색한다. `파일경로:줄번호: 매칭줄` 을 반환.
+    """md 코퍼스를 정규식으로 검색한다. `파일경로:줄번호: 매칭줄` 을 관련도 높은 파일 순으로 반환.
 
     대상: 리서치노트 원문·어닝콜 번역 전문·실적 분석시트·Notion 스터디·보고서
           아카이브·데이터셋 카탈로그·시스템 위키.
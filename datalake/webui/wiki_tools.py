@@ -2,8 +2,8 @@
 """위키 문답 도구 구현 — API 루프와 headless(MCP) 백엔드가 공유하는 정본.
 
 노출 3종 (2026-08-05 headless 전환 설계):
-  run_sql      : market.duckdb 읽기전용 SELECT (최대 200행)
-  search_notes : md 코퍼스 정규식 검색 (SEARCH_ROOTS 한정, 기본 40건)
+  run_sql      : market.duckdb 읽기전용 SELECT (최대 200행, sql_pool 연결 풀·결과 캐시)
+  search_notes : md 코퍼스 정규식 검색 (SEARCH_ROOTS 한정, 기본 40건, notes_index FTS 사전필터)
   tag_search   : tag_index.sqlite 태그 검색
 
 ★read_file / list_datasets 는 의도적으로 제외한다 — headless 쪽은 Claude Code
@@ -20,22 +20,14 @@ import sqlite3
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from dl_common import CATALOG_DIR, DATALAKE_ROOT, DUCKDB_PATH, MARKET_DIR, REPO  # noqa: E402
+from dl_common import DATALAKE_ROOT, DUCKDB_PATH, MARKET_DIR, ROLLUP_DB_PATH  # noqa: E402
+import notes_index  # noqa: E402
+import sql_pool  # noqa: E402
+import tag_lookup  # noqa: E402
+from notes_index import SEARCH_ROOTS, WIKI_DIR  # noqa: E402,F401  (정본 = notes_index)
 
-WIKI_DIR = os.path.join(REPO, "architecture", "wiki")
 TAG_INDEX_PATH = os.path.join(DATALAKE_ROOT, "tag_index.sqlite")
 
-SEARCH_ROOTS = [
-    os.path.join(DATALAKE_ROOT, "research_notes"),
-    os.path.join(DATALAKE_ROOT, "transcripts"),
-    os.path.join(DATALAKE_ROOT, "news"),
-    os.path.join(DATALAKE_ROOT, "analyses"),
-    os.path.join(DATALAKE_ROOT, "notion_study"),
-    os.path.join(DATALAKE_ROOT, "reports"),
-    CATALOG_DIR,
-    WIKI_DIR,
-]
-
 # ── run_sql ────────────────────────────────────────────────────────
 MAX_ROWS = 200
 MAX_OUT_CHARS = 200000
@@ -63,11 +55,17 @@ def _sandboxed_connect():
     """읽기전용 + 외부접근 차단 + 자원 상한.
 
     ★순서 주의: allowed_directories 를 먼저 좁힌 뒤 external_access 를 끈다
-      (끄고 나면 세션 내 재활성화 불가).
+      (끄고 나면 세션 내 재활성화 불가). 요약 테이블(rollups.duckdb)도 그 전에 ATTACH —
+      갱신 중(쓰기 락)이면 붙이지 않고 원천 뷰만으로 연다.
     """
     import duckdb
     con = duckdb.connect(DUCKDB_PATH, read_only=True)
     con.execute("SET allowed_directories=['%s']" % MARKET_DIR)
+    if os.path.exists(ROLLUP_DB_PATH):
+        try:
+            con.execute("ATTACH '%s' AS rollups (READ_ONLY)" % ROLLUP_DB_PATH)
+        except duckdb.Error as e:
+            print("wiki_tools: rollups.duckdb ATTACH 생략: %s" % e, file=sys.stderr)
     con.execute("SET autoinstall_known_extensions=false")
     con.execute("SET autoload_known_extensions=false")
     con.execute("SET memory_limit='2GB'")
@@ -93,43 +91,53 @@ def _validate_sql(sql):
     return None
 
 
+_POOL = None
+_CACHE = None
+
+
+def _pool():
+    global _POOL, _CACHE
+    if _POOL is None:
+        _POOL = sql_pool.ConnectionPool(_sandboxed_connect)
+        _CACHE = sql_pool.ResultCache()
+    return _POOL, _CACHE
+
+
 def run_sql(sql):
+    """검증 → 결과 캐시(세대·정규화 SQL) → 풀 연결로 실행. 성공 결과만 캐시한다."""
     bad = _validate_sql(sql)
     if bad:
         return bad
+    pool, cache = _pool()
+    norm = sql_pool.normalize_sql(sql)
+    gen, _building = pool.generation()
+    cached = cache.get(gen, norm)
+    if cached is not None:
+        return cached
     try:
-        con = _sandboxed_connect()
+        lease = pool.acquire(SQL_TIMEOUT_SEC)
     except Exception as e:
         return "ERROR: DB 연결 실패(카탈로그 갱신 중일 수 있음, 잠시 후 재시도): %s" % e
-
-    import threading
-    timed_out = {"v": False}
-
-    def _kill():
-        timed_out["v"] = True
-        try:
-            con.interrupt()
-        except Exception:
-            pass
-
-    timer = threading.Timer(SQL_TIMEOUT_SEC, _kill)
-    timer.start()
     try:
-        cur = con.execute(sql.strip().rstrip(";"))
+        cur = lease.con.execute(sql.strip().rstrip(";"))
         cols = [d[0] for d in (cur.description or [])]
         # ★전량 materialize(fetchdf) 대신 필요한 만큼만 — 거대 결과가 메모리를 밀어내지 않게
         rows = cur.fetchmany(MAX_ROWS + 1)
     except Exception as e:
-        if timed_out["v"]:
+        if lease.timed_out:
             return "ERROR: 쿼리가 %d초를 넘겨 중단됐습니다. 조건을 좁혀 주세요." % SQL_TIMEOUT_SEC
+        if 'schema "rollups" does not exist' in str(e):
+            return ("ERROR: 요약 테이블(rollups)을 지금 쓸 수 없습니다(갱신 중). "
+                    "같은 집계를 원천 뷰로 조회하세요.")
         return "ERROR: %s: %s" % (type(e).__name__, e)
     finally:
-        timer.cancel()
-        try:
-            con.close()
-        except Exception:
-            pass
+        pool.release(lease)
+    out = _format_rows(cols, rows)
+    cache.put(lease.gen, norm, out, **{"pool_reuse" if lease.reused else "pool_open": 1})
+    return out
+
 
+def _format_rows(cols, rows):
     if not rows:
         return "(0행)"
     more = len(rows) > MAX_ROWS
@@ -151,30 +159,34 @@ def run_sql(sql):
 
 # ── search_notes ───────────────────────────────────────────────────
 def search_notes(pattern, max_results=40):
+    """FTS 인덱스(notes_index)로 후보 파일을 골라 순위순 정규식 검색. 인덱스를 못 쓰면 전체 스캔."""
     try:
         rx = re.compile(pattern)
     except re.error as e:
         return "ERROR: 잘못된 정규식 — %s" % e
     max_results = max(1, min(int(max_results or 40), 200))
+    try:
+        hits = notes_index.search(rx, max_results)
+    except sqlite3.Error as e:
+        print("search_notes: 인덱스 사용 불가, 전체 스캔 — %s" % e, file=sys.stderr)
+        hits = _scan_notes(rx, max_results)
+    return "\n".join(hits) if hits else "(매칭 없음)"
+
+
+def _scan_notes(rx, max_results):
+    """인덱스 없이 SEARCH_ROOTS 의 md 를 직접 열어 줄 단위 검색 (폴백)."""
     hits = []
-    for root in SEARCH_ROOTS:
-        if not os.path.isdir(root):
+    for fp in notes_index.walk_md():
+        try:
+            with open(fp, encoding="utf-8", errors="replace") as fh:
+                for i, line in enumerate(fh, 1):
+                    if rx.search(line):
+                        hits.append("%s:%d: %s" % (fp, i, line.strip()[:200]))
+                        if len(hits) >= max_results:
+                            return hits
+        except OSError:
             continue
-        for dirpath, _dirs, files in os.walk(root):
-            for fn in sorted(files):
-                if not fn.endswith(".md"):
-                    continue
-                fp = os.path.join(dirpath, fn)
-                try:
-                    with open(fp, encoding="utf-8", errors="replace") as fh:
-                        for i, line in enumerate(fh, 1):
-                            if rx.search(line):
-                                hits.append("%s:%d: %s" % (fp, i, line.strip()[:200]))
-                                if len(hits) >= max_results:
-                                    return "\n".join(hits)
-                except OSError:
-                    continue
-    return "\n".join(hits) if hits else "(매칭 없음)"
+    return hits
 
 
 # ── tag_search ─────────────────────────────────────────────────────
@@ -186,21 +198,15 @@ def _tag_conn():
     return con
 
 
-def _tag_norm(q):
-    return re.sub(r"\s+", "", (q or "").strip().lstrip("#")).lower()
-
-
 def _resolve_tags(con, q, limit=12):
     """질의 → 실제 태그 키 목록. 정확히 일치하면 그것만, 아니면 부분 일치."""
-    key = _tag_norm(q)
+    key = tag_lookup.tag_norm(q)
     if not key:
         return []
     row = con.execute("SELECT tag FROM labels WHERE tag=?", (key,)).fetchone()
     if row:
         return [row["tag"]]
-    like = "%" + key + "%"
-    return [r["tag"] for r in con.execute(
-        "SELECT tag FROM labels WHERE tag LIKE ? ORDER BY freq DESC LIMIT ?", (like, limit))]
+    return [r["tag"] for r in tag_lookup.suggest(con, key, limit)]
 
 
 def tag_search(q, limit=20):
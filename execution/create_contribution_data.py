@@ -5,7 +5,7 @@ WRAP 종목별/업종별 일별 기여도(attribution) 데이터 생성 → cont
   - 일별 종목 기여도(fraction) = 비중(직전 NEW 스냅샷, 날짜 '<' 엄격) × 일별등락 / 100
   - 종목 합 = 일별 포트폴리오 수익률 port_return(d)  → NAV 와 정합
   - 비중: NEW 시트 = '리밸런스일 완전 스냅샷'(미기재=0), ffill 금지
-  - 일별등락: FinanceDataReader 종가 pct_change (종목 종가는 KIS==FDR, NAV와 동일)
+  - 일별등락: KIS 확정 종가(price_store 캐시) pct_change, 실패 종목만 FDR (NAV와 동일 소스)
 
 출력 contribution_data.json (단위 bp):
   {
@@ -63,6 +63,7 @@ SECTOR_OVERRIDES = {
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import wrap_config
+import wrap_nav_store
 portfolio_config = wrap_config.contribution_portfolio_config()
 
 
@@ -128,7 +129,7 @@ def tag_owner(tags, code, buy, sell, pf_scopes, pf_name=''):
 
 def main():
     print("1. Wrap_NAV.xlsx 로드")
-    xl = pd.read_excel(NAV_FILE, sheet_name=None)
+    xl = wrap_nav_store.read_sheets(['NEW', 'Code', '기준가'], xlsx=NAV_FILE)
 
     # --- NEW(비중) 전처리: calculate_wrap_nav.py 와 동일 ---
     df_w = xl['NEW'].copy()
@@ -173,13 +174,26 @@ def main():
     today_kst = now_kst.normalize().tz_localize(None)
     end_date = today_kst if now_kst.hour >= 17 else today_kst - pd.Timedelta(days=1)
 
-    # --- 가격(FDR) 수집 → 일별 등락(fraction) ---
+    # --- 가격 수집 → 일별 등락(fraction): KIS 확정 일봉(로컬 캐시 경유) 우선, 실패 종목만 FDR ---
     all_codes = sorted(df_w['코드'].unique())
     data_start = pd.Timestamp(min(c['start_date'] for c in portfolio_config.values())) - pd.Timedelta(days=10)
-    print(f"2. FDR 종가 수집: {len(all_codes)}종목 (since {data_start.date()})")
+    print(f"2. 종가 수집: {len(all_codes)}종목 (since {data_start.date()})")
+    kis_closes = {}
+    try:
+        import kis_token
+        kis_closes = kis_token.fetch_daily_closes(all_codes, data_start.strftime('%Y%m%d'),
+                                                  end_date.strftime('%Y%m%d'))
+        print(f"   - KIS 확정 일봉: {len(kis_closes)}/{len(all_codes)}종목")
+    except Exception as e:
+        print(f"   - KIS 일봉 수집 불가({e}) → 전 종목 FDR 폴백")
     closes = {}
     miss = []
     for code in all_codes:
+        if len(kis_closes.get(code, {})) >= 2:
+            s = pd.Series(kis_closes[code])
+            s.index = pd.to_datetime(s.index)
+            closes[code] = s.sort_index()
+            continue
         try:
             d = fdr.DataReader(code, start=data_start)
             if not d.empty and 'Close' in d.columns:
@@ -16,6 +16,10 @@ KST = timezone(timedelta(hours=9))
 from config import CATEGORY_MAP, CSV_FILE
 import wrap_config  # WRAP 증권사·상품 단일 출처 레지스트리
 import taiwan_table  # Taiwan 월매출 테이블 공유 빌더 (Data 페이지 Taiwan 버튼 패널)
+import dashboard_data  # 실행 1회 데이터 컨텍스트 (Wrap_NAV.xlsx·dataset.csv 1회 로드)
+import dashboard_render  # 섹션 렌더러 레지스트리 병렬 실행 + 타이밍 리포트
+import dashboard_cache  # 섹션 HTML 조각 캐시 (입력 내용 해시 키)
+from dashboard_render import Section
 
 # Version 3.0 - Added category grouping
 CHARTS_DIR = 'charts'
@@ -579,12 +583,9 @@ def get_item_category(item_name):
         return 'Wrap'
 
     try:
-        with open(CSV_FILE, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('제품명', '').strip() == item_name:
-                    data_type = row.get('데이터 타입', '').strip()
-                    return CATEGORY_MAP.get(data_type, 'Other')
+        data_type = dashboard_data.current().item_types().get(item_name)
+        if data_type is not None:
+            return CATEGORY_MAP.get(data_type, 'Other')
     except:
         pass
     return 'Other'
@@ -606,12 +607,11 @@ def read_portfolio_sectors(stock_sector_map):
     종목코드 → KRX 표준 업종명 매핑 사용 (stock_sector_map)
     """
     try:
-        nav_file = 'Wrap_NAV.xlsx'
-        if not os.path.exists(nav_file):
+        data = dashboard_data.current()
+        if not data.has_nav():
             return {}
 
-        nav_df = pd.read_excel(nav_file, sheet_name='NEW')
-        nav_df['날짜'] = pd.to_datetime(nav_df['날짜'])
+        nav_df = data.nav('NEW')
 
         portfolio_map = {
             '트루밸류': '삼성 트루밸류',
@@ -1206,9 +1206,7 @@ def _build_indices_chart_section(category_label='Indices'):
     좌 사이드바 시리즈 토글 + 우 Chart.js 라인. Local/USD 모드 토글로 통화 환산 보기.
     WRAP CHART 패턴(_build_wrap_chart_section)과 동일한 UX."""
     try:
-        df = pd.read_csv(CSV_FILE, encoding='utf-8-sig')
-        df['날짜'] = pd.to_datetime(df['날짜'])
-        df['가격'] = pd.to_numeric(df['가격'].astype(str).str.replace(',', ''), errors='coerce')
+        df = dashboard_data.current().dataset()
 
         # 시리즈 정의: display name, local 컬럼, USD 컬럼, 색
         series_config = [
@@ -1804,6 +1802,20 @@ def _cmb_metric_key(display):
     return CMB_ASSET_ALIASES.get(display, display), 0
 
 
+def _cmb_prev_upd_state_text():
+    """직전 market.html 에 임베드된 cmbUpdState JSON 원문 (없으면 '').
+
+    통합 차트의 '최근 업데이트' 배지 입력 — 섹션 캐시 키도 market.html 전체(매 빌드 시각이 바뀜)
+    대신 이 상태만 본다.
+    """
+    if not os.path.exists(OUTPUT_FILE):
+        return ''
+    with open(OUTPUT_FILE, encoding='utf-8') as _pf:
+        _pm = re.search(r'<script id="cmbUpdState" type="application/json">(.*?)</script>',
+                        _pf.read(), re.S)
+    return _pm.group(1) if _pm else ''
+
+
 def _build_combined_chart_section():
     """전 카테고리(INDEX/DERIVATIVES/INVESTOR/EXCHANGE RATE/INTEREST RATES/MACRO/CREDIT & HOUSING/CRYPTOCURRENCY/MEMORY/COMMODITIES/CAPEX)
     를 단일 동적 Chart.js 차트로 통합. 좌 사이드바는 카테고리 그룹 헤더 + 토글 항목,
@@ -2080,9 +2092,7 @@ def _build_combined_chart_section():
             ]},
         ]
 
-        df = pd.read_csv(CSV_FILE, encoding='utf-8-sig')
-        df['날짜'] = pd.to_datetime(df['날짜'])
-        df['가격'] = pd.to_numeric(df['가격'].astype(str).str.replace(',', ''), errors='coerce')
+        df = dashboard_data.current().dataset()
 
         # 단위 변환: KRX ETS/GOLD Trading Volume은 원 단위(수십~수백억 원) → 억원 단위로 환산.
         # Y축 라벨은 별도로 안 적음 (사용자 명시).
@@ -2204,12 +2214,9 @@ def _build_combined_chart_section():
         #    첫 빌드(상태 없음)는 전량 무배지로 시작해 다음 변동부터 표시된다.
         prev_upd_state = {}
         try:
-            if os.path.exists(OUTPUT_FILE):
-                with open(OUTPUT_FILE, encoding='utf-8') as _pf:
-                    _pm = re.search(r'<script id="cmbUpdState" type="application/json">(.*?)</script>',
-                                    _pf.read(), re.S)
-                if _pm:
-                    prev_upd_state = json.loads(_pm.group(1))
+            _prev_txt = _cmb_prev_upd_state_text()
+            if _prev_txt:
+                prev_upd_state = json.loads(_prev_txt)
         except Exception as _pe:
             print(f"  Warning: cmbUpdState 파싱 실패 (무배지로 진행): {_pe}")
         upd_today = datetime.now()
@@ -3711,9 +3718,9 @@ def _build_combined_chart_section():
 def _build_wrap_chart_section(category_label):
     """동적 Chart.js 수익률 비교 차트 (멀티 셀렉트)"""
     try:
-        df_nav = pd.read_excel('Wrap_NAV.xlsx', sheet_name='기준가')
+        data = dashboard_data.current()
+        df_nav = data.nav('기준가')
         if 'Date' in df_nav.columns:
-            df_nav['Date'] = pd.to_datetime(df_nav['Date'])
             df_nav = df_nav.set_index('Date')
 
         chart_series = wrap_config.chart_series()  # 단일 출처: execution/wrap_config.py
@@ -3746,8 +3753,7 @@ def _build_wrap_chart_section(category_label):
         # NEW 상품명 == nav_key(col) 정확 일치 매칭 (substring 금지 — '목표전환형' vs '목표전환형 1호').
         weight_export = {'dates': nav_export['dates']}
         try:
-            df_new_w = pd.read_excel('Wrap_NAV.xlsx', sheet_name='NEW')
-            df_new_w['날짜'] = pd.to_datetime(df_new_w['날짜'])
+            df_new_w = data.nav('NEW')
             for display, col in chart_series:
                 if col not in df_nav.columns or display not in raw_export:
                     continue
@@ -3775,8 +3781,7 @@ def _build_wrap_chart_section(category_label):
         # 매핑 = wrap_config Product.aum_name (AUM 시트 상품명 ≠ nav_key인 상품 있음: 다이내믹밸류/Value ESG).
         aum_export = {'dates': nav_export['dates']}
         try:
-            df_aum_c = pd.read_excel('Wrap_NAV.xlsx', sheet_name='AUM')
-            df_aum_c['날짜'] = pd.to_datetime(df_aum_c['날짜'])
+            df_aum_c = data.nav('AUM')
             _aum_name_by_display = {p.display: p.aum_name for p in wrap_config.active_products()}
             for display, col in chart_series:
                 _aum_nm = _aum_name_by_display.get(display)
@@ -4289,13 +4294,12 @@ def pick_weekly_last(date_strs):
 def create_aum_table():
     """AUM 테이블 HTML 생성"""
     try:
-        nav_file = 'Wrap_NAV.xlsx'
-        if not os.path.exists(nav_file):
+        data = dashboard_data.current()
+        if not data.has_nav():
             return ""
-        df = pd.read_excel(nav_file, sheet_name='AUM')
+        df = data.nav('AUM')
         if df.empty:
             return ""
-        df['날짜'] = pd.to_datetime(df['날짜'])
         latest = df.sort_values('날짜').groupby('상품명').last().reset_index()
         # 상단 테이블: 최신 날짜 상품만 (가장 최근 거래일 기준)
         # 정렬: broker AUM 합 내림차순 → broker 안에서 일반형 → 목표전환형 → AUM 내림차순
@@ -4461,13 +4465,12 @@ def create_aum_table():
 def create_cumulative_aum_chart():
     """누적 AUM 차트 - 일반형은 현재 AUM, 목표전환형은 회차별 AUM 누적 합산"""
     try:
-        nav_file = 'Wrap_NAV.xlsx'
-        if not os.path.exists(nav_file):
+        data = dashboard_data.current()
+        if not data.has_nav():
             return ""
-        df = pd.read_excel(nav_file, sheet_name='AUM')
+        df = data.nav('AUM')
         if df.empty:
             return ""
-        df['날짜'] = pd.to_datetime(df['날짜'])
 
         # 목표전환형 종료일/운용 개시일 결정: 기준가 시트에서 각 회차의 첫/마지막 유효 데이터.
         # 종료일 — 전체 최신 거래일과 같으면 활성(=빈칸), 빠르면 청산일(=MM/DD).
@@ -4477,9 +4480,8 @@ def create_cumulative_aum_chart():
         last_in_nav = {}            # 회차별 마지막 유효 NAV 일자 (거래일 집계용)
         nav_trading_days = None     # 기준가 시트의 전체 거래일 인덱스 (공휴일 자동 제외)
         try:
-            df_nav = pd.read_excel(nav_file, sheet_name='기준가')
+            df_nav = data.nav('기준가')
             if 'Date' in df_nav.columns:
-                df_nav['Date'] = pd.to_datetime(df_nav['Date'])
                 df_nav = df_nav.set_index('Date')
             else:
                 df_nav.index = pd.to_datetime(df_nav.iloc[:, 0])
@@ -4798,13 +4800,12 @@ def create_wrap_monthly_returns_table():
     KOSPI/KOSDAQ는 기준가 시트의 동일 컬럼(상단 RETURN 표와 동일 소스)을 사용.
     색상은 MONTHLY RETURNS 표와 동일(양수 빨강/음수 파랑, 강도 3단계)."""
     try:
-        nav_file = 'Wrap_NAV.xlsx'
-        if not os.path.exists(nav_file):
+        data = dashboard_data.current()
+        if not data.has_nav():
             return ''
-        df = pd.read_excel(nav_file, sheet_name='기준가')
+        df = data.nav('기준가')
         if 'Date' not in df.columns:
             return ''
-        df['Date'] = pd.to_datetime(df['Date'])
         df = df.set_index('Date').sort_index()
         products = wrap_config.monthly_returns_products()  # 단일 출처: execution/wrap_config.py
         MONTHS = list(range(1, 13))
@@ -4936,11 +4937,11 @@ def create_wrap_monthly_returns_table():
 def create_wrap_returns_table():
     """WRAP 수익률 비교 테이블 HTML (삼성 트루밸류, KOSPI, KOSDAQ) - 날짜 필터 포함"""
     try:
-        nav_file = 'Wrap_NAV.xlsx'
-        if not os.path.exists(nav_file):
+        data = dashboard_data.current()
+        if not data.has_nav():
             return ""
 
-        df_returns = pd.read_excel(nav_file, sheet_name='수익률')
+        df_returns = data.nav('수익률')
         if df_returns.empty:
             return ""
 
@@ -7067,11 +7068,9 @@ def _fee_rev_metrics(records):
         r['avgAum'] = None
         r['ret'] = None
     try:
-        nav = pd.read_excel('Wrap_NAV.xlsx', sheet_name='기준가')
-        nav['Date'] = pd.to_datetime(nav['Date'])
-        nav = nav.set_index('Date').sort_index()
-        aum = pd.read_excel('Wrap_NAV.xlsx', sheet_name='AUM')
-        aum['날짜'] = pd.to_datetime(aum['날짜'])
+        data = dashboard_data.current()
+        nav = data.nav('기준가').set_index('Date').sort_index()
+        aum = data.nav('AUM')
     except Exception as e:
         print(f"  ! 매출 평균AUM/수익률 계산 불가 (Wrap_NAV.xlsx 읽기 실패): {e}")
         return
@@ -7533,7 +7532,56 @@ def _build_contribution_section():
     """
 
 
-def create_dashboard():
+# ── 섹션 렌더러 레지스트리 ────────────────────────────────────────────────
+# inputs = 섹션이 읽는 원천 파일(실행 cwd 기준), config = 결과를 좌우하는 설정 모듈.
+# 섹션끼리는 서로의 결과를 쓰지 않는다 — 조립 순서는 create_dashboard() 가 이름으로 고정.
+_AOE_CORE_FILES = (os.path.join('chart_core', 'dist', 'aoe_chart.js'),
+                   os.path.join('chart_core', 'dist', 'aoe_chart.manifest.json'))
+_NAV_FILE = dashboard_data.NAV_FILE
+
+DASHBOARD_SECTIONS = [
+    Section('indices_chart', lambda: _build_indices_chart_section('Indices'), (CSV_FILE,) + _AOE_CORE_FILES),
+    Section('combined_chart', _build_combined_chart_section,
+            (CSV_FILE, 'hotel_adr.csv', 'roc_history.csv', _cmb_prev_upd_state_text) + _AOE_CORE_FILES,
+            daily=True),
+    Section('sector', create_sector_section_html, ('kodex_sectors.json', _NAV_FILE), daily=True),
+    # 제목 라벨이 portfolio_data.json mtime(생성 시각)을 쓴다
+    Section('portfolio', create_portfolio_tables_html,
+            ('portfolio_data.json', lambda: os.path.exists('portfolio_data.json')
+             and os.path.getmtime('portfolio_data.json')), ('wrap_config',)),
+    Section('wrap_chart', lambda: _build_wrap_chart_section('CHART'), (_NAV_FILE,) + _AOE_CORE_FILES, ('wrap_config',)),
+    Section('wrap_returns', create_wrap_returns_table, (_NAV_FILE,), ('wrap_config',)),
+    Section('aum_table', create_aum_table, (_NAV_FILE,) + _AOE_CORE_FILES, ('wrap_config',)),
+    Section('cumulative_aum', create_cumulative_aum_chart, (_NAV_FILE,) + _AOE_CORE_FILES, ('wrap_config',)),
+    Section('monthly_returns', create_monthly_returns_table, ('monthly_returns.json',)),
+    Section('order', create_order_section, (), ('wrap_config',)),
+    Section('fee_rate', create_fee_section),
+    Section('fee_revenue', create_fee_revenue_section, ('fee_revenue.json', _NAV_FILE), ('wrap_config',)),
+    Section('disclosures', create_disclosures_section),
+    Section('contribution', _build_contribution_section),
+    # etf.html 을 직접 기록하는 페이지 렌더러 (HTML 조각 없음)
+    Section('etf_page', lambda: generate_etf_html() or '', ('etf_data.db',), cacheable=False),
+]
+
+# 페이지 → 들어가는 섹션. 섹션이 하나라도 실패하면 그 페이지만 건너뛴다 (직전 파일 유지).
+PAGE_SECTIONS = {
+    OUTPUT_FILE: ('indices_chart', 'combined_chart', 'monthly_returns'),
+    'wrap.html': ('sector', 'portfolio', 'wrap_chart', 'wrap_returns', 'aum_table', 'cumulative_aum',
+                  'order', 'fee_rate', 'fee_revenue', 'disclosures', 'contribution'),
+}
+
+
+def _page_ok(page, failed):
+    """page 에 들어가는 섹션이 모두 성공했는지. 아니면 건너뛴다고 알린다."""
+    bad = [n for n in PAGE_SECTIONS.get(page, ()) if n in failed]
+    if bad:
+        print(f"! {page} 건너뜀 (직전 파일 유지) — 실패 섹션: {', '.join(bad)}")
+    return not bad
+
+
+def create_dashboard(force_rebuild=False):
+    dashboard_data.begin_run()  # 이번 실행의 원천 캐시 (섹션 빌더가 공유)
+
     # Check if charts directory exists
     if not os.path.exists(CHARTS_DIR):
         print(f"Charts directory not found: {CHARTS_DIR}")
@@ -7543,40 +7591,54 @@ def create_dashboard():
     chart_files = glob.glob(os.path.join(CHARTS_DIR, '*.png'))
     chart_files.sort()
 
+    # Group charts by category
+    charts_by_category = {}
+    
+    for file_path in chart_files:
+        filename = os.path.basename(file_path)
+        # Extract item name from filename (remove .png and replace _ with space)
+        item_name = os.path.splitext(filename)[0].replace('_', ' ')
+        
+        # Normalize S P 500 to S&P 500 (fix chart naming)
+        item_name = item_name.replace('S P 500', 'S&P 500')
+        
+        # Fix Dollar Index naming: "Dollar Index  DXY " -> "Dollar Index (DXY)"
+        if 'Dollar Index' in item_name:
+            item_name = 'Dollar Index (DXY)'
+            
+        # Fix FX naming: convert "XXX USD" to "XXX/USD" to match dataset format
+        item_name = item_name.replace(' USD', '/USD').strip()
+        
+        # Get category
+        category = get_item_category(item_name)
+        
+        if category not in charts_by_category:
+            charts_by_category[category] = []
+        
+        charts_by_category[category].append({
+            'filename': filename,
+            'title': item_name,
+            'path': f"charts/{filename}"
+        })
+    
+    # 섹션 병렬 렌더 (dashboard_render) — 아래 조립은 이름으로 고정 순서, 결과는 직렬 실행과 동일.
+    wanted = ['monthly_returns', 'order', 'fee_rate', 'fee_revenue', 'disclosures', 'contribution', 'etf_page']
+    if chart_files:
+        wanted += ['indices_chart', 'combined_chart', 'sector', 'portfolio']
+        if 'Wrap' in charts_by_category:
+            wanted += ['wrap_chart', 'wrap_returns', 'aum_table', 'cumulative_aum']
+    #   입력(파일 내용·설정·코드) 해시가 직전과 같은 섹션은 캐시 HTML 재사용.
+    force_rebuild = force_rebuild or os.getenv('DASHBOARD_FORCE_REBUILD') == '1'
+    rendered = dashboard_render.render_sections([sec for sec in DASHBOARD_SECTIONS if sec.name in wanted],
+                                                cache=dashboard_cache.RenderCache(force=force_rebuild))
+    # 실패 섹션은 빈 조각으로 조립을 끝까지 돌리고, 그 섹션이 들어가는 페이지만 쓰지 않는다
+    failed = sorted(set(wanted) - set(rendered))
+    rendered.update({name: '' for name in failed})
+
     if not chart_files:
         print("No charts found.")
         charts_html = "<p style='text-align:center; width:100%;'>No charts available yet.</p>"
     else:
-        # Group charts by category
-        charts_by_category = {}
-        
-        for file_path in chart_files:
-            filename = os.path.basename(file_path)
-            # Extract item name from filename (remove .png and replace _ with space)
-            item_name = os.path.splitext(filename)[0].replace('_', ' ')
-            
-            # Normalize S P 500 to S&P 500 (fix chart naming)
-            item_name = item_name.replace('S P 500', 'S&P 500')
-            
-            # Fix Dollar Index naming: "Dollar Index  DXY " -> "Dollar Index (DXY)"
-            if 'Dollar Index' in item_name:
-                item_name = 'Dollar Index (DXY)'
-                
-            # Fix FX naming: convert "XXX USD" to "XXX/USD" to match dataset format
-            item_name = item_name.replace(' USD', '/USD').strip()
-            
-            # Get category
-            category = get_item_category(item_name)
-            
-            if category not in charts_by_category:
-                charts_by_category[category] = []
-            
-            charts_by_category[category].append({
-                'filename': filename,
-                'title': item_name,
-                'path': f"charts/{filename}"
-            })
-        
         # Build HTML with category sections
         charts_html = ""
         wrap_html   = ""   # WRAP page: Wrap charts + Portfolio + Sector
@@ -7597,11 +7659,11 @@ def create_dashboard():
         for category in category_order:
             # Indices는 동적 차트 (charts_by_category와 무관)
             if category == 'Indices':
-                indices_section_html = _build_indices_chart_section('Indices')
+                indices_section_html = rendered['indices_chart']
                 charts_html += indices_section_html
                 # Indices 직후에 통합 차트 1회 렌더
                 if not combined_rendered:
-                    data_section_html = _build_combined_chart_section()
+                    data_section_html = rendered['combined_chart']
                     charts_html += data_section_html
                     combined_rendered = True
                 continue
@@ -7612,7 +7674,7 @@ def create_dashboard():
 
             # Portfolio는 차트가 아니라 테이블이므로 특별 처리
             if category == 'SECTOR':
-                sector_html = create_sector_section_html()
+                sector_html = rendered['sector']
                 if sector_html:
                     wrap_html += f"""
             <div class="category-section" id="wrap-sec-sector">
@@ -7626,7 +7688,7 @@ def create_dashboard():
 
             if category == 'Portfolio':
                 # Portfolio 테이블 HTML 생성
-                portfolio_html = create_portfolio_tables_html()
+                portfolio_html = rendered['portfolio']
                 if portfolio_html:
                     wrap_html += f"""
             <div class="category-section" id="wrap-sec-portfolio">
@@ -7764,10 +7826,10 @@ def create_dashboard():
             target = wrap_html if category == 'Wrap' else charts_html
 
             if category == 'Wrap':
-                wrap_html += _build_wrap_chart_section(category_label)
-                wrap_html += create_wrap_returns_table()
-                wrap_html += create_aum_table()
-                wrap_html += create_cumulative_aum_chart()
+                wrap_html += rendered['wrap_chart']
+                wrap_html += rendered['wrap_returns']
+                wrap_html += rendered['aum_table']
+                wrap_html += rendered['cumulative_aum']
             else:
                 section = f"""
             <div class="category-section">
@@ -7791,7 +7853,7 @@ def create_dashboard():
     # Generate full HTML
     now = datetime.now(tz=KST).strftime("%Y-%m-%d %H:%M:%S KST")
 
-    monthly_returns_html = create_monthly_returns_table()
+    monthly_returns_html = rendered['monthly_returns']
 
     # Taiwan 월매출 패널 (Data 페이지 'Taiwan' 버튼) — taiwan_table 공유 빌더로 임베드.
     # CSV 부재/로드 실패 시 버튼·패널은 유지하되 안내 문구만 표시 (전체 생성 중단 방지).
@@ -8341,9 +8403,10 @@ def create_dashboard():
 """
 
     # Write index.html
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print(f"Dashboard generated: {OUTPUT_FILE}")
+    if _page_ok(OUTPUT_FILE, failed):
+        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"Dashboard generated: {OUTPUT_FILE}")
 
     # ── Generate index.html (Landing page) ──
     # 고객예탁금/신용잔고는 Market DATA(INDEX_KOREA)로 이전 — 랜딩에서 제외.
@@ -8624,9 +8687,9 @@ def create_dashboard():
     print("Landing page generated: index.html")
 
     # ── Generate wrap.html (WRAP + Portfolio + Sector + 공시/Order/수수료 tabs) ──
-    order_html = create_order_section()
-    fee_rate_html = create_fee_section()
-    fee_revenue_html = create_fee_revenue_section()
+    order_html = rendered['order']
+    fee_rate_html = rendered['fee_rate']
+    fee_revenue_html = rendered['fee_revenue']
     fee_html = f"""
         <div class="fee-subtabs">
             <button class="fee-subtab active" data-fee-sub="rate" onclick="feeSwitchSub('rate')">요율</button>
@@ -8635,8 +8698,8 @@ def create_dashboard():
         <div id="feeSubRate">{fee_rate_html}</div>
         <div id="feeSubRevenue" style="display:none;">{fee_revenue_html}</div>
     """
-    disclosures_html = create_disclosures_section()
-    contribution_html = _build_contribution_section()
+    disclosures_html = rendered['disclosures']
+    contribution_html = rendered['contribution']
     wrap_page = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -9088,9 +9151,10 @@ def create_dashboard():
 </body>
 </html>"""
 
-    with open('wrap.html', 'w', encoding='utf-8') as f:
-        f.write(wrap_page)
-    print("WRAP page generated: wrap.html")
+    if _page_ok('wrap.html', failed):
+        with open('wrap.html', 'w', encoding='utf-8') as f:
+            f.write(wrap_page)
+        print("WRAP page generated: wrap.html")
 
     # Universe page
     universe_page = """<!DOCTYPE html>
@@ -9960,14 +10024,13 @@ function superDownloadUniverse() {
 
     # SEIBro page - TOP 50 종목별 데이터
     try:
-        _df = pd.read_csv('dataset.csv', encoding='utf-8-sig')
+        _df = dashboard_data.current().dataset()
         seibro_data = _df[_df['데이터 타입'] == 'SEIBro'].copy()
     except:
         seibro_data = pd.DataFrame()
 
     seibro_records = []
     if not seibro_data.empty:
-        seibro_data['날짜'] = pd.to_datetime(seibro_data['날짜'])
         for _, row in seibro_data.iterrows():
             seibro_records.append({
                 'd': row['날짜'].strftime('%Y-%m-%d'),
@@ -10614,8 +10677,8 @@ refresh();
         f.write(featured_page.replace('__FEATURED_UPDATED__', now))
     print("Featured page generated: featured_legacy.html")
 
-    # ── ETF page ──
-    generate_etf_html()
+    # ── ETF page ── (etf_page 섹션이 렌더 풀에서 etf.html 을 이미 기록)
+    return failed
 
 
 
@@ -11449,4 +11512,11 @@ render();
 
 
 if __name__ == "__main__":
-    create_dashboard()
+    import argparse
+    import sys
+    _ap = argparse.ArgumentParser(description='market.html / wrap.html 등 대시보드 페이지 생성')
+    _ap.add_argument('--force-rebuild', action='store_true', help='섹션 캐시 무시하고 전 섹션 재렌더')
+    _failed = create_dashboard(force_rebuild=_ap.parse_args().force_rebuild)
+    if _failed:
+        print(f"! 실패 섹션: {', '.join(_failed)}")
+        sys.exit(1)
@@ -27,6 +27,7 @@ from datetime import datetime, timedelta, timezone
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from krx_session import is_session
+import high_history
 from nav_style import (PRETENDARD_LINK_LOCAL, PALETTE_CSS_VARS,
                        NAV_CSS as AOE_NAV_CSS, SIDEBAR_CSS, nav_html, sidebar_html)
 from aoe_tokens_util import aoe_tokens_css
@@ -54,8 +55,8 @@ STREAK_WINDOW = 20
 TILT_MIN_SAMPLE = 5
 NH_WINDOW = 20
 STRONG_RANK = 20
-YF_HIST = 'stock_price_history.json'
-KIS_HIST = 'kis_price_history.json'
+YF_HIST = high_history.YF_HISTORY_FILE
+KIS_HIST = high_history.KIS_HISTORY_FILE
 
 RANK_TYPES = [
     ('absolute',   '거래대금 TOP 30'),
@@ -131,18 +132,11 @@ def load_sector_map():
 
 def load_price_history():
     """code -> {name, highs{d:v}, closes{d:v}} — 거래일만. KIS 가 yfinance 를 덮어쓴다."""
-    merged = {}
-    for path in (YF_HIST, KIS_HIST):
-        h = _read(path, {}) or {}
-        for code, st in (h.get('stocks') or {}).items():
-            m = merged.setdefault(code, {'name': '', 'highs': {}, 'closes': {}})
-            if st.get('name'):
-                m['name'] = st['name']
-            for key in ('highs', 'closes'):
-                for dt, v in (st.get(key) or {}).items():
-                    if v and is_session(dt):
-                        m[key][dt] = v
-    return merged
+    hist = high_history.merge(high_history.load_kis(os.path.join(REPO, KIS_HIST),
+                                                    os.path.join(REPO, high_history.KIS_HISTORY_LEGACY)),
+                              high_history.load_yf(os.path.join(REPO, YF_HIST),
+                                                   os.path.join(REPO, high_history.YF_SIDECAR)))
+    return hist.to_stocks(sessions_only=True)
 
 
 def load_records():
@@ -7,16 +7,16 @@
 - 입력 누락 슬롯은 skip, 빌더 예외는 로그만 남기고 다른 슬롯은 살림
 - atomic write (tmp -> os.replace)
 """
-import csv
 import json
 import os
 import random
 import re
 import sys
-from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+import dataset_store
+
 KST = timezone(timedelta(hours=9))
 ROOT = Path(__file__).resolve().parents[1]
 OUTPUT = ROOT / 'landing_highlights.json'
@@ -165,25 +165,36 @@ def atomic_write_json(path, data):
     os.replace(tmp, path)
 
 
+class DatasetSeries:
+    """dataset_store 지연 조회 — (데이터 타입, 제품명) → [(날짜, 값)] 를 빌더가 요청할 때만 읽는다.
+
+    종전 load_dataset_csv 는 슬롯 수십 개를 위해 dataset.csv 전체를 파싱했다.
+    """
+
+    def __init__(self, csv_path=ROOT / 'dataset.csv'):
+        self.csv_path = str(csv_path)
+        self.ok = os.path.exists(self.csv_path)
+        self._cache = {}
+
+    def get(self, key, default=None):
+        if not self.ok:
+            return default
+        if key not in self._cache:
+            dtype, name = key
+            s = dataset_store.series(name, dtype=dtype, csv_path=self.csv_path)
+            self._cache[key] = [(d.strftime('%Y-%m-%d'), float(v)) for d, v in s.items()]
+        return self._cache[key] or default
+
+    def latest_of_type(self, dtype):
+        """{제품명: (최근 날짜, 값)} — 데이터 타입 dtype 의 전 제품명."""
+        if not self.ok:
+            return {}
+        names = dataset_store.names(dtype, csv_path=self.csv_path)
+        return dataset_store.latest(names, dtype=dtype, csv_path=self.csv_path)
+
+
 def load_dataset_csv():
-    series = defaultdict(list)
-    path = ROOT / 'dataset.csv'
-    if not path.exists():
-        return series
-    with open(path, 'r', encoding='utf-8') as f:
-        r = csv.reader(f)
-        next(r, None)
-        for row in r:
-            if len(row) < 4:
-                continue
-            date, name, val, dtype = row[0], row[1], row[2], row[3]
-            v = safe_float(val)
-            if v is None:
-                continue
-            series[(dtype, name)].append((date, v))
-    for k in series:
-        series[k].sort()
-    return series
+    return DatasetSeries()
 
 
 def get_series(series, dtype, name, days=SPARK_DAYS):
@@ -881,14 +892,7 @@ def b_kodex_sector_leader(ctx):
 
 
 def b_seibro_top_settlement(ctx):
-    candidates = []
-    for (dtype, name), pairs in ctx['ds'].items():
-        if dtype != 'SEIBro' or not pairs:
-            continue
-        d, v = pairs[-1]
-        if v is None:
-            continue
-        candidates.append((d, name, v))
+    candidates = [(d, name, v) for name, (d, v) in ctx['ds'].latest_of_type('SEIBro').items()]
     if not candidates:
         return None
     latest = max(d for d, _, _ in candidates)
@@ -1168,7 +1172,7 @@ def main():
         'featured_latest': featured_latest,
         'seibro_tickers': safe_load_json(ROOT / 'seibro_tickers.json') or {},
     }
-    print(f"  loaded: ds={len(ds)} series, featured_latest_rows={len(featured_latest[0]) if featured_latest else 0}")
+    print(f"  loaded: ds={'store' if ds.ok else 'none'}, featured_latest_rows={len(featured_latest[0]) if featured_latest else 0}")
 
     slots = []
     for b in BUILDERS:
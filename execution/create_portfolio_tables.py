@@ -16,6 +16,7 @@ sys.stdout.reconfigure(encoding='utf-8')
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import wrap_config
+import wrap_nav_store
 
 # Constants
 WRAP_NAV_FILE = 'Wrap_NAV.xlsx'
@@ -390,7 +391,7 @@ def create_portfolio_tables():
 
     try:
         # NEW 시트에서 포트폴리오 데이터 읽기 (1회만)
-        nav_df = pd.read_excel(WRAP_NAV_FILE, sheet_name='NEW')
+        nav_df = wrap_nav_store.read_sheet('NEW', xlsx=WRAP_NAV_FILE)
         nav_df['날짜'] = pd.to_datetime(nav_df['날짜'])
 
         print(f"   전체 날짜 범위: {nav_df['날짜'].min()} ~ {nav_df['날짜'].max()}")
@@ -405,7 +406,7 @@ def create_portfolio_tables():
         # 실패한 지수만 야후 폴백(data.krx LOGOUT 차단으로 fdr 불가).
         INDEX_PRICE_SERIES = {'KOSPI': None, 'KOSDAQ': None}
         try:
-            _nav = pd.read_excel(WRAP_NAV_FILE, sheet_name='기준가')
+            _nav = wrap_nav_store.read_sheet('기준가', xlsx=WRAP_NAV_FILE)
             _nav.columns = [str(c).strip() for c in _nav.columns]
             if 'Date' in _nav.columns:
                 _nav['Date'] = pd.to_datetime(_nav['Date'])
@@ -438,7 +439,7 @@ def create_portfolio_tables():
                 print(f"  Warning: yfinance import 실패 (RSI 미표시): {e}")
 
         # Code 시트에서 FICS 섹터 매핑 로드
-        code_df = pd.read_excel(WRAP_NAV_FILE, sheet_name='Code')
+        code_df = wrap_nav_store.read_sheet('Code', xlsx=WRAP_NAV_FILE)
         code_df['종목코드'] = code_df['종목코드'].apply(lambda x: str(x).zfill(6))
         sector_map = dict(zip(code_df['종목코드'], code_df['섹터']))
 
@@ -741,7 +742,7 @@ def create_portfolio_tables():
         portfolio_meta = {}
         try:
             base_map = {p.nav_key: p.base_price for p in wrap_config.PRODUCTS}
-            nav_px = pd.read_excel(WRAP_NAV_FILE, sheet_name='기준가')
+            nav_px = wrap_nav_store.read_sheet('기준가', xlsx=WRAP_NAV_FILE)
             nav_px.columns = [str(c).strip() for c in nav_px.columns]
             if 'Date' in nav_px.columns:
                 nav_px['Date'] = pd.to_datetime(nav_px['Date'])
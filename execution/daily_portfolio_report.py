@@ -20,6 +20,7 @@ sys.stdout.reconfigure(encoding='utf-8')
 # 단일 출처 레지스트리 (execution/wrap_config.py)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import wrap_config
+import wrap_nav_store
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -108,7 +109,7 @@ def get_report_date():
 
 def get_latest_nav():
     """최신 기준가 가져오기"""
-    df = pd.read_excel(file_name, sheet_name='기준가')
+    df = wrap_nav_store.read_sheet('기준가', xlsx=file_name)
     df['Date'] = pd.to_datetime(df['Date'])
     df = df.set_index('Date')
     
@@ -134,7 +135,7 @@ def get_latest_nav():
 
 def get_latest_returns():
     """최신 수익률 가져오기"""
-    df = pd.read_excel(file_name, sheet_name='수익률')
+    df = wrap_nav_store.read_sheet('수익률', xlsx=file_name)
     
     if len(df) == 0:
         return {}
@@ -0,0 +1,155 @@
+"""create_dashboard 섹션 렌더 캐시 — 입력 내용 해시가 같으면 직전 HTML 조각을 재사용.
+
+배경: sisyphe_bot.run_portfolio_update·스케줄 잡이 create_dashboard.py 를 하루 수십 번 돌리는데,
+대부분의 섹션(월별 수익률·수수료 매출·공시·ETF·통합 차트 ...)은 직전 실행 이후 입력이 그대로다.
+
+키 (섹션별 sha256):
+  - 섹션 이름 + 렌더 코드 (렌더러가 정의된 모듈 파일 + 공용 코드 _SHARED_CODE 내용 해시:
+    dashboard_data.py·wrap_nav_store.py, import 시 _AOE_TOKENS_CSS 로 읽히는 aoe_tokens.css)
+  - 선언 입력 파일의 내용 해시 (없는 파일 = None). 해시는 (size, mtime_ns) 지문으로 메모 —
+    git pull 로 mtime 만 바뀐 파일은 내용 해시가 같아 그대로 hit.
+  - 선언 입력이 callable 이면 그 반환 문자열 (파일 일부·mtime 처럼 파일 해시로 안 잡히는 입력)
+  - 설정 모듈(wrap_config 등) 소스 해시
+  - daily 섹션은 KST 날짜 (렌더 시 '오늘'을 쓰는 섹션)
+
+저장: DASHBOARD_CACHE_DIR (기본 .dashboard_cache/, gitignore) 에 섹션당 최신 1건
+<name>.json {key, html, rendered_at}. 빈 HTML(로드 실패 폴백 포함)과 예외는 저장하지 않는다.
+강제 재생성: create_dashboard.py --force-rebuild 또는 DASHBOARD_FORCE_REBUILD=1.
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+CACHE_DIR = os.getenv('DASHBOARD_CACHE_DIR') or '.dashboard_cache'
+_FP_FILE = 'fingerprints.json'
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# 모든 섹션 렌더 결과에 영향을 주는 공용 코드·자산 (렌더러 모듈 파일과 함께 코드 해시에 넣는다)
+_SHARED_CODE = (
+    os.path.join(_HERE, 'dashboard_data.py'),
+    os.path.join(_HERE, 'wrap_nav_store.py'),
+    os.path.join(os.path.dirname(_HERE), 'chart_core', 'dist', 'aoe_tokens.css'),
+)
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """섹션 HTML 조각 캐시 (create_dashboard 실행 1회 = 인스턴스 1개, 스레드 안전)."""
+
+    def __init__(self, cache_dir=CACHE_DIR, force=False):
+        self.cache_dir = cache_dir
+        self.force = force
+        self.hits = []
+        self.misses = []
+        self._mu = threading.Lock()
+        self._fp = self._load_fingerprints()
+        self._fp_dirty = False
+
+    # ── 지문 ───────────────────────────────────────────────────────────
+    def _load_fingerprints(self):
+        try:
+            with open(os.path.join(self.cache_dir, _FP_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def file_hash(self, path):
+        """내용 sha256 (없는 파일 None). (size, mtime_ns) 가 같으면 직전 해시 재사용."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stat = f'{st.st_size}:{st.st_mtime_ns}'
+        ap = os.path.abspath(path)
+        with self._mu:
+            memo = self._fp.get(ap)
+        if memo and memo[0] == stat:
+            return memo[1]
+        digest = _sha256_file(path)
+        with self._mu:
+            self._fp[ap] = [stat, digest]
+            self._fp_dirty = True
+        return digest
+
+    def _code_hash(self, section):
+        files = set(_SHARED_CODE)
+        try:
+            files.add(inspect.getsourcefile(section.render))
+        except TypeError:
+            pass
+        return {os.path.basename(p): self.file_hash(p) for p in sorted(f for f in files if f)}
+
+    def key(self, section):
+        material = {
+            'name': section.name,
+            'code': self._code_hash(section),
+            'inputs': [self.file_hash(i) if isinstance(i, str) else str(i()) for i in section.inputs],
+            'config': {m: self.file_hash(getattr(sys.modules.get(m), '__file__', None) or '')
+                       for m in section.config},
+        }
+        if section.daily:
+            material['day'] = datetime.now(KST).strftime('%Y-%m-%d')
+        blob = json.dumps(material, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    # ── 조회/저장 ──────────────────────────────────────────────────────
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.json')
+
+    def get(self, section, key):
+        """hit 면 HTML, 아니면 None (force 면 항상 None)."""
+        html = None
+        if not self.force:
+            try:
+                with open(self._path(section.name), encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry.get('key') == key:
+                    html = entry.get('html')
+            except (OSError, ValueError):
+                pass
+        with self._mu:
+            (self.hits if html is not None else self.misses).append(section.name)
+        return html
+
+    def put(self, section, key, html):
+        if not html:
+            return
+        entry = {'key': key, 'html': html,
+                 'rendered_at': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S KST')}
+        self._write_json(self._path(section.name), entry)
+
+    def _write_json(self, path, obj):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(obj, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  Warning: 섹션 캐시 기록 실패 ({os.path.basename(path)}): {e}")
+
+    def close(self):
+        """지문 메모 저장 + hit/miss 요약 로그."""
+        with self._mu:
+            if self._fp_dirty:
+                self._write_json(os.path.join(self.cache_dir, _FP_FILE), self._fp)
+                self._fp_dirty = False
+            hits, misses = sorted(self.hits), sorted(self.misses)
+        total = len(hits) + len(misses)
+        rate = f'{len(hits) / total * 100:.0f}%' if total else '-'
+        mode = ' (force rebuild)' if self.force else ''
+        print(f"Section cache{mode}: hit {len(hits)} / miss {len(misses)} ({rate})"
+              + (f" · 재렌더: {', '.join(misses)}" if misses else ''))
+        return {'hits': hits, 'misses': misses}
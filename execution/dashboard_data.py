@@ -0,0 +1,119 @@
+"""create_dashboard 1회 실행용 데이터 컨텍스트 — 원천 파일을 한 번만 읽어 섹션 빌더에 나눠준다.
+
+배경: create_dashboard.py 한 번 실행에 Wrap_NAV.xlsx 를 섹션마다 다시 읽었고
+(read_portfolio_sectors / _build_wrap_chart_section 3시트 / create_aum_table /
+create_cumulative_aum_chart / create_wrap_monthly_returns_table / create_wrap_returns_table /
+_fee_rev_metrics), dataset.csv 도 지수 차트·DATA 차트·본문(SEIBro)이 각자 파싱 + '가격' 콤마
+제거를 반복했다. get_item_category 는 차트 PNG 하나마다 csv 를 처음부터 훑었다.
+
+규칙
+----
+- 원천별 1회 로드 + 공통 정규화 1회:
+    · Wrap_NAV.xlsx : wrap_nav_store 시트 단위 로드. NEW/AUM/수익률 '날짜', 기준가 'Date' → datetime.
+    · dataset.csv   : '날짜' → datetime, '가격' → 콤마 제거 후 숫자(변환 불가 = NaN).
+- 내주는 프레임은 캐시의 사본 — 섹션이 컬럼을 덧붙이거나 값을 고쳐도 다른 섹션에 새지 않는다
+  (pandas 3 Copy-on-Write 에서는 얕은 사본이라 비용 거의 없음).
+- 로드 실패(파일 없음 등)도 기억했다가 같은 예외를 다시 던진다 → 섹션별 기존 try/except 폴백 유지.
+- 스레드 안전 (원천별 락) — 섹션 병렬 렌더에서 같은 원천을 동시에 요청해도 1회만 읽는다.
+
+사용 예 (create_dashboard.py):
+    dashboard_data.begin_run()                 # create_dashboard() 시작 시 새 컨텍스트
+    df = dashboard_data.current().nav('AUM')   # 섹션 빌더
+"""
+import os
+import threading
+
+import pandas as pd
+
+import dataset_store
+import wrap_nav_store
+from config import CSV_FILE
+
+NAV_FILE = 'Wrap_NAV.xlsx'
+
+# 시트별 날짜 컬럼 (로드 시 datetime 변환)
+NAV_DATE_COLUMNS = {'기준가': 'Date', 'NEW': '날짜', 'AUM': '날짜', '수익률': '날짜'}
+
+_COW = int(pd.__version__.split('.')[0]) >= 3
+
+
+def _handout(df):
+    return df.copy(deep=not _COW)
+
+
+class DashboardData:
+    """원천 파일별 1회 로드 캐시 (create_dashboard 실행 1회 = 인스턴스 1개)."""
+
+    def __init__(self, nav_file=NAV_FILE, csv_file=CSV_FILE):
+        self.nav_file = nav_file
+        self.csv_file = csv_file
+        self._cache = {}
+        self._locks = {}
+        self._mu = threading.Lock()
+
+    def _load(self, key, loader):
+        with self._mu:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._cache:
+                try:
+                    self._cache[key] = (True, loader())
+                except Exception as e:
+                    self._cache[key] = (False, e)
+            ok, value = self._cache[key]
+        if not ok:
+            raise value
+        return value
+
+    # ── Wrap_NAV.xlsx ──────────────────────────────────────────────────
+    def has_nav(self):
+        return os.path.exists(self.nav_file)
+
+    def nav(self, sheet):
+        """Wrap_NAV.xlsx 시트 (날짜 컬럼 datetime 정규화). 없는 시트/파일이면 예외."""
+        return _handout(self._load(('nav', sheet), lambda: self._read_nav(sheet)))
+
+    def _read_nav(self, sheet):
+        df = wrap_nav_store.read_sheet(sheet, xlsx=self.nav_file)
+        date_col = NAV_DATE_COLUMNS.get(sheet)
+        if date_col in df.columns:
+            df[date_col] = pd.to_datetime(df[date_col])
+        return df
+
+    # ── dataset.csv ────────────────────────────────────────────────────
+    def dataset(self):
+        """dataset.csv ('날짜' datetime, '가격' 콤마 제거 숫자)."""
+        return _handout(self._load('dataset', self._read_dataset))
+
+    def _read_dataset(self):
+        df = pd.read_csv(self.csv_file, encoding='utf-8-sig')
+        df['날짜'] = pd.to_datetime(df['날짜'])
+        df['가격'] = pd.to_numeric(df['가격'].astype(str).str.replace(',', ''), errors='coerce')
+        return df
+
+    def item_types(self):
+        """dataset.csv {제품명: 데이터 타입} (같은 제품명은 첫 행 기준 — get_item_category 구 동작)."""
+        return self._load('item_types', self._read_item_types)
+
+    def _read_item_types(self):
+        if not os.path.exists(self.csv_file):
+            raise FileNotFoundError(self.csv_file)
+        return dataset_store.item_types(csv_path=self.csv_file)   # 인덱스 조회 — csv 전체 파싱 없음
+
+
+_CURRENT = None
+
+
+def begin_run(**kwargs):
+    """새 실행 컨텍스트 시작 (이전 실행 캐시 폐기)."""
+    global _CURRENT
+    _CURRENT = DashboardData(**kwargs)
+    return _CURRENT
+
+
+def current():
+    """현재 실행 컨텍스트 (begin_run 없이 섹션 함수를 단독 호출하면 새로 만든다)."""
+    global _CURRENT
+    if _CURRENT is None:
+        _CURRENT = DashboardData()
+    return _CURRENT
@@ -0,0 +1,122 @@
+"""create_dashboard 섹션 렌더러 레지스트리 + 병렬 실행기 (섹션별 소요시간 JSON 리포트).
+
+배경: create_dashboard() 가 지수 차트·통합 차트·WRAP 차트·AUM·Order·공시·수수료·기여도·ETF
+페이지를 한 줄로 차례차례 만들었다. 섹션끼리는 서로의 결과를 쓰지 않으므로(입력은 원천 파일뿐)
+각 섹션을 '선언된 입력을 가진 렌더러'로 등록하고 스레드 풀에서 동시에 돌린 뒤, 조립은
+호출측이 고정 순서로 한다 → 결과 HTML 은 직렬 실행과 같다.
+
+- 스레드 풀: 섹션들이 dashboard_data 실행 컨텍스트(원천 1회 로드)를 공유해야 하고, 렌더러가
+  모듈 전역 상수·캐시를 쓰므로 프로세스 풀 대신 스레드. 파일 I/O·pandas/json C 구간에서 겹친다.
+- 예외: 렌더러 예외는 던지지 않고 섹션 단위로 격리 — 리포트(ok/error)와 로그에 남기고 결과에서
+  뺀다. 호출측은 빠진 섹션을 쓰는 페이지만 건너뛰고 나머지 페이지는 그대로 쓴다 (종전 직렬
+  실행에서 ETF 페이지 실패가 다른 페이지 기록 뒤에 났던 것처럼).
+- 리포트: DASHBOARD_TIMING_REPORT (기본 logs/dashboard_timing.json) 에 섹션별 wall-time·
+  스레드·성공 여부와 전체 소요를 기록 → 다음 최적화 대상 확인용.
+- 워커 수: DASHBOARD_WORKERS (기본 8, 1 = 직렬).
+- 캐시: cache(dashboard_cache.RenderCache) 를 주면 입력 해시가 같은 섹션은 직전 HTML 재사용
+  (리포트에 섹션별 hit/miss).
+"""
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+KST = timezone(timedelta(hours=9))
+
+MAX_WORKERS = int(os.getenv('DASHBOARD_WORKERS', '8'))
+REPORT_PATH = os.getenv('DASHBOARD_TIMING_REPORT') or os.path.join('logs', 'dashboard_timing.json')
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    render: Callable[[], str]
+    inputs: tuple = ()      # 읽는 원천 파일 (실행 cwd 기준 상대경로) 또는 키 문자열을 돌려주는 callable
+    config: tuple = ()      # 결과에 영향을 주는 설정 모듈명 (예: 'wrap_config')
+    daily: bool = False     # 렌더 시 '오늘' 날짜를 쓰는 섹션 (캐시 키에 KST 날짜 포함)
+    cacheable: bool = True  # False = 매번 렌더 (파일을 직접 쓰는 페이지 렌더러 등)
+
+
+@dataclass
+class Timing:
+    name: str
+    seconds: float = 0.0
+    ok: bool = True
+    thread: str = ''
+    error: str = ''
+    extra: dict = field(default_factory=dict)
+
+
+def _run_one(section, timing, cache=None):
+    t0 = time.perf_counter()
+    timing.thread = threading.current_thread().name
+    try:
+        if cache is None or not section.cacheable:
+            return section.render()
+        key = cache.key(section)
+        html = cache.get(section, key)
+        timing.extra['cache'] = 'miss' if html is None else 'hit'
+        if html is None:
+            html = section.render()
+            cache.put(section, key, html)
+        return html
+    except Exception as e:
+        timing.ok = False
+        timing.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        timing.seconds = time.perf_counter() - t0
+
+
+def render_sections(sections, max_workers=MAX_WORKERS, report_path=REPORT_PATH, cache=None):
+    """[Section, ...] → {name: html}. 모든 섹션을 병렬 렌더(캐시 hit 은 재사용) 후 타이밍 리포트 기록.
+
+    결과 dict 는 sections 순서 (조립 순서는 호출측이 이름으로 고정). 실패한 섹션은 결과에 없다.
+    """
+    t0 = time.perf_counter()
+    timings = {s.name: Timing(s.name) for s in sections}
+    workers = max(1, min(max_workers, len(sections) or 1))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section') as pool:
+        futures = [(s, pool.submit(_run_one, s, timings[s.name], cache)) for s in sections]
+        for s, fut in futures:
+            try:
+                results[s.name] = fut.result()
+            except Exception as e:
+                print(f"! 섹션 실패: {s.name} — {timings[s.name].error}")
+                traceback.print_exception(type(e), e, e.__traceback__)
+    total = time.perf_counter() - t0
+    cache_stats = cache.close() if cache is not None else None
+    write_report(timings.values(), total, workers, report_path, cache_stats)
+    return results
+
+
+def write_report(timings, total, workers, report_path=REPORT_PATH, cache_stats=None):
+    """섹션별 소요시간 JSON (느린 순). 기록 실패는 경고만."""
+    timings = sorted(timings, key=lambda t: t.seconds, reverse=True)
+    report = {
+        'generated_at': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S KST'),
+        'workers': workers,
+        'wall_seconds': round(total, 3),
+        'sum_seconds': round(sum(t.seconds for t in timings), 3),
+        'sections': [dict({'name': t.name, 'seconds': round(t.seconds, 3), 'ok': t.ok,
+                           'thread': t.thread}, **({'error': t.error} if t.error else {}), **t.extra)
+                     for t in timings],
+    }
+    if cache_stats is not None:
+        report['cache'] = cache_stats
+    try:
+        os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"  Warning: 섹션 타이밍 리포트 기록 실패: {e}")
+    top = ', '.join(f"{t.name} {t.seconds:.2f}s" for t in timings[:3])
+    print(f"Sections rendered: {len(timings)}개 · wall {total:.2f}s (합 {report['sum_seconds']:.2f}s, "
+          f"workers {workers}) · 상위: {top}")
+    return report
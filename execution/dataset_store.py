@@ -0,0 +1,286 @@
+"""dataset.csv 인덱스 저장소 — (날짜, 제품명) 유니크 키 SQLite + CSV 는 내보내기 산출물.
+
+배경: market_crawler.save_to_csv 는 호출마다 dataset.csv 전체를 읽어 (날짜, 제품명) 키 set 을
+만들었고(크롤러 1회 실행에 여러 번 호출), 시리즈 하나/최신값 하나가 필요한 쪽도 파일 전체를
+파싱했다 → 추가·조회 비용이 파일 크기에 비례해 계속 증가.
+
+구조
+----
+- rows(date, name, price, type) — UNIQUE(date, name), (name, date) 인덱스. price 는 CSV 원문 문자열
+  (콤마 포함 가능) 그대로 보존, 숫자 변환은 조회 API 에서.
+- dataset.csv 는 GitHub Pages·기존 pandas 리더용 내보내기 산출물로 유지. upsert() 는 신규 행만
+  CSV 에 append (기존 값 교체가 있으면 전체 재작성).
+- CSV 를 직접 쓰는 수집기(fetch_* 다수)와 공존: 저장소가 마지막으로 본 CSV 지문
+  (size, mtime_ns, 소비 offset, 직전 64KB sha256)을 기록해 두고
+  · 파일이 뒤로만 자랐으면 → 늘어난 바이트만 파싱해 반영 (append 경로 O(신규 행))
+  · 그 외(재작성·축소) → 전체 재적재
+- 같은 키가 CSV 에 두 번 이상 있으면 나중 행 값이 이긴다 (행 위치는 처음 등장 자리).
+
+저장 위치: DATASET_STORE 환경변수 → 기본 <CSV 폴더>/.dataset_store.sqlite (gitignore).
+
+사용 예:
+    import dataset_store
+    added = dataset_store.upsert([('2026-08-21', 'KOSPI', '3,201.5', 'INDEX_KR')])
+    s = dataset_store.series('KOSPI', since='2026-01-01')     # pd.Series (DatetimeIndex → float)
+    dataset_store.latest(['KOSPI', 'KOSDAQ'])                 # {'KOSPI': ('2026-08-21', 3201.5), ...}
+    dataset_store.names('SEIBro')                             # 데이터 타입별 제품명 목록
+    dataset_store.item_types()                                # {제품명: 데이터 타입}
+
+조회 사용처: create_landing_highlights(시리즈·SEIBro 최신값), dashboard_data.item_types
+(get_item_category). 전체 프레임이 필요한 차트 빌더는 dashboard_data.dataset() 그대로.
+"""
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+
+from config import CSV_FILE
+
+HEADER = ['날짜', '제품명', '가격', '데이터 타입']
+_TAIL = 64 * 1024
+
+
+def store_path(csv_path=CSV_FILE):
+    return os.getenv('DATASET_STORE') or os.path.join(
+        os.path.dirname(os.path.abspath(csv_path)), '.dataset_store.sqlite')
+
+
+def _conn(csv_path):
+    conn = sqlite3.connect(store_path(csv_path), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS rows (
+            date TEXT NOT NULL,
+            name TEXT NOT NULL,
+            price TEXT,
+            type TEXT,
+            UNIQUE (date, name)
+        );
+        CREATE INDEX IF NOT EXISTS rows_name_date ON rows (name, date);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """)
+    return conn
+
+
+def _meta(conn):
+    return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+
+def _set_meta(conn, **kv):
+    conn.executemany("INSERT INTO meta(key, value) VALUES(?, ?) "
+                     "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                     [(k, str(v)) for k, v in kv.items()])
+
+
+def _tail_sha(f, end):
+    f.seek(max(0, end - _TAIL))
+    return hashlib.sha256(f.read(end - max(0, end - _TAIL))).hexdigest()
+
+
+def _norm(row):
+    """(날짜, 제품명, 가격, 데이터 타입) → 문자열 4-튜플 (csv.writer 와 같은 변환)."""
+    row = list(row) + [''] * (4 - len(row))
+    return tuple('' if v is None else str(v) for v in row[:4])
+
+
+_UPSERT_LAST = ("INSERT INTO rows(date, name, price, type) VALUES(?,?,?,?) "
+                "ON CONFLICT(date, name) DO UPDATE SET price=excluded.price, type=excluded.type")
+
+
+def _record_csv(conn, csv_path, offset=None):
+    st = os.stat(csv_path)
+    offset = st.st_size if offset is None else offset
+    with open(csv_path, 'rb') as f:
+        tail = _tail_sha(f, offset)
+    _set_meta(conn, csv_stat=f"{st.st_size}:{st.st_mtime_ns}", csv_offset=offset, csv_tail=tail)
+
+
+def _sync_locked(conn, csv_path):
+    """트랜잭션 안에서 CSV 변경분 반영. 반영한 행 수 (-1 = 전체 재적재)."""
+    if not os.path.exists(csv_path):
+        return 0
+    st = os.stat(csv_path)
+    meta = _meta(conn)
+    if meta.get('csv_stat') == f"{st.st_size}:{st.st_mtime_ns}":
+        return 0
+    offset = int(meta.get('csv_offset', -1))
+    with open(csv_path, 'rb') as f:
+        if 0 < offset <= st.st_size and meta.get('csv_tail') == _tail_sha(f, offset):
+            f.seek(offset)
+            chunk = f.read()
+            full = False
+        else:
+            f.seek(0)
+            chunk = f.read()
+            full = True
+    end = chunk.rfind(b'\n') + 1          # 쓰는 중인 마지막 줄(개행 전)은 다음 동기화로
+    text = chunk[:end].decode('utf-8-sig' if full else 'utf-8')
+    reader = csv.reader(io.StringIO(text))
+    if full:
+        next(reader, None)
+        conn.execute("DELETE FROM rows")
+        offset = 0
+    rows = [_norm(r) for r in reader if len(r) >= 2]
+    conn.executemany(_UPSERT_LAST, rows)
+    _record_csv(conn, csv_path, offset + end)
+    return -1 if full else len(rows)
+
+
+def sync(csv_path=CSV_FILE):
+    """CSV 변경분을 저장소에 반영 (append 면 늘어난 부분만). 반영 행 수, -1 = 전체 재적재."""
+    conn = _conn(csv_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        n = _sync_locked(conn, csv_path)
+        conn.commit()
+        return n
+    finally:
+        conn.close()
+
+
+def export(csv_path=CSV_FILE):
+    """저장소 전체를 CSV 로 다시 쓴다 (원자적 교체)."""
+    conn = _conn(csv_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _sync_locked(conn, csv_path)
+        _export_locked(conn, csv_path)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _export_locked(conn, csv_path):
+    tmp = f"{csv_path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', newline='', encoding='utf-8-sig') as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        w.writerows(conn.execute("SELECT date, name, price, type FROM rows ORDER BY rowid"))
+    os.replace(tmp, csv_path)
+    _record_csv(conn, csv_path)
+
+
+# ── 쓰기 ───────────────────────────────────────────────────────────────
+def upsert(rows, replace=False, csv_path=CSV_FILE):
+    """(날짜, 제품명, 가격, 데이터 타입) 행들을 저장하고 CSV 에 반영. 신규 행 수 반환.
+
+    replace=False : 이미 있는 키는 건너뜀 (save_to_csv 구 동작 — 배치 내 중복은 첫 행).
+    replace=True  : 이미 있는 키도 값이 다르면 교체 (교체가 있으면 CSV 전체 재작성).
+    """
+    batch = {}
+    for r in rows:
+        r = _norm(r)
+        if replace or (r[0], r[1]) not in batch:
+            batch[(r[0], r[1])] = r
+    conn = _conn(csv_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _sync_locked(conn, csv_path)
+        new_rows, changed = [], 0
+        for (d, n), r in batch.items():
+            old = conn.execute("SELECT price, type FROM rows WHERE date=? AND name=?", (d, n)).fetchone()
+            if old is None:
+                new_rows.append(r)
+            elif replace and tuple(old) != r[2:]:
+                conn.execute("UPDATE rows SET price=?, type=? WHERE date=? AND name=?", (r[2], r[3], d, n))
+                changed += 1
+        conn.executemany("INSERT INTO rows(date, name, price, type) VALUES(?,?,?,?)", new_rows)
+        if changed:
+            _export_locked(conn, csv_path)
+        elif new_rows:
+            is_new = not os.path.exists(csv_path)
+            with open(csv_path, 'a', newline='', encoding='utf-8-sig') as f:
+                w = csv.writer(f)
+                if is_new:
+                    w.writerow(HEADER)
+                w.writerows(new_rows)
+            _record_csv(conn, csv_path)
+        conn.commit()
+        return len(new_rows)
+    finally:
+        conn.close()
+
+
+# ── 조회 ───────────────────────────────────────────────────────────────
+def _to_float(v):
+    try:
+        f = float(str(v).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+    return None if f != f else f
+
+
+def _read(sql, args, csv_path):
+    sync(csv_path)
+    conn = _conn(csv_path)
+    try:
+        return conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+
+
+def get(date, name, csv_path=CSV_FILE):
+    """단건 조회 → (가격 원문, 데이터 타입) 또는 None."""
+    row = _read("SELECT price, type FROM rows WHERE date=? AND name=?", (str(date), name), csv_path)
+    return tuple(row[0]) if row else None
+
+
+def series(name, since=None, dtype=None, csv_path=CSV_FILE):
+    """제품명 시계열 → pd.Series (DatetimeIndex 오름차순 → float, 숫자 아닌 값 제외).
+
+    dtype 을 주면 그 데이터 타입 행만.
+    """
+    import pandas as pd
+    sql = "SELECT date, price FROM rows WHERE name=?"
+    args = [name]
+    if dtype is not None:
+        sql += " AND type=?"
+        args.append(dtype)
+    if since is not None:
+        sql += " AND date >= ?"
+        args.append(str(pd.Timestamp(since).date()))
+    pairs = [(d, _to_float(p)) for d, p in _read(sql + " ORDER BY date", args, csv_path)]
+    pairs = [(d, v) for d, v in pairs if v is not None]
+    return pd.Series([v for _, v in pairs], index=pd.to_datetime([d for d, _ in pairs]),
+                     name=name, dtype=float)
+
+
+def latest(names, dtype=None, csv_path=CSV_FILE):
+    """{제품명: (최근 날짜, 값 float)} — 숫자로 읽히는 마지막 관측. 없는 제품명은 빠진다."""
+    sync(csv_path)
+    conn = _conn(csv_path)
+    sql = "SELECT date, price FROM rows WHERE name=?" + ("" if dtype is None else " AND type=?")
+    try:
+        out = {}
+        for name in names:
+            args = (name,) if dtype is None else (name, dtype)
+            for d, p in conn.execute(sql + " ORDER BY date DESC", args):
+                v = _to_float(p)
+                if v is not None:
+                    out[name] = (d, v)
+                    break
+        return out
+    finally:
+        conn.close()
+
+
+def names(dtype=None, csv_path=CSV_FILE):
+    """제품명 목록 (정렬). dtype 을 주면 그 데이터 타입 행이 있는 제품명만."""
+    if dtype is None:
+        rows = _read("SELECT DISTINCT name FROM rows ORDER BY name", (), csv_path)
+    else:
+        rows = _read("SELECT DISTINCT name FROM rows WHERE type=? ORDER BY name", (dtype,), csv_path)
+    return [r[0] for r in rows]
+
+
+def item_types(csv_path=CSV_FILE):
+    """{제품명: 데이터 타입} — 같은 제품명은 CSV 에 처음 등장한 행 기준 (앞뒤 공백 제거)."""
+    out = {}
+    for name, dtype in _read("SELECT name, type FROM rows ORDER BY rowid", (), csv_path):
+        out.setdefault((name or '').strip(), (dtype or '').strip())
+    return out
@@ -40,6 +40,7 @@ LINE_COLOR = '#404040'  # RGB(64, 64, 64)
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import wrap_config
+import wrap_nav_store
 PORTFOLIO_NAMES = wrap_config.portfolio_names()
 
 def smart_format_yaxis(y, pos):
@@ -69,7 +70,7 @@ def draw_wrap_charts():
 
     try:
         # Load data from '기준가' sheet
-        df = pd.read_excel(WRAP_NAV_FILE, sheet_name='기준가')
+        df = wrap_nav_store.read_sheet('기준가', xlsx=WRAP_NAV_FILE)
 
         # Set Date column as index
         if 'Date' in df.columns:
@@ -28,6 +28,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s', stream
 
 from kis_token import kis_get
 from krx_session import is_session
+import high_history
 import newhigh_themes
 
 KST = timezone(timedelta(hours=9))
@@ -38,8 +39,8 @@ TOP_N = 30
 MIN_MKTCAP = 200_000_000_000   # 2,000억 (원)
 
 # 20일 신고가 (텔레그램 알림용 산출물) — ra_sisyphe_bot이 16:00에 읽어 전송
-YF_HISTORY_FILE = 'stock_price_history.json'    # yfinance 과거(폴백/초기 seed)
-KIS_HISTORY_FILE = 'kis_price_history.json'      # 오늘부터 KIS 당일고가/종가 누적
+YF_HISTORY_FILE = high_history.YF_HISTORY_FILE    # yfinance 과거(폴백/초기 seed, JSON → npz 사이드카)
+KIS_HISTORY_FILE = high_history.KIS_HISTORY_FILE  # 오늘부터 KIS 당일고가/종가 누적 (npz)
 KIS_HIST_KEEP_DAYS = 300                         # 52주(252) 룩백 + 버퍼 보관 (yfinance 폴백 의존도 점진 감소)
 NEWHIGH_OUTPUT = 'newhigh_20d.json'
 NEWHIGH_DAYS = 20
@@ -253,34 +254,21 @@ def rank_all(rows, date_disp):
 
 # ───────────────────────── KIS 가격 히스토리 누적 + 20일 신고가 ─────────────────────────
 def accumulate_kis_history(master, prices, date_disp):
-    """오늘 KIS 당일고가/종가를 kis_price_history.json에 누적(오늘 것 덮어쓰기) + 오래된 날짜 prune."""
+    """오늘 KIS 당일고가/종가를 kis_price_history.npz에 누적(오늘 것 덮어쓰기) + 오래된 날짜 prune."""
     # 가드 2/3 — 호출부가 뚫려도 비거래일은 히스토리에 남기지 않는다(룩백 창 보호).
     if not is_session(date_disp):
         logging.warning('비거래일 %s 히스토리 기록 차단', date_disp)
         return
-    try:
-        with open(KIS_HISTORY_FILE, encoding='utf-8') as f:
-            hist = json.load(f)
-    except Exception:
-        hist = {'dates': [], 'stocks': {}}
-    stocks = hist.setdefault('stocks', {})
+    rows = {}
     for code, p in prices.items():
         if not p.get('price') or not p.get('high'):
             continue
         m = master.get(code, {})
-        st = stocks.setdefault(code, {'name': m.get('name', ''), 'market': m.get('market', ''),
-                                      'highs': {}, 'closes': {}})
-        st['highs'][date_disp] = p['high']       # 당일 고가
-        st['closes'][date_disp] = p['price']     # 마감 후 현재가 = 종가
-    dates = sorted(set(hist.get('dates', [])) | {date_disp})
-    keep = set(dates[-KIS_HIST_KEEP_DAYS:])      # 최근 N거래일만 보관
-    for st in stocks.values():
-        st['highs'] = {d: v for d, v in st['highs'].items() if d in keep}
-        st['closes'] = {d: v for d, v in st['closes'].items() if d in keep}
-    hist['dates'] = sorted(keep)
-    with open(KIS_HISTORY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(hist, f, ensure_ascii=False)
-    logging.info('KIS 히스토리 누적: %s (보관 %d거래일)', date_disp, len(keep))
+        rows[code] = (p['high'], p['price'], m.get('name', ''), m.get('market', ''))   # 당일 고가, 종가
+    hist = high_history.upsert_day(high_history.load_kis(KIS_HISTORY_FILE), date_disp, rows)
+    hist = high_history.prune(hist, KIS_HIST_KEEP_DAYS)      # 최근 N거래일만 보관
+    high_history.save(hist, KIS_HISTORY_FILE)
+    logging.info('KIS 히스토리 누적: %s (보관 %d거래일)', date_disp, len(hist))
 
 
 def compute_newhigh_20d(master, prices, date_disp, now_iso):
@@ -289,18 +277,17 @@ def compute_newhigh_20d(master, prices, date_disp, now_iso):
     각 종목에 is_52w 플래그(당일 고가 > 과거 252거래일 최대값=52주 신고가도 달성)를 부여.
     52주는 20일의 부분집합(252⊃20)이라 별도 리스트 대신 플래그로 표시 → 봇이 🔥 뱃지로 강조.
     과거 고가는 KIS 히스토리 우선 + yfinance 폴백 머지 → 누적될수록 자연히 KIS 단일화.
+    창 최대값은 high_history.prior_highs 가 전 종목을 배열 연산 한 번으로 구한다.
     ⚠️ yfinance 시드가 오래되면 그 갭 구간 고가 누락 → KIS 누적이 252일 채우기 전까지 52주 과다판정 여지.
     """
-    def _load(path):
-        try:
-            with open(path, encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {'dates': [], 'stocks': {}}
-    yf_hist = _load(YF_HISTORY_FILE)
-    kis_hist = _load(KIS_HISTORY_FILE)
-    yf_stocks = yf_hist.get('stocks', {})
-    kis_stocks = kis_hist.get('stocks', {})
+    # 과거 고가 머지: 날짜별 KIS 우선, 없으면 yfinance
+    hist = high_history.merge(high_history.load_kis(KIS_HISTORY_FILE),
+                              high_history.load_yf(YF_HISTORY_FILE))
+    # 가드 3/3 — 이미 기록된 비거래일이 남아 있어도 판정 창에는 넣지 않는다 (prior_highs 의 거래일 마스크).
+    # (읽기 필터가 있어야 과거 오염 정리 전에도 판정이 정확해진다)
+    windows = high_history.prior_highs(hist, date_disp,
+                                       (NEWHIGH_DAYS, NEWHIGH_120D_DAYS, NEWHIGH_52W_DAYS))
+    col = hist.code_index()
     sector_map = load_sector_map()
 
     out20 = []
@@ -312,33 +299,18 @@ def compute_newhigh_20d(master, prices, date_disp, now_iso):
         mktcap = p['price'] * m['shares']
         if not passes_filter(m['name'], code, mktcap):
             continue
-        # 과거 고가 머지: 날짜별 KIS 우선, 없으면 yfinance
-        yf_h = (yf_stocks.get(code) or {}).get('highs', {})
-        kis_h = (kis_stocks.get(code) or {}).get('highs', {})
-        # 가드 3/3 — 이미 기록된 비거래일이 남아 있어도 판정 창에는 넣지 않는다.
-        # (읽기 필터가 있어야 과거 오염 정리 전에도 판정이 정확해진다)
-        past = {}
-        for d, v in yf_h.items():
-            if d < date_disp and v and is_session(d):
-                past[d] = v
-        for d, v in kis_h.items():                # KIS가 덮어씀(우선)
-            if d < date_disp and v and is_session(d):
-                past[d] = v
-        if not past:
+        j = col.get(code)
+        if j is None or not windows[NEWHIGH_DAYS][1][j]:
             continue
-        dates_sorted = sorted(past)
         high = p['high']
         # 3종 룩백 각각 독립 판정 (52w⊂120d⊂20d 이지만 KRX와 동일하게 타입별로 emit)
-        win20 = dates_sorted[-NEWHIGH_DAYS:]
-        win120 = dates_sorted[-NEWHIGH_120D_DAYS:]
-        win52 = dates_sorted[-NEWHIGH_52W_DAYS:]
-        prev20 = max(past[d] for d in win20)
-        prev120 = max(past[d] for d in win120)
-        prev52 = max(past[d] for d in win52)
+        (prev20, n20), (prev120, n120), (prev52, n52w) = (
+            (high_history.plain(windows[n][0][j]), int(windows[n][1][j]))
+            for n in (NEWHIGH_DAYS, NEWHIGH_120D_DAYS, NEWHIGH_52W_DAYS))
         # 실제 사용된 창 길이 — 상장 직후 종목은 창이 짧아 '52주 신고가'가 과대 해석된다.
-        lookback = {'newhigh_20d': (len(win20), NEWHIGH_DAYS),
-                    'newhigh_120d': (len(win120), NEWHIGH_120D_DAYS),
-                    'newhigh_52w': (len(win52), NEWHIGH_52W_DAYS)}
+        lookback = {'newhigh_20d': (n20, NEWHIGH_DAYS),
+                    'newhigh_120d': (n120, NEWHIGH_120D_DAYS),
+                    'newhigh_52w': (n52w, NEWHIGH_52W_DAYS)}
         is_20 = high > prev20
         is_120 = high > prev120
         is_52w = high > prev52
@@ -367,9 +339,9 @@ def compute_newhigh_20d(master, prices, date_disp, now_iso):
             'sector': sector_map.get(code, '기타'),
             'price': p['price'], 'chg': round(p['chg'], 2),
             'high': high, 'prev_high': prev20, 'trdval': p['trdval'], 'mktcap': mktcap,
-            'lookback': len(win20), 'is_52w': is_52w,
-            'lookback_52w': len(win52),
-            'history_complete_52w': len(win52) >= NEWHIGH_52W_DAYS,
+            'lookback': n20, 'is_52w': is_52w,
+            'lookback_52w': n52w,
+            'history_complete_52w': n52w >= NEWHIGH_52W_DAYS,
         })
     out20.sort(key=lambda x: x['trdval'], reverse=True)   # 거래대금순
     n52 = sum(1 for s in out20 if s['is_52w'])
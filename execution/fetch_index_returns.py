@@ -71,8 +71,9 @@ def load_nav_kr_indices() -> dict:
     """Wrap_NAV.xlsx '기준가' 시트에서 KOSPI/KOSDAQ 일별 종가 Series dict 반환.
     실패/부재 시 {} → 호출부가 야후 폴백. (1M=21거래일, history=252거래일 모두 커버하도록 전체 시트 반환)"""
     try:
+        import wrap_nav_store
         nav_file = os.path.join(ROOT, 'Wrap_NAV.xlsx')
-        df = pd.read_excel(nav_file, sheet_name='기준가')
+        df = wrap_nav_store.read_sheet('기준가', xlsx=nav_file)
         df.columns = [str(c).strip() for c in df.columns]  # 컬럼명 방어(공백/BOM)
         if 'Date' not in df.columns:
             return {}
@@ -474,7 +474,10 @@ def main(target_date=None):
     # 4. 120일선 계산 (Wrap_NAV.xlsx 기준가)
     try:
         import pandas as pd
-        nav = pd.read_excel('Wrap_NAV.xlsx', sheet_name='기준가')
+        import wrap_nav_store
+        # 120거래일 + 여유분만 로드
+        since = pd.Timestamp.now().normalize() - pd.Timedelta(days=300)
+        nav = wrap_nav_store.read_sheet('기준가', start=since, xlsx='Wrap_NAV.xlsx')
         nav['Date'] = pd.to_datetime(nav['Date'])
         nav = nav.sort_values('Date')
         for col, prefix in [('KOSPI', 'k'), ('KOSDAQ', 'q')]:
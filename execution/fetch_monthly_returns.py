@@ -76,7 +76,8 @@ def fetch_monthly_closes_from_nav(col: str) -> pd.Series:
     index=YYYY-MM 문자열, value=close. 야후 경로와 동일한 월말-resample 규칙.
     파일/시트/컬럼 부재 또는 빈 컬럼이면 ValueError → 호출부에서 야후로 폴백.
     """
-    df = pd.read_excel(NAV_FILE, sheet_name=NAV_SHEET)
+    import wrap_nav_store
+    df = wrap_nav_store.read_sheet(NAV_SHEET, xlsx=NAV_FILE)
     df.columns = [str(c).strip() for c in df.columns]  # 컬럼명 방어(공백/BOM)
     if 'Date' not in df.columns or col not in df.columns:
         raise ValueError(f"기준가 시트 컬럼 없음: Date/{col}")
@@ -0,0 +1,246 @@
+"""
+KRX 종목 일별 고가·종가 히스토리 — (날짜 × 종목) 조밀 배열 + npz 바이너리 저장.
+
+배경: compute_newhigh_20d 가 마스터 전 종목(~2,500)마다 kis_price_history.json 과
+stock_price_history.json 의 고가 dict 를 머지하고, 날짜마다 krx_session.is_session 을 부르고,
+정렬한 뒤 창 3개(20/120/252)의 최대값을 따로 구했다. 히스토리 JSON 도 매번 통째로 파싱·직렬화
+→ KIS_HIST_KEEP_DAYS 가 늘수록 16:20·18:30 재수집 시간과 메모리가 같이 늘었다.
+
+구조:
+- History: dates(datetime64[D] 오름차순) × codes(str 오름차순) 의 highs·closes float64 배열
+  (0 = 값 없음) + 종목별 name·market.
+- KIS 누적분: kis_price_history.npz (np.savez 비압축 — 로드가 메모리 복사 수준).
+  npz 가 아직 없으면 기존 kis_price_history.json 을 변환해 이어 쓴다 (JSON 은 지우지 않는다).
+- yfinance 시드: stock_price_history.json 은 update_price_history.py 가 계속 JSON 으로 쓴다 →
+  변환본을 stock_price_history.npz 사이드카로 두고 원본 (size, mtime_ns) 가 같으면 재사용.
+- 거래일 마스크: krx_session.session_mask 로 날짜 축만 판정한다 (종목 수와 무관).
+- 직전 N거래일 최고가: prior_highs() — 종목별 '값이 있는 거래일' 중 최근 N개(종전
+  sorted(past)[-N:] 와 같은 창)의 최대값을, 역방향 누적 최대 1회 + 창 시작 행 gather 로 구한다.
+"""
+import json
+import logging
+import os
+
+import numpy as np
+
+from krx_session import session_mask
+
+KIS_HISTORY_FILE = 'kis_price_history.npz'
+KIS_HISTORY_LEGACY = 'kis_price_history.json'    # 변환 전 형식 (첫 로드 때 1회 변환)
+YF_HISTORY_FILE = 'stock_price_history.json'     # update_price_history.py 산출 (JSON 유지)
+YF_SIDECAR = 'stock_price_history.npz'
+
+def _num(v):
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return 0.0
+    return f if f > 0 else 0.0       # NaN·0·음수 = 값 없음
+
+
+def plain(v):
+    """JSON 출력용 — 정수값이면 int (종전 dict 값과 같은 표기)."""
+    v = float(v)
+    return int(v) if v.is_integer() else v
+
+
+class History:
+    __slots__ = ('dates', 'codes', 'names', 'markets', 'highs', 'closes')
+
+    def __init__(self, dates, codes, names, markets, highs, closes):
+        self.dates = dates
+        self.codes = codes
+        self.names = names
+        self.markets = markets
+        self.highs = highs
+        self.closes = closes
+
+    @classmethod
+    def empty(cls):
+        z = np.zeros((0, 0))
+        s = np.array([], dtype=str)
+        return cls(np.array([], dtype='datetime64[D]'), s, s, s, z, z.copy())
+
+    # ── 종전 JSON 형식 ↔ 배열 ─────────────────────────────────────────
+    @classmethod
+    def from_legacy(cls, obj):
+        """{'dates': [...], 'stocks': {code: {name, market, highs{d:v}, closes{d:v}}}} → History."""
+        stocks = (obj or {}).get('stocks') or {}
+        dset = set((obj or {}).get('dates') or [])
+        for st in stocks.values():
+            dset.update(st.get('highs') or {})
+            dset.update(st.get('closes') or {})
+        days = []
+        for d in dset:
+            try:
+                days.append((np.datetime64(str(d)[:10], 'D'), d))
+            except ValueError:
+                continue
+        days.sort()
+        row = {d: i for i, (_, d) in enumerate(days)}
+        codes = sorted(stocks)
+        highs = np.zeros((len(days), len(codes)))
+        closes = np.zeros((len(days), len(codes)))
+        for j, code in enumerate(codes):
+            st = stocks[code]
+            for key, arr in (('highs', highs), ('closes', closes)):
+                for d, v in (st.get(key) or {}).items():
+                    i = row.get(d)
+                    if i is not None:
+                        arr[i, j] = _num(v)
+        return cls(np.array([dt for dt, _ in days], dtype='datetime64[D]'),
+                   np.array(codes, dtype=str),
+                   np.array([stocks[c].get('name') or '' for c in codes], dtype=str),
+                   np.array([stocks[c].get('market') or '' for c in codes], dtype=str),
+                   highs, closes)
+
+    def to_legacy(self):
+        """종전 JSON 형식 dict (repair_featured_history 등 dict 소비자용)."""
+        ds = [str(d) for d in self.dates]
+        stocks = {}
+        for j, code in enumerate(self.codes):
+            st = {'name': str(self.names[j]), 'market': str(self.markets[j]), 'highs': {}, 'closes': {}}
+            for key, arr in (('highs', self.highs), ('closes', self.closes)):
+                col = arr[:, j]
+                st[key] = {ds[i]: plain(col[i]) for i in np.flatnonzero(col)}
+            stocks[str(code)] = st
+        return {'dates': ds, 'stocks': stocks}
+
+    def to_stocks(self, sessions_only=True):
+        """code → {name, highs{d:v}, closes{d:v}} (create_featured_v2 형식, 기본 거래일만)."""
+        keep = session_mask(self.dates) if sessions_only else np.ones(len(self.dates), bool)
+        sub = History(self.dates[keep], self.codes, self.names, self.markets,
+                      self.highs[keep], self.closes[keep])
+        return {code: {'name': st['name'], 'highs': st['highs'], 'closes': st['closes']}
+                for code, st in sub.to_legacy()['stocks'].items()}
+
+    def code_index(self):
+        return {str(c): j for j, c in enumerate(self.codes)}
+
+    def __len__(self):
+        return len(self.dates)
+
+
+# ── 저장/로드 ─────────────────────────────────────────────────────────
+def save(hist, path=KIS_HISTORY_FILE, **extra):
+    """npz 원자적 기록 (임시파일 → os.replace)."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, dates=hist.dates, codes=hist.codes, names=hist.names, markets=hist.markets,
+                 highs=hist.highs, closes=hist.closes,
+                 **{k: np.array(v, dtype=str) for k, v in extra.items()})
+    os.replace(tmp, path)
+
+
+def _load_npz(path):
+    with np.load(path, allow_pickle=False) as z:
+        extra = {k: str(z[k]) for k in z.files if k not in History.__slots__}
+        return History(*(z[k] for k in History.__slots__)), extra
+
+
+def _load_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return History.from_legacy(json.load(f))
+    except (OSError, ValueError):
+        return History.empty()
+
+
+def load_kis(path=KIS_HISTORY_FILE, legacy=KIS_HISTORY_LEGACY):
+    """KIS 누적 히스토리. npz 가 없으면 종전 JSON 변환 (둘 다 없으면 빈 History)."""
+    if os.path.exists(path):
+        try:
+            return _load_npz(path)[0]
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning('KIS 히스토리 npz 로드 실패(%s) — JSON 폴백', e)
+    if os.path.exists(legacy):
+        logging.info('KIS 히스토리 JSON → npz 변환 대상: %s', legacy)
+    return _load_json(legacy)
+
+
+def load_yf(path=YF_HISTORY_FILE, sidecar=YF_SIDECAR):
+    """yfinance 시드 히스토리. 원본 JSON (size, mtime_ns) 가 같으면 npz 사이드카 재사용."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return History.empty()
+    stamp = f'{st.st_size}:{st.st_mtime_ns}'
+    if os.path.exists(sidecar):
+        try:
+            hist, extra = _load_npz(sidecar)
+            if extra.get('src_stat') == stamp:
+                return hist
+        except (OSError, ValueError, KeyError):
+            pass
+    hist = _load_json(path)
+    try:
+        save(hist, sidecar, src_stat=stamp)
+    except OSError as e:
+        logging.warning('yfinance 히스토리 사이드카 기록 실패: %s', e)
+    return hist
+
+
+# ── 배열 연산 ────────────────────────────────────────────────────────
+def merge(primary, fallback):
+    """날짜·종목 합집합 배열. 같은 칸은 primary 값(>0)이 이긴다, 이름·시장도 primary 우선."""
+    dates = np.union1d(fallback.dates, primary.dates)
+    codes = np.union1d(fallback.codes, primary.codes)
+    highs = np.zeros((len(dates), len(codes)))
+    closes = np.zeros((len(dates), len(codes)))
+    names = np.full(len(codes), '', dtype=object)
+    markets = np.full(len(codes), '', dtype=object)
+    for src in (fallback, primary):
+        if not len(src.codes):
+            continue
+        ri = np.searchsorted(dates, src.dates)
+        ci = np.searchsorted(codes, src.codes)
+        for dst, val in ((highs, src.highs), (closes, src.closes)):
+            if len(ri):
+                block = np.ix_(ri, ci)
+                dst[block] = np.where(val > 0, val, dst[block])
+        for dst, val in ((names, src.names), (markets, src.markets)):
+            has = val != ''
+            dst[ci[has]] = val[has]
+    return History(dates, codes, names.astype(str), markets.astype(str), highs, closes)
+
+
+def upsert_day(hist, day, rows):
+    """하루치 {code: (high, close, name, market)} 를 덮어쓴 새 History."""
+    codes = sorted(rows)
+    one = History(np.array([day], dtype='datetime64[D]'), np.array(codes, dtype=str),
+                  np.array([rows[c][2] or '' for c in codes], dtype=str),
+                  np.array([rows[c][3] or '' for c in codes], dtype=str),
+                  np.array([[_num(rows[c][0]) for c in codes]]),
+                  np.array([[_num(rows[c][1]) for c in codes]]))
+    return merge(one, hist)
+
+
+def prune(hist, keep_days):
+    """최근 keep_days 개 날짜만 + 값이 하나도 없는 종목 제거."""
+    hist = History(hist.dates[-keep_days:], hist.codes, hist.names, hist.markets,
+                   hist.highs[-keep_days:], hist.closes[-keep_days:])
+    live = (hist.highs > 0).any(axis=0) | (hist.closes > 0).any(axis=0)
+    return History(hist.dates, hist.codes[live], hist.names[live], hist.markets[live],
+                   hist.highs[:, live], hist.closes[:, live])
+
+
+def prior_highs(hist, before, windows):
+    """before(미포함) 이전 거래일 고가 기준, 종목별 최근 N개 관측의 최대값.
+
+    → {N: (prev float64[종목], used int[종목])} — used = 실제 창 길이(관측이 N 개 미만이면
+    그 수, 0 이면 prev=0). 종목 순서는 hist.codes.
+    """
+    rows = (hist.dates < np.datetime64(str(before)[:10], 'D')) & session_mask(hist.dates)
+    h = hist.highs[rows]
+    n_codes = h.shape[1]
+    if not len(h):
+        zero = np.zeros(n_codes)
+        return {n: (zero, np.zeros(n_codes, dtype=int)) for n in windows}
+    obs = np.cumsum((h > 0)[::-1], axis=0)[::-1]             # 행 t 이후(포함) 관측 수
+    suffix = np.maximum.accumulate(h[::-1], axis=0)[::-1]     # 행 t 이후(포함) 최대
+    cols = np.arange(n_codes)
+    out = {}
+    for n in windows:
+        start = np.maximum((obs >= n).sum(axis=0) - 1, 0)     # 최근 n개 관측이 시작되는 행
+        out[n] = (suffix[start, cols], np.minimum(obs[0], n))
+    return out
@@ -14,7 +14,7 @@ KIS 기반 시가총액 조회 — 투자유의종목(market_alert) enrichment 
 import logging
 
 try:
-    from kis_token import kis_get, get_access_token
+    from kis_token import kis_get, get_access_token, run_concurrent
     _AVAILABLE = True
 except Exception:  # 모듈/자격증명 부재 시에도 import는 깨지지 않게
     _AVAILABLE = False
@@ -54,13 +54,23 @@ def fetch_stock_meta(codes):
 
     # 중복 제거 + 공란 제거 (입력 순서 보존)
     uniq = [c for c in dict.fromkeys(codes) if c]
-    for code in uniq:
+
+    def _one(code):
         try:
-            j = kis_get(
+            return kis_get(
                 _INQUIRE_PRICE_PATH,
                 tr_id=_TR_ID,
                 params={"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code},
             )
+        except Exception as e:
+            logging.debug("KIS 종목 메타 조회 실패 %s: %s", code, e)
+            return None
+
+    # 종목별 1콜을 동시 파이프라인 (속도 상한은 kis_token 공유 버킷)
+    for code, j in zip(uniq, run_concurrent(_one, uniq)):
+        if not j or isinstance(j, Exception):
+            continue
+        try:
             output = j.get("output") or {}
             avls = output.get("hts_avls")  # 시가총액 (억원)
             market = _canonical_market(output.get("rprs_mrkt_kor_name"))
@@ -72,7 +82,7 @@ def fetch_stock_meta(codes):
             if entry:
                 result[code] = entry
         except Exception as e:
-            logging.debug("KIS 종목 메타 조회 실패 %s: %s", code, e)
+            logging.debug("KIS 종목 메타 파싱 실패 %s: %s", code, e)
     return result
 
 
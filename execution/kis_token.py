@@ -12,6 +12,8 @@ KIS Open API 공유 액세스 토큰 매니저.
 - 자격증명 우선순위: 환경변수(KIS_APP_KEY/KIS_APP_SECRET) → ~/KIS/config/kis_devlp.yaml(my_app/my_sec).
 - 새 발급 전에 MCP/공식 kis_auth가 남긴 캐시(~/KIS/config/KIS<YYYYMMDD>)를 먼저 임포트해
   불필요한 재발급(알림톡)을 회피.
+- 초당 호출 제한(~20/s)은 appkey 단위 → 모든 프로세스가 토큰 캐시 옆 상태 파일(.rate)의
+  **공유 토큰 버킷**을 거친다. 배치는 kis_get_many / run_concurrent 로 스레드 파이프라인.
 
 production: Oracle VM(Linux, cron/systemd). local: Windows 테스트 가능(fcntl 없으면 msvcrt 폴백).
 
@@ -20,14 +22,21 @@ production: Oracle VM(Linux, cron/systemd). local: Windows 테스트 가능(fcnt
     tok = get_access_token()
     rows = kis_get("/uapi/domestic-stock/v1/quotations/volume-rank",
                    tr_id="FHPST01710000", params={...})
+    outs = kis_get_many([{"path": ..., "tr_id": ..., "params": {...}}, ...])
 """
 import os
 import json
 import time
+import math
+import struct
+import threading
 import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     from dotenv import load_dotenv
@@ -81,6 +90,72 @@ def _load_credentials():
     )
 
 
+_CREDS = None
+
+
+def _credentials():
+    """_load_credentials 프로세스 메모 (env/yaml 은 실행 중 바뀌지 않는다)."""
+    global _CREDS
+    if _CREDS is None:
+        _CREDS = _load_credentials()
+    return _CREDS
+
+
+# ───────────────────────────── HTTP 세션 ─────────────────────────────
+# 호출마다 bare requests.get → 매번 openapi.koreainvestment.com:9443 TLS 핸드셰이크.
+# 프로세스 공용 Session(keep-alive + 커넥션 풀)으로 재사용. 풀 크기는 동시 워커 수 이상.
+_SESSION = None
+_SESSION_MU = threading.Lock()
+
+
+def _session():
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_MU:
+            if _SESSION is None:
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2,
+                                      pool_maxsize=max(4, int(os.getenv("KIS_MAX_WORKERS", "8")) + 2))
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                _SESSION = sess
+    return _SESSION
+
+
+# ───────────────────────────── 지연 계측 ─────────────────────────────
+# tr_id 별 최근 _LAT_WINDOW 건 응답시간(ms). latency_stats() 로 p50/p99 조회
+# (quoteboard 스윕 META 에 노출 → keep-alive 전후 핸드셰이크 절감 확인용).
+_LAT_WINDOW = 2000
+_LAT = {}
+_LAT_MU = threading.Lock()
+
+
+def _record_latency(tr_id, ms):
+    with _LAT_MU:
+        q = _LAT.get(tr_id)
+        if q is None:
+            q = _LAT[tr_id] = deque(maxlen=_LAT_WINDOW)
+        q.append(ms)
+
+
+def _percentile(sorted_vals, pct):
+    """nearest-rank 백분위."""
+    if not sorted_vals:
+        return None
+    k = max(0, math.ceil(pct / 100.0 * len(sorted_vals)) - 1)
+    return sorted_vals[k]
+
+
+def latency_stats(tr_id=None):
+    """{tr_id: {'n', 'p50', 'p99', 'max'}} (ms, 최근 _LAT_WINDOW 건). tr_id 지정 시 그 항목만(없으면 {})."""
+    with _LAT_MU:
+        snap = {k: sorted(v) for k, v in _LAT.items() if tr_id is None or k == tr_id}
+    out = {k: {"n": len(v), "p50": round(_percentile(v, 50), 1),
+               "p99": round(_percentile(v, 99), 1), "max": round(v[-1], 1)}
+           for k, v in snap.items() if v}
+    return out.get(tr_id, {}) if tr_id is not None else out
+
+
 # ───────────────────────────── 파일 락 ─────────────────────────────
 @contextlib.contextmanager
 def _file_lock(timeout=30):
@@ -134,19 +209,25 @@ def _parse_dt(s):
     return datetime.strptime(s, "%Y-%m-%d %H:%M:%S").replace(tzinfo=KST)
 
 
-def _read_cache():
-    """우리 캐시 읽기 → 유효하면 토큰 문자열, 아니면 None."""
+def _read_cache_entry():
+    """우리 캐시 읽기 → 유효하면 (토큰, 만료 datetime), 아니면 None."""
     try:
         with open(CACHE_PATH, encoding="utf-8") as f:
             data = json.load(f)
         exp = _parse_dt(data["expires_at"])
         if exp > datetime.now(KST) + timedelta(seconds=_REFRESH_MARGIN_SEC):
-            return data["access_token"]
+            return data["access_token"], exp
     except Exception:
         pass
     return None
 
 
+def _read_cache():
+    """우리 캐시 읽기 → 유효하면 토큰 문자열, 아니면 None."""
+    entry = _read_cache_entry()
+    return entry[0] if entry else None
+
+
 def _write_cache(token, expires_at):
     os.makedirs(_CONFIG_DIR, exist_ok=True)
     tmp = CACHE_PATH + ".tmp"
@@ -198,8 +279,8 @@ def _issue_token():
         time.sleep(_MIN_REISSUE_INTERVAL_SEC - elapsed)
     _last_issue_attempt = time.time()
 
-    app, sec = _load_credentials()
-    res = requests.post(
+    app, sec = _credentials()
+    res = _session().post(
         f"{BASE_URL}/oauth2/tokenP",
         headers={"content-type": "application/json"},
         data=json.dumps(
@@ -220,44 +301,164 @@ def _issue_token():
     return token, expires_at
 
 
-def get_access_token(force=False):
-    """
-    공유 액세스 토큰 반환. 캐시 재사용 우선, 만료 시에만 락 잡고 단일 갱신.
-    force=True면 캐시 무시하고 강제 재발급(긴급 시에만).
+# 프로세스 메모리 토큰. 유효(만료 _REFRESH_MARGIN_SEC 이전)하면 캐시 파일도 다시 읽지 않는다 —
+# 파일 재확인은 만료 임박 또는 401 때만.
+_TOKEN_MEM = {"token": None, "exp": None}
+_TOKEN_MU = threading.Lock()
+
+
+def _mem_token():
+    exp = _TOKEN_MEM["exp"]
+    if _TOKEN_MEM["token"] and exp and exp > datetime.now(KST) + timedelta(seconds=_REFRESH_MARGIN_SEC):
+        return _TOKEN_MEM["token"]
+    return None
+
+
+def _remember(token, expires_at=None):
+    """메모리 토큰 갱신. 만료시각 모르면 캐시 파일에서, 그래도 없으면 보수적으로 짧게."""
+    exp = _parse_dt(expires_at) if expires_at else None
+    if exp is None:
+        entry = _read_cache_entry()
+        if entry and entry[0] == token:
+            exp = entry[1]
+        else:
+            exp = datetime.now(KST) + timedelta(seconds=_REFRESH_MARGIN_SEC + 300)
+    _TOKEN_MEM.update(token=token, exp=exp)
+    return token
+
+
+def _load_token_locked(force=False, rejected=None):
+    """파일 캐시/공식 캐시/신규 발급 순 토큰 확보 (호출측이 _TOKEN_MU 보유).
+
+    force=True 여도 rejected(401 받은 토큰)와 다른 유효 캐시가 있으면 그걸 쓴다
+    — 다른 프로세스가 이미 재발급한 경우 중복 발급(알림톡·1분 제한) 회피.
     """
     if not force:
         tok = _read_cache()
         if tok:
-            return tok
+            return _remember(tok)
 
     with _file_lock():
         # double-checked: 락 대기 중 다른 프로세스가 갱신했을 수 있음
+        tok = _read_cache()
+        if tok and (not force or (rejected and tok != rejected)):
+            return _remember(tok)
         if not force:
-            tok = _read_cache()
-            if tok:
-                return tok
             tok = _import_official_cache()  # 공식 캐시 재활용(알림톡 회피)
             if tok:
-                return tok
+                return _remember(tok)
         token, expires_at = _issue_token()
         _write_cache(token, expires_at)
-        return token
+        return _remember(token, expires_at)
 
 
-# ───────────────────────────── 인증 요청 헬퍼 ─────────────────────────────
-# KIS 초당 거래건수 제한(~20/s) 보수적 가드.
-_MIN_CALL_INTERVAL_SEC = 0.06
-_last_call_ts = 0.0
+def get_access_token(force=False):
+    """
+    공유 액세스 토큰 반환. 메모리 → 캐시 파일 재사용 우선, 만료 시에만 락 잡고 단일 갱신.
+    force=True면 캐시 무시하고 강제 재발급(긴급 시에만).
+    """
+    if not force:
+        tok = _mem_token()
+        if tok:
+            return tok
+    with _TOKEN_MU:
+        if not force:
+            tok = _mem_token()
+            if tok:
+                return tok
+        return _load_token_locked(force)
+
+
+def _token_after_401(rejected):
+    """401 받은 토큰 → 대체 토큰. 동시 워커들이 한꺼번에 401을 받아도 재발급은 1회."""
+    with _TOKEN_MU:
+        tok = _mem_token()
+        if tok and tok != rejected:
+            return tok          # 다른 스레드가 이미 교체
+        _TOKEN_MEM.update(token=None, exp=None)
+        return _load_token_locked(force=True, rejected=rejected)
+
+
+# ───────────────────────────── 공유 레이트 리미터 ─────────────────────────────
+# KIS 초당 거래건수 제한(~20/s, 계좌 단위)은 프로세스가 아니라 appkey 전체에 걸린다.
+# 구 _throttle(프로세스 로컬 60ms 간격)은 quoteboard·sisyphe_bot·featured 수집기가 서로의
+# 사용량을 모른 채 경합했다 → 토큰 캐시와 같은 디렉터리의 상태 파일 하나를 flock으로
+# 공유하는 토큰 버킷으로 교체. 어느 1초 창에서도 호출 수 ≤ BURST + RATE (기본 2 + 18 = 20).
+RATE_PATH = CACHE_PATH + ".rate"
+_RATE_PER_SEC = float(os.getenv("KIS_RATE_PER_SEC", "18"))
+_RATE_BURST = float(os.getenv("KIS_RATE_BURST", "2"))
+
+
+class _TokenBucket:
+    """프로세스 간 공유 토큰 버킷. 상태 = (남은 토큰, 마지막 갱신 epoch) 16바이트.
+
+    posix: RATE_PATH 를 flock 으로 잠그고 pread/pwrite. 파일을 못 쓰거나 Windows면
+    프로세스 로컬 버킷으로 폴백(구 _throttle 과 같은 범위 — 회귀 아님).
+    """
+
+    _FMT = "dd"
+
+    def __init__(self, path, rate, burst):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self._mu = threading.Lock()
+        self._fd = None
+        self._shared = os.name == "posix"
+        self._local = (burst, time.time())
+
+    def _open(self):
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        return self._fd
+
+    def _take(self, state, now):
+        tokens, ts = state
+        tokens = min(self.burst, tokens + max(0.0, now - ts) * self.rate)
+        if tokens >= 1.0:
+            return (tokens - 1.0, now), 0.0
+        return (tokens, now), (1.0 - tokens) / self.rate
+
+    def _try_acquire(self):
+        """토큰 1개 시도 → 0이면 획득, 양수면 그만큼 기다렸다 재시도."""
+        with self._mu:
+            if self._shared:
+                try:
+                    import fcntl
+                    fd = self._open()
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    try:
+                        raw = os.pread(fd, 16, 0)
+                        now = time.time()
+                        state = struct.unpack(self._FMT, raw) if len(raw) == 16 else (self.burst, now)
+                        state, wait = self._take(state, now)
+                        os.pwrite(fd, struct.pack(self._FMT, *state), 0)
+                        return wait
+                    finally:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                except OSError as e:
+                    print(f"[kis_token] 공유 레이트 파일 사용 불가({e}) → 프로세스 로컬 버킷")
+                    self._shared = False
+            self._local, wait = self._take(self._local, time.time())
+            return wait
+
+    def acquire(self):
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+_BUCKET = _TokenBucket(RATE_PATH, _RATE_PER_SEC, _RATE_BURST)
 
 
 def _throttle():
-    global _last_call_ts
-    gap = time.time() - _last_call_ts
-    if gap < _MIN_CALL_INTERVAL_SEC:
-        time.sleep(_MIN_CALL_INTERVAL_SEC - gap)
-    _last_call_ts = time.time()
+    _BUCKET.acquire()
 
 
+# ───────────────────────────── 인증 요청 헬퍼 ─────────────────────────────
 _MAX_5XX_RETRY = 3   # KIS 랭킹 엔드포인트는 간헐적으로 5xx 반환 → 짧게 재시도
 
 
@@ -265,16 +466,18 @@ def kis_get(path, tr_id, params, tr_cont="", custtype="P", retry_on_expire=True)
     """
     인증 GET 호출. 헤더 자동 구성(authorization/appkey/appsecret/tr_id) + timeout 강제.
     반환: 응답 JSON(dict).
-    - 토큰 만료(401) 시 1회 강제 재발급 후 재시도.
+    - 토큰 만료(401) 시 1회 토큰 교체(캐시 재확인 → 필요 시 재발급) 후 재시도.
+    - 프로세스 공용 keep-alive 세션 + 메모리 토큰/자격증명, tr_id별 지연 계측(latency_stats).
     - 5xx(서버 일시 오류)·네트워크 오류 시 최대 _MAX_5XX_RETRY회 짧은 백오프 재시도.
     """
-    app, sec = _load_credentials()
+    app, sec = _credentials()
     url = f"{BASE_URL}{path}"
+    sess = _session()
 
-    def _headers():
+    def _headers(token):
         return {
             "content-type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {get_access_token()}",
+            "authorization": f"Bearer {token}",
             "appkey": app,
             "appsecret": sec,
             "tr_id": tr_id,
@@ -282,16 +485,22 @@ def kis_get(path, tr_id, params, tr_cont="", custtype="P", retry_on_expire=True)
             "custtype": custtype,
         }
 
+    def _get(headers):
+        t0 = time.perf_counter()
+        try:
+            return sess.get(url, headers=headers, params=params, timeout=_HTTP_TIMEOUT)
+        finally:
+            _record_latency(tr_id, (time.perf_counter() - t0) * 1000)
+
     last_exc = None
     for attempt in range(_MAX_5XX_RETRY):
         _throttle()
         try:
-            headers = _headers()
-            res = requests.get(url, headers=headers, params=params, timeout=_HTTP_TIMEOUT)
+            token = get_access_token()
+            res = _get(_headers(token))
             if res.status_code == 401 and retry_on_expire:
-                headers["authorization"] = f"Bearer {get_access_token(force=True)}"
                 _throttle()
-                res = requests.get(url, headers=headers, params=params, timeout=_HTTP_TIMEOUT)
+                res = _get(_headers(_token_after_401(token)))
             if 500 <= res.status_code < 600:
                 last_exc = requests.HTTPError(f"{res.status_code} server error")
                 time.sleep(0.5 * (attempt + 1))   # 0.5s, 1.0s 백오프
@@ -304,6 +513,37 @@ def kis_get(path, tr_id, params, tr_cont="", custtype="P", retry_on_expire=True)
     raise last_exc
 
 
+# ───────────────────────── 동시 호출 (파이프라인) ─────────────────────────
+# 속도 상한은 공유 버킷이 지키므로 워커 수는 '응답 대기 겹치기' 용도. 8이면 RTT ~300ms에서도
+# 20/s 쿼터를 채운다.
+MAX_WORKERS = int(os.getenv("KIS_MAX_WORKERS", "8"))
+
+
+def run_concurrent(fn, items, max_workers=None):
+    """items 각각에 fn(item)을 스레드 풀로 실행 → 입력 순서 결과 리스트.
+
+    fn 이 던진 예외는 결과 자리에 예외 객체로 담는다 (한 건 실패가 배치 전체를 깨지 않게).
+    """
+    items = list(items)
+    workers = max(1, min(max_workers or MAX_WORKERS, len(items)))
+
+    def _safe(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            return e
+
+    if workers == 1:
+        return [_safe(it) for it in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis") as ex:
+        return list(ex.map(_safe, items))
+
+
+def kis_get_many(calls, max_workers=None):
+    """kis_get 배치. calls: [dict(path=, tr_id=, params=, ...)] → 입력 순서 [응답 JSON | 예외]."""
+    return run_concurrent(lambda kw: kis_get(**kw), calls, max_workers)
+
+
 # ───────────────────────── 배치 당일 등락률 ─────────────────────────
 _MULTPRICE_PATH = "/uapi/domestic-stock/v1/quotations/intstock-multprice"
 _MULTPRICE_TRID = "FHKST11300006"
@@ -317,25 +557,26 @@ def fetch_changes(codes):
     """
     out = {}
     codes = [str(c).zfill(6) for c in codes if c]
+    calls = []
     for i in range(0, len(codes), 30):
         chunk = codes[i:i + 30]
         params = {}
         for j, c in enumerate(chunk, 1):
             params[f"FID_COND_MRKT_DIV_CODE_{j}"] = "J"
             params[f"FID_INPUT_ISCD_{j}"] = c
-        try:
-            j = kis_get(_MULTPRICE_PATH, tr_id=_MULTPRICE_TRID, params=params)
-            for row in (j.get("output") or []):
-                code = row.get("inter_shrn_iscd")
-                ctrt = row.get("prdy_ctrt")
-                if not code or ctrt in (None, ""):
-                    continue
-                try:
-                    out[code] = float(ctrt)
-                except (TypeError, ValueError):
-                    continue
-        except Exception:
+        calls.append({"path": _MULTPRICE_PATH, "tr_id": _MULTPRICE_TRID, "params": params})
+    for j in kis_get_many(calls):
+        if isinstance(j, Exception):
             continue   # 청크 실패 → 해당 종목은 호출측에서 FDR 폴백
+        for row in (j.get("output") or []):
+            code = row.get("inter_shrn_iscd")
+            ctrt = row.get("prdy_ctrt")
+            if not code or ctrt in (None, ""):
+                continue
+            try:
+                out[code] = float(ctrt)
+            except (TypeError, ValueError):
+                continue
     return out
 
 
@@ -344,44 +585,115 @@ _DAILY_PATH = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
 _DAILY_TRID = "FHKST03010100"
 
 
-def fetch_daily_closes(codes, start_ymd, end_ymd, adj="0"):
+def _fetch_daily_range(code, start_ymd, end_ymd, adj):
+    """단일 종목 [start, end] 일봉 → ({'YYYY-MM-DD': 종가}, 완주 여부).
+
+    100봉/콜 제한 → 날짜 윈도우 분할. 중간 호출 실패 시 완주=False (부분 결과는 캐시 커버리지에 넣지 않는다).
+    """
+    series = {}
+    cur_end = end_ymd
+    guard = 0
+    done = False
+    while cur_end >= start_ymd and guard < 16:
+        guard += 1
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code,
+            "FID_INPUT_DATE_1": start_ymd, "FID_INPUT_DATE_2": cur_end,
+            "FID_PERIOD_DIV_CODE": "D", "FID_ORG_ADJ_PRC": adj,
+        }
+        try:
+            j = kis_get(_DAILY_PATH, tr_id=_DAILY_TRID, params=params)
+        except Exception:
+            return series, False
+        if j.get("rt_cd") not in (None, "0"):   # 업무 오류(200 + rt_cd≠0) — 빈 응답을 '휴장'으로 오인 금지
+            return series, False
+        bars = [b for b in (j.get("output2") or [])
+                if b.get("stck_bsop_date") and b.get("stck_clpr")]
+        if not bars:
+            done = True
+            break
+        for b in bars:
+            dd = b["stck_bsop_date"]
+            try:
+                series[f"{dd[:4]}-{dd[4:6]}-{dd[6:]}"] = float(b["stck_clpr"])
+            except (TypeError, ValueError):
+                continue
+        earliest = min(b["stck_bsop_date"] for b in bars)
+        if earliest <= start_ymd:
+            done = True
+            break
+        cur_end = (datetime.strptime(earliest, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+    return series, done or cur_end < start_ymd
+
+
+def _price_store():
+    try:
+        from execution import price_store
+    except ImportError:
+        import price_store
+    return price_store
+
+
+def _fetch_daily_cached(code, start_ymd, end_ymd, adj, conn):
+    """price_store 경유: 확정 이력은 로컬, 빠진 머리/꼬리(+재확인 창)만 API. 실패 시 None."""
+    price_store = _price_store()
+    ranges = price_store.plan_fetch(price_store.get_coverage(conn, code, adj), start_ymd, end_ymd)
+    for lo, hi in ranges:
+        got, ok = _fetch_daily_range(code, lo, hi, adj)
+        if not ok:
+            return None
+        if price_store.conflicts(conn, code, adj, got):
+            # 수정주가 재산출(분할·증자 등) → 이 종목 캐시 폐기 후 전 구간 재수신
+            price_store.drop_code(conn, code, adj)
+            got, ok = _fetch_daily_range(code, start_ymd, end_ymd, adj)
+            if not ok:
+                return None
+            price_store.store(conn, code, adj, got, start_ymd, end_ymd)
+            break
+        price_store.store(conn, code, adj, got, lo, hi)
+    return price_store.read_series(conn, code, adj, start_ymd, end_ymd)
+
+
+def fetch_daily_closes(codes, start_ymd, end_ymd, adj="0", use_cache=True, max_workers=None):
     """종목 코드 리스트 → {code(6자리): {'YYYY-MM-DD': 확정 종가(float)}}.
 
     KIS 일봉은 장 마감(15:30) 후 KRX 확정 종가를 반환 → FDR 일봉(당일 봉 장중 지연/잠정)과 달리
     NAV 기준가 산출에 적합한 '확정 종가' 소스. 100봉/콜 제한 → 날짜 윈도우 분할.
     조회 실패 종목은 결과 dict에서 누락(호출측 FDR 폴백). start_ymd/end_ymd: 'YYYYMMDD'.
+
+    use_cache=True(기본)면 price_store 로컬 캐시를 거쳐 빠진 구간만 API로 받는다
+    (KIS_PRICE_CACHE=0 이거나 캐시 DB를 열 수 없으면 구 동작 = 전 구간 직조회).
+    종목들은 run_concurrent 로 동시에 받는다 (속도 상한은 공유 버킷, 캐시 연결은 종목별).
     """
-    out = {}
-    for code in [str(c).zfill(6) for c in codes if c]:
-        series = {}
-        cur_end = end_ymd
-        guard = 0
-        while cur_end >= start_ymd and guard < 16:
-            guard += 1
-            params = {
-                "FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code,
-                "FID_INPUT_DATE_1": start_ymd, "FID_INPUT_DATE_2": cur_end,
-                "FID_PERIOD_DIV_CODE": "D", "FID_ORG_ADJ_PRC": adj,
-            }
+    price_store = None
+    if use_cache:
+        try:
+            price_store = _price_store()
+            if price_store.enabled():
+                price_store.get_conn().close()   # 스키마 준비 + 열림 확인
+            else:
+                price_store = None
+        except Exception as e:
+            print(f"[kis_token] 일봉 캐시 사용 불가({e}) → API 직조회")
+            price_store = None
+
+    def _one(code):
+        if price_store is not None:
             try:
-                j = kis_get(_DAILY_PATH, tr_id=_DAILY_TRID, params=params)
-            except Exception:
-                break
-            bars = [b for b in (j.get("output2") or [])
-                    if b.get("stck_bsop_date") and b.get("stck_clpr")]
-            if not bars:
-                break
-            for b in bars:
-                dd = b["stck_bsop_date"]
+                conn = price_store.get_conn()
                 try:
-                    series[f"{dd[:4]}-{dd[4:6]}-{dd[6:]}"] = float(b["stck_clpr"])
-                except (TypeError, ValueError):
-                    continue
-            earliest = min(b["stck_bsop_date"] for b in bars)
-            if earliest <= start_ymd:
-                break
-            cur_end = (datetime.strptime(earliest, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
-        if series:
+                    return _fetch_daily_cached(code, start_ymd, end_ymd, adj, conn)
+                finally:
+                    conn.close()
+            except Exception as e:   # 캐시 DB 잠김/손상 → 이 종목만 직조회
+                print(f"[kis_token] {code} 일봉 캐시 오류({e}) → API 직조회")
+        series, _ = _fetch_daily_range(code, start_ymd, end_ymd, adj)
+        return series
+
+    codes = list(dict.fromkeys(str(c).zfill(6) for c in codes if c))
+    out = {}
+    for code, series in zip(codes, run_concurrent(_one, codes, max_workers)):
+        if series and not isinstance(series, Exception):
             out[code] = series
     return out
 
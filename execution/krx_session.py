@@ -8,15 +8,30 @@ KRX 거래일 판별 — 주말 + 법정공휴일 + 근로자의날(5/1) + 연
 holidays 미설치 환경에서는 주말만으로 판정하고 경고를 남긴다(fail-open).
 가드를 fail-closed 로 두면 라이브러리 사고 하나로 수집 전체가 영구 정지하는데,
 fail-open 은 최악이어도 '가드 도입 이전과 동일한 동작'이라 회귀가 아니다.
+
+거래일 표: 첫 호출 때 (올해-YEARS_BACK ~ 올해+YEARS_AHEAD) 달력일별 거래일 여부·누적 거래일 수를
+numpy 배열로 한 번 만든다 → is_session 은 인덱스 조회(O(1)), previous/next_session·offset·
+sessions_between 은 누적 수로 바로 찾는다. 범위 밖 날짜가 오면 그 해까지 넓혀 다시 만든다.
+KRX_CALENDAR_CACHE=경로 를 주면 표를 npz 로 저장해 다음 프로세스가 holidays 조회 없이 읽는다.
+배열판(session_mask·offset_array·previous_sessions·next_sessions)은 datetime64·pandas·문자열 배열을 받는다.
 """
 import logging
+import os
 from datetime import date, timedelta, timezone
 
+import numpy as np
+
 KST = timezone(timedelta(hours=9))
 
 # KRX 휴장이지만 holidays.KR에 없는 날 (월, 일)
 EXTRA_CLOSED = ((5, 1), (12, 31))
 
+# 거래일 표 초기 범위 (올해 기준 과거·미래 연수) — 범위 밖 날짜가 오면 그 해까지 넓혀 다시 만든다.
+YEARS_BACK = 15
+YEARS_AHEAD = 2
+# 설정하면 거래일 표를 npz 로 저장·재사용 (holidays 버전·범위·EXTRA_CLOSED 가 같을 때만)
+CALENDAR_CACHE = os.getenv('KRX_CALENDAR_CACHE', '')
+
 _HOLIDAY_CACHE = {}
 _WARNED = False
 
@@ -42,12 +57,8 @@ def as_date(d):
     return date.fromisoformat(str(d)[:10])
 
 
-def is_session(d):
-    """d(‘YYYY-MM-DD’ 또는 date)가 KRX 거래일이면 True."""
-    try:
-        d = as_date(d)
-    except Exception:
-        return False
+def _is_session_uncached(d):
+    """표를 만들 때 쓰는 날짜 1개 판정 (holidays 조회)."""
     if d.weekday() >= 5:
         return False
     if (d.month, d.day) in EXTRA_CLOSED:
@@ -58,14 +69,168 @@ def is_session(d):
     return True
 
 
+# ── 거래일 표 ─────────────────────────────────────────────────────────
+class _Calendar:
+    """[first, last] 달력일 구간의 거래일 표.
+
+    open[i]  : first + i 일이 거래일인지 (bool)
+    rank[i]  : first + i 일 '이전(미포함)' 거래일 수 = sessions 에서의 searchsorted(left)
+    sessions : 거래일 datetime64[D] 오름차순
+    """
+
+    def __init__(self, first, last, is_open):
+        self.first = first
+        self.last = last
+        self.base = np.datetime64(first, 'D')
+        self.open = is_open
+        self.rank = np.concatenate(([0], np.cumsum(is_open)[:-1]))
+        self.sessions = self.base + np.flatnonzero(is_open)
+        self.base_ord = first.toordinal()
+
+    def covers(self, d):
+        return self.first <= d <= self.last
+
+
+_CAL = None
+_STR_MEMO = {}       # 'YYYY-MM-DD…' 문자열 → bool (파싱을 호출마다 반복하지 않는다)
+
+
+def _holidays_version():
+    try:
+        import holidays
+        return str(holidays.__version__)
+    except Exception:
+        return ''
+
+
+def _cache_key(first, last):
+    return '%s|%s|%s|%r' % (first, last, _holidays_version(), EXTRA_CLOSED)
+
+
+def _load_cached(first, last):
+    if not CALENDAR_CACHE or not os.path.exists(CALENDAR_CACHE):
+        return None
+    try:
+        with np.load(CALENDAR_CACHE, allow_pickle=False) as z:
+            if str(z['key']) == _cache_key(first, last):
+                return z['open'].astype(bool)
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_cached(first, last, is_open):
+    if not CALENDAR_CACHE or not _holidays_version():      # fail-open(주말만) 표는 저장하지 않는다
+        return
+    tmp = '%s.%d.tmp' % (CALENDAR_CACHE, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(f, key=np.array(_cache_key(first, last)), open=is_open)
+        os.replace(tmp, CALENDAR_CACHE)
+    except OSError as e:
+        logging.warning('거래일 표 저장 실패(%s)', e)
+
+
+def _build(first_year, last_year):
+    global _CAL
+    first, last = date(first_year, 1, 1), date(last_year, 12, 31)
+    is_open = _load_cached(first, last)
+    if is_open is None:
+        n = (last - first).days + 1
+        is_open = np.fromiter((_is_session_uncached(first + timedelta(days=i)) for i in range(n)),
+                              dtype=bool, count=n)
+        _save_cached(first, last, is_open)
+    _CAL = _Calendar(first, last, is_open)
+    _STR_MEMO.clear()
+    return _CAL
+
+
+def calendar(*dates):
+    """거래일 표 (프로세스당 1회 생성). dates 가 범위 밖이면 그 해까지 넓혀 다시 만든다."""
+    cal = _CAL
+    if cal is None:
+        y = date.today().year
+        cal = _build(y - YEARS_BACK, y + YEARS_AHEAD)
+    if dates:
+        lo, hi = min(dates), max(dates)
+        if not (cal.covers(lo) and cal.covers(hi)):
+            cal = _build(min(lo.year - 1, cal.first.year), max(hi.year + 1, cal.last.year))
+    return cal
+
+
+def _index(d):
+    """date → 표 인덱스 (필요하면 표 확장)."""
+    cal = calendar(d) if _CAL is None or not _CAL.covers(d) else _CAL
+    return cal, d.toordinal() - cal.base_ord
+
+
+def _to_date(d):
+    return date.fromordinal(int(d.astype('datetime64[D]').astype(np.int64)) + 719163)   # 1970-01-01 서수
+
+
+# ── 스칼라 API ────────────────────────────────────────────────────────
+def is_session(d):
+    """d(‘YYYY-MM-DD’ 또는 date)가 KRX 거래일이면 True. (표 조회 O(1))"""
+    if isinstance(d, str):
+        hit = _STR_MEMO.get(d)
+        if hit is not None:
+            return hit
+    try:
+        dd = as_date(d)
+    except Exception:
+        return False
+    cal, i = _index(dd)
+    out = bool(cal.open[i])
+    if isinstance(d, str):
+        _STR_MEMO[d] = out
+    return out
+
+
+def _offset_rank(cal, i, n):
+    """표 인덱스 i 의 날짜에서 n 거래일 이동한 날의 sessions 인덱스 (범위 밖일 수 있음)."""
+    is_open = int(cal.open[i])
+    r = int(cal.rank[i]) + is_open - 1 + n              # 마지막 '<= d' 거래일 기준
+    return r + 1 if not is_open and n < 0 else r        # 비거래일: n=-1 도 직전 거래일
+
+
+def offset(d, n):
+    """d 에서 n 거래일 이동한 날 (n<0 이면 과거).
+
+    d 가 거래일이 아니면 직전·다음 거래일 '사이'로 본다 — n=1 은 다음 거래일,
+    n=-1 은 직전 거래일, n=0 은 직전 거래일(롤백).
+    """
+    d = as_date(d)
+    cal, i = _index(d)
+    r = _offset_rank(cal, i, n)
+    years = abs(n) // 240 + 1
+    while not 0 <= r < len(cal.sessions):             # 표 끝을 넘으면 넓혀 다시
+        cal = calendar(d - timedelta(days=366 * years), d + timedelta(days=366 * years))
+        r = _offset_rank(cal, d.toordinal() - cal.base_ord, n)
+        years *= 2
+    return _to_date(cal.sessions[r])
+
+
 def previous_session(d, max_back=15):
-    """d 직전(미포함)의 거래일. 못 찾으면 None."""
+    """d 직전(미포함)의 거래일. max_back 일 안에 없으면 None."""
     d = as_date(d)
-    for back in range(1, max_back + 1):
-        cand = d - timedelta(days=back)
-        if is_session(cand):
-            return cand
-    return None
+    prev = offset(d, -1)
+    return prev if (d - prev).days <= max_back else None
+
+
+def next_session(d):
+    """d 다음(미포함)의 거래일."""
+    return offset(d, 1)
+
+
+def sessions_between(start, end):
+    """start ≤ s ≤ end 인 거래일 date 리스트."""
+    start, end = as_date(start), as_date(end)
+    if end < start:
+        return []
+    cal = calendar(start, end)
+    i, j = start.toordinal() - cal.base_ord, end.toordinal() - cal.base_ord
+    lo, hi = int(cal.rank[i]), int(cal.rank[j]) + int(cal.open[j])
+    return [_to_date(s) for s in cal.sessions[lo:hi]]
 
 
 def sessions_only(dates):
@@ -73,6 +238,66 @@ def sessions_only(dates):
     return sorted(s for s in dates if is_session(s))
 
 
+# ── 배열 API (numpy datetime64 / pandas DatetimeIndex·Series / 문자열 배열) ─────────
+def _as_days(dates):
+    """→ (datetime64[D] 배열, 유효 마스크). NaT·파싱 불가 문자열은 무효."""
+    arr = np.asarray(getattr(dates, 'values', dates))
+    if arr.dtype.kind == 'M':
+        days = arr.astype('datetime64[D]')
+    elif arr.dtype.kind in 'OUS':
+        days = np.empty(arr.shape, dtype='datetime64[D]')
+        flat = days.reshape(-1)
+        for k, v in enumerate(arr.reshape(-1)):
+            try:
+                flat[k] = np.datetime64(as_date(v), 'D')
+            except Exception:
+                flat[k] = np.datetime64('NaT')
+    else:
+        raise TypeError('날짜 배열이 아님: dtype=%s' % arr.dtype)
+    return days, ~np.isnat(days)
+
+
+def _indices(days, valid):
+    if not valid.any():
+        return calendar(), np.zeros(days.shape, dtype=np.int64)
+    lo, hi = days[valid].min(), days[valid].max()
+    cal = calendar(_to_date(lo), _to_date(hi))
+    idx = np.where(valid, (days - cal.base).astype(np.int64), 0)
+    return cal, idx
+
+
+def session_mask(dates):
+    """날짜 배열 → 거래일 bool 배열 (무효 날짜는 False)."""
+    days, valid = _as_days(dates)
+    cal, idx = _indices(days, valid)
+    return cal.open[idx] & valid
+
+
+def offset_array(dates, n):
+    """offset() 의 배열판 → datetime64[D] 배열 (무효 날짜는 NaT)."""
+    days, valid = _as_days(dates)
+    cal, idx = _indices(days, valid)
+    is_open = cal.open[idx]
+    r = cal.rank[idx] + is_open - 1 + n + ((~is_open) & (n < 0))
+    if valid.any() and (r[valid].min() < 0 or r[valid].max() >= len(cal.sessions)):
+        lo, hi = days[valid].min(), days[valid].max()
+        span = abs(n) // 240 + 1
+        calendar(_to_date(lo) - timedelta(days=366 * span), _to_date(hi) + timedelta(days=366 * span))
+        return offset_array(dates, n)
+    out = cal.sessions[np.clip(r, 0, len(cal.sessions) - 1)]
+    return np.where(valid, out, np.datetime64('NaT'))
+
+
+def previous_sessions(dates):
+    """previous_session() 의 배열판 (max_back 제한 없음)."""
+    return offset_array(dates, -1)
+
+
+def next_sessions(dates):
+    """next_session() 의 배열판."""
+    return offset_array(dates, 1)
+
+
 def today_kst():
     from datetime import datetime
     return datetime.now(tz=KST).date()
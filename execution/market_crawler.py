@@ -20,6 +20,7 @@ import requests
 
 # Import shared configuration
 from config import CATEGORY_MAP, YFINANCE_TICKERS, TARGET_DRAM_ITEMS, TARGET_NAND_ITEMS, CSV_FILE
+import dataset_store
 
 # 경고 메시지 무시
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -52,36 +53,14 @@ def setup_driver(headless=True):
     return driver
 
 def save_to_csv(data):
-    """중복 방지 기능이 강화된 CSV 저장 (배치 내 중복까지 제거)"""
+    """중복 방지 CSV 저장 (배치 내 중복까지 제거) — dataset_store 유니크 키로 O(신규 행) append"""
     try:
-        existing_keys = set()
-        if os.path.exists(CSV_FILE):
-            with open(CSV_FILE, 'r', encoding='utf-8-sig') as f:
-                reader = csv.reader(f)
-                next(reader, None)
-                for row in reader:
-                    if len(row) >= 2:
-                        key = (row[0], row[1])
-                        existing_keys.add(key)
-
-        new_data = []
-        current_batch_keys = set()
-
-        for row in data:
-            current_key = (row[0], row[1])
-            if current_key not in existing_keys and current_key not in current_batch_keys:
-                new_data.append(row)
-                current_batch_keys.add(current_key)
-
-        if new_data:
-            with open(CSV_FILE, 'a', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                writer.writerows(new_data)
-            print(f"✅ {len(new_data)}건 저장 완료 (중복 제외됨)")
-            return True
+        added = dataset_store.upsert(data, csv_path=CSV_FILE)
+        if added:
+            print(f"✅ {added}건 저장 완료 (중복 제외됨)")
         else:
             print("💡 새로운 데이터가 없습니다. (모두 중복)")
-            return True
+        return True
 
     except Exception as e:
         print(f"\n❌ 저장 중 오류: {str(e)}")
@@ -320,8 +299,11 @@ def _load_kr_index_from_nav(months=7):
     야후 ^KS11/^KQ11의 지연·잠정값 회피(2026-06-23 -9.99% 폭락 익일 미반영 사례).
     실패 시 (None, None) → 호출부에서 야후 폴백."""
     try:
+        import wrap_nav_store
         nav_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Wrap_NAV.xlsx')
-        df = pd.read_excel(nav_file, sheet_name='기준가')
+        # 최근 구간만 로드 (아래 cutoff 보다 한 달 여유)
+        since = pd.Timestamp.now().normalize() - pd.Timedelta(days=(months + 1) * 31)
+        df = wrap_nav_store.read_sheet('기준가', start=since, xlsx=nav_file)
         df.columns = [str(c).strip() for c in df.columns]  # 컬럼명 방어(공백/BOM)
         if 'Date' not in df.columns or 'KOSPI' not in df.columns or 'KOSDAQ' not in df.columns:
             return None, None
@@ -0,0 +1,126 @@
+"""WRAP 기준가(NAV) 벡터 엔진 — calculate_wrap_nav.py 5절의 일자별 루프 대체.
+
+구 루프는 상품마다 계산일 하나씩 `w_table.index < d` 검색 + `df_change.loc[d, cols]`
+슬라이스 + Series 곱을 반복했다 (O(일수 × 리밸런스 × 종목) / 상품, 목표전환형 N차·N호가
+늘 때마다 한 바퀴씩 추가). 이 엔진은 같은 산식을 세 단계로 한 번에 푼다.
+
+  1. as-of 정렬 : NEW 시트 리밸런스 스냅샷을 거래일에 searchsorted 한 번으로 붙인다.
+                  ★엄격한 '<' (당일 NEW 변경은 다음 거래일부터 적용 — 룩어헤드 금지) 유지.
+  2. 수익률     : 전 상품 스냅샷을 한 행렬로 쌓아 `W @ R.T` 행렬곱 1회 → 상품×일자 수익률.
+  3. 지수       : [시작 기준가, 1+r1, 1+r2, ...] 의 cumprod — 구 루프와 곱셈 순서가 같아
+                  반올림(소수 둘째 자리) 결과가 동일하다.
+
+비중 정의는 구 루프와 같다: 리밸런스일 '완전 스냅샷'(편출종목 미기재=0, ffill 금지),
+리밸런스 이전 구간과 가격 데이터가 없는 종목은 수익률 0 기여.
+
+사용 예 (calculate_wrap_nav.py):
+    df_weights = nav_engine.prepare_weights(df_dict['NEW'])
+    plans = {pf: nav_engine.NavPlan(start_price, calc_dates, seed_date), ...}
+    results = nav_engine.build_nav(df_weights, df_change, plans)   # {pf: pd.Series}
+
+벤치마크(구 루프 대비): scripts/bench_nav_engine.py
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class NavPlan:
+    start_price: float                 # 계산 시작 기준가 (신규=설정 기준가, 기존=마지막 기록값)
+    calc_dates: pd.DatetimeIndex       # 수익률을 반영할 거래일 (시작일 미포함, 청산일 이하)
+    seed_date: pd.Timestamp | None = None  # T=0 초기값을 기록할 날짜 (기존 상품 이어 계산은 None)
+
+
+def prepare_weights(df_new):
+    """NEW 시트 원본 → 전처리된 비중 DataFrame (코드 6자리 문자열·날짜 datetime)."""
+    df_weights = df_new.copy()
+    df_weights = df_weights.dropna(subset=['코드'])
+    df_weights['코드'] = df_weights['코드'].astype(str).str.strip()
+    df_weights = df_weights[df_weights['코드'].str.lower() != 'nan']
+    df_weights['코드'] = df_weights['코드'].str.zfill(6)
+    df_weights['날짜'] = pd.to_datetime(df_weights['날짜'])
+    return df_weights
+
+
+def weight_panels(df_weights, products):
+    """상품별 리밸런스 스냅샷 표 {상품명: DataFrame(리밸런스일 × 코드)}.
+
+    NEW 시트에 행이 없는 상품은 결과에서 빠진다 (구 루프의 `sub_df.empty: continue`).
+    """
+    sub = df_weights[df_weights['상품명'].isin(list(products))]
+    panels = {}
+    for pf in products:
+        g = sub[sub['상품명'] == pf]
+        if g.empty:
+            continue
+        panels[pf] = g.pivot_table(index='날짜', columns='코드', values='비중',
+                                   aggfunc='last').fillna(0)
+    return panels
+
+
+def asof_positions(snapshot_dates, dates):
+    """각 d 에 대해 `snapshot_dates < d` 인 마지막 스냅샷 위치 (없으면 -1).
+
+    snapshot_dates 는 정렬된 DatetimeIndex (pivot_table 결과는 정렬 보장).
+    side='left' = d 와 같은 날의 스냅샷은 제외 → 엄격한 '<'.
+    """
+    return np.asarray(pd.DatetimeIndex(snapshot_dates).searchsorted(
+        pd.DatetimeIndex(dates), side='left'), dtype=np.intp) - 1
+
+
+def portfolio_returns(panels, df_change):
+    """전 상품 일간 수익률 DataFrame(거래일 × 상품), 단위: 비율(0.01 = 1%).
+
+    df_change: 거래일 × 코드 등락률(NaN은 0으로 채워진 상태). 비중은 % 단위라 /100.
+    스냅샷을 [무비중 행] + 상품별 스냅샷 순으로 쌓은 W(S × 코드)와 R(일자 × 코드)의
+    행렬곱 M = W @ R.T 에서 (상품, 일자)별 유효 스냅샷 행만 take_along_axis 로 뽑는다.
+    """
+    dates = df_change.index
+    codes = df_change.columns
+    if not panels:
+        return pd.DataFrame(index=dates)
+    R = df_change.to_numpy(dtype=float)
+
+    stacked = [np.zeros((1, len(codes)))]   # 0번 행 = 리밸런스 이전(수익률 0)
+    pos = np.zeros((len(panels), len(dates)), dtype=np.intp)
+    offset = 1
+    for i, w in enumerate(panels.values()):
+        # 가격 없는 종목은 제외(구 루프 valid_cols), 비중표에 없는 종목은 0
+        stacked.append(w.reindex(columns=codes, fill_value=0).to_numpy(dtype=float))
+        p = asof_positions(w.index, dates)
+        pos[i] = np.where(p >= 0, p + offset, 0)
+        offset += len(w)
+    W = np.vstack(stacked)
+
+    M = W @ R.T                                   # (스냅샷 S) × (일자 D)
+    rets = np.take_along_axis(M, pos, axis=0) / 100
+    return pd.DataFrame(rets.T, index=dates, columns=list(panels))
+
+
+def build_nav(df_weights, df_change, plans):
+    """{상품명: NavPlan} → {상품명: 기준가 pd.Series(날짜 → 기준가)}.
+
+    구 루프와 동일한 출력 계약: seed_date 가 있으면 첫 값은 시작 기준가(T=0),
+    이후 calc_dates 순서대로 누적 지수. NEW 시트에 없는 상품은 결과에서 빠진다.
+    """
+    panels = weight_panels(df_weights, plans)
+    rets = portfolio_returns(panels, df_change)
+    out = {}
+    for pf, plan in plans.items():
+        if pf not in panels:
+            continue
+        calc_dates = pd.DatetimeIndex(plan.calc_dates)
+        r = rets[pf].reindex(calc_dates).fillna(0).to_numpy()
+        # [시작값, 1+r1, 1+r2, ...] 순차 누적곱 = 구 루프 current_index *= (1 + r) 와 같은 곱셈 순서
+        path = np.cumprod(np.concatenate(([float(plan.start_price)], 1 + r)))
+        values = list(path[1:])
+        dates = list(calc_dates)
+        if plan.seed_date is not None:
+            values = [plan.start_price] + values
+            dates = [plan.seed_date] + dates
+        out[pf] = pd.Series(values, index=dates)
+    return out
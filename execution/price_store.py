@@ -0,0 +1,166 @@
+"""
+KIS 확정 일봉(종가) 로컬 영속 캐시 — kis_token.fetch_daily_closes 뒤에 붙는 공유 저장소.
+
+배경: calculate_wrap_nav / create_contribution_data 가 매 실행마다 전 종목 일봉 이력을
+처음부터 다시 받았다 (100봉/콜 페이징 × 종목수, 전부 0.06s _throttle 직렬).
+확정된 과거 종가는 바뀌지 않으므로 로컬에 두고, 매 실행은 '빠진 꼬리 + 재확인 창'만 받는다.
+
+저장 (SQLite, 여러 프로세스 공유 — WAL):
+  closes   (code, adj, date) → close          확정/잠정 구분 없이 마지막 수신값
+  coverage (code, adj) → lo, hi, confirmed   API로 조회 완료한 요청 구간 'YYYYMMDD'
+    · lo~hi        : 이 구간은 조회를 마쳤다 (봉이 없는 날 = 휴장/거래정지로 확정)
+    · confirmed    : 이 날짜까지는 장 마감 확정 후(KST 17시 이후) 받은 값 → 재조회 불필요
+
+재확인 창(RECONFIRM_DAYS): 꼬리를 받을 때 confirmed 이전 며칠도 같이 받아 캐시값과 대조한다.
+수정주가(adj='0')는 액면분할·증자 시 과거 전체가 재산출되므로, 겹치는 날 값이 다르면
+해당 종목 캐시를 버리고 전 구간을 새로 받는다 (stale 수정주가 혼입 방지).
+
+경로: KIS_PRICE_DB 환경변수 → 기본 ~/KIS/cache/daily_closes.sqlite.
+끄기: KIS_PRICE_CACHE=0 (항상 API 직조회 — 구 동작).
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+DB_PATH = os.getenv("KIS_PRICE_DB") or os.path.join(
+    os.path.expanduser("~"), "KIS", "cache", "daily_closes.sqlite")
+
+# KIS 일봉이 KRX 확정 종가로 안정되는 시각 (calculate_wrap_nav 17시 가드와 동일)
+CONFIRM_HOUR = 17
+# 꼬리 조회 시 함께 재확인할 과거 달력일 수 (수정주가 재산출 감지 + 잠정값 덮어쓰기)
+RECONFIRM_DAYS = 7
+# 재확인 대조 허용 오차 (상대)
+_REL_TOL = 1e-6
+
+
+def enabled():
+    return os.getenv("KIS_PRICE_CACHE", "1") != "0"
+
+
+def get_conn():
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS closes (
+            code TEXT NOT NULL,
+            adj TEXT NOT NULL,
+            date TEXT NOT NULL,
+            close REAL NOT NULL,
+            PRIMARY KEY (code, adj, date)
+        );
+        CREATE TABLE IF NOT EXISTS coverage (
+            code TEXT NOT NULL,
+            adj TEXT NOT NULL,
+            lo TEXT NOT NULL,
+            hi TEXT NOT NULL,
+            confirmed TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (code, adj)
+        );
+    """)
+    return conn
+
+
+def _ymd(d):
+    return d.strftime("%Y%m%d")
+
+
+def _shift(ymd, days):
+    return _ymd(datetime.strptime(ymd, "%Y%m%d") + timedelta(days=days))
+
+
+def confirmed_through(end_ymd, now=None):
+    """지금 end_ymd 까지 조회했을 때 '확정'으로 볼 수 있는 마지막 날짜 'YYYYMMDD'."""
+    now = now or datetime.now(KST)
+    today = _ymd(now)
+    last_final = today if now.hour >= CONFIRM_HOUR else _shift(today, -1)
+    return min(end_ymd, last_final)
+
+
+def get_coverage(conn, code, adj):
+    row = conn.execute("SELECT lo, hi, confirmed FROM coverage WHERE code=? AND adj=?",
+                       (code, adj)).fetchone()
+    return row if row else None
+
+
+def plan_fetch(cov, start_ymd, end_ymd):
+    """캐시 커버리지 → API로 받아야 할 구간 리스트 [(from, to), ...] (빈 리스트 = 캐시로 충분).
+
+    · 커버리지 없음 → 전 구간
+    · start 가 lo 보다 앞 → 머리 구간 [start, lo-1]
+    · end 가 confirmed 보다 뒤 → 꼬리 구간 [confirmed-RECONFIRM_DAYS, end] (lo 하한)
+    """
+    if cov is None:
+        return [(start_ymd, end_ymd)]
+    lo, hi, confirmed = cov
+    ranges = []
+    if start_ymd < lo:
+        ranges.append((start_ymd, min(end_ymd, _shift(lo, -1))))
+    if end_ymd > confirmed:
+        tail_from = max(lo, start_ymd, _shift(confirmed, -RECONFIRM_DAYS))
+        ranges.append((min(tail_from, end_ymd), end_ymd))
+    return ranges
+
+
+def read_series(conn, code, adj, start_ymd, end_ymd):
+    """캐시 → {'YYYY-MM-DD': close} (start~end 포함)."""
+    s = f"{start_ymd[:4]}-{start_ymd[4:6]}-{start_ymd[6:]}"
+    e = f"{end_ymd[:4]}-{end_ymd[4:6]}-{end_ymd[6:]}"
+    rows = conn.execute(
+        "SELECT date, close FROM closes WHERE code=? AND adj=? AND date BETWEEN ? AND ? ORDER BY date",
+        (code, adj, s, e)).fetchall()
+    return dict(rows)
+
+
+def conflicts(conn, code, adj, series):
+    """새로 받은 값이 캐시와 다른 날짜가 있으면 True (수정주가 재산출 등)."""
+    if not series:
+        return False
+    dates = sorted(series)
+    cached = read_series(conn, code, adj, dates[0].replace("-", ""), dates[-1].replace("-", ""))
+    for d, old in cached.items():
+        new = series.get(d)
+        if new is not None and abs(new - old) > _REL_TOL * max(abs(old), 1.0):
+            return True
+    return False
+
+
+def drop_code(conn, code, adj):
+    conn.execute("DELETE FROM closes WHERE code=? AND adj=?", (code, adj))
+    conn.execute("DELETE FROM coverage WHERE code=? AND adj=?", (code, adj))
+
+
+def store(conn, code, adj, series, start_ymd, end_ymd, now=None):
+    """조회 완료 구간 [start, end] 의 종가를 upsert 하고 커버리지를 넓힌다 (커밋 포함).
+
+    호출측은 구간을 '끝까지' 조회했을 때만 부른다 — 중간 실패 구간을 커버리지에 넣으면
+    빠진 날이 휴장으로 오인된다.
+    """
+    now = now or datetime.now(KST)
+    conn.executemany(
+        "INSERT INTO closes(code, adj, date, close) VALUES(?,?,?,?) "
+        "ON CONFLICT(code, adj, date) DO UPDATE SET close=excluded.close",
+        [(code, adj, d, c) for d, c in series.items()])
+    conf = confirmed_through(end_ymd, now)
+    cov = get_coverage(conn, code, adj)
+    if cov is None:
+        lo, hi, confirmed = start_ymd, end_ymd, conf
+    else:
+        lo, hi, confirmed = cov
+        # 커버리지는 연속 구간으로만 확장 (떨어진 구간이면 새 구간으로 교체)
+        if start_ymd > _shift(hi, 1) or end_ymd < _shift(lo, -1):
+            lo, hi, confirmed = start_ymd, end_ymd, conf
+        else:
+            lo, hi = min(lo, start_ymd), max(hi, end_ymd)
+            if start_ymd <= _shift(confirmed, 1):
+                confirmed = max(confirmed, conf)
+    conn.execute(
+        "INSERT INTO coverage(code, adj, lo, hi, confirmed, updated_at) VALUES(?,?,?,?,?,?) "
+        "ON CONFLICT(code, adj) DO UPDATE SET lo=excluded.lo, hi=excluded.hi, "
+        "confirmed=excluded.confirmed, updated_at=excluded.updated_at",
+        (code, adj, lo, hi, confirmed, now.strftime("%Y-%m-%d %H:%M:%S")))
+    conn.commit()
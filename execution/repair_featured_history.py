@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-비거래일 오염 정리 — featured_data.json / kis_price_history.json 에서 KRX 비거래일 데이터를 제거.
+비거래일 오염 정리 — featured_data.json / kis_price_history(.npz) 에서 KRX 비거래일 데이터를 제거.
 
 배경: 2026-06-02 KRX→KIS 컷오버 이후 fetch_featured_data_kis.py 에 거래일 가드가 없어
 토·일·공휴일에도 랭킹 30행이 기록되고 kis_price_history 에 비거래일 고가가 누적됐다.
@@ -26,10 +26,12 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from krx_session import is_session, KST
+import high_history
 
 REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 FEATURED = os.path.join(REPO, 'featured_data.json')
-KIS_HIST = os.path.join(REPO, 'kis_price_history.json')
+KIS_HIST = os.path.join(REPO, high_history.KIS_HISTORY_FILE)
+KIS_HIST_LEGACY = os.path.join(REPO, high_history.KIS_HISTORY_LEGACY)   # npz 변환 전 형식
 BACKUP_ROOT = os.path.expanduser('~/tmp')       # repo 밖 (게시·git 대상 아님)
 
 
@@ -57,7 +59,7 @@ def plan_featured():
 
 
 def plan_kis_hist():
-    hist = json.load(io.open(KIS_HIST, encoding='utf-8'))
+    hist = high_history.load_kis(KIS_HIST, KIS_HIST_LEGACY).to_legacy()
     bad_dates = sorted(d for d in hist.get('dates', []) if not is_session(d))
     n_high = n_close = 0
     for st in hist.get('stocks', {}).values():
@@ -91,7 +93,7 @@ def main():
     print('  비거래일 %d일: %s' % (len(bad_dates), ', '.join(bad_dates)))
     from collections import Counter
     print('  제거 type 분포:', dict(Counter(r.get('type') for r in bad)))
-    print('== kis_price_history.json ==')
+    print('== kis_price_history ==')
     print('  비거래일 %d일: %s' % (len(hist_bad_dates), ', '.join(hist_bad_dates)))
     print('  제거 대상 highs %d개 / closes %d개 (종목 %d)' % (n_high, n_close, len(hist.get('stocks', {}))))
 
@@ -112,7 +114,7 @@ def main():
     bdir = os.path.join(BACKUP_ROOT, 'featured_repair_' + stamp)
     os.makedirs(bdir, exist_ok=True)
     manifest = {'created_at': stamp, 'files': {}}
-    for p in (FEATURED, KIS_HIST):
+    for p in (FEATURED, KIS_HIST if os.path.exists(KIS_HIST) else KIS_HIST_LEGACY):
         dst = os.path.join(bdir, os.path.basename(p))
         shutil.copy2(p, dst)
         manifest['files'][os.path.basename(p)] = {'sha256': sha256(p), 'bytes': os.path.getsize(p)}
@@ -128,7 +130,7 @@ def main():
         json.dump(manifest, f, ensure_ascii=False, indent=1)
 
     atomic_write_json(FEATURED, keep)
-    atomic_write_json(KIS_HIST, hist2)
+    high_history.save(high_history.History.from_legacy(hist2), KIS_HIST)
     print('\n정리 완료. 백업·journal: %s' % bdir)
     return 0
 
@@ -2212,8 +2212,8 @@ async def idea_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # 종목 lookup (Wrap_NAV.xlsx Code 시트)
     try:
-        import pandas as pd
-        df_code = pd.read_excel('Wrap_NAV.xlsx', sheet_name='Code')
+        import wrap_nav_store
+        df_code = wrap_nav_store.read_sheet('Code', xlsx='Wrap_NAV.xlsx')
         match = df_code[df_code['종목명'] == stock_input]
         if match.empty:
             match = df_code[df_code['종목명'].str.contains(stock_input, na=False, regex=False)]
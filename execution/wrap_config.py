@@ -625,17 +625,17 @@ def validate(today=None, nav_file='Wrap_NAV.xlsx'):
             warns.append(f'GROUPS[{_gid}].use={_use}가 활성 멤버 nav_key 아님')
     if today is not None:
         import os
-        import pandas as pd
         new_pairs = set()
         aum_pairs = set()
         if os.path.exists(nav_file):
+            import wrap_nav_store
             try:
-                new_df = pd.read_excel(nav_file, sheet_name='NEW')
+                new_df = wrap_nav_store.read_sheet('NEW', columns=['증권사', '상품명'], xlsx=nav_file)
                 new_pairs = set(zip(new_df['증권사'], new_df['상품명']))
             except Exception:
                 pass
             try:
-                aum_df = pd.read_excel(nav_file, sheet_name='AUM')
+                aum_df = wrap_nav_store.read_sheet('AUM', columns=['증권사', '상품명'], xlsx=nav_file)
                 aum_pairs = set(zip(aum_df['증권사'], aum_df['상품명']))
             except Exception:
                 pass
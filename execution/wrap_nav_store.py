@@ -0,0 +1,306 @@
+"""Wrap_NAV.xlsx 읽기 경로용 SQLite 시트 저장소 (증분 upsert + 시트·기간 단위 로드).
+
+배경: calculate_wrap_nav / calculate_returns / create_dashboard 외 20여 개 스크립트가 각자
+`pd.read_excel(Wrap_NAV.xlsx, ...)` 로 같은 통합문서를 openpyxl 파싱했다 (전 시트 ~1.7s,
+기준가 이력이 길어질수록 증가). 쓰기도 시트 통째 replace.
+
+구조
+----
+- 엑셀은 여전히 사람이 편집·머지하는 교환 포맷이다 (NEW/AUM 수기 입력, merge_wrap_nav.py,
+  push 트리거 recalc). 저장소는 그 '파생 읽기 사본'이자 파생 시트(기준가/수익률)의 쓰기 경로.
+- 동기화: 엑셀의 (size, mtime_ns) → 달라졌으면 sha256 → 내용이 바뀐 경우에만 전 시트를
+  한 번 파싱해 재적재. 이후 모든 리더는 SQLite 에서 필요한 시트·기간만 읽는다.
+- 쓰기: upsert()/replace() 로 저장소를 갱신한 뒤 export() 가 해당 시트만 엑셀에 내보내고
+  내보낸 파일의 지문을 기록 → 우리 쓰기로 인한 재적재는 일어나지 않는다.
+  엑셀을 직접 쓰는 스크립트(add_aum, finalize_pending_*, update_stock_master ...)는 그대로
+  두어도 된다 — 지문이 바뀌므로 다음 읽기가 재적재한다.
+- 타입 보존: 열 값은 affinity 없는 컬럼에 원형(int/float/str)으로, datetime 은 ISO 문자열로
+  저장하고 meta 의 pandas dtype 으로 복원 → read_excel 결과와 같은 모양.
+
+저장 위치: WRAP_NAV_STORE 환경변수 → 기본 <엑셀 폴더>/.wrap_nav_store.sqlite (gitignore).
+
+사용 예:
+    import wrap_nav_store
+    nav = wrap_nav_store.read_sheet('기준가', start='2026-01-01')
+    wrap_nav_store.upsert('수익률', df_row, keys=['날짜'])
+    wrap_nav_store.export(['수익률'])
+"""
+import hashlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAV_FILE = os.path.join(ROOT, 'Wrap_NAV.xlsx')
+
+# 시트별 날짜 컬럼 (기간 필터 키). 없는 시트는 기간 필터 불가.
+DATE_COLUMNS = {'기준가': 'Date', 'NEW': '날짜', 'AUM': '날짜', '수익률': '날짜'}
+
+
+def store_path(xlsx=NAV_FILE):
+    return os.getenv('WRAP_NAV_STORE') or os.path.join(
+        os.path.dirname(os.path.abspath(xlsx)), '.wrap_nav_store.sqlite')
+
+
+def _conn(xlsx):
+    conn = sqlite3.connect(store_path(xlsx), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sheets (
+            name TEXT PRIMARY KEY,
+            pos INTEGER NOT NULL,
+            columns TEXT NOT NULL,      -- JSON [[컬럼명, pandas dtype], ...]
+            tbl TEXT NOT NULL
+        );
+    """)
+    return conn
+
+
+def _q(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+# ── 지문 / 동기화 ──────────────────────────────────────────────────────
+def _stat_fp(xlsx):
+    st = os.stat(xlsx)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _meta_get(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _meta_set(conn, key, value):
+    conn.execute("INSERT INTO meta(key, value) VALUES(?, ?) "
+                 "ON CONFLICT(key) DO UPDATE SET value=excluded.value", (key, value))
+
+
+def _record_source(conn, xlsx):
+    _meta_set(conn, 'src_stat', _stat_fp(xlsx))
+    _meta_set(conn, 'src_sha', _sha256(xlsx))
+
+
+def sync(xlsx=NAV_FILE, force=False):
+    """엑셀 내용이 저장소와 다르면 전 시트 재적재. 재적재했으면 True."""
+    conn = _conn(xlsx)
+    try:
+        if not force and _meta_get(conn, 'src_stat') == _stat_fp(xlsx):
+            return False
+        conn.execute("BEGIN IMMEDIATE")   # 동시 실행 프로세스끼리 재적재 1회
+        stat = _stat_fp(xlsx)
+        if not force and _meta_get(conn, 'src_stat') == stat:
+            conn.rollback()
+            return False
+        sha = _sha256(xlsx)
+        if not force and _meta_get(conn, 'src_sha') == sha:
+            _meta_set(conn, 'src_stat', stat)   # touch/checkout 만 된 경우
+            conn.commit()
+            return False
+        book = pd.read_excel(xlsx, sheet_name=None)
+        for row in conn.execute("SELECT tbl FROM sheets").fetchall():
+            conn.execute(f"DROP TABLE IF EXISTS {_q(row[0])}")
+        conn.execute("DELETE FROM sheets")
+        for pos, (name, df) in enumerate(book.items()):
+            _write_table(conn, name, df, pos)
+        _meta_set(conn, 'src_stat', stat)
+        _meta_set(conn, 'src_sha', sha)
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+# ── 직렬화 ─────────────────────────────────────────────────────────────
+def _py(v):
+    if v is None:
+        return None
+    if isinstance(v, pd.Timestamp):
+        return None if pd.isna(v) else v.isoformat(sep=' ')
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(v, 'item'):      # numpy 스칼라 → 파이썬
+        return v.item()
+    return v
+
+
+def _records(df):
+    return [tuple(_py(v) for v in row) for row in df.itertuples(index=False, name=None)]
+
+
+def _table_name(name):
+    return 'sheet_' + hashlib.md5(str(name).encode('utf-8')).hexdigest()[:12]
+
+
+def _write_table(conn, name, df, pos=None):
+    """시트 테이블을 df 로 통째 교체 (컬럼은 affinity 없음 — 값 원형 보존)."""
+    tbl = _table_name(name)
+    cols = [[str(c), str(df[c].dtype)] for c in df.columns]
+    if pos is None:
+        row = conn.execute("SELECT pos FROM sheets WHERE name=?", (name,)).fetchone()
+        pos = row[0] if row else (conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM sheets").fetchone()[0])
+    conn.execute(f"DROP TABLE IF EXISTS {_q(tbl)}")
+    conn.execute(f"CREATE TABLE {_q(tbl)} ({', '.join(_q(c) for c, _ in cols) or '_empty'})")
+    date_col = DATE_COLUMNS.get(name)
+    if date_col in df.columns:
+        conn.execute(f"CREATE INDEX {_q(tbl + '_date')} ON {_q(tbl)} ({_q(date_col)})")
+    if cols and len(df):
+        conn.executemany(f"INSERT INTO {_q(tbl)} VALUES ({', '.join('?' * len(cols))})", _records(df))
+    conn.execute("INSERT INTO sheets(name, pos, columns, tbl) VALUES(?,?,?,?) "
+                 "ON CONFLICT(name) DO UPDATE SET pos=excluded.pos, columns=excluded.columns, tbl=excluded.tbl",
+                 (name, pos, json.dumps(cols, ensure_ascii=False), tbl))
+
+
+def _restore(df, cols):
+    for c, dtype in cols:
+        if c not in df.columns:
+            continue
+        try:
+            if dtype.startswith('datetime64'):
+                df[c] = pd.to_datetime(df[c])
+            elif dtype.startswith(('float', 'int', 'bool')):
+                df[c] = df[c].astype(dtype)
+            elif dtype == 'object' and df[c].isna().any():
+                df[c] = df[c].where(df[c].notna(), float('nan'))   # NULL → NaN (read_excel 과 동일)
+        except (TypeError, ValueError):
+            pass
+    return df
+
+
+# ── 읽기 ───────────────────────────────────────────────────────────────
+def sheet_names(xlsx=NAV_FILE):
+    sync(xlsx)
+    conn = _conn(xlsx)
+    try:
+        return [r[0] for r in conn.execute("SELECT name FROM sheets ORDER BY pos")]
+    finally:
+        conn.close()
+
+
+def read_sheet(name, start=None, end=None, columns=None, xlsx=NAV_FILE):
+    """시트 1개 → DataFrame (read_excel(sheet_name=name) 과 같은 모양).
+
+    start/end: 날짜 컬럼(DATE_COLUMNS) 기준 포함 구간 'YYYY-MM-DD'. columns: 필요한 컬럼만.
+    없는 시트면 ValueError (read_excel 과 동일 계약).
+    """
+    sync(xlsx)
+    conn = _conn(xlsx)
+    try:
+        row = conn.execute("SELECT columns, tbl FROM sheets WHERE name=?", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Worksheet named '{name}' not found")
+        cols = json.loads(row[0])
+        names = [c for c, _ in cols]
+        if columns is not None:
+            names = [c for c in names if c in set(columns)]
+        where, args = [], []
+        date_col = DATE_COLUMNS.get(name)
+        if date_col in [c for c, _ in cols]:
+            if start is not None:
+                where.append(f"{_q(date_col)} >= ?")
+                args.append(str(pd.Timestamp(start).date()))
+            if end is not None:
+                where.append(f"{_q(date_col)} < ?")
+                args.append(str((pd.Timestamp(end) + pd.Timedelta(days=1)).date()))
+        elif start is not None or end is not None:
+            raise ValueError(f"'{name}' 시트는 기간 필터를 지원하지 않습니다")
+        sql = f"SELECT {', '.join(_q(c) for c in names) or '*'} FROM {_q(row[1])}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        df = pd.DataFrame.from_records(conn.execute(sql, args).fetchall(), columns=names)
+        return _restore(df, cols)
+    finally:
+        conn.close()
+
+
+def read_sheets(names=None, xlsx=NAV_FILE):
+    """{시트명: DataFrame}. names=None 이면 전 시트 (read_excel(sheet_name=None) 대체)."""
+    have = sheet_names(xlsx)
+    names = have if names is None else [n for n in names if n in have]
+    return {n: read_sheet(n, xlsx=xlsx) for n in names}
+
+
+# ── 쓰기 ───────────────────────────────────────────────────────────────
+def replace(name, df, xlsx=NAV_FILE):
+    """시트 전체 교체 (저장소만 — 엑셀 반영은 export)."""
+    sync(xlsx)
+    conn = _conn(xlsx)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _write_table(conn, name, df)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def upsert(name, df, keys, xlsx=NAV_FILE):
+    """keys 가 같은 기존 행을 지우고 df 행을 추가 (새 컬럼은 자동 추가, 저장소만).
+
+    기존 행 순서는 유지되고 새 행은 끝에 붙는다 — 정렬이 필요한 시트는 호출측이 판단.
+    """
+    sync(xlsx)
+    conn = _conn(xlsx)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT columns, tbl FROM sheets WHERE name=?", (name,)).fetchone()
+        if row is None:
+            _write_table(conn, name, df)
+            conn.commit()
+            return
+        cols, tbl = json.loads(row[0]), row[1]
+        known = {c for c, _ in cols}
+        for c in df.columns:
+            if str(c) not in known:
+                conn.execute(f"ALTER TABLE {_q(tbl)} ADD COLUMN {_q(c)}")
+                cols.append([str(c), str(df[c].dtype)])
+        key_rows = {tuple(_py(v) for v in r) for r in df[keys].itertuples(index=False, name=None)}
+        cond = " AND ".join(f"{_q(k)} IS ?" for k in keys)
+        conn.executemany(f"DELETE FROM {_q(tbl)} WHERE {cond}", list(key_rows))
+        names = [str(c) for c in df.columns]
+        conn.executemany(
+            f"INSERT INTO {_q(tbl)} ({', '.join(_q(c) for c in names)}) VALUES ({', '.join('?' * len(names))})",
+            _records(df))
+        conn.execute("UPDATE sheets SET columns=? WHERE name=?", (json.dumps(cols, ensure_ascii=False), name))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def export(names, xlsx=NAV_FILE, index_sheets=()):
+    """저장소의 시트들을 엑셀에 내보낸다 (해당 시트만 replace, 나머지 시트·서식 유지).
+
+    index_sheets: 첫 컬럼을 인덱스로 써야 하는 시트 (예: 기준가 — Date 인덱스 헤더 보존).
+    내보낸 뒤 엑셀 지문을 기록해 자기 쓰기로 인한 재적재를 막는다.
+    """
+    frames = {n: read_sheet(n, xlsx=xlsx) for n in names}
+    with pd.ExcelWriter(xlsx, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+        for n, df in frames.items():
+            if n in index_sheets:
+                df.set_index(df.columns[0]).to_excel(writer, sheet_name=n)
+            else:
+                df.to_excel(writer, sheet_name=n, index=False)
+    conn = _conn(xlsx)
+    try:
+        _record_source(conn, xlsx)
+        conn.commit()
+    finally:
+        conn.close()
@@ -5,7 +5,9 @@
 - 시세: KIS multprice(FHKST11300006) 30종목/콜 배치, 기본 1초 스윕(실패 시 최대 10초 백오프)
 - 시총: 현재가 x 상장주식수 (상장주식수는 KIS inquire-price로 매일 1회 갱신,
         첫 기동은 kis_universe_master.json / 이전 캐시로 즉시 시작)
-- 서빙: http://127.0.0.1:8778/  (index.html + /data JSON, 프런트는 1초 폴링)
+- 서빙: http://127.0.0.1:8778/  (index.html + /stream SSE, /data JSON 은 폴링 폴백)
+- /stream: 접속 시 snapshot 1건, 이후 스윕 세대마다 바뀐 행만 delta (id = 기동ID:세대 seq).
+        세대별 JSON 은 1번만 직렬화해 모든 클라이언트가 공유, 재접속은 Last-Event-ID 로 이어받기
 
 실행:  python quoteboard/server.py [--interval 3.0] [--port 8778]
 """
@@ -17,13 +19,14 @@ import time
 import logging
 import argparse
 import threading
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(BASE)
 sys.path.insert(0, os.path.join(ROOT, 'execution'))
-from kis_token import kis_get  # noqa: E402  (0.06s 자체 스로틀 내장)
+from kis_token import kis_get_many, latency_stats  # noqa: E402  (프로세스 간 공유 레이트 버킷 내장)
 import nav_style  # noqa: E402  — AoE 상단 네비 정본 (2026-07-26 통일)
 
 KST = timezone(timedelta(hours=9))
@@ -45,9 +48,18 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
 STOCKS = []          # [{code, name, sector}]
 SHARES = {}          # code -> 상장주식수
 SNAP = {}            # code -> {price, chg, trdval}
-META = {'sweep_at': None, 'sweep_ms': 0, 'fail': 0, 'shares_date': None}
+META = {'sweep_at': None, 'sweep_ms': 0, 'fail': 0, 'shares_date': None,
+        'kis_ms': {}}      # multprice 호출 지연 p50/p99 (kis_token.latency_stats)
 _LOCK = threading.Lock()
 
+# 발행 상태 (스윕 세대 단위) — publish() 만 갱신, /stream·/data 는 여기서 읽는다
+SSE_PING_SEC = 15        # 변화 없을 때 keep-alive 주석 주기 (끊긴 클라이언트 정리)
+DELTA_KEEP = 120         # 재접속 이어받기용 delta 보관 세대 수 (넘으면 snapshot)
+_PUB = {'seq': 0, 'rows': {}, 'meta': {}, 'snap': None}   # snap = (seq, JSON) 직렬화 캐시
+_DELTAS = deque(maxlen=DELTA_KEEP)                         # (seq, SSE 이벤트 bytes)
+_PUB_COND = threading.Condition()
+_BOOT = '%x' % int(time.time())   # 이벤트 id 접두 — 서버 재기동 후 재접속은 snapshot 부터
+
 
 def _to_int(v, default=0):
     try:
@@ -129,16 +141,17 @@ def refresh_shares(targets=None):
     today = datetime.now(KST).strftime('%Y-%m-%d')
     fetch_list = targets if targets else [s['code'] for s in STOCKS]
     got, fail = {}, 0
-    for code in fetch_list:
-        try:
-            j = kis_get(PRICE_PATH, tr_id=PRICE_TRID,
-                        params={'FID_COND_MRKT_DIV_CODE': 'J',
-                                'FID_INPUT_ISCD': code})
-            n = _to_int((j.get('output') or {}).get('lstn_stcn'))
-            if n:
-                got[code] = n
-        except Exception:
+    calls = [{'path': PRICE_PATH, 'tr_id': PRICE_TRID,
+              'params': {'FID_COND_MRKT_DIV_CODE': 'J', 'FID_INPUT_ISCD': code}}
+             for code in fetch_list]
+    # 스윕과 같은 appkey 버킷을 나눠 쓰므로 워커를 낮게 (시세 스윕 우선)
+    for code, j in zip(fetch_list, kis_get_many(calls, max_workers=2)):
+        if isinstance(j, Exception):
             fail += 1
+            continue
+        n = _to_int((j.get('output') or {}).get('lstn_stcn'))
+        if n:
+            got[code] = n
     if got:
         with _LOCK:
             SHARES.update(got)
@@ -150,29 +163,30 @@ def refresh_shares(targets=None):
 
 
 def sweep_once(codes):
-    """multprice 30종목/콜 전체 1회 스윕 → SNAP 갱신."""
-    fail = 0
+    """multprice 30종목/콜 전체 1회 스윕 → SNAP 갱신 (배치 동시 호출)."""
+    calls = []
     for i in range(0, len(codes), 30):
-        ch = codes[i:i + 30]
         params = {}
-        for k, c in enumerate(ch, 1):
+        for k, c in enumerate(codes[i:i + 30], 1):
             params[f'FID_COND_MRKT_DIV_CODE_{k}'] = 'J'
             params[f'FID_INPUT_ISCD_{k}'] = c
-        try:
-            j = kis_get(MULTI_PATH, tr_id=MULTI_TRID, params=params)
-            with _LOCK:
-                for row in (j.get('output') or []):
-                    code = row.get('inter_shrn_iscd')
-                    if not code:
-                        continue
-                    SNAP[code] = {
-                        'price': _to_int(row.get('inter2_prpr')),
-                        'chg': _to_float(row.get('prdy_ctrt')),
-                        'trdval': _to_int(row.get('acml_tr_pbmn')),
-                    }
-        except Exception as e:
+        calls.append({'path': MULTI_PATH, 'tr_id': MULTI_TRID, 'params': params})
+    fail = 0
+    for n, j in enumerate(kis_get_many(calls), 1):
+        if isinstance(j, Exception):
             fail += 1
-            logging.warning('배치 %d 실패: %s', i // 30 + 1, e)
+            logging.warning('배치 %d 실패: %s', n, j)
+            continue
+        with _LOCK:
+            for row in (j.get('output') or []):
+                code = row.get('inter_shrn_iscd')
+                if not code:
+                    continue
+                SNAP[code] = {
+                    'price': _to_int(row.get('inter2_prpr')),
+                    'chg': _to_float(row.get('prdy_ctrt')),
+                    'trdval': _to_int(row.get('acml_tr_pbmn')),
+                }
     return fail
 
 
@@ -187,19 +201,28 @@ def effective_interval(base):
 def poll_loop(interval):
     codes = [s['code'] for s in STOCKS]
     backoff = 0.0     # 배치 실패(KIS 한도 충돌 등) 시 스윕 간격 일시 확대 → 정상 복귀 시 해제
+    n_sweep = 0
     while True:
         t0 = time.time()
         fail = sweep_once(codes)
         backoff = min((backoff or 1.0) * 2, 10.0) if fail else 0.0
+        lat = latency_stats(MULTI_TRID)
         with _LOCK:
             META['sweep_at'] = datetime.now(KST).strftime('%H:%M:%S')
             META['sweep_ms'] = int((time.time() - t0) * 1000)
             META['fail'] = fail
+            META['kis_ms'] = lat
+        publish()
+        n_sweep += 1
+        if n_sweep % 300 == 0 and lat:
+            logging.info('KIS multprice 지연 p50=%.0fms p99=%.0fms (n=%d), 스윕 %dms',
+                         lat['p50'], lat['p99'], lat['n'], META['sweep_ms'])
         target = max(effective_interval(interval), backoff)
         time.sleep(max(0.0, target - (time.time() - t0)))
 
 
-def build_payload():
+def _current_rows():
+    """SNAP + SHARES → 시세판 행 (STOCKS 순서, 시세 없는 종목 제외)."""
     with _LOCK:
         rows = []
         for s in STOCKS:
@@ -213,7 +236,61 @@ def build_payload():
                 'mcap': q['price'] * shares,
             })
         meta = dict(META, total=len(STOCKS), quoted=len(rows))
-    return json.dumps({'meta': meta, 'rows': rows}, ensure_ascii=False)
+    return rows, meta
+
+
+def _sse(event, seq, body):
+    return f'id: {_BOOT}:{seq}\nevent: {event}\ndata: {body}\n\n'.encode('utf-8')
+
+
+def publish():
+    """스윕 1회 끝 → 새 세대 발행: 직전 세대와 다른 행만 delta 로 직렬화 (1회) 후 대기 스트림 깨움."""
+    rows, meta = _current_rows()
+    cur = {r['code']: r for r in rows}
+    with _PUB_COND:
+        prev = _PUB['rows']
+        seq = _PUB['seq'] + 1
+        meta['seq'] = seq
+        changed = [r for c, r in cur.items() if prev.get(c) != r]
+        removed = [c for c in prev if c not in cur]
+        body = json.dumps({'seq': seq, 'meta': meta, 'rows': changed, 'removed': removed},
+                          ensure_ascii=False)
+        _PUB.update(seq=seq, rows=cur, meta=meta)
+        _DELTAS.append((seq, _sse('delta', seq, body)))
+        _PUB_COND.notify_all()
+    return seq, len(changed)
+
+
+def build_payload():
+    """현재 세대 전체 스냅샷 JSON (세대당 1회 직렬화 후 캐시 — /data 폴링·SSE 첫 이벤트 공용)."""
+    with _PUB_COND:
+        seq = _PUB['seq']
+        if not _PUB['snap'] or _PUB['snap'][0] != seq:
+            _PUB['snap'] = (seq, json.dumps({'seq': seq, 'meta': _PUB['meta'],
+                                             'rows': list(_PUB['rows'].values())},
+                                            ensure_ascii=False))
+        return _PUB['snap'][1]
+
+
+def events_since(last):
+    """클라이언트가 last 세대까지 받았을 때 보낼 이벤트 → (현재 seq, [bytes]).
+
+    보관 delta 로 이어지면 그 delta 들, 아니면(첫 접속·너무 오래 끊김) snapshot 1건.
+    """
+    with _PUB_COND:
+        seq = _PUB['seq']
+        if seq == 0 or last == seq:
+            return seq, []
+        if 0 <= last < seq and _DELTAS and _DELTAS[0][0] <= last + 1:
+            return seq, [ev for s, ev in _DELTAS if s > last]
+        return seq, [_sse('snapshot', seq, build_payload())]   # RLock — 같은 세대로 직렬화
+
+
+def wait_events(last, timeout=SSE_PING_SEC):
+    """last 이후 새 세대가 발행될 때까지 (최대 timeout) 대기 → events_since(last)."""
+    with _PUB_COND:
+        _PUB_COND.wait_for(lambda: _PUB['seq'] != last, timeout)
+    return events_since(last)
 
 
 # ── 관심그룹 1·2 = 포트폴리오 자동 동기화 (10분 주기, 키워드 매칭이라 회차 변경에도 추종) ──
@@ -380,9 +457,29 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(data)
 
+    def _stream(self):
+        """SSE: snapshot → 세대별 delta. 연결이 끊기면(쓰기 실패) 스레드 종료."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        boot, _, last = (self.headers.get('Last-Event-ID') or '').partition(':')
+        seq, events = events_since(_to_int(last, -1) if boot == _BOOT else -1)
+        try:
+            self.wfile.write(b'retry: 3000\n\n')
+            while True:
+                self.wfile.write(b''.join(events) if events else b': ping\n\n')
+                self.wfile.flush()
+                seq, events = wait_events(seq)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, TimeoutError):
+            pass
+
     def do_GET(self):
         path = self.path.split('?', 1)[0]           # 쿼리스트링 무시
-        if path.startswith('/data'):
+        if path.startswith('/stream'):
+            self._stream()
+        elif path.startswith('/data'):
             self._send(build_payload(), 'application/json')
         elif path.startswith('/wl'):
             with _LOCK:
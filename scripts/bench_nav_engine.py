@@ -0,0 +1,136 @@
+"""
+bench_nav_engine.py — nav_engine(벡터) vs 구 일자별 루프 기준가 계산 벤치마크.
+
+실제 Wrap_NAV.xlsx 의 NEW 시트 비중과 wrap_config.nav_portfolio_config() 전 상품을
+'전부 신규 상품'으로 처음부터 계산한다 (가장 무거운 경로 = 최초 생성/recalc).
+등락률은 기본적으로 시드 고정 합성값(±3%)이라 오프라인·결정적이며, --kis 를 주면
+KIS 확정 일봉(kis_token.fetch_daily_closes)으로 실제 등락률을 쓴다.
+
+검증: 두 결과를 소수 둘째 자리 반올림 후 전 상품·전 날짜 일치해야 통과 (exit 1 = 불일치).
+
+CLI:  python scripts/bench_nav_engine.py [--file Wrap_NAV.xlsx] [--repeat 5] [--kis]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'execution'))
+import nav_engine
+import wrap_config
+
+
+def legacy_loop(df_weights, df_change, plans):
+    """calculate_wrap_nav.py 5절 구 구현 (비교 기준, 산식 수정 금지)."""
+    results = {}
+    for pf_name, plan in plans.items():
+        sub_df = df_weights[df_weights['상품명'] == pf_name]
+        if sub_df.empty:
+            continue
+        w_table = sub_df.pivot_table(index='날짜', columns='코드', values='비중', aggfunc='last').fillna(0)
+        idx_list, date_list = [], []
+        if plan.seed_date is not None:
+            idx_list.append(plan.start_price)
+            date_list.append(plan.seed_date)
+        current_index = plan.start_price
+        for d in plan.calc_dates:
+            past_dates = w_table.index[w_table.index < d]
+            if len(past_dates) == 0:
+                port_return = 0
+            else:
+                weights = w_table.loc[past_dates[-1]]
+                valid_cols = weights.index.intersection(df_change.columns)
+                if len(valid_cols) == 0:
+                    port_return = 0
+                else:
+                    port_return = (weights[valid_cols] * df_change.loc[d, valid_cols]).sum() / 100
+            current_index = current_index * (1 + port_return)
+            idx_list.append(current_index)
+            date_list.append(d)
+        results[pf_name] = pd.Series(idx_list, index=date_list)
+    return results
+
+
+def synthetic_changes(codes, start, end, seed=0):
+    """영업일 × 코드 합성 등락률 (±3% 균등, 시드 고정)."""
+    dates = pd.bdate_range(start, end)
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.uniform(-0.03, 0.03, size=(len(dates), len(codes))),
+                        index=dates, columns=list(codes))
+
+
+def kis_changes(codes, start, end):
+    import kis_token
+    closes = kis_token.fetch_daily_closes(list(codes), start.strftime('%Y%m%d'), end.strftime('%Y%m%d'))
+    df = pd.DataFrame()
+    for code, series in closes.items():
+        s = pd.Series(series)
+        s.index = pd.to_datetime(s.index)
+        df[code] = s.sort_index().pct_change()
+    return df.fillna(0)
+
+
+def build_plans(df_change, end):
+    cfg = wrap_config.nav_portfolio_config()
+    plans = {}
+    for pf, c in cfg.items():
+        start = pd.Timestamp(c['start_date'])
+        pf_end = min(end, pd.Timestamp(c['end_date'])) if c.get('end_date') else end
+        if start > pf_end:
+            continue
+        calc = df_change.index[(df_change.index > start) & (df_change.index <= pf_end)]
+        plans[pf] = nav_engine.NavPlan(c['base_price'], calc, start)
+    return plans
+
+
+def _best_of(fn, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--file', default=os.path.join(ROOT, 'Wrap_NAV.xlsx'))
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--kis', action='store_true', help='합성 대신 KIS 확정 일봉 등락률 사용')
+    args = ap.parse_args()
+
+    df_weights = nav_engine.prepare_weights(pd.read_excel(args.file, sheet_name='NEW'))
+    cfg = wrap_config.nav_portfolio_config()
+    start = min(pd.Timestamp(c['start_date']) for c in cfg.values())
+    end = pd.Timestamp.now().normalize()
+    codes = df_weights['코드'].unique()
+    df_change = kis_changes(codes, start, end) if args.kis else synthetic_changes(codes, start, end)
+    plans = build_plans(df_change, end)
+
+    print(f'상품 {len(plans)}개 · 종목 {len(codes)}개 · 거래일 {len(df_change)}일 · '
+          f'리밸런스 행 {len(df_weights)}건 ({"KIS" if args.kis else "합성"} 등락률)')
+
+    t_old, old = _best_of(lambda: legacy_loop(df_weights, df_change, plans), args.repeat)
+    t_new, new = _best_of(lambda: nav_engine.build_nav(df_weights, df_change, plans), args.repeat)
+    print(f'구 루프   : {t_old * 1000:9.1f} ms')
+    print(f'nav_engine: {t_new * 1000:9.1f} ms  (x{t_old / max(t_new, 1e-9):.1f})')
+
+    mismatched = []
+    for pf in old:
+        a = old[pf].round(2)
+        b = new.get(pf, pd.Series(dtype=float)).round(2)
+        if len(a) != len(b) or not a.index.equals(b.index) or not np.array_equal(a.values, b.values):
+            mismatched.append(pf)
+    if set(new) != set(old) or mismatched:
+        print(f'❌ 결과 불일치(소수 둘째 자리): {", ".join(mismatched) or "상품 집합 상이"}')
+        sys.exit(1)
+    print(f'✅ 전 상품 {len(old)}개 소수 둘째 자리 일치')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""별칭 매칭 — AliasMatcher(Aho-Corasick)·_SpanCover 가 종전 별칭별 전수 스캔과 같은 후보를 내는지."""
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'datalake'))
+sys.path.insert(0, os.path.join(ROOT, 'datalake', 'tagging'))
+
+import tagging_common as tc  # noqa: E402
+from bench_alias_matcher import find_candidates_scan  # noqa: E402  (종전 구현)
+
+
+def _universe():
+    """universe_tickers.csv 에서 tagging 이 받는 티커 형식의 행만 (load_universe 와 같은 dict)."""
+    rows = {}
+    with open(os.path.join(ROOT, 'universe_tickers.csv'), encoding='utf-8') as f:
+        for r in csv.DictReader(f):
+            tk, nm, sec = (r['티커'] or '').strip(), (r['기업명'] or '').strip(), (r['섹터'] or '').strip()
+            if tk and nm and sec and ':' in tk and tk.split(':', 1)[0] in tc.TICKER_PREFIXES:
+                rows.setdefault(tk, {'name': nm, 'sector': sec})
+    return {'rows': rows, 'hash': '', 'count': len(rows)}
+
+
+@pytest.fixture(scope='module')
+def index():
+    return tc.build_alias_index(universe=_universe())
+
+
+def _texts(index, n=60, seed=7):
+    """별칭 표면형 + 조사·경계 변형 + URL·출처 헤더·$심볼·코드를 섞은 합성 본문."""
+    rng = random.Random(seed)
+    aliases = [e['alias'] for e in index['entries']]
+    glue = [' ', '가 ', '는 ', '의 ', '와 ', '에이치', ',', '\n', '(', ') ', '$', 'A', '0', 'x']
+    extra = ['https://www.samsung.com/ko 참고 ', '[미래에셋증권 리서치] ', '목표가 상향 ', 'AI 수요 ']
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(5, 40)):
+            parts.append(rng.choice(aliases) if rng.random() < 0.6 else rng.choice(extra))
+            parts.append(rng.choice(glue))
+        text = ''.join(parts)
+        out.append(text.upper() if rng.random() < 0.1 else text)
+    return out
+
+
+def test_find_candidates_matches_scan(index):
+    for text in _texts(index):
+        assert tc.find_candidates(text, index) == find_candidates_scan(text, index)
+
+
+def test_matcher_present_matches_substring_filter(index):
+    m = tc.AliasMatcher(index['entries'])
+    keys = [tc.nfkc(e['alias']).lower() for e in index['entries']]
+    for text in _texts(index, n=20, seed=3):
+        low = tc.nfkc(text).lower()
+        assert m.present(low) == [i for i, k in enumerate(keys) if k and k in low]
+
+
+def test_span_cover_matches_list_scan():
+    rng = random.Random(11)
+    for _ in range(200):
+        n = rng.randint(1, 60)
+        cover, spans = tc._SpanCover(n), []
+        for _ in range(rng.randint(0, 30)):
+            s = rng.randrange(n)
+            e = rng.randint(s + 1, n)
+            want = any(a <= s and e <= b for a, b in spans)
+            assert cover.covers(s, e) == want
+            if not want and rng.random() < 0.7:
+                cover.add(s, e)
+                spans.append((s, e))
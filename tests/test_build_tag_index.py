@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""build_tag_index 증분 갱신 — 노트·문서가 바뀐 뒤 증분 결과가 --full 재생성과 같은지."""
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'datalake'))
+sys.path.insert(0, os.path.join(ROOT, 'datalake', 'tagging'))
+
+import build_tag_index as b  # noqa: E402
+import file_fingerprint  # noqa: E402
+import tag_docs  # noqa: E402
+import tag_worker as tw  # noqa: E402
+import tagging_common as tc  # noqa: E402
+from test_alias_matcher import _universe  # noqa: E402
+
+
+class _Corpus:
+    """리서치 노트 원본 DB + 태깅 상태 DB 2종 + 문서 md 파일 합성."""
+
+    def __init__(self, root, rng):
+        self.root, self.rng = root, rng
+        uni, onto = tc.load_universe(), tc.load_ontology()
+        self.ents = list(uni['rows'])[:200] + ['inst:모건스탠리', 'person:홍길동']
+        self.themes = list(onto['themes'])[:30]
+        self.src = sqlite3.connect(b.RESEARCH_SRC)
+        self.src.execute('CREATE TABLE messages(id INTEGER PRIMARY KEY, timestamp TEXT, text_content TEXT)')
+        self.st = sqlite3.connect(b.RESEARCH_STATE)
+        self.st.executescript(tw.SCHEMA)
+        self.ds = sqlite3.connect(b.DOC_STATE)
+        self.ds.executescript(tw.SCHEMA)
+        self.ds.executescript(tag_docs.DOC_SCHEMA)
+        self.mtime = time.time() - 3600     # 파일 mtime 을 과거로 — 지문 캐시의 racy 구간 회피
+
+    def tag(self, con, mid):
+        con.execute('DELETE FROM theme_assignments WHERE message_id=?', (mid,))
+        con.execute('DELETE FROM entity_occurrences WHERE message_id=?', (mid,))
+        for t in self.rng.sample(self.themes, 2):
+            con.execute('INSERT INTO theme_assignments VALUES (?,?,?,?,?)', (mid, t, 'primary', 1, ''))
+        for i, e in enumerate(self.rng.sample(self.ents, 3)):
+            con.execute('INSERT INTO entity_occurrences VALUES (?,?,?,?,?,?,?,?,?)',
+                        (mid, e, 'text', i, i + 1, e,
+                         self.rng.choice(['subject', 'incidental', 'mentioned']), 'rule', 1))
+
+    def note(self, mid, day):
+        self.src.execute('INSERT OR REPLACE INTO messages VALUES (?,?,?)',
+                         (mid, '%s 09:%02d:00' % (day, mid % 60), '본문 %d ' % mid * 5))
+        self.st.execute('INSERT OR REPLACE INTO items VALUES (?,?,?,?,?,?,?,?,?)',
+                        (mid, day, 'h%d' % mid, 'ck', 'succeeded', 1, None, 1, tw.now()))
+        self.tag(self.st, mid)
+
+    def doc(self, rel):
+        path = os.path.join(self.root, rel)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('---\ntitle: x\n---\n문단 %s %f' % (rel, self.rng.random()))
+        self.mtime += 1
+        os.utime(path, (self.mtime, self.mtime))
+        self.ds.execute('DELETE FROM items WHERE message_id IN (SELECT chunk_id FROM docs WHERE rel_path=?)', (rel,))
+        self.ds.execute('DELETE FROM docs WHERE rel_path=?', (rel,))
+        cid = self.ds.execute('INSERT INTO docs (rel_path,chunk_no,kind,doc_date,title) VALUES (?,?,?,?,?)',
+                              (rel, 0, 'transcripts', '2026-09-01', rel)).lastrowid
+        self.ds.execute('INSERT INTO items VALUES (?,?,?,?,?,?,?,?,?)',
+                        (cid, '2026-09-01', 'h', 'ck', 'succeeded', 1, None, 1, tw.now()))
+        self.tag(self.ds, cid)
+
+    def commit(self):
+        for c in (self.src, self.st, self.ds):
+            c.commit()
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'research_notes'))
+    os.makedirs(os.path.join(root, 'transcripts'))
+    monkeypatch.setattr(b, 'DATALAKE_ROOT', root)
+    monkeypatch.setattr(b, 'OUT_PATH', os.path.join(root, 'tag_index.sqlite'))
+    monkeypatch.setattr(b, 'RESEARCH_STATE', os.path.join(root, 'research_notes', 'tag_state.sqlite'))
+    monkeypatch.setattr(b, 'RESEARCH_SRC', os.path.join(root, 'research_notes.db'))
+    monkeypatch.setattr(b, 'DOC_STATE', os.path.join(root, 'doc_tag_state.sqlite'))
+    monkeypatch.setattr(tag_docs, 'DATALAKE_ROOT', root)
+    monkeypatch.setattr(tc, 'load_universe', lambda path=None: _universe())
+    fp = file_fingerprint.FingerprintCache(os.path.join(root, 'fp.sqlite'))
+    monkeypatch.setattr(file_fingerprint, '_SHARED', fp)
+    c = _Corpus(root, random.Random(1))
+    yield c
+    fp.close()
+    for con in (c.src, c.st, c.ds):
+        con.close()
+
+
+def _run(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['build_tag_index'] + list(args))
+    assert b.main() == 0
+
+
+def _snapshot():
+    c = sqlite3.connect(b.OUT_PATH)
+    try:
+        return (sorted(c.execute('SELECT tag,kind,corpus,doc_date,rel_path,anchor,title,snippet,src FROM hits')),
+                sorted(c.execute('SELECT tag,freq FROM labels')),
+                sorted(c.execute('SELECT term,tag,freq FROM tag_terms')))
+    finally:
+        c.close()
+
+
+def test_incremental_matches_full(corpus, monkeypatch):
+    for m in range(1, 401):
+        corpus.note(m, '2026-08-%02d' % (m % 28 + 1))
+    for k in range(20):
+        corpus.doc('transcripts/d%d.md' % k)
+    corpus.commit()
+    _run(monkeypatch)
+
+    # 새 노트·재태깅·실패 전환, 문서 수정·신규·청크 삭제
+    for m in range(401, 431):
+        corpus.note(m, '2026-09-02')
+    for m in corpus.rng.sample(range(1, 401), 15):
+        corpus.tag(corpus.st, m)
+        corpus.st.execute('UPDATE items SET updated_at=? WHERE message_id=?', (tw.now() + 'x', m))
+    corpus.st.execute("UPDATE items SET status='failed' WHERE message_id BETWEEN 100 AND 104")
+    for rel in ('transcripts/d3.md', 'transcripts/d4.md', 'transcripts/new.md'):
+        corpus.doc(rel)
+    corpus.ds.execute("DELETE FROM items WHERE message_id IN "
+                      "(SELECT chunk_id FROM docs WHERE rel_path='transcripts/d5.md')")
+    corpus.commit()
+
+    _run(monkeypatch)
+    incremental = _snapshot()
+    assert incremental[0]
+    _run(monkeypatch, '--full')
+    assert incremental == _snapshot()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""high_history.prior_highs — 종전 compute_newhigh_20d 의 종목별 dict 머지·정렬 창 스캔과 같은지."""
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip('holidays')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'execution'))
+os.environ.pop('KRX_CALENDAR_CACHE', None)
+
+import high_history  # noqa: E402
+from krx_session import is_session  # noqa: E402
+
+WINDOWS = (20, 120, 252)
+
+
+def _legacy(rng, days, codes, fill):
+    """종전 JSON 형식 히스토리 — 비거래일·빈 값·0 섞음."""
+    stocks = {}
+    for code in codes:
+        highs = {d: rng.choice([0, '', rng.randint(1000, 99000)]) if rng.random() < 0.05
+                 else rng.randint(1000, 99000)
+                 for d in days if rng.random() < fill}
+        stocks[code] = {'name': 'N' + code, 'market': 'KOSPI', 'highs': highs, 'closes': dict(highs)}
+    return {'dates': days, 'stocks': stocks}
+
+
+def _ref_prior(kis, yf, code, before):
+    """종전 스캔: 날짜별 KIS 우선 머지 → 거래일·before 미만만 → sorted(past)[-N:] 의 최대."""
+    past = {}
+    for src in (yf, kis):
+        for d, v in ((src['stocks'].get(code) or {}).get('highs') or {}).items():
+            if d < before and v and is_session(d):
+                past[d] = v
+    ds = sorted(past)
+    return {n: (max(past[d] for d in ds[-n:]) if ds else 0, len(ds[-n:])) for n in WINDOWS}
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_prior_highs_matches_legacy_scan(seed):
+    rng = random.Random(seed)
+    start = date(2024, 6, 1)
+    days = [(start + timedelta(days=i)).isoformat() for i in range(420)]
+    codes = ['%06d' % i for i in range(40)]
+    yf = _legacy(rng, days[:300], codes[:30], 0.9)
+    kis = _legacy(rng, days[200:], codes[10:], 0.7)
+    hist = high_history.merge(high_history.History.from_legacy(kis),
+                              high_history.History.from_legacy(yf))
+    for before in (days[100], days[310], days[-1], '2030-01-01'):
+        got = high_history.prior_highs(hist, before, WINDOWS)
+        for j, code in enumerate(hist.codes):
+            want = _ref_prior(kis, yf, str(code), before)
+            for n in WINDOWS:
+                prev, used = got[n]
+                assert (float(prev[j]), int(used[j])) == (float(want[n][0]), want[n][1]), (code, before, n)
+
+
+def test_prior_highs_empty_history():
+    out = high_history.prior_highs(high_history.History.empty(), '2026-01-05', WINDOWS)
+    assert all(len(prev) == 0 and len(used) == 0 for prev, used in out.values())
+    assert isinstance(out[20][0], np.ndarray)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""krx_session 거래일 표 — 종전 날짜별 판정(주말·holidays.KR·EXTRA_CLOSED, 하루씩 걷기)과 같은지."""
+import os
+import sys
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytest
+
+holidays = pytest.importorskip('holidays')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'execution'))
+os.environ.pop('KRX_CALENDAR_CACHE', None)
+
+import krx_session  # noqa: E402
+
+FIRST, LAST = date(2018, 1, 1), date(2027, 12, 31)
+DAYS = [FIRST + timedelta(days=i) for i in range((LAST - FIRST).days + 1)]
+
+
+@lru_cache(maxsize=None)
+def _kr(year):
+    return holidays.KR(years=[year])
+
+
+def _ref_is_session(d):
+    """종전 is_session — 날짜마다 주말·EXTRA_CLOSED·holidays.KR 판정."""
+    if d.weekday() >= 5 or (d.month, d.day) in krx_session.EXTRA_CLOSED:
+        return False
+    return d not in _kr(d.year)
+
+
+REF = {d: _ref_is_session(d) for d in DAYS}
+
+
+def _ref_walk(d, n):
+    """종전 방식 — 하루씩 걸으며 거래일을 센다 (n=0 은 d 포함 직전 거래일)."""
+    step = 1 if n > 0 else -1
+    left = abs(n) if n else 1
+    cur = d if n else d + timedelta(days=1)
+    while left:
+        cur += timedelta(days=step)
+        if REF.get(cur, _ref_is_session(cur)):
+            left -= 1
+    return cur
+
+
+def test_is_session_matches_per_day_logic():
+    assert [krx_session.is_session(d) for d in DAYS] == [REF[d] for d in DAYS]
+    assert [krx_session.is_session(d.isoformat()) for d in DAYS[::7]] == [REF[d] for d in DAYS[::7]]
+
+
+def test_previous_and_offset_match_walk():
+    for d in DAYS[30:-30:3]:
+        assert krx_session.previous_session(d) == _ref_walk(d, -1)
+        assert krx_session.next_session(d) == _ref_walk(d, 1)
+        for n in (-20, -5, 0, 3, 20):
+            assert krx_session.offset(d, n) == _ref_walk(d, n), (d, n)
+
+
+def test_sessions_between_matches_filter():
+    for a, b in ((date(2019, 12, 20), date(2020, 1, 10)), (date(2024, 9, 1), date(2024, 10, 15)),
+                 (date(2025, 5, 1), date(2025, 5, 1)), (date(2025, 5, 2), date(2025, 5, 1))):
+        want = [d for d in DAYS if a <= d <= b and REF[d]]
+        assert krx_session.sessions_between(a, b) == want
+
+
+def test_array_api_matches_scalar():
+    days = np.array(DAYS[::5], dtype='datetime64[D]')
+    want = np.array([REF[d] for d in DAYS[::5]])
+    assert (krx_session.session_mask(days) == want).all()
+    assert (krx_session.session_mask(pd.DatetimeIndex(days)) == want).all()
+    strs = np.array([d.isoformat() for d in DAYS[::5]] + ['bad'], dtype=object)
+    assert (krx_session.session_mask(strs) == np.append(want, False)).all()
+    prev = krx_session.previous_sessions(days)
+    assert [p.astype(object) for p in prev] == [_ref_walk(d, -1) for d in DAYS[::5]]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""nav_engine 회귀 테스트 — 엄격한 '<' 비중 적용·스냅샷(ffill 금지)·누적 산식."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from execution.nav_engine import NavPlan, build_nav, prepare_weights
+
+D = pd.to_datetime(['2026-05-04', '2026-05-06', '2026-05-07', '2026-05-08'])
+
+
+def _weights(rows):
+    return prepare_weights(pd.DataFrame(rows, columns=['날짜', '상품명', '코드', '비중']))
+
+
+def test_same_day_rebalance_applies_next_session():
+    """당일 NEW 변경은 당일 NAV에 반영되지 않는다 (룩어헤드 금지)."""
+    w = _weights([
+        ('2026-05-04', 'A', '5930', 100),
+        ('2026-05-07', 'A', '660', 100),
+    ])
+    chg = pd.DataFrame({'005930': [0, 0.10, 0.10, 0.10], '000660': [0, -0.05, -0.05, -0.05]}, index=D)
+    nav = build_nav(w, chg, {'A': NavPlan(1000.0, D[1:], D[0])})['A']
+    # 05-06·05-07 = 005930(+10%), 05-08 = 000660(-5%)
+    assert list(nav.index) == list(D)
+    assert nav.round(2).tolist() == [1000.0, 1100.0, 1210.0, 1149.5]
+
+
+def test_dropped_code_is_not_resurrected():
+    """편출 종목(다음 스냅샷 미기재)은 비중 0 — 옛 비중 ffill 금지."""
+    w = _weights([
+        ('2026-05-04', 'A', '005930', 50),
+        ('2026-05-04', 'A', '000660', 50),
+        ('2026-05-06', 'A', '005930', 50),
+    ])
+    chg = pd.DataFrame({'005930': [0, 0, 0.02, 0], '000660': [0, 0, 0.50, 0]}, index=D)
+    nav = build_nav(w, chg, {'A': NavPlan(1000.0, D[1:])})['A']
+    assert nav.loc[D[2]] == pytest.approx(1010.0)
+
+
+def test_before_first_rebalance_and_missing_product():
+    w = _weights([('2026-05-07', 'A', '005930', 100)])
+    chg = pd.DataFrame({'005930': [0.01, 0.01, 0.01, 0.01]}, index=D)
+    out = build_nav(w, chg, {'A': NavPlan(1000.0, D[1:]), 'B': NavPlan(1000.0, D[1:])})
+    assert 'B' not in out
+    assert out['A'].round(2).tolist() == [1000.0, 1000.0, 1010.0]